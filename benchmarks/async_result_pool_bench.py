@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""Throughput benchmark of the redis async result pool.
+
+It compares the current `RedisPool` with the previous implementation, which
+issued SET/RPUSH/EXPIRE for each write and GET/BLPOP/RPUSH/GET for each
+read. By default an in-process fakeredis server is used, pass
+`--redis-url` to run against a real redis server, where the saved round
+trips matter much more.
+
+.. code-block:: shell
+
+    python benchmarks/async_result_pool_bench.py --tasks 2000 --workers 16
+"""
+import argparse
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import redis
+
+from agentscope.server.async_result_pool import RedisPool
+
+
+class LegacyRedisPool:
+    """The redis pool before the pipelined version, kept for comparison."""
+
+    INCR_KEY = "as_legacy_obj_id"
+    TASK_QUEUE_PREFIX = "as_legacy_task_"
+
+    def __init__(self, client: redis.Redis, max_expire: int) -> None:
+        self.pool = client
+        self.max_expire = max_expire
+
+    def prepare(self) -> int:
+        """Prepare a key."""
+        return self.pool.incr(LegacyRedisPool.INCR_KEY)
+
+    def set(self, key: int, value: bytes) -> None:
+        """Set a value."""
+        qkey = LegacyRedisPool.TASK_QUEUE_PREFIX + str(key)
+        self.pool.set(key, value, ex=self.max_expire)
+        self.pool.rpush(qkey, key)
+        self.pool.expire(qkey, self.max_expire)
+
+    def get(self, key: int, timeout: int = 5) -> bytes:
+        """Get a value."""
+        result = self.pool.get(key)
+        if result:
+            return result
+        keys = self.pool.blpop(
+            keys=LegacyRedisPool.TASK_QUEUE_PREFIX + str(key),
+            timeout=timeout,
+        )
+        if keys is None:
+            raise TimeoutError(f"Waiting timeout for task[{key}]")
+        self.pool.rpush(LegacyRedisPool.TASK_QUEUE_PREFIX + str(key), key)
+        return self.pool.get(key)
+
+
+def _run(pool: object, tasks: int, workers: int, payload: bytes) -> dict:
+    """Prepare `tasks` keys, wait for them in `workers` threads while they
+    are set by another `workers` threads."""
+    keys = [pool.prepare() for _ in range(tasks)]
+    st = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as get_executor:
+        with ThreadPoolExecutor(max_workers=workers) as set_executor:
+            getters = [get_executor.submit(pool.get, key, 30) for key in keys]
+            for key in keys:
+                set_executor.submit(pool.set, key, payload)
+            for getter in getters:
+                assert getter.result() == payload
+    elapsed = time.perf_counter() - st
+    return {
+        "tasks": tasks,
+        "seconds": round(elapsed, 4),
+        "tasks_per_second": round(tasks / elapsed, 1),
+    }
+
+
+def main() -> None:
+    """Run the benchmark and print the results as json."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--redis-url", type=str, default=None)
+    parser.add_argument("--tasks", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--payload-size", type=int, default=1024)
+    args = parser.parse_args()
+
+    if args.redis_url is None:
+        import fakeredis
+
+        connection_pool = redis.BlockingConnectionPool(
+            connection_class=fakeredis.FakeConnection,
+            server=fakeredis.FakeServer(),
+            max_connections=args.workers * 4,
+        )
+    else:
+        connection_pool = redis.BlockingConnectionPool.from_url(
+            args.redis_url,
+            max_connections=args.workers * 4,
+        )
+    with patch.object(
+        redis.BlockingConnectionPool,
+        "from_url",
+        return_value=connection_pool,
+    ):
+        current = RedisPool(
+            url=args.redis_url or "redis://fakeredis",
+            max_expire=600,
+            max_connections=args.workers * 4,
+        )
+    legacy = LegacyRedisPool(
+        redis.Redis(connection_pool=connection_pool),
+        max_expire=600,
+    )
+    payload = b"x" * args.payload_size
+    results = {
+        "backend": args.redis_url or "fakeredis",
+        "legacy": _run(legacy, args.tasks, args.workers, payload),
+        "current": _run(current, args.tasks, args.workers, payload),
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,599 @@
+# -*- coding: utf-8 -*-
+"""End-to-end benchmark of the overhead of AgentScope.
+
+The agents call a local mock LLM server (see `mock_llm_server.py`) with a
+fixed latency and token rate, so the time spent by the framework itself,
+e.g. formatting the prompts, parsing the responses, broadcasting the
+messages and the rpc calls, can be told apart from the time of the LLM. The
+scenarios are
+
+- `msghub_rounds`: the agents in a msghub speak in turn, each message being
+  broadcast to the others,
+- `sequential_pipeline`: a `SequentialPipeline` of dialog agents,
+- `react`: a `ReActAgent` calling a tool in a loop before finishing,
+- `to_dist`: one dialog agent in each of N agent servers, called in
+  parallel in each round,
+- `memory_retrieval`: retrieving a `TemporaryMemory` by embeddings,
+- `rag_retrieval`: retrieving a `LlamaIndexKnowledge`, skipped if
+  llama-index is not installed.
+
+For each scenario it reports the wall time, the CPU time of this process
+(including the threads of the mock server), the number of the LLM
+requests, the time spent in the mock server and the overhead, i.e. the
+wall time minus the time of the LLM on the critical path. The results
+are printed as json, and saved by `--output`, so that the overhead can be
+tracked across commits by `--compare` with a previous result, which exits
+with a non-zero status if any overhead regresses by more than
+`--threshold`. With `--profile`, the run is profiled by
+`agentscope.init(profile=True)` and the summary of the hot paths is
+printed, which also shows the overhead of the profiler itself.
+
+The model calls can be recorded by `--record <save_dir>` and replayed by
+`--replay <run_dir>`, where the replayed responses are served without
+delay, so the whole wall time is the overhead of the framework.
+
+.. code-block:: shell
+
+    python benchmarks/e2e_bench.py --latency 0.05 --output before.json
+    # after changing the code
+    python benchmarks/e2e_bench.py --latency 0.05 --compare before.json
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional
+
+import agentscope
+from agentscope.agents import DialogAgent, ReActAgent
+from agentscope.manager import (
+    ASManager,
+    FileManager,
+    ModelManager,
+    MonitorManager,
+)
+from agentscope.memory import TemporaryMemory
+from agentscope.message import Msg
+from agentscope.msghub import msghub
+from agentscope.pipelines import SequentialPipeline
+from agentscope.server import RpcAgentServerLauncher
+from agentscope.service import ServiceToolkit, ServiceResponse, cos_sim
+from agentscope.service.service_status import ServiceExecStatus
+
+# the mock server next to this script, not a third party package
+from mock_llm_server import MockLLMServer  # pylint: disable=C0411
+
+SCENARIOS: Dict[str, Callable[[argparse.Namespace, MockLLMServer], dict]] = {}
+
+
+def scenario(func: Callable) -> Callable:
+    """Register a scenario by its function name."""
+    SCENARIOS[func.__name__] = func
+    return func
+
+
+def add(a: int, b: int) -> ServiceResponse:
+    """Add two numbers.
+
+    Args:
+        a (`int`):
+            The first number.
+        b (`int`):
+            The second number.
+    """
+    return ServiceResponse(ServiceExecStatus.SUCCESS, int(a) + int(b))
+
+
+def _model_configs(args: argparse.Namespace, base_url: str) -> list:
+    client_args = {"base_url": f"{base_url}/v1", "max_retries": 0}
+    return [
+        {
+            "config_name": "mock_chat",
+            "model_type": "openai_chat",
+            "model_name": "gpt-4o",
+            "api_key": "mock",
+            "client_args": client_args,
+            "stream": args.stream,
+        }
+        if args.api == "openai"
+        else {
+            "config_name": "mock_chat",
+            "model_type": "post_api_chat",
+            "api_url": f"{base_url}/api/chat",
+            "json_args": {"model": "gpt-4o"},
+            "messages_key": "messages",
+        },
+        {
+            "config_name": "mock_embedding",
+            "model_type": "openai_embedding",
+            "model_name": "text-embedding-3-small",
+            "api_key": "mock",
+            "client_args": client_args,
+        },
+    ]
+
+
+def _dialog_agents(n: int) -> List[DialogAgent]:
+    return [
+        DialogAgent(
+            name=f"agent_{i}",
+            sys_prompt="You're a helpful assistant.",
+            model_config_name="mock_chat",
+        )
+        for i in range(n)
+    ]
+
+
+def _consume(msg: Msg) -> Msg:
+    """Wait for the streaming content, if any."""
+    content = msg.content
+    del content
+    return msg
+
+
+@scenario
+def msghub_rounds(args: argparse.Namespace, server: MockLLMServer) -> dict:
+    """The agents speak in turn in a msghub."""
+    del server
+    agents = _dialog_agents(args.agents)
+    announcement = Msg("host", "Let's discuss.", "assistant")
+    with msghub(agents, announcement=announcement):
+        for _ in range(args.rounds):
+            for agent in agents:
+                _consume(agent())
+    return {"agents": args.agents, "rounds": args.rounds}
+
+
+@scenario
+def sequential_pipeline(
+    args: argparse.Namespace,
+    server: MockLLMServer,
+) -> dict:
+    """A pipeline of dialog agents."""
+    del server
+    pipeline = SequentialPipeline(_dialog_agents(args.agents))
+    msg = Msg("user", "Hello.", "user")
+    for _ in range(args.rounds):
+        msg = _consume(pipeline(msg))
+    return {"agents": args.agents, "rounds": args.rounds}
+
+
+@scenario
+def react(args: argparse.Namespace, server: MockLLMServer) -> dict:
+    """A ReAct agent calling a tool in a loop."""
+    del server
+    toolkit = ServiceToolkit()
+    toolkit.add(add)
+    agent = ReActAgent(
+        name="react",
+        model_config_name="mock_chat",
+        service_toolkit=toolkit,
+        max_iters=args.react_iters + 2,
+        verbose=False,
+    )
+    for i in range(args.rounds):
+        res = agent(
+            Msg("user", f"Task {i} [react:{args.react_iters}]", "user"),
+        )
+        assert "called add" in res.content, res.content
+    return {"rounds": args.rounds, "tool_calls_per_reply": args.react_iters}
+
+
+@scenario
+def to_dist(args: argparse.Namespace, server: MockLLMServer) -> dict:
+    """Call one agent in each agent server in parallel."""
+    launchers = [
+        RpcAgentServerLauncher(host="localhost", local_mode=True)
+        for _ in range(args.servers)
+    ]
+    try:
+        for launcher in launchers:
+            launcher.launch()
+        agents = [
+            DialogAgent(
+                name=f"agent_{i}",
+                sys_prompt="You're a helpful assistant.",
+                model_config_name="mock_chat",
+            ).to_dist(host=launcher.host, port=launcher.port)
+            for i, launcher in enumerate(launchers)
+        ]
+        # warm up the channels and the agents out of the measurement
+        for res in [agent() for agent in agents]:
+            _consume(res)
+
+        server.reset_stats()
+        start = time.perf_counter()
+        msg = Msg("user", "Hello.", "user")
+        for _ in range(args.rounds):
+            for res in [agent(msg) for agent in agents]:
+                _consume(res)
+        wall = time.perf_counter() - start
+    finally:
+        for launcher in launchers:
+            launcher.shutdown()
+
+    # the requests of a round run in parallel in the servers
+    llm_path = args.rounds * server.generation_seconds(args.completion_tokens)
+    return {
+        "servers": args.servers,
+        "rounds": args.rounds,
+        "wall_s": wall,
+        "llm_critical_path_s": llm_path,
+        "model_calls": args.servers * args.rounds,
+    }
+
+
+@scenario
+def memory_retrieval(args: argparse.Namespace, server: MockLLMServer) -> dict:
+    """Retrieve the memory by embeddings."""
+    del server
+    embedding_model = ModelManager.get_instance().get_model_by_config_name(
+        "mock_embedding",
+    )
+    memory = TemporaryMemory(embedding_model=embedding_model)
+    units = [
+        Msg("user", f"memory unit {i} about topic {i % 7}", "user")
+        for i in range(args.memory_size)
+    ]
+    memory.add(units)
+    # embed the memory units in one request
+    for unit, embedding in zip(
+        units,
+        embedding_model([_.content for _ in units]).embedding,
+    ):
+        unit.embedding = embedding
+
+    for i in range(args.queries):
+        retrieved = memory.retrieve_by_embedding(
+            embedding_model(f"topic {i % 7}").embedding[0],
+            metric=lambda a, b: cos_sim(a, b).content,
+            top_k=5,
+        )
+        assert len(retrieved) == 5
+    return {"memory_size": args.memory_size, "queries": args.queries}
+
+
+@scenario
+def rag_retrieval(args: argparse.Namespace, server: MockLLMServer) -> dict:
+    """Retrieve a llama-index knowledge."""
+    del server
+    try:
+        from agentscope.rag.llama_index_knowledge import LlamaIndexKnowledge
+        import llama_index.core  # noqa: F401 # pylint: disable=W0611
+    except ImportError as e:
+        return {"skipped": f"llama-index is not installed: {e}"}
+
+    data_dir = tempfile.mkdtemp()
+    persist_dir = tempfile.mkdtemp()
+    try:
+        for i in range(args.documents):
+            with open(
+                os.path.join(data_dir, f"doc_{i}.txt"),
+                "w",
+                encoding="utf-8",
+            ) as file:
+                file.write(f"Document {i} about topic {i % 7}. " * 20)
+
+        knowledge = LlamaIndexKnowledge(
+            knowledge_id="bench_knowledge",
+            emb_model=ModelManager.get_instance().get_model_by_config_name(
+                "mock_embedding",
+            ),
+            knowledge_config={
+                "knowledge_id": "bench_knowledge",
+                "data_processing": [
+                    {
+                        "load_data": {
+                            "loader": {
+                                "create_object": True,
+                                "module": "llama_index.core",
+                                "class": "SimpleDirectoryReader",
+                                "init_args": {
+                                    "input_dir": data_dir,
+                                    "required_exts": [".txt"],
+                                },
+                            },
+                        },
+                    },
+                ],
+            },
+            persist_root=persist_dir,
+        )
+        for i in range(args.queries):
+            knowledge.retrieve(f"topic {i % 7}", similarity_top_k=5)
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+        shutil.rmtree(persist_dir, ignore_errors=True)
+    return {"documents": args.documents, "queries": args.queries}
+
+
+def _model_calls() -> int:
+    """The number of the model calls of this process in the metrics."""
+    _, counters = MonitorManager.get_instance().metrics.snapshot()
+    return sum(
+        v for (_, metric), v in counters.items() if metric == "requests"
+    )
+
+
+def run_scenario(
+    name: str,
+    args: argparse.Namespace,
+    server: MockLLMServer,
+) -> dict:
+    """Run a scenario and compute its overhead."""
+    server.reset_stats()
+    calls = _model_calls()
+    cpu = time.process_time()
+    start = time.perf_counter()
+    result = SCENARIOS[name](args, server)
+    wall = time.perf_counter() - start
+    cpu = time.process_time() - cpu
+    if "skipped" in result:
+        return result
+
+    # the scenarios running in other processes measure their own time
+    wall = result.pop("wall_s", wall)
+    llm = result.pop("llm_critical_path_s", server.busy_seconds)
+    requests = server.requests
+    if args.replay is not None:
+        # the replayed responses are served without delay
+        llm = 0.0
+        requests = _model_calls() - calls
+    # the model calls in the other processes
+    requests = result.pop("model_calls", requests)
+    overhead = max(wall - llm, 0.0)
+    return {
+        **result,
+        "wall_s": round(wall, 4),
+        "cpu_s": round(cpu, 4),
+        "llm_requests": requests,
+        "llm_s": round(llm, 4),
+        "overhead_s": round(overhead, 4),
+        "overhead_per_request_ms": round(
+            overhead / max(requests, 1) * 1000,
+            3,
+        ),
+    }
+
+
+def _commit() -> Optional[str]:
+    try:
+        return (
+            subprocess.check_output(
+                ["git", "rev-parse", "HEAD"],
+                cwd=os.path.dirname(os.path.abspath(__file__)),
+                stderr=subprocess.DEVNULL,
+            )
+            .decode()
+            .strip()
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> List[str]:
+    """The scenarios whose overhead per request regressed by more than the
+    threshold compared with the baseline."""
+    regressions = []
+    for name, result in results["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(name, {})
+        key = "overhead_per_request_ms"
+        if key not in result or key not in before:
+            continue
+        # ignore the differences within the timer resolution
+        if result[key] > before[key] * (1 + threshold) + 0.05:
+            regressions.append(
+                f"{name}: {before[key]} -> {result[key]} ms per request",
+            )
+    return regressions
+
+
+def _parse_args() -> argparse.Namespace:
+    """Parse the command line arguments."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--scenarios",
+        nargs="+",
+        choices=list(SCENARIOS),
+        default=list(SCENARIOS),
+        help="The scenarios to run.",
+    )
+    parser.add_argument(
+        "--api",
+        choices=["openai", "post_api"],
+        default="openai",
+        help="The model wrapper calling the mock server.",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Stream the chat responses.",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Profile the run and print the summary of the hot paths.",
+    )
+    parser.add_argument(
+        "--record",
+        type=str,
+        default=None,
+        help="The directory to record the model calls into.",
+    )
+    parser.add_argument(
+        "--replay",
+        type=str,
+        default=None,
+        help="The recorded run to replay the model calls from.",
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.05,
+        help="The seconds before the first token of each chat response.",
+    )
+    parser.add_argument(
+        "--token-rate",
+        type=float,
+        default=0.0,
+        help="The generated tokens per second, unlimited if 0.",
+    )
+    parser.add_argument(
+        "--completion-tokens",
+        type=int,
+        default=16,
+        help="The number of the words of each plain reply.",
+    )
+    parser.add_argument(
+        "--embedding-latency",
+        type=float,
+        default=0.005,
+        help="The seconds of each embedding request.",
+    )
+    parser.add_argument(
+        "--agents",
+        type=int,
+        default=4,
+        help="The number of the agents in the msghub and the pipeline.",
+    )
+    parser.add_argument(
+        "--rounds",
+        type=int,
+        default=5,
+        help="The number of the rounds of each scenario.",
+    )
+    parser.add_argument(
+        "--servers",
+        type=int,
+        default=4,
+        help="The number of the agent servers of `to_dist`.",
+    )
+    parser.add_argument(
+        "--react-iters",
+        type=int,
+        default=3,
+        help="The number of the tool calls in each reply of `react`.",
+    )
+    parser.add_argument(
+        "--memory-size",
+        type=int,
+        default=200,
+        help="The number of the messages in the memory to retrieve.",
+    )
+    parser.add_argument(
+        "--documents",
+        type=int,
+        default=20,
+        help="The number of the documents in the knowledge to retrieve.",
+    )
+    parser.add_argument(
+        "--queries",
+        type=int,
+        default=20,
+        help="The number of the retrieval queries.",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default=None,
+        help="The json file to save the results.",
+    )
+    parser.add_argument(
+        "--compare",
+        type=str,
+        default=None,
+        help="The json file of the baseline results to compare with.",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="The relative regression of the overhead to fail with.",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Run the benchmark and print the results as json."""
+    args = _parse_args()
+
+    run_dir = args.record or tempfile.mkdtemp()
+    server = MockLLMServer(
+        latency=args.latency,
+        token_rate=args.token_rate,
+        completion_tokens=args.completion_tokens,
+        embedding_latency=args.embedding_latency,
+    ).start()
+    try:
+        agentscope.init(
+            model_configs=_model_configs(args, server.base_url),
+            save_dir=run_dir,
+            save_log=False,
+            logger_level="WARNING",
+            profile=args.profile,
+            record_model_calls=args.record is not None,
+            replay=args.replay,
+        )
+        # import the sdks and open the connections out of the measurement
+        manager = ModelManager.get_instance()
+        manager.get_model_by_config_name("mock_embedding")("warm up")
+        _consume(_dialog_agents(1)[0]())
+
+        scenarios = {}
+        for name in args.scenarios:
+            scenarios[name] = run_scenario(name, args, server)
+            print(f"{name}: {json.dumps(scenarios[name])}", file=sys.stderr)
+    finally:
+        server.stop()
+        profile_dir = os.path.join(
+            FileManager.get_instance().run_dir or run_dir,
+            "profile",
+        )
+        ASManager.get_instance().flush()
+        if args.profile and os.path.exists(profile_dir):
+            with open(
+                os.path.join(profile_dir, "summary.txt"),
+                "r",
+                encoding="utf-8",
+            ) as file:
+                print(file.read(), file=sys.stderr)
+        if args.record is None:
+            shutil.rmtree(run_dir, ignore_errors=True)
+
+    results = {
+        "meta": {
+            "commit": _commit(),
+            "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "agentscope": agentscope.__version__,
+            "args": {
+                k: v
+                for k, v in vars(args).items()
+                if k not in ("output", "compare", "threshold", "record")
+            },
+        },
+        "scenarios": scenarios,
+    }
+    print(json.dumps(results, indent=2))
+    if args.output is not None:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+    if args.compare is not None:
+        with open(args.compare, "r", encoding="utf-8") as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline, args.threshold)
+        for regression in regressions:
+            print(f"Regression in {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""Latency benchmark of `execute_python_code` without docker.
+
+It compares the pre-forked sandbox pool with the previous implementation,
+which started a `multiprocessing.Manager` and a new process for every
+snippet. Snippets are executed one after another, so that the numbers
+reflect the per-snippet overhead seen by an agent.
+
+.. code-block:: shell
+
+    python benchmarks/exec_python_bench.py --runs 50
+"""
+import argparse
+import json
+import multiprocessing
+import statistics
+import time
+from typing import Callable
+
+from loguru import logger
+
+from agentscope.service.execute_code.exec_python import (
+    _execute_python_code_sys,
+    _sys_execute,
+)
+
+
+def legacy_execute(code: str, timeout: float) -> tuple:
+    """The implementation before the sandbox pool, kept for comparison."""
+    manager = multiprocessing.Manager()
+    shared_list = manager.list()
+    p = multiprocessing.Process(
+        target=_sys_execute,
+        args=(code, shared_list, None, timeout),
+    )
+    p.start()
+    p.join()
+    result = tuple(shared_list)
+    manager.shutdown()
+    return result
+
+
+def current_execute(code: str, timeout: float) -> tuple:
+    """The current implementation."""
+    response = _execute_python_code_sys(code, timeout)
+    return response.status, response.content
+
+
+def _run(func: Callable, code: str, runs: int) -> dict:
+    latencies = []
+    for _ in range(runs):
+        st = time.perf_counter()
+        func(code, 10)
+        latencies.append((time.perf_counter() - st) * 1000)
+    latencies.sort()
+    return {
+        "runs": runs,
+        "mean_ms": round(statistics.mean(latencies), 2),
+        "p50_ms": round(latencies[len(latencies) // 2], 2),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1], 2),
+    }
+
+
+def main() -> None:
+    """Run the benchmark and print the results as json."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--code", type=str, default="print(sum(range(100)))")
+    args = parser.parse_args()
+
+    # the warning of sys execution is logged for every call
+    logger.remove()
+    # warm up the pool
+    current_execute(args.code, 10)
+    results = {
+        "code": args.code,
+        "legacy": _run(legacy_execute, args.code, args.runs),
+        "current": _run(current_execute, args.code, args.runs),
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
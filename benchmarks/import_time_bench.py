@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""Import-time benchmark of AgentScope.
+
+Each statement is run in fresh interpreters with `python -X importtime`, and
+the median of the cumulative import time of the top-level modules is
+reported, together with the slowest modules and the heavy optional
+dependencies that were imported. With `--max-ms`, it exits with an error if
+a statement takes longer, so that it can be used as a regression check.
+
+.. code-block:: shell
+
+    python benchmarks/import_time_bench.py --runs 5
+    python benchmarks/import_time_bench.py --max-ms 300 \\
+        --statement "import agentscope"
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+STATEMENTS = [
+    "import agentscope",
+    "import agentscope; agentscope.init(disable_saving=True)",
+    "import agentscope.service.execute_code.exec_python",
+    "from agentscope.models import OpenAIChatWrapper",
+]
+
+# the optional dependencies that should only be imported when they're used
+HEAVY_MODULES = [
+    "openai",
+    "dashscope",
+    "google.generativeai",
+    "zhipuai",
+    "litellm",
+    "anthropic",
+    "ollama",
+    "playwright",
+    "flask",
+    "grpc",
+    "cloudpickle",
+    "socketio",
+    "sqlalchemy",
+    "numpy",
+    "scipy",
+    "llama_index",
+]
+
+
+def parse_importtime(stderr: str) -> list:
+    """Parse the output of `-X importtime` into a list of (module,
+    cumulative microseconds, whether it's imported at the top level)."""
+    records = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        if cumulative.strip().isdigit():
+            # the nested imports are indented by two spaces per level
+            records.append(
+                (name.strip(), int(cumulative), not name[1:].startswith(" ")),
+            )
+    return records
+
+
+def measure(statement: str) -> tuple:
+    """Run the statement in a fresh interpreter, return the import time in
+    milliseconds, the import records and the imported heavy modules."""
+    code = (
+        f"{statement}\n"
+        "import json, sys\n"
+        f"print(json.dumps([m for m in {HEAVY_MODULES!r} "
+        "if m in sys.modules]))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    records = parse_importtime(result.stderr)
+    # the modules imported by the interpreter startup are excluded
+    startup = parse_importtime(
+        subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "pass"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stderr,
+    )
+    startup_modules = {name for name, _, _ in startup}
+    total = sum(
+        us
+        for name, us, top_level in records
+        if top_level and name not in startup_modules
+    )
+    heavy = json.loads(result.stdout.strip().splitlines()[-1])
+    return total / 1000, records, heavy
+
+
+def main() -> None:
+    """Run the benchmark and print the results as json."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument(
+        "--statement",
+        action="append",
+        help="The statements to measure, defaults to a built-in list.",
+    )
+    parser.add_argument(
+        "--max-ms",
+        type=float,
+        default=None,
+        help="Fail if the median import time of a statement exceeds it.",
+    )
+    args = parser.parse_args()
+
+    results = {}
+    failed = []
+    for statement in args.statement or STATEMENTS:
+        runs = [measure(statement) for _ in range(args.runs)]
+        median = statistics.median(_[0] for _ in runs)
+        _, records, heavy = runs[-1]
+        slowest = sorted(
+            (
+                (name, us)
+                for name, us, _ in records
+                if name.startswith("agentscope")
+            ),
+            key=lambda _: -_[1],
+        )[: args.top]
+        results[statement] = {
+            "median_ms": round(median, 1),
+            "heavy_modules": heavy,
+            "slowest_agentscope_modules_ms": {
+                name: round(us / 1000, 1) for name, us in slowest
+            },
+        }
+        if args.max_ms is not None and median > args.max_ms:
+            failed.append(statement)
+
+    print(json.dumps(results, indent=2))
+    if failed:
+        sys.exit(f"Import time exceeds {args.max_ms} ms: {failed}")
+
+
+if __name__ == "__main__":
+    main()
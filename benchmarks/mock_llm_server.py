@@ -0,0 +1,396 @@
+# -*- coding: utf-8 -*-
+"""A local mock LLM server for the benchmarks, with a configurable latency
+and token rate, so that the overhead of AgentScope can be measured apart
+from the latency of real LLM services.
+
+It serves
+
+- `POST /v1/chat/completions`: the OpenAI chat API, streaming or not,
+  which is used by `OpenAIChatWrapper` with the `base_url` client argument,
+- `POST /v1/embeddings`: the OpenAI embedding API,
+- `POST /api/chat`: the chat API in the format of `PostAPIChatWrapper`,
+- `POST /api/embedding`: the embedding API in the format of
+  `PostAPIEmbeddingWrapper`.
+
+A chat request takes `latency + completion_tokens / token_rate` seconds,
+where the streaming responses send their first chunk after `latency`
+seconds. The reply is a fixed number of words, unless the last message asks
+for a tool loop by the marker `[react:<n>]`, when the reply calls the `add`
+tool in the format of `ReActAgent` until it has been called `n` times, and
+then calls `finish`. The embeddings are deterministic pseudo-random unit
+vectors of the input texts.
+
+.. code-block:: shell
+
+    python benchmarks/mock_llm_server.py --port 8000 --latency 0.2 \\
+        --token-rate 50
+"""
+import argparse
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional, Tuple
+
+_REACT_MARKER = re.compile(r"\[react:(\d+)\]")
+
+
+def _count_tokens(text: str) -> int:
+    return len(text.split())
+
+
+def _embed(text: str, dimension: int) -> List[float]:
+    """A deterministic pseudo-random unit vector of the text."""
+    seed = int.from_bytes(hashlib.md5(text.encode()).digest()[:8], "little")
+    rng = random.Random(seed)
+    vector = [rng.gauss(0, 1) for _ in range(dimension)]
+    norm = math.sqrt(sum(_ * _ for _ in vector)) or 1.0
+    return [_ / norm for _ in vector]
+
+
+def _message_text(message: dict) -> str:
+    content = message.get("content")
+    if isinstance(content, list):
+        return " ".join(
+            _.get("text", "") for _ in content if isinstance(_, dict)
+        )
+    return str(content or "")
+
+
+class MockLLMServer:
+    """The mock LLM server running in a daemon thread, which can be used as
+    a context manager."""
+
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 0,
+        latency: float = 0.05,
+        token_rate: float = 0.0,
+        completion_tokens: int = 16,
+        embedding_latency: float = 0.005,
+        dimension: int = 64,
+    ) -> None:
+        """Initialize the server.
+
+        Args:
+            host (`str`, defaults to `"localhost"`):
+                The host to listen to.
+            port (`int`, defaults to `0`):
+                The port to listen to, a free port is chosen if `0`.
+            latency (`float`, defaults to `0.05`):
+                The seconds before the first token of each chat response.
+            token_rate (`float`, defaults to `0.0`):
+                The generated tokens per second, unlimited if `0`.
+            completion_tokens (`int`, defaults to `16`):
+                The number of the words of each plain reply.
+            embedding_latency (`float`, defaults to `0.005`):
+                The seconds of each embedding request.
+            dimension (`int`, defaults to `64`):
+                The dimension of the embeddings.
+        """
+        self.host = host
+        self.latency = latency
+        self.token_rate = token_rate
+        self.completion_tokens = completion_tokens
+        self.embedding_latency = embedding_latency
+        self.dimension = dimension
+
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.busy_seconds = 0.0
+        """The sum of the simulated seconds of all the requests."""
+
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        """The url of the server."""
+        return f"http://{self.host}:{self._server.server_port}"
+
+    def start(self) -> "MockLLMServer":
+        """Start serving in a daemon thread."""
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the server."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "MockLLMServer":
+        return self.start()
+
+    def __exit__(self, *args: object) -> None:
+        self.stop()
+
+    def reset_stats(self) -> None:
+        """Reset the number of the requests and the busy seconds."""
+        with self._lock:
+            self.requests = 0
+            self.busy_seconds = 0.0
+
+    def generation_seconds(self, completion_tokens: int) -> float:
+        """The simulated seconds to generate a reply."""
+        if self.token_rate <= 0:
+            return self.latency
+        return self.latency + completion_tokens / self.token_rate
+
+    def _record(self, seconds: float) -> None:
+        with self._lock:
+            self.requests += 1
+            self.busy_seconds += seconds
+
+    def reply(self, messages: List[dict]) -> str:
+        """The reply to the chat messages."""
+        prompt = "\n".join(_message_text(_) for _ in messages)
+        matches = list(_REACT_MARKER.finditer(prompt))
+        if not matches:
+            return " ".join(["token"] * self.completion_tokens)
+
+        # the tool calls after the last task in the memory of the agent
+        match = matches[-1]
+        calls = prompt[match.end() :].count("<function>add</function>")
+        if calls < int(match.group(1)):
+            return (
+                f"<thought>step {calls + 1}</thought>\n"
+                f"<function>add</function>\n"
+                f"<a>{calls}</a>\n"
+                f"<b>1</b>"
+            )
+        return (
+            "<thought>done</thought>\n"
+            "<function>finish</function>\n"
+            f"<response>called add {calls} times</response>"
+        )
+
+    def _handler(self) -> type:
+        server = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            """Handle the requests of the mock APIs."""
+
+            protocol_version = "HTTP/1.1"
+            # the headers and the body are written separately
+            disable_nagle_algorithm = True
+
+            def do_POST(self) -> None:  # pylint: disable=C0103
+                """Route the requests."""
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                path = self.path.split("?")[0]
+                if path == "/v1/chat/completions":
+                    self._chat(body)
+                elif path == "/v1/embeddings":
+                    self._send_json(server.embeddings(body.get("input")))
+                elif path == "/api/chat":
+                    messages = body.get("messages") or body.get("inputs")
+                    completion, _ = server.completion(messages, body)
+                    self._send_json({"data": {"response": completion}})
+                elif path == "/api/embedding":
+                    self._send_json(
+                        server.embeddings(
+                            body.get("input") or body.get("inputs"),
+                        ),
+                    )
+                else:
+                    self.send_error(404)
+
+            def _chat(self, body: dict) -> None:
+                if not body.get("stream"):
+                    completion, _ = server.completion(body["messages"], body)
+                    self._send_json(completion)
+                    return
+
+                start = time.perf_counter()
+                text = server.reply(body["messages"])
+                words = text.split(" ")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                time.sleep(server.latency)
+                chunk_id = f"chatcmpl-{uuid.uuid4().hex}"
+                for i, word in enumerate(words):
+                    if i > 0 and server.token_rate > 0:
+                        time.sleep(1 / server.token_rate)
+                    self._send_event(
+                        _chunk(
+                            chunk_id,
+                            body,
+                            {"content": word if i == 0 else " " + word},
+                        ),
+                    )
+                usage_chunk = _chunk(chunk_id, body, None)
+                usage_chunk["usage"] = _usage(body["messages"], text)
+                self._send_event(usage_chunk)
+                self._send_raw(b"data: [DONE]\n\n")
+                self._send_raw(b"")
+                server._record(  # pylint: disable=protected-access
+                    time.perf_counter() - start,
+                )
+
+            def _send_event(self, data: dict) -> None:
+                self._send_raw(f"data: {json.dumps(data)}\n\n".encode())
+
+            def _send_raw(self, data: bytes) -> None:
+                # chunked transfer encoding, an empty chunk ends the body
+                self.wfile.write(
+                    f"{len(data):x}\r\n".encode() + data + b"\r\n",
+                )
+                self.wfile.flush()
+
+            def _send_json(self, data: dict) -> None:
+                payload = json.dumps(data).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args: object) -> None:
+                """Skip logging each request."""
+
+        return _Handler
+
+    def completion(self, messages: List[dict], body: dict) -> Tuple[dict, str]:
+        """Generate a chat completion in the OpenAI format after the
+        simulated seconds."""
+        text = self.reply(messages)
+        seconds = self.generation_seconds(_count_tokens(text))
+        time.sleep(seconds)
+        self._record(seconds)
+        return (
+            {
+                "id": f"chatcmpl-{uuid.uuid4().hex}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": body.get("model", "mock"),
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": text},
+                        "finish_reason": "stop",
+                    },
+                ],
+                "usage": _usage(messages, text),
+            },
+            text,
+        )
+
+    def embeddings(self, texts: object) -> dict:
+        """Embed the texts in the OpenAI format after the latency."""
+        inputs = texts if isinstance(texts, list) else [texts or ""]
+        time.sleep(self.embedding_latency)
+        self._record(self.embedding_latency)
+        return {
+            "object": "list",
+            "data": [
+                {
+                    "object": "embedding",
+                    "embedding": _embed(str(text), self.dimension),
+                    "index": i,
+                }
+                for i, text in enumerate(inputs)
+            ],
+            "model": "mock-embedding",
+            "usage": {
+                "prompt_tokens": sum(_count_tokens(str(_)) for _ in inputs),
+                "total_tokens": sum(_count_tokens(str(_)) for _ in inputs),
+            },
+        }
+
+
+def _usage(messages: List[dict], text: str) -> dict:
+    prompt_tokens = sum(_count_tokens(_message_text(_)) for _ in messages)
+    completion_tokens = _count_tokens(text)
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+    }
+
+
+def _chunk(chunk_id: str, body: dict, delta: Optional[dict]) -> dict:
+    return {
+        "id": chunk_id,
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": body.get("model", "mock"),
+        "choices": []
+        if delta is None
+        else [{"index": 0, "delta": delta, "finish_reason": None}],
+    }
+
+
+def main() -> None:
+    """Run the mock server in the foreground."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--host",
+        type=str,
+        default="localhost",
+        help="The host to listen to.",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=8000,
+        help="The port to listen to.",
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.05,
+        help="The seconds before the first token of each chat response.",
+    )
+    parser.add_argument(
+        "--token-rate",
+        type=float,
+        default=0.0,
+        help="The generated tokens per second, unlimited if 0.",
+    )
+    parser.add_argument(
+        "--completion-tokens",
+        type=int,
+        default=16,
+        help="The number of the words of each plain reply.",
+    )
+    parser.add_argument(
+        "--embedding-latency",
+        type=float,
+        default=0.005,
+        help="The seconds of each embedding request.",
+    )
+    args = parser.parse_args()
+
+    server = MockLLMServer(
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        token_rate=args.token_rate,
+        completion_tokens=args.completion_tokens,
+        embedding_latency=args.embedding_latency,
+    )
+    print(f"Mock LLM server at {server.base_url}")
+    try:
+        server.start()
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""Benchmark of creating messages.
+
+A large number of messages are created, and then serialized by `to_dict`,
+with the current `Msg` and its implementation before the slots and the
+lazily generated id and timestamp, which generated a uuid, formatted the
+timestamp and dumped the content into json to check it's serializable in
+the constructor. The memory of the messages is measured by `tracemalloc`.
+
+.. code-block:: shell
+
+    python benchmarks/msg_bench.py --num 1000000
+"""
+import argparse
+import json
+import time
+import tracemalloc
+from typing import Any, Callable, List, Optional, Union
+from uuid import uuid4
+
+from loguru import logger
+
+from agentscope.message import Msg
+from agentscope.serialize import is_serializable
+from agentscope.utils.common import _get_timestamp
+
+
+class LegacyMsg:
+    """The message before the slots, kept for comparison."""
+
+    def __init__(
+        self,
+        name: str,
+        content: Any,
+        role: str,
+        url: Optional[Union[str, List[str]]] = None,
+        metadata: Optional[Union[dict, str]] = None,
+    ) -> None:
+        self.id = uuid4().hex
+        self.name = name
+        self.content = content
+        self.role = role
+        self.url = url
+        self.metadata = metadata
+        self.timestamp = _get_timestamp()
+
+    @property
+    def content(self) -> Any:
+        """The content of the message."""
+        return self._content
+
+    @content.setter
+    def content(self, value: Any) -> None:
+        if not is_serializable(value):
+            logger.warning(f"The content of {type(value)} isn't serializable")
+        self._content = value
+
+    @property
+    def role(self) -> str:
+        """The role of the message sender."""
+        return self._role
+
+    @role.setter
+    def role(self, value: str) -> None:
+        if value not in ["system", "user", "assistant"]:
+            raise ValueError(f"Invalid role {value}.")
+        self._role = value
+
+    def to_dict(self) -> dict:
+        """Serialize the message into a dictionary."""
+        return {
+            "__module__": Msg.__module__,
+            "__name__": Msg.__name__,
+            "id": self.id,
+            "name": self.name,
+            "content": self.content,
+            "role": self.role,
+            "url": self.url,
+            "metadata": self.metadata,
+            "timestamp": self.timestamp,
+        }
+
+
+def _create(cls: Callable, num: int) -> list:
+    return [
+        cls(f"agent{i % 100}", "I vote for player 3.", "assistant")
+        for i in range(num)
+    ]
+
+
+def _measure(cls: Callable, num: int, memory_num: int) -> dict:
+    st = time.perf_counter()
+    msgs = _create(cls, num)
+    created = time.perf_counter() - st
+
+    st = time.perf_counter()
+    for msg in msgs:
+        msg.to_dict()
+    serialized = time.perf_counter() - st
+    del msgs
+
+    tracemalloc.start()
+    msgs = _create(cls, memory_num)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del msgs
+
+    return {
+        "create_seconds": round(created, 3),
+        "us_per_create": round(created / num * 1e6, 3),
+        "us_per_to_dict": round(serialized / num * 1e6, 3),
+        "bytes_per_msg": round(size / memory_num),
+    }
+
+
+def main() -> None:
+    """Run the benchmark and print the results as json."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num", type=int, default=1000000)
+    parser.add_argument(
+        "--memory-num",
+        type=int,
+        default=100000,
+        help="The number of messages to measure the memory.",
+    )
+    args = parser.parse_args()
+
+    legacy = LegacyMsg("a", "b", "user").to_dict()
+    current = Msg("a", "b", "user").to_dict()
+    assert legacy.keys() == current.keys()
+
+    results = {
+        "num": args.num,
+        "current": _measure(Msg, args.num, args.memory_num),
+        "legacy": _measure(LegacyMsg, args.num, args.memory_num),
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
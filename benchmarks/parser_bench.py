@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+"""Microbenchmark of the model response parsers.
+
+Each parser parses a typical response of its format repeatedly, and the
+tagged content parsers are compared with their implementations before the
+single-pass tag scanner and the compiled regex, which searched the text once
+per tag and passed the pattern string to `re.finditer` on every call.
+
+.. code-block:: shell
+
+    python benchmarks/parser_bench.py --runs 20000 --filler 2000
+"""
+import argparse
+import json
+import re
+import time
+from typing import Callable
+
+from loguru import logger
+
+from agentscope.models import ModelResponse
+from agentscope.parsers import (
+    MarkdownCodeBlockParser,
+    MarkdownJsonDictParser,
+    MarkdownJsonObjectParser,
+    MultiTaggedContentParser,
+    RegexTaggedContentParser,
+    TaggedContent,
+)
+
+
+def legacy_multi_tagged_parse(
+    parser: MultiTaggedContentParser,
+    response: ModelResponse,
+) -> dict:
+    """The per-tag search before the single-pass scanner, kept for
+    comparison."""
+    results = {}
+    for tagged_content in parser.tagged_contents:
+        content = (
+            parser._extract_first_content_by_tag(  # pylint: disable=W0212
+                response,
+                tagged_content.tag_begin,
+                tagged_content.tag_end,
+            )
+        )
+        if tagged_content.parse_json:
+            content = json.loads(content)
+        results[tagged_content.name] = content
+    return results
+
+
+def legacy_regex_tagged_parse(
+    parser: RegexTaggedContentParser,
+    response: ModelResponse,
+) -> dict:
+    """The regex parsing before compiling the pattern in the constructor,
+    kept for comparison."""
+    results = {}
+    for match in re.finditer(
+        parser.tagged_content_pattern,
+        response.text,
+        flags=re.DOTALL,
+    ):
+        results[match.group("name")] = match.group("content")
+    for key, value in results.items():
+        try:
+            results[key] = json.loads(value)
+        except json.JSONDecodeError:
+            pass
+    return results
+
+
+def _timed(func: Callable, runs: int) -> dict:
+    st = time.perf_counter()
+    for _ in range(runs):
+        func()
+    elapsed = time.perf_counter() - st
+    return {"us_per_parse": round(elapsed / runs * 1e6, 2)}
+
+
+def main() -> None:
+    """Run the benchmark and print the results as json."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=20000)
+    parser.add_argument(
+        "--filler",
+        type=int,
+        default=2000,
+        help="The number of characters of free text around the tags.",
+    )
+    parser.add_argument(
+        "--tags",
+        type=int,
+        default=5,
+        help="The number of tagged contents in the responses.",
+    )
+    args = parser.parse_args()
+
+    # the debug messages of failing to parse json are logged for every call
+    logger.remove()
+    filler = ("Let me think about it. " * (args.filler // 23 + 1))[
+        : args.filler
+    ]
+
+    names = ["thought", "speak", "plan", "action", "finish"]
+    names = (names + [f"field{i}" for i in range(args.tags)])[: args.tags]
+    multi = MultiTaggedContentParser(
+        *[
+            TaggedContent(
+                name,
+                f"[{name.upper()}]",
+                f"your {name}",
+                f"[/{name.upper()}]",
+                parse_json=name == "finish",
+            )
+            for name in names
+        ],
+    )
+    multi_text = filler + "".join(
+        f"[{name.upper()}]{'false' if name == 'finish' else name * 20}"
+        f"[/{name.upper()}]\n{filler}"
+        for name in names
+    )
+    regex = RegexTaggedContentParser()
+    regex_text = filler + "".join(
+        f"<{name}>{name * 20}</{name}>\n" for name in names
+    )
+    json_dict = {name: name * 20 for name in names}
+
+    cases = {
+        "MultiTaggedContentParser": (multi, multi_text),
+        "RegexTaggedContentParser": (regex, regex_text),
+        "MarkdownJsonDictParser": (
+            MarkdownJsonDictParser(),
+            f"{filler}\n```json\n{json.dumps(json_dict)}\n```",
+        ),
+        "MarkdownJsonObjectParser": (
+            MarkdownJsonObjectParser(),
+            f"{filler}\n```json\n{json.dumps(list(json_dict))}\n```",
+        ),
+        "MarkdownCodeBlockParser": (
+            MarkdownCodeBlockParser("python"),
+            f"{filler}\n```python\nprint('hello')\n```",
+        ),
+    }
+    legacy = {
+        "MultiTaggedContentParser": legacy_multi_tagged_parse,
+        "RegexTaggedContentParser": legacy_regex_tagged_parse,
+    }
+
+    results = {
+        "runs": args.runs,
+        "filler_chars": args.filler,
+        "tags": args.tags,
+    }
+    for name, (response_parser, text) in cases.items():
+        result = {
+            "current": _timed(
+                lambda p=response_parser, t=text: p.parse(
+                    ModelResponse(text=t),
+                ),
+                args.runs,
+            ),
+        }
+        if name in legacy:
+            assert (
+                legacy[name](
+                    response_parser,
+                    ModelResponse(text=text),
+                )
+                == response_parser.parse(ModelResponse(text=text)).parsed
+            )
+            result["legacy"] = _timed(
+                lambda f=legacy[name], p=response_parser, t=text: f(
+                    p,
+                    ModelResponse(text=t),
+                ),
+                args.runs,
+            )
+        results[name] = result
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
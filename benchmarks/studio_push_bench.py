@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+"""Load test of the message ingestion of AgentScope Studio.
+
+Several runs stream their messages to the studio concurrently, where each
+message is pushed once per streamed chunk, as `log_stream_msg` does. The
+throughput of the pushes and the number of the database writes and the
+socket.io emits are measured for
+
+- `legacy`: the former push route, which committed the deletion and the
+  insertion of every pushed message and emitted it immediately,
+- `push`: the buffered `/api/messages/push` route,
+- `push_batch`: the `/api/messages/push_batch` route with the chunks of
+  all the messages of a run in one request.
+
+The studio database is created in a temporary home directory.
+
+.. code-block:: shell
+
+    python benchmarks/studio_push_bench.py --runs 8 --messages 20 --chunks 10
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List
+
+os.environ["HOME"] = tempfile.mkdtemp()
+
+# pylint: disable=C0413
+from sqlalchemy import event  # noqa: E402
+
+# the benchmark drives the internals of the studio app directly
+# pylint: disable=protected-access
+
+from agentscope.studio import _app as studio  # noqa: E402
+
+
+def legacy_push(client: object, data: dict) -> None:
+    """The former push route, kept for comparison."""
+    del client
+    with studio._app.app_context():
+        studio._MessageTable.query.filter_by(id=data["id"]).delete()
+        studio._db.session.commit()
+        studio._db.session.add(
+            studio._MessageTable(
+                id=data["id"],
+                run_id=data["run_id"],
+                name=data["name"],
+                role=data["role"],
+                content=data["content"],
+                meta=json.dumps(data["metadata"], ensure_ascii=False),
+                url=json.dumps(data["url"], ensure_ascii=False),
+                timestamp=data["timestamp"],
+            ),
+        )
+        studio._db.session.commit()
+    studio._socketio.emit("display_message", data, room=data["run_id"])
+
+
+def push(client: object, data: dict) -> None:
+    """Push a message by the buffered route."""
+    client.post("/api/messages/push", json=data)
+
+
+def push_batch(client: object, streams: List[List[dict]]) -> None:
+    """Push the updates of all the messages of a run in one request."""
+    client.post(
+        "/api/messages/push_batch",
+        json=[_ for chunks in streams for _ in chunks],
+    )
+
+
+def _push_each(
+    push_func: Callable[[object, dict], None],
+) -> Callable[[object, List[List[dict]]], None]:
+    """Push the updates of a run one request per update."""
+
+    def _push(client: object, streams: List[List[dict]]) -> None:
+        for chunks in streams:
+            for data in chunks:
+                push_func(client, data)
+
+    return _push
+
+
+def _stream(run_id: str, messages: int, chunks: int) -> List[List[dict]]:
+    """The pushed updates of the streaming messages of a run."""
+    updates = []
+    for i in range(messages):
+        msg_id = uuid.uuid4().hex
+        updates.append(
+            [
+                {
+                    "id": msg_id,
+                    "run_id": run_id,
+                    "name": "assistant",
+                    "role": "assistant",
+                    "content": "token " * (chunk + 1),
+                    "url": None,
+                    "metadata": None,
+                    "timestamp": f"2024-01-01 00:00:{i % 60:02d}",
+                }
+                for chunk in range(chunks)
+            ],
+        )
+    return updates
+
+
+def _run(
+    name: str,
+    func: Callable[[object, List[List[dict]]], None],
+    args: argparse.Namespace,
+) -> dict:
+    counters = {"commits": 0, "emits": 0}
+
+    def _count_commit(*_: object) -> None:
+        counters["commits"] += 1
+
+    event.listen(studio._db.engine, "commit", _count_commit)
+    emit = studio._socketio.emit
+
+    def _count_emit(*a: object, **kw: object) -> None:
+        counters["emits"] += 1
+        emit(*a, **kw)
+
+    studio._socketio.emit = _count_emit
+
+    run_ids = [f"{name}-{i}" for i in range(args.runs)]
+    with studio._app.app_context():
+        for run_id in run_ids:
+            studio._db.session.add(studio._RunTable(run_id=run_id))
+        studio._db.session.commit()
+    streams = [_stream(_, args.messages, args.chunks) for _ in run_ids]
+
+    def _client_thread(stream: List[List[dict]]) -> None:
+        client = studio._app.test_client()
+        func(client, stream)
+
+    st = time.perf_counter()
+    with ThreadPoolExecutor(args.runs) as executor:
+        list(executor.map(_client_thread, streams))
+    pushed = time.perf_counter() - st
+    studio._message_buffer.flush()
+    studio._emit_buffer.flush()
+    total = time.perf_counter() - st
+
+    event.remove(studio._db.engine, "commit", _count_commit)
+    studio._socketio.emit = emit
+
+    with studio._app.app_context():
+        rows = studio._MessageTable.query.filter(
+            studio._MessageTable.run_id.in_(run_ids),
+        ).count()
+    updates = args.runs * args.messages * args.chunks
+    assert rows == args.runs * args.messages, rows
+    return {
+        "updates": updates,
+        "updates_per_second": round(updates / pushed),
+        "seconds_until_written": round(total, 3),
+        **counters,
+    }
+
+
+def main() -> None:
+    """Run the load test and print the results as json."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=8)
+    parser.add_argument("--messages", type=int, default=20)
+    parser.add_argument("--chunks", type=int, default=10)
+    args = parser.parse_args()
+
+    # for the engine used to count the commits
+    studio._app.app_context().push()
+    studio._db.create_all()
+    studio._create_indexes()
+
+    cases = {
+        "legacy": _push_each(legacy_push),
+        "push": _push_each(push),
+        "push_batch": push_batch,
+    }
+    results = {"runs": args.runs, "messages": args.messages}
+    for name, func in cases.items():
+        results[name] = _run(name, func, args)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
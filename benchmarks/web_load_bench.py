@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+"""Throughput benchmark of loading web pages.
+
+Local fixture servers serve generated html pages with `ETag` headers and a
+configurable latency per request, which simulates the network. It compares
+calling `load_web` for each url with `load_web_many`, with a cold and a
+warm cache, and the html-to-text conversion of BeautifulSoup (the previous
+implementation, if installed) with the streaming extractor.
+
+.. code-block:: shell
+
+    python benchmarks/web_load_bench.py --pages 64 --hosts 4 --latency 0.05
+"""
+import argparse
+import json
+import shutil
+import tempfile
+import threading
+import time
+from typing import Any, Callable
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from loguru import logger
+
+from agentscope.service import load_web, load_web_many, parse_html_to_text
+from agentscope.service.web.web_digest import is_valid_url
+
+TAGS = ("h", "p", "li", "div", "a")
+
+
+def legacy_parse_html_to_text(
+    html_text: str,
+    html_selected_tags: tuple,
+) -> str:
+    """The BeautifulSoup implementation before the streaming extractor, kept
+    for comparison."""
+    from bs4 import BeautifulSoup, NavigableString, Tag
+
+    doc = BeautifulSoup(html_text, "html.parser")
+
+    def get_navigable_strings(e: Tag) -> str:
+        text = ""
+        for child in e.children:
+            if isinstance(child, Tag):
+                text += get_navigable_strings(child).strip(" \n\t")
+            elif isinstance(child, NavigableString):
+                if (e.name == "a") and (href := e.get("href")):
+                    if is_valid_url(href):
+                        text += f"[{child.strip()}]({href})"
+                else:
+                    text += child.text
+        return " ".join(text.split())
+
+    text_parts = ""
+    # pylint: disable=not-an-iterable
+    for element in doc.find_all(recursive=True):
+        if element.name in html_selected_tags:
+            text_parts += get_navigable_strings(element).strip(" \n\t")
+            element.decompose()
+    return text_parts
+
+
+def make_page(index: int, paragraphs: int) -> bytes:
+    """Generate a html page with navigation, scripts and paragraphs."""
+    items = "".join(
+        f'<li><a href="https://example.com/{i}">Link {i}</a></li>'
+        for i in range(50)
+    )
+    body = "".join(
+        f"<div class='c'><h2>Section {i}</h2><p>Paragraph {i} of page "
+        f"{index}, with <b>some</b> <i>inline</i> text.</p>"
+        f"<script>var x{i} = {i};</script></div>"
+        for i in range(paragraphs)
+    )
+    return (
+        f"<!DOCTYPE html><html><head><title>Page {index}</title>"
+        f"<style>p {{color: red}}</style></head><body><nav><ul>{items}"
+        f"</ul></nav>{body}</body></html>"
+    ).encode()
+
+
+def start_server(pages: dict, latency: float) -> ThreadingHTTPServer:
+    """Start a fixture server in a daemon thread."""
+
+    class Handler(BaseHTTPRequestHandler):
+        """Serve the pages with ETag."""
+
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self) -> None:  # pylint: disable=invalid-name
+            """Handle the GET requests."""
+            time.sleep(latency)
+            body = pages[self.path]
+            etag = f'"{hash(body)}"'
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("ETag", etag)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args: object) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _timed(func: Callable[[], Any], pages: int) -> dict:
+    st = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - st
+    return {
+        "seconds": round(elapsed, 3),
+        "pages_per_second": round(pages / elapsed, 1),
+    }
+
+
+def main() -> None:
+    """Run the benchmark and print the results as json."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=64)
+    parser.add_argument("--hosts", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--paragraphs", type=int, default=200)
+    parser.add_argument("--max-per-host", type=int, default=4)
+    args = parser.parse_args()
+
+    logger.remove()
+    pages = {f"/{i}": make_page(i, args.paragraphs) for i in range(args.pages)}
+    servers = [start_server(pages, args.latency) for _ in range(args.hosts)]
+    urls = [
+        f"http://127.0.0.1:{servers[i % args.hosts].server_address[1]}/{i}"
+        for i in range(args.pages)
+    ]
+    cache_dir = tempfile.mkdtemp()
+
+    def _sequential() -> None:
+        for url in urls:
+            assert load_web(url, keep_raw=False, html_selected_tags=TAGS)[
+                "content"
+            ]["html_to_text"]
+
+    def _concurrent() -> None:
+        res = load_web_many(
+            urls,
+            html_selected_tags=TAGS,
+            max_per_host=args.max_per_host,
+            cache_dir=cache_dir,
+        )
+        assert all(r.content["html_to_text"] for r in res.content.values())
+
+    try:
+        results = {
+            "pages": args.pages,
+            "hosts": args.hosts,
+            "latency_seconds": args.latency,
+            "page_kb": round(len(pages["/0"]) / 1024, 1),
+            "load_web_sequential": _timed(_sequential, args.pages),
+            "load_web_many_cold": _timed(_concurrent, args.pages),
+            "load_web_many_warm": _timed(_concurrent, args.pages),
+        }
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+        for server in servers:
+            server.shutdown()
+
+    html = pages["/0"].decode()
+    parse = {
+        "streaming": _timed(
+            lambda: [parse_html_to_text(html, TAGS) for _ in range(20)],
+            20,
+        ),
+    }
+    try:
+        assert legacy_parse_html_to_text(html, TAGS) == parse_html_to_text(
+            html,
+            TAGS,
+        )
+        parse["legacy_bs4"] = _timed(
+            lambda: [legacy_parse_html_to_text(html, TAGS) for _ in range(20)],
+            20,
+        )
+    except ImportError:
+        pass
+    results["html_to_text"] = parse
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
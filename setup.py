@@ -68,6 +68,7 @@ extra_dev_requires = [
     # unit test
     "pytest",
     "pytest-cov",
+    "fakeredis",
     "pre-commit",
     # doc
     "sphinx",
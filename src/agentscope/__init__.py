@@ -1,33 +1,72 @@
 # -*- coding: utf-8 -*-
-""" Import all modules in the package. """
+""" Import all modules in the package. The modules are imported on first
+access, so that `import agentscope` doesn't import the heavy dependencies
+of the unused modules. """
+from typing import TYPE_CHECKING
 
-# modules
-from . import manager
-from . import agents
-from . import memory
-from . import models
-from . import pipelines
-from . import service
-from . import message
-from . import prompt
-from . import web
-from . import exception
-from . import parsers
-from . import rag
-from . import tokens
+from ._lazy import lazy_loader
 
 # objects or function
 from .msghub import msghub
 from ._version import __version__
-from ._init import init
-from ._init import print_llm_usage
-from ._init import state_dict
-from ._init import register_model_wrapper_class
+
+if TYPE_CHECKING:
+    # modules
+    from . import manager
+    from . import agents
+    from . import memory
+    from . import models
+    from . import pipelines
+    from . import service
+    from . import message
+    from . import prompt
+    from . import web
+    from . import exception
+    from . import parsers
+    from . import rag
+    from . import tokens
+    from . import tracing
+    from . import profiling
+
+    from ._init import init
+    from ._init import print_llm_usage
+    from ._init import print_model_metrics
+    from ._init import state_dict
+    from ._init import register_model_wrapper_class
+
+__getattr__, __dir__ = lazy_loader(
+    __name__,
+    submodules=[
+        "manager",
+        "agents",
+        "memory",
+        "models",
+        "pipelines",
+        "service",
+        "message",
+        "prompt",
+        "web",
+        "exception",
+        "parsers",
+        "rag",
+        "tokens",
+        "tracing",
+        "profiling",
+    ],
+    attributes={
+        "init": "._init",
+        "print_llm_usage": "._init",
+        "print_model_metrics": "._init",
+        "state_dict": "._init",
+        "register_model_wrapper_class": "._init",
+    },
+)
 
 __all__ = [
     "init",
     "state_dict",
     "print_llm_usage",
+    "print_model_metrics",
     "msghub",
     "register_model_wrapper_class",
 ]
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 """The init function for the package."""
 import json
-from typing import Optional, Union, Sequence, Type
+from typing import List, Literal, Optional, Union, Sequence, Type
 
 from loguru import logger
 
@@ -13,11 +13,7 @@ from .constants import _DEFAULT_LOG_LEVEL
 from .constants import _DEFAULT_CACHE_DIR
 from .manager import ASManager, ModelManager
 from .models import ModelWrapperBase
-
-# init the singleton class by default settings to avoid reinit in subprocess
-# especially in spawn mode, which will copy the object from the parent process
-# to the child process rather than re-import the module (fork mode)
-ASManager()
+from .tracing import SpanExporterBase
 
 
 def init(
@@ -29,12 +25,19 @@ def init(
     save_log: bool = True,
     save_code: bool = True,
     save_api_invoke: bool = False,
+    invoke_compression: Optional[Literal["gzip", "zstd"]] = None,
     cache_dir: str = _DEFAULT_CACHE_DIR,
     use_monitor: bool = True,
     logger_level: LOG_LEVEL = _DEFAULT_LOG_LEVEL,
     runtime_id: Optional[str] = None,
     agent_configs: Optional[Union[str, list, dict]] = None,
     studio_url: Optional[str] = None,
+    trace: bool = False,
+    trace_exporters: Sequence[Union[str, SpanExporterBase]] = ("jsonl",),
+    profile: bool = False,
+    record_model_calls: bool = False,
+    replay: Optional[str] = None,
+    replay_speed: float = 0.0,
 ) -> Sequence[AgentBase]:
     """A unified entry to initialize the package, including model configs,
     runtime names, saving directories and logging settings.
@@ -64,6 +67,10 @@ def init(
         save_api_invoke (`bool`, defaults to `False`):
             Whether to save api invocations locally, including model and web
             search invocation.
+        invoke_compression (`Optional[Literal["gzip", "zstd"]]`, defaults
+        to `None`):
+            The compression of the full segments of the api invocation
+            log, where "zstd" requires the `zstandard` package.
         cache_dir (`str`):
             The directory to cache files. In Linux/Mac, the dir defaults to
             `~/.cache/agentscope`. In Windows, the dir defaults to
@@ -79,6 +86,34 @@ def init(
             object, otherwise the default values will be used.
         studio_url (`Optional[str]`, defaults to `None`):
             The url of the agentscope studio.
+        trace (`bool`, defaults to `False`):
+            Whether to trace the agent replies, the model calls and the tool
+            calls, including those in the agent servers.
+        trace_exporters (`Sequence[Union[str, SpanExporterBase]]`, defaults
+        to `("jsonl",)`):
+            The exporters of the spans, either "jsonl" and "chrome" to save
+            them in the `trace` directory of the run, "otel" to export them
+            to OpenTelemetry, or `SpanExporterBase` objects.
+        profile (`bool`, defaults to `False`):
+            Whether to sample the stacks of the threads running the agents,
+            including those in the agent servers, and write the collapsed
+            stacks and a summary by the agents and the components (e.g.
+            formatting, parsing, memory and RPC) into the `profile`
+            directory of the run.
+        record_model_calls (`bool`, defaults to `False`):
+            Whether to record the requests and the responses of the model
+            calls, including the chunks of the streaming responses and
+            their timing, into the `replay` directory of the run, so that
+            they can be replayed by a later run.
+        replay (`Optional[str]`, defaults to `None`):
+            The directory of a run recorded by `record_model_calls=True`.
+            If given, the model calls identical to the recorded ones are
+            served from its archive without calling the model APIs, and
+            the others raise `ReplayMissError`.
+        replay_speed (`float`, defaults to `0.0`):
+            The speed to replay the recorded latencies, e.g. `1.0` for the
+            original timing and `2.0` for twice as fast. The recorded
+            responses are served without delay if `0`.
     """
     # Init the runtime
     ASManager.get_instance().initialize(
@@ -95,6 +130,13 @@ def init(
         logger_level=logger_level,
         run_id=runtime_id,
         studio_url=studio_url,
+        invoke_compression=invoke_compression,
+        trace=trace,
+        trace_exporters=trace_exporters,
+        profile=profile,
+        record_model_calls=record_model_calls,
+        replay=replay,
+        replay_speed=replay_speed,
     )
 
     # Load config and init agent by configs
@@ -128,6 +170,12 @@ def print_llm_usage() -> dict:
     return ASManager.get_instance().monitor.print_llm_usage()
 
 
+def print_model_metrics() -> List[dict]:
+    """Print the latency, the throughput and the errors of the model calls
+    by their config names."""
+    return ASManager.get_instance().monitor.print_model_metrics()
+
+
 def register_model_wrapper_class(
     model_wrapper_class: Type[ModelWrapperBase],
     exist_ok: bool = False,
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""Load the submodules and the attributes of a package on first access
+(PEP 562), so that importing the package doesn't import the heavy
+dependencies of the modules that are not used."""
+import importlib
+import sys
+from typing import Any, Callable, Optional, Sequence, Tuple
+
+
+def lazy_loader(
+    package: str,
+    submodules: Sequence[str] = (),
+    attributes: Optional[dict[str, str]] = None,
+) -> Tuple[Callable[[str], Any], Callable[[], list]]:
+    """Create the module-level `__getattr__` and `__dir__` functions of a
+    package.
+
+    Example:
+
+        .. code-block:: python
+
+            __getattr__, __dir__ = lazy_loader(
+                __name__,
+                submodules=["models"],
+                attributes={"ModelResponse": ".models.response"},
+            )
+
+    Args:
+        package (`str`):
+            The name of the package, i.e. `__name__` in its `__init__.py`.
+        submodules (`Sequence[str]`, defaults to `()`):
+            The names of the submodules to import on first access.
+        attributes (`Optional[dict[str, str]]`, defaults to `None`):
+            The names of the attributes to the (relative) names of the
+            modules defining them.
+
+    Returns:
+        `Tuple[Callable[[str], Any], Callable[[], list]]`: The
+        `__getattr__` and `__dir__` functions.
+    """
+    submodule_names = set(submodules)
+    attributes = attributes or {}
+
+    def __getattr__(name: str) -> Any:
+        if name in submodule_names:
+            value = importlib.import_module(f"{package}.{name}")
+        elif name in attributes:
+            module = importlib.import_module(attributes[name], package)
+            value = getattr(module, name)
+        else:
+            raise AttributeError(
+                f"module {package!r} has no attribute {name!r}",
+            )
+        # cache it, so that `__getattr__` is not called again
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> list:
+        return sorted(
+            set(vars(sys.modules[package]))
+            | submodule_names
+            | set(attributes),
+        )
+
+    return __getattr__, __dir__
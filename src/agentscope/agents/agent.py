@@ -18,6 +18,7 @@ from agentscope.logging import log_stream_msg, log_msg
 from agentscope.manager import ModelManager
 from agentscope.message import Msg
 from agentscope.memory import TemporaryMemory
+from agentscope.tracing import start_span
 
 
 class AgentBase(Operator, metaclass=RpcMeta):
@@ -132,7 +133,12 @@ class AgentBase(Operator, metaclass=RpcMeta):
     def __call__(self, *args: Any, **kwargs: Any) -> Msg:
         """Calling the reply function, and broadcast the generated
         response to all audiences if needed."""
-        res = self.reply(*args, **kwargs)
+        with start_span(
+            f"{type(self).__name__}.reply",
+            "agent",
+            agent=self.name,
+        ):
+            res = self.reply(*args, **kwargs)
 
         # broadcast to audiences if needed
         if self._audience is not None:
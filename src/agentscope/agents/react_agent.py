@@ -3,11 +3,13 @@
 and act iteratively to solve problems. More details can be found in the paper
 https://arxiv.org/abs/2210.03629.
 """
-from typing import Optional, Union, Sequence
+from typing import Generator, Optional, Union, Sequence
 
 from agentscope.exception import ResponseParsingError
 from agentscope.agents import AgentBase
+from agentscope.logging import log_stream_msg
 from agentscope.message import Msg
+from agentscope.models import ModelResponse
 from agentscope.parsers import RegexTaggedContentParser
 from agentscope.service import (
     ServiceToolkit,
@@ -188,8 +190,11 @@ class ReActAgent(AgentBase):
 
         # Get the response from the model and print it out
         raw_response = self.model(prompt)
+        if raw_response.stream is not None:
+            return self._reasoning_stream(raw_response)
+
         if self.verbose:
-            self.speak(raw_response.stream or raw_response.text)
+            self.speak(raw_response.text)
         self.memory.add(Msg(self.name, raw_response.text, role="assistant"))
 
         # Try to parse the response into function calling commands
@@ -203,6 +208,65 @@ class ReActAgent(AgentBase):
             self.memory.add(Msg("system", str(e), "system", echo=self.verbose))
             return None
 
+    def _reasoning_stream(
+        self,
+        raw_response: ModelResponse,
+    ) -> Union[dict, None]:
+        """Parse a streamed response while it's being generated, and stop
+        the generation as soon as the function call is complete, i.e. all
+        the arguments of the chosen function are available, since the
+        following text won't be used anyway."""
+        msg = Msg(self.name, "", role="assistant")
+        stream = raw_response.stream
+
+        def _speaking_stream() -> Generator[str, None, None]:
+            try:
+                for _, text in stream:
+                    if self.verbose:
+                        msg.content = text
+                        log_stream_msg(msg, last=False)
+                    yield text
+            finally:
+                stream.close()
+
+        response = ModelResponse(stream=_speaking_stream())
+        error = None
+        try:
+            for _ in self.parser.parse_stream(
+                response,
+                stop_early=self._is_function_call_complete,
+            ):
+                pass
+        except ResponseParsingError as e:
+            error = e
+
+        if self.verbose and response.text:
+            msg.content = response.text
+            log_stream_msg(msg, last=True)
+        self.memory.add(Msg(self.name, response.text, role="assistant"))
+
+        if error is not None:
+            # When failed to parse the response, return the error message to
+            # the llm
+            self.memory.add(
+                Msg("system", str(error), "system", echo=self.verbose),
+            )
+            return None
+        return response.parsed
+
+    def _is_function_call_complete(self, parsed: dict) -> bool:
+        """Whether the thought, the function and all its arguments are
+        available in the parsed fields."""
+        function = parsed.get("function")
+        # the function name may be generated as another type by mistake
+        if "thought" not in parsed or not isinstance(function, str):
+            return False
+        schema = self.service_toolkit.json_schemas.get(function)
+        if schema is None:
+            return False
+        arguments = schema["function"]["parameters"].get("properties", {})
+        return all(name in parsed for name in arguments)
+
     def _acting(self, function_call: dict) -> None:
         """The acting process of the agent."""
 
@@ -1,11 +1,11 @@
 # -*- coding: utf-8 -*-
 """User Agent class"""
-import time
 from typing import Union, Sequence
 from typing import Optional
 from loguru import logger
 
 from agentscope.agents import AgentBase
+from agentscope.logging import flush_chat_log
 from agentscope.studio._client import _studio_client
 from agentscope.message import Msg
 from agentscope.web.gradio.utils import user_input
@@ -89,9 +89,8 @@ class UserAgent(AgentBase):
             url = raw_input["url"]
             kwargs = {}
         else:
-            # TODO: To avoid order confusion, because `input` print much
-            #  quicker than logger.chat
-            time.sleep(0.5)
+            # print the logged messages before the input prompt
+            flush_chat_log()
             content = user_input(timeout=timeout, prefix=self.input_hint)
             kwargs = {}
             if required_keys is not None:
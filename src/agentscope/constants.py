@@ -20,6 +20,9 @@ _DEFAULT_LOG_LEVEL = "INFO"
 _DEFAULT_SUBDIR_CODE = "code"
 _DEFAULT_SUBDIR_FILE = "file"
 _DEFAULT_SUBDIR_INVOKE = "invoke"
+_DEFAULT_SUBDIR_TRACE = "trace"
+_DEFAULT_SUBDIR_PROFILE = "profile"
+_DEFAULT_SUBDIR_REPLAY = "replay"
 _DEFAULT_CACHE_DIR = str(
     Path(
         os.environ.get(
@@ -46,6 +49,12 @@ _DEFAULT_TRUSTED_HOST = "mirrors.aliyun.com"
 # for monitor
 _DEFAULT_TABLE_NAME_FOR_CHAT_AND_EMBEDDING = "chat_and_embedding_model_monitor"
 _DEFAULT_TABLE_NAME_FOR_IMAGE = "image_model_monitor"
+_DEFAULT_TABLE_NAME_FOR_METRICS = "model_metrics_snapshot"
+_DEFAULT_METRICS_SNAPSHOT_INTERVAL = 60
+# for profiler
+_DEFAULT_PROFILE_INTERVAL = 0.01
+_DEFAULT_PROFILE_WRITE_INTERVAL = 10
+_DEFAULT_PROFILE_TOP_N = 20
 # for summarization
 _DEFAULT_SUMMARIZATION_PROMPT = """
 TEXT: {}
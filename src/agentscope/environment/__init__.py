@@ -1,11 +1,18 @@
 # -*- coding: utf-8 -*-
 """ Import all environment related modules in the package. """
 from .event import Event
-from .env import Env, BasicEnv, EventListener, event_func
+from .env import (
+    Env,
+    BasicEnv,
+    EventListener,
+    event_func,
+    batched_events,
+)
 
 __all__ = [
     "Event",
     "event_func",
+    "batched_events",
     "Env",
     "BasicEnv",
     "EventListener",
@@ -2,9 +2,13 @@
 """The env module."""
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from typing import Any, List, Callable
+from contextlib import contextmanager
+from typing import Any, Generator, List, Callable, Optional, Sequence
 from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 import inspect
+import os
+import threading
 from loguru import logger
 from ..exception import (
     EnvNotFoundError,
@@ -13,20 +17,147 @@ from ..exception import (
 from .event import Event
 from ..rpc.rpc_meta import RpcMeta, sync_func
 
+_LISTENER_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_LISTENER_EXECUTOR_LOCK = threading.Lock()
+_LISTENER_THREAD = threading.local()
+
+
+def _mark_listener_thread() -> None:
+    _LISTENER_THREAD.active = True
+
+
+def _get_listener_executor() -> ThreadPoolExecutor:
+    """Get the process-wide executor used to run listeners."""
+    global _LISTENER_EXECUTOR
+    if _LISTENER_EXECUTOR is None:
+        with _LISTENER_EXECUTOR_LOCK:
+            if _LISTENER_EXECUTOR is None:
+                _LISTENER_EXECUTOR = ThreadPoolExecutor(
+                    thread_name_prefix="env-listener",
+                    initializer=_mark_listener_thread,
+                )
+    return _LISTENER_EXECUTOR
+
+
+def _reset_listener_executor() -> None:
+    """Threads of the executor don't survive `fork`."""
+    global _LISTENER_EXECUTOR, _LISTENER_EXECUTOR_LOCK
+    _LISTENER_EXECUTOR = None
+    _LISTENER_EXECUTOR_LOCK = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_listener_executor)
+
+
+def _run_all(calls: Sequence[Callable[[], Any]]) -> None:
+    """Run the calls and wait for all of them.
+
+    A single call, or calls issued from a listener thread (e.g. a listener
+    that triggers another event), are run inline, so that nested events
+    never wait for a worker of the executor they are occupying.
+    """
+    if len(calls) == 1 or getattr(_LISTENER_THREAD, "active", False):
+        for call in calls:
+            call()
+        return
+    executor = _get_listener_executor()
+    futures = [executor.submit(call) for call in calls[1:]]
+    try:
+        calls[0]()
+    finally:
+        for future in futures:
+            future.result()
+
+
+def _notify(env: "Env", event: Event, listeners: Sequence[Callable]) -> None:
+    """Deliver the event to the listeners."""
+    if not listeners:
+        return
+    _run_all([partial(listener, env, event) for listener in listeners])
+
+
+def _notify_each(
+    listener: Callable,
+    env: "Env",
+    events: Sequence[Event],
+) -> None:
+    """Deliver the events to a listener one by one."""
+    for event in events:
+        listener(env, event)
+
 
 def trigger_listener(env: "Env", event: Event) -> None:
     """Trigger the listener bound to the event.
 
+    If the env is in batched event mode (see `batched_events`), the event
+    is buffered and delivered when the batch is flushed.
+
     Args:
         env (`Env`): The env that trigger the listener.
         event (`Event`): The event information.
     """
-    futures = []
-    with ThreadPoolExecutor() as executor:
-        for listener in env.get_listeners(event.name):
-            futures.append(executor.submit(listener, env, event))
-    for future in futures:
-        future.result()
+    batch = env._event_batch  # pylint: disable=W0212
+    if batch is not None:
+        batch.append(event)
+        return
+    _notify(env, event, env.get_listeners(event.name))
+
+
+def flush_events(env: "Env", events: List[Event]) -> None:
+    """Deliver buffered events to the listeners of the env.
+
+    The events are grouped by name, and each listener receives all events
+    it listens to in a single `on_batch` call, in the order they happened.
+
+    Args:
+        env (`Env`): The env that trigger the listeners.
+        events (`List[Event]`): The buffered events.
+    """
+    grouped: dict[str, List[Event]] = {}
+    for event in events:
+        grouped.setdefault(event.name, []).append(event)
+    calls: List[Callable[[], Any]] = []
+    for name, group in grouped.items():
+        for listener in env.get_listeners(name):
+            on_batch = getattr(listener, "on_batch", None)
+            if on_batch is not None:
+                calls.append(partial(on_batch, env, group))
+            else:
+                calls.append(partial(_notify_each, listener, env, group))
+    if calls:
+        _run_all(calls)
+
+
+@contextmanager
+def batched_events(env: "Env") -> Generator[None, None, None]:
+    """A context manager that switches the env into batched event mode.
+
+    Events triggered inside the context are buffered instead of being
+    delivered immediately, and are delivered to the listeners together
+    when the context exits, e.g. once per tick of a simulation.
+
+    Example:
+
+        .. code-block:: python
+
+            with batched_events(grid):
+                for agent in agents:
+                    agent(grid_msg)
+
+    Note:
+
+        Batched event mode is not thread-safe. Enter and exit the context,
+        and trigger the buffered events, in the same thread.
+
+    Args:
+        env (`Env`): The env whose events are batched.
+    """
+    env.begin_event_batch()
+    try:
+        yield
+    finally:
+        env.end_event_batch()
 
 
 def event_func(func: Callable) -> Callable:
@@ -46,27 +177,54 @@ def event_func(func: Callable) -> Callable:
     Returns:
         `Callable`: The decorated event function.
     """
+    name = func.__name__
+    sig = inspect.signature(func)
+    names = list(sig.parameters)
+    params = set(names)
+    defaults = {
+        p.name: p.default
+        for p in sig.parameters.values()
+        if p.default is not inspect.Parameter.empty
+    }
+    # functions with only plain parameters can be bound without `inspect`
+    simple = all(
+        p.kind is inspect.Parameter.POSITIONAL_OR_KEYWORD
+        for p in sig.parameters.values()
+    )
+
+    def bind(args: tuple, kwargs: dict) -> dict:
+        if simple and len(args) <= len(names):
+            values = dict(zip(names, args))
+            if values.keys().isdisjoint(kwargs) and kwargs.keys() <= params:
+                values.update(kwargs)
+                if values.keys() | defaults.keys() >= params:
+                    return {
+                        n: values[n] if n in values else defaults[n]
+                        for n in names
+                    }
+        bound_args = sig.bind(*args, **kwargs)
+        bound_args.apply_defaults()
+        return dict(bound_args.arguments)
 
     def wrapper(  # type: ignore[no-untyped-def]
         *args,
         **kwargs,
     ) -> Any:
-        # get the dict format args of the decorated function
-        sig = inspect.signature(func)
-        bound_args = sig.bind(*args, **kwargs)
-        bound_args.apply_defaults()
-        args_dict = bound_args.arguments
         # call the function
         returns = func(*args, **kwargs)
-        self = args_dict.pop("self")
-        trigger_listener(
-            env=self,
-            event=Event(
-                name=func.__name__,
-                args=args_dict,
-                returns=returns,
-            ),
-        )
+        self = args[0]
+        batch = self._event_batch  # pylint: disable=W0212
+        listeners = [] if batch is not None else self.get_listeners(name)
+        if batch is None and not listeners:
+            return returns
+        # get the dict format args of the decorated function
+        args_dict = bind(args, kwargs)
+        args_dict.pop(names[0])
+        event = Event(name=name, args=args_dict, returns=returns)
+        if batch is not None:
+            batch.append(event)
+        else:
+            _notify(self, event, listeners)
         return returns
 
     return wrapper
@@ -111,6 +269,18 @@ class EventListener(ABC):
             event (`Event`): The event information.
         """
 
+    def on_batch(self, env: Env, events: List[Event]) -> None:
+        """Activate the listener with the events buffered in batched event
+        mode. Override it to handle the events of a tick together, by
+        default the listener is activated once per event.
+
+        Args:
+            env (`Env`): The env bound to the listener.
+            events (`List[Event]`): The events in the order they happened.
+        """
+        for event in events:
+            self(env, event)
+
 
 class Env(ABC, metaclass=RpcMeta):
     """The Env Interface.
@@ -128,6 +298,12 @@ class Env(ABC, metaclass=RpcMeta):
     is called.
     """
 
+    def __init__(self) -> None:
+        """Init the batched event mode state of the env, see
+        `batched_events`."""
+        self._event_batch_depth = 0
+        self._event_batch: Optional[List[Event]] = None
+
     @property
     @abstractmethod
     def name(self) -> str:
@@ -215,6 +391,30 @@ class Env(ABC, metaclass=RpcMeta):
     def describe(self, **kwargs: Any) -> str:
         """Describe the current state of the environment."""
 
+    def begin_event_batch(self) -> None:
+        """Switch into batched event mode, where events are buffered until
+        `end_event_batch` is called. Prefer the `batched_events` context
+        manager to calling this method directly."""
+        self._event_batch_depth += 1
+        if self._event_batch is None:
+            self._event_batch = []
+
+    def end_event_batch(self) -> int:
+        """Leave batched event mode and deliver the buffered events to the
+        listeners. Nested batches are flushed by the outermost one.
+
+        Returns:
+            `int`: The number of delivered events.
+        """
+        self._event_batch_depth -= 1
+        if self._event_batch_depth > 0:
+            return 0
+        batch, self._event_batch = self._event_batch, None
+        if not batch:
+            return 0
+        flush_events(self, batch)
+        return len(batch)
+
 
 class BasicEnv(Env):
     """A basic implementation of Env, which has no event function
@@ -241,6 +441,7 @@ class BasicEnv(Env):
             children (`List[Env]`, optional): A list of children
             envs. Defaults to None.
         """
+        super().__init__()
         self._name = name
         self.children = {
             child.name: child for child in (children if children else [])
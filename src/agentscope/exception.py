@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 """AgentScope exception classes."""
+from typing import Optional
 
 # - Model Response Parsing Exceptions
 
@@ -190,6 +191,36 @@ class QuotaExceededError(Exception):
         super().__init__(self.message)
 
 
+# - Model Call Replay Exceptions
+
+
+class ReplayMissError(Exception):
+    """The exception class for the model requests not found in the archive
+    being replayed."""
+
+    def __init__(
+        self,
+        model_class: str,
+        config_name: Optional[str],
+        key: str,
+    ) -> None:
+        """Init a ReplayMissError instance.
+
+        Args:
+            model_class (`str`): The class of the model wrapper.
+            config_name (`Optional[str]`): The config name of the model
+                wrapper.
+            key (`str`): The key of the request.
+        """
+        self.message = (
+            f"The request [{key}] of model [{config_name}] ({model_class}) "
+            f"is not found in the replayed archive, e.g. the prompt "
+            f"differs from the recorded run."
+        )
+        self.key = key
+        super().__init__(self.message)
+
+
 # - Environment Exceptions
 
 
@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+"""Logging utilities."""
+import os
+import sys
+from typing import Optional, Literal, Any
+
+from loguru import logger
+
+
+from ._sink import (
+    BACK_PRESSURE_POLICY,
+    LEVEL_SAVE_LOG,
+    ChatLog,
+    ChatRecord,
+    ChatSinkBase,
+    FileSink,
+    GradioSink,
+    StudioSink,
+    TerminalSink,
+    _chat_log,
+    _send_to_gradio,
+)
+from ..message import Msg
+from ..web.gradio.utils import thread_local_data
+
+LOG_LEVEL = Literal[
+    "TRACE",
+    "DEBUG",
+    "INFO",
+    "SUCCESS",
+    "WARNING",
+    "ERROR",
+    "CRITICAL",
+]
+
+LEVEL_SAVE_MSG = "SAVE_MSG"
+
+_DEFAULT_LOG_FORMAT = (
+    "<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{"
+    "level: <8}</level> | <cyan>{name}</cyan>:<cyan>{"
+    "function}</cyan>:<cyan>{line}</cyan> - <level>{"
+    "message}</level>"
+)
+
+__all__ = [
+    "LOG_LEVEL",
+    "BACK_PRESSURE_POLICY",
+    "ChatLog",
+    "ChatRecord",
+    "ChatSinkBase",
+    "TerminalSink",
+    "FileSink",
+    "StudioSink",
+    "GradioSink",
+    "log_msg",
+    "log_stream_msg",
+    "log_gradio",
+    "add_chat_sink",
+    "remove_chat_sink",
+    "flush_chat_log",
+    "setup_logger",
+]
+
+
+def log_stream_msg(msg: Msg, last: bool = True) -> None:
+    """Print the message in different streams, including terminal, studio, and
+    gradio if it is active.
+
+    Args:
+        msg (`Msg`):
+            The message object to be printed.
+        last (`bool`, defaults to `True`):
+            True if this is the last message in the stream or a single message.
+            Otherwise, False.
+    """
+    _chat_log.put(
+        ChatRecord(
+            msg.to_dict(),
+            last=last,
+            uid=getattr(thread_local_data, "uid", None),
+        ),
+    )
+
+
+def log_msg(msg: Msg, disable_gradio: bool = False) -> None:
+    """Print the message and save it into files. Note the message should be a
+    Msg object."""
+
+    if not isinstance(msg, Msg):
+        raise TypeError(f"Get type {type(msg)}, expect Msg object.")
+
+    _chat_log.put(
+        ChatRecord(
+            msg.to_dict(),
+            uid=None
+            if disable_gradio
+            else getattr(thread_local_data, "uid", None),
+        ),
+    )
+
+
+def add_chat_sink(sink: ChatSinkBase) -> None:
+    """Add a sink to the chat log, which replaces the sink with the same
+    name, e.g. to change the back-pressure policy of the terminal by
+    `add_chat_sink(TerminalSink(policy="drop"))`.
+
+    Args:
+        sink (`ChatSinkBase`):
+            The sink to add.
+    """
+    _chat_log.add_sink(sink)
+
+
+def remove_chat_sink(name: str) -> Optional[ChatSinkBase]:
+    """Remove a sink from the chat log after its queued messages are
+    written.
+
+    Args:
+        name (`str`):
+            The name of the sink, e.g. `"terminal"`, `"file"`, `"studio"` and
+            `"gradio"`.
+
+    Returns:
+        `Optional[ChatSinkBase]`: The removed sink, or `None` if not found.
+    """
+    return _chat_log.remove_sink(name)
+
+
+def flush_chat_log() -> None:
+    """Wait until the logged messages are printed, saved and pushed."""
+    _chat_log.flush()
+
+
+def log_gradio(msg: Msg, uid: str, **kwargs: Any) -> None:
+    """Send chat message to studio.
+
+    Args:
+        msg (`Msg`):
+            The message to be logged.
+        uid (`str`):
+            The local value 'uid' of the thread.
+    """
+    if uid:
+        _send_to_gradio(
+            msg.name,
+            msg.content,
+            msg.url,
+            uid,
+            kwargs.get("avatar", None),
+        )
+
+
+def _level_format(record: dict) -> str:
+    """Format the log record."""
+    # Display the chat message
+    if record["level"].name == LEVEL_SAVE_LOG:
+        return "{message}\n"
+    else:
+        return _DEFAULT_LOG_FORMAT + "\n"
+
+
+def setup_logger(
+    path_log: Optional[str] = None,
+    level: LOG_LEVEL = "INFO",
+) -> None:
+    r"""Setup `loguru.logger` and redirect stderr to logging.
+
+    Args:
+        path_log (`str`, defaults to `""`):
+            The directory of log files.
+        level (`str`, defaults to `"INFO"`):
+            The logging level, which is one of the following: `"TRACE"`,
+            `"DEBUG"`, `"INFO"`, `"SUCCESS"`, `"WARNING"`, `"ERROR"`,
+            `"CRITICAL"`.
+    """
+    # write the queued messages into the previous files
+    _chat_log.remove_sink(FileSink.name)
+
+    # set logging level
+    logger.remove()
+
+    # avoid reinit in subprocess
+    if not hasattr(logger, "chat"):
+        # add chat function for logger
+        logger.level(LEVEL_SAVE_LOG, no=51)
+
+        # save chat message into file
+        logger.level(LEVEL_SAVE_MSG, no=53)
+        logger.chat = log_msg
+
+        # standard output for all logging except chat
+        logger.add(
+            sys.stdout,
+            filter=lambda record: record["level"].name
+            not in [LEVEL_SAVE_LOG, LEVEL_SAVE_MSG],
+            format=_DEFAULT_LOG_FORMAT,
+            enqueue=True,
+            level=level,
+        )
+
+    if path_log is not None:
+        os.makedirs(path_log, exist_ok=True)
+        path_log_file = os.path.join(path_log, "logging.log")
+
+        # save all logging into logging.log, where the chat messages are
+        # saved by the file sink of the chat log
+        logger.add(
+            path_log_file,
+            filter=lambda record: record["level"].name != LEVEL_SAVE_MSG,
+            format=_level_format,
+            enqueue=True,
+            level=level,
+        )
+
+        _chat_log.add_sink(FileSink(path_log))
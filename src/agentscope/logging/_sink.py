@@ -0,0 +1,505 @@
+# -*- coding: utf-8 -*-
+"""The sinks of the chat log, which print, save and push the messages of the
+agents in background threads, so that logging a message doesn't wait for
+the terminal, the disk or the network."""
+import atexit
+import os
+import queue
+import sys
+import threading
+from typing import Any, Dict, List, Literal, Optional, TextIO
+
+from loguru import logger
+
+from ..serialize import serialize
+from ..studio._client import _studio_client
+from ..utils.common import _guess_type_by_extension, _map_string_to_color_mark
+from ..web.gradio.utils import (
+    generate_image_from_name,
+    get_reset_msg,
+    send_msg,
+)
+
+_DEFAULT_MAX_QUEUE_SIZE = 10000
+_DEFAULT_BATCH_SIZE = 256
+_DEFAULT_SAMPLE_EVERY = 10
+
+BACK_PRESSURE_POLICY = Literal["block", "drop", "sample"]
+
+LEVEL_SAVE_LOG = "SAVE_LOG"
+
+# the sentinel to stop the worker threads
+_CLOSE = object()
+
+
+class ChatRecord:
+    """A message to log, whose fields are copied when it's logged, as the
+    streaming messages are updated in place. The formatted strings are
+    computed at most once and shared by the sinks."""
+
+    __slots__ = ("data", "last", "uid", "_plain", "_colored", "_serialized")
+
+    def __init__(
+        self,
+        data: dict,
+        last: bool = True,
+        uid: Optional[str] = None,
+    ) -> None:
+        """Initialize the record.
+
+        Args:
+            data (`dict`):
+                The message serialized by `Msg.to_dict`.
+            last (`bool`, defaults to `True`):
+                Whether it's a single message or the last update of a
+                streaming message.
+            uid (`Optional[str]`, defaults to `None`):
+                The gradio user id of the logging thread, if any.
+        """
+        self.data = data
+        self.last = last
+        self.uid = uid
+        self._plain: Optional[str] = None
+        self._colored: Optional[str] = None
+        self._serialized: Optional[str] = None
+
+    def _format(self, name: str) -> str:
+        """Format the message as `Msg.formatted_str`."""
+        lines = [f"{name}: {self.data['content']}"]
+        url = self.data["url"]
+        if url is not None:
+            for _ in url if isinstance(url, list) else [url]:
+                lines.append(f"{name}: {_}")
+        return "\n".join(lines)
+
+    @property
+    def plain(self) -> str:
+        """The formatted string of the message."""
+        if self._plain is None:
+            self._plain = self._format(self.data["name"])
+        return self._plain
+
+    @property
+    def colored(self) -> str:
+        """The formatted string with the colored name."""
+        if self._colored is None:
+            m1, m2 = _map_string_to_color_mark(self.data["name"])
+            self._colored = self._format(f"{m1}{self.data['name']}{m2}")
+        return self._colored
+
+    @property
+    def serialized(self) -> str:
+        """The json string of the message."""
+        if self._serialized is None:
+            self._serialized = serialize(self.data)
+        return self._serialized
+
+
+class ChatSinkBase:
+    """The base class of the sinks of the chat log. The records are put into
+    a bounded queue of the sink, and written in batches by a background
+    thread started on demand. When the queue is full, the back-pressure
+    policy decides what to do with the new records:
+
+    - "block": wait until the queue has room, which slows down the agents
+      instead of losing records,
+    - "drop": drop the new records,
+    - "sample": once the queue is half full, keep only one of every
+      `sample_every` new records, and drop the new records when it's full.
+
+    All the built-in sinks block by default, and the lossy policies are
+    opt-in, e.g. by `add_chat_sink(StudioSink(policy="drop"))`. The dropped
+    records are counted in `dropped`.
+    """
+
+    name: str
+    """The name of the sink, each sink of the chat log has a unique name."""
+
+    def __init__(
+        self,
+        policy: BACK_PRESSURE_POLICY = "block",
+        max_queue_size: int = _DEFAULT_MAX_QUEUE_SIZE,
+        batch_size: int = _DEFAULT_BATCH_SIZE,
+        sample_every: int = _DEFAULT_SAMPLE_EVERY,
+    ) -> None:
+        """Initialize the sink.
+
+        Args:
+            policy (`BACK_PRESSURE_POLICY`, defaults to `"block"`):
+                The back-pressure policy when the queue is full, one of
+                "block", "drop" and "sample".
+            max_queue_size (`int`, defaults to `10000`):
+                The maximum number of the records waiting to be written.
+            batch_size (`int`, defaults to `256`):
+                The maximum number of the records written at once.
+            sample_every (`int`, defaults to `10`):
+                Keep one of every `sample_every` records under pressure with
+                the "sample" policy.
+        """
+        if policy not in ("block", "drop", "sample"):
+            raise ValueError(
+                f"Unsupported back-pressure policy {policy}, expected one "
+                f"of 'block', 'drop' and 'sample'.",
+            )
+        self.policy = policy
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.sample_every = sample_every
+        self.dropped = 0
+        self._lock = threading.Lock()
+        self._queue: queue.Queue = queue.Queue(self.max_queue_size)
+        self._worker: Optional[threading.Thread] = None
+        self._sampled = 0
+
+    def _reset(self) -> None:
+        """Reset the queue and the worker in the child process after
+        `fork`, where the worker thread doesn't exist."""
+        self._lock = threading.Lock()
+        self._queue = queue.Queue(self.max_queue_size)
+        self._worker = None
+        self._sampled = 0
+
+    def accept(
+        self,
+        record: ChatRecord,  # pylint: disable=W0613
+    ) -> bool:
+        """Whether the sink writes the record, which is checked in the
+        logging thread before the record is queued."""
+        return True
+
+    def write(self, records: List[ChatRecord]) -> None:
+        """Write a batch of records in the worker thread."""
+        raise NotImplementedError(
+            f"Sink [{type(self).__name__}] is missing the required `write`"
+            f" method.",
+        )
+
+    def close(self) -> None:
+        """Release the resources, e.g. the files, after the queued records
+        are written."""
+
+    def put(self, record: ChatRecord) -> None:
+        """Queue a record by the back-pressure policy."""
+        if self._worker is None:
+            with self._lock:
+                if self._worker is None:
+                    self._worker = threading.Thread(
+                        target=self._run,
+                        args=(self._queue,),
+                        name=f"chat-log-{self.name}",
+                        daemon=True,
+                    )
+                    self._worker.start()
+
+        if self.policy == "sample" and (
+            self._queue.qsize() >= self.max_queue_size // 2
+        ):
+            self._sampled += 1
+            if self._sampled % self.sample_every != 0:
+                self.dropped += 1
+                return
+
+        if self.policy == "block":
+            self._queue.put(record)
+            return
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self, records: queue.Queue) -> None:
+        """Write the queued records in batches until closed."""
+        closing = False
+        while not closing:
+            batch = [records.get()]
+            while len(batch) < self.batch_size and batch[-1] is not _CLOSE:
+                try:
+                    batch.append(records.get_nowait())
+                except queue.Empty:
+                    break
+            if batch[-1] is _CLOSE:
+                closing = True
+                batch.pop()
+            try:
+                if batch:
+                    self.write(batch)
+                if closing:
+                    self.close()
+            except Exception as e:  # pylint: disable=W0703
+                logger.error(
+                    f"Failed to write the chat log to {self.name}: {e}",
+                )
+            finally:
+                for _ in range(len(batch) + closing):
+                    records.task_done()
+
+    def flush(self) -> None:
+        """Wait until the queued records are written."""
+        if self._worker is not None:
+            self._queue.join()
+
+    def stop(self) -> None:
+        """Write the queued records and close the sink."""
+        with self._lock:
+            worker = self._worker
+            self._worker = None
+            if worker is not None:
+                # always wait for the room, so the sentinel isn't dropped
+                self._queue.put(_CLOSE)
+        if worker is not None:
+            worker.join()
+        else:
+            self.close()
+        if self.dropped > 0:
+            logger.warning(
+                f"{self.dropped} records of the chat log are dropped by the "
+                f"sink [{self.name}] under back-pressure.",
+            )
+
+
+class TerminalSink(ChatSinkBase):
+    """Print the messages into the standard output, where the updates of a
+    streaming message are printed incrementally."""
+
+    name = "terminal"
+
+    def __init__(self, **kwargs: Any) -> None:
+        """Initialize the sink, the arguments are the same as
+        `ChatSinkBase`."""
+        super().__init__(**kwargs)
+        # the printed lengths of the streaming messages
+        self._printed: Dict[str, int] = {}
+
+    def write(self, records: List[ChatRecord]) -> None:
+        """Print the records at once."""
+        texts = []
+        for record in records:
+            msg_id = record.data["id"]
+            colored = record.colored
+            texts.append(colored[self._printed.get(msg_id, 0) :])
+            if record.last:
+                self._printed.pop(msg_id, None)
+                texts.append("\n")
+            else:
+                self._printed[msg_id] = len(colored)
+        sys.stdout.write("".join(texts))
+        sys.stdout.flush()
+
+
+class FileSink(ChatSinkBase):
+    """Save the messages into `logging.chat` of the run directory as json
+    lines, and their formatted strings into `logging.log` together with the
+    other logs."""
+
+    name = "file"
+
+    def __init__(self, path_log: str, **kwargs: Any) -> None:
+        """Initialize the sink.
+
+        Args:
+            path_log (`str`):
+                The directory of the log files.
+            **kwargs (`Any`):
+                The arguments of `ChatSinkBase`.
+        """
+        super().__init__(**kwargs)
+        self.path_log = path_log
+        self._file: Optional[TextIO] = None
+
+        # create the file in advance, which is listed by the studio
+        os.makedirs(path_log, exist_ok=True)
+        self._open()
+
+    def _open(self) -> TextIO:
+        """Open the chat file in the append mode."""
+        if self._file is None:
+            # pylint: disable=R1732
+            self._file = open(
+                os.path.join(self.path_log, "logging.chat"),
+                "a",
+                encoding="utf-8",
+            )
+        return self._file
+
+    def accept(self, record: ChatRecord) -> bool:
+        """Only the complete messages are saved."""
+        return record.last
+
+    def write(self, records: List[ChatRecord]) -> None:
+        """Append the records to the file."""
+        file = self._open()
+        file.write("".join(_.serialized + "\n" for _ in records))
+        file.flush()
+
+        # one log record for the batch, so that the lines aren't mixed with
+        # the other logs written into `logging.log` by loguru
+        logger.log(LEVEL_SAVE_LOG, "\n".join(_.plain for _ in records))
+
+    def close(self) -> None:
+        """Close the file."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class StudioSink(ChatSinkBase):
+    """Push the messages to AgentScope Studio if it's connected, where the
+    updates of a message in a batch are pushed as the latest one."""
+
+    name = "studio"
+
+    def accept(self, record: ChatRecord) -> bool:
+        """Only push when the studio is connected."""
+        return _studio_client.active
+
+    def write(self, records: List[ChatRecord]) -> None:
+        """Push the records in one request."""
+        latest = {_.data["id"]: _.data for _ in records}
+        _studio_client.push_messages(list(latest.values()))
+
+
+def _send_to_gradio(
+    name: str,
+    content: Any,
+    url: Any,
+    uid: str,
+    avatar: Optional[str] = None,
+) -> None:
+    """Send a message to the gradio web UI of the user."""
+    get_reset_msg(uid=uid)
+    avatar = avatar or generate_image_from_name(name)
+
+    flushing = True
+    if url is not None:
+        flushing = False
+        for _ in [url] if isinstance(url, str) else url:
+            typ = _guess_type_by_extension(_)
+            if typ == "image":
+                content += f"\n<img src='{_}'/>"
+            elif typ == "audio":
+                content += f"\n<audio src='{_}' controls/></audio>"
+            elif typ == "video":
+                content += f"\n<video src='{_}' controls/></video>"
+            else:
+                content += f"\n<a href='{_}'>{_}</a>"
+
+    send_msg(
+        content,
+        role=name,
+        uid=uid,
+        flushing=flushing,
+        avatar=avatar,
+    )
+
+
+class GradioSink(ChatSinkBase):
+    """Send the complete messages logged in the threads of the gradio
+    users to their web UI."""
+
+    name = "gradio"
+
+    def accept(self, record: ChatRecord) -> bool:
+        """Only send the complete messages of the gradio users."""
+        return record.last and bool(record.uid)
+
+    def write(self, records: List[ChatRecord]) -> None:
+        """Send the records one by one."""
+        for record in records:
+            if record.uid is None:
+                continue
+            _send_to_gradio(
+                record.data["name"],
+                record.data["content"],
+                record.data["url"],
+                record.uid,
+            )
+
+
+class ChatLog:
+    """The pipeline of the chat log, which queues each logged message to all
+    the sinks accepting it."""
+
+    def __init__(self) -> None:
+        """Initialize the chat log with no sinks."""
+        self._sinks: Dict[str, ChatSinkBase] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def sinks(self) -> List[ChatSinkBase]:
+        """The sinks of the chat log."""
+        return list(self._sinks.values())
+
+    def add_sink(self, sink: ChatSinkBase) -> None:
+        """Add a sink, which replaces the sink with the same name after its
+        queued records are written."""
+        with self._lock:
+            previous = self._sinks.get(sink.name)
+            sinks = dict(self._sinks)
+            sinks[sink.name] = sink
+            self._sinks = sinks
+        if previous is not None:
+            previous.stop()
+
+    def remove_sink(self, name: str) -> Optional[ChatSinkBase]:
+        """Remove a sink after its queued records are written.
+
+        Args:
+            name (`str`):
+                The name of the sink.
+
+        Returns:
+            `Optional[ChatSinkBase]`: The removed sink, or `None` if not
+            found.
+        """
+        with self._lock:
+            sinks = dict(self._sinks)
+            sink = sinks.pop(name, None)
+            self._sinks = sinks
+        if sink is not None:
+            sink.stop()
+        return sink
+
+    def get_sink(self, name: str) -> Optional[ChatSinkBase]:
+        """Get a sink by its name."""
+        return self._sinks.get(name)
+
+    def put(self, record: ChatRecord) -> None:
+        """Queue a record to the sinks accepting it."""
+        # the dict is replaced rather than modified, so it's safe to iterate
+        for sink in self._sinks.values():
+            if sink.accept(record):
+                sink.put(record)
+
+    def flush(self) -> None:
+        """Wait until the queued records of all the sinks are written."""
+        for sink in self.sinks:
+            sink.flush()
+
+    def close(self) -> None:
+        """Write the queued records and close all the sinks."""
+        for name in list(self._sinks):
+            self.remove_sink(name)
+
+
+_chat_log = ChatLog()
+_chat_log.add_sink(TerminalSink())
+_chat_log.add_sink(StudioSink())
+_chat_log.add_sink(GradioSink())
+
+
+def _flush_at_exit() -> None:
+    """Write the queued records before the interpreter exits, since the
+    worker threads are daemon threads."""
+    _chat_log.close()
+
+
+def _reset_after_fork() -> None:
+    """The worker threads don't survive `fork`, and the records queued in
+    the parent process are written by the parent."""
+    for sink in _chat_log.sinks:
+        sink._reset()  # pylint: disable=W0212
+
+
+atexit.register(_flush_at_exit)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
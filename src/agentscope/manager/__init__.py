@@ -1,14 +1,22 @@
 # -*- coding: utf-8 -*-
 """Import all manager related classes and functions."""
 
-from ._monitor import MonitorManager
+from ._monitor import MonitorManager, read_metric_snapshots
+from ._metrics import Histogram, MetricsStore, format_prometheus
 from ._file import FileManager
 from ._model import ModelManager
 from ._manager import ASManager
+from ._invocation import InvocationLog, read_invocations
 
 __all__ = [
     "FileManager",
     "ModelManager",
     "MonitorManager",
+    "read_metric_snapshots",
+    "Histogram",
+    "MetricsStore",
+    "format_prometheus",
     "ASManager",
+    "InvocationLog",
+    "read_invocations",
 ]
@@ -8,6 +8,7 @@ from typing import Any, Union, Optional, List, Literal, Generator
 import numpy as np
 from PIL import Image
 
+from ._invocation import InvocationLog
 from ..utils.common import (
     _download_file,
     _hash_string,
@@ -61,6 +62,7 @@ class FileManager:
         "save_log",
         "save_code",
         "save_api_invoke",
+        "invoke_compression",
         # Basic directory
         "base_dir",
         "run_dir",
@@ -84,10 +86,13 @@ class FileManager:
         self.save_log = False
         self.save_code = False
         self.save_api_invoke = False
+        self.invoke_compression = None
 
         self.cache_dir = None
         self.base_dir = None
-        self.run_dir = None
+        self.run_dir: Optional[str] = None
+
+        self._invocation_log: Optional[InvocationLog] = None
 
     def initialize(
         self,
@@ -96,6 +101,7 @@ class FileManager:
         save_code: bool,
         save_api_invoke: bool,
         cache_dir: str,
+        invoke_compression: Optional[Literal["gzip", "zstd"]] = None,
     ) -> None:
         """Set the directory for saving files.
 
@@ -110,10 +116,17 @@ class FileManager:
                 Whether to save API invocations locally.
             cache_dir (`str`):
                 The directory to save cache files.
+            invoke_compression (`Optional[Literal["gzip", "zstd"]]`,
+            defaults to `None`):
+                The compression of the full segments of the API invocation
+                log.
         """
+        self._close_invocation_log()
+
         self.save_log = save_log
         self.save_code = save_code
         self.save_api_invoke = save_api_invoke
+        self.invoke_compression = invoke_compression
 
         self.cache_dir = cache_dir
 
@@ -145,6 +158,18 @@ class FileManager:
         os.makedirs(dir_cache_embedding, exist_ok=True)
         return dir_cache_embedding
 
+    @property
+    def web_cache_dir(self) -> str:
+        """Obtain the directory to cache the loaded web pages."""
+        if self.cache_dir is None:
+            raise ValueError(
+                "The cache directory is not specified. Please specify the "
+                "cache directory when initializing the file manager.",
+            )
+        dir_cache_web = os.path.join(self.cache_dir, "web")
+        os.makedirs(dir_cache_web, exist_ok=True)
+        return dir_cache_web
+
     @property
     def file_dir(self) -> str:
         """The directory for saving files, including images, audios and
@@ -174,20 +199,48 @@ class FileManager:
 
     def save_api_invocation(
         self,
-        prefix: str,
+        prefix: str,  # pylint: disable=W0613
         record: dict,
     ) -> Union[None, str]:
-        """Save api invocation locally."""
-        if self.save_api_invoke:
-            filename = f"{prefix}_{_generate_random_code()}.json"
-            path_save = os.path.join(str(self.invoke_dir), filename)
-            with open(path_save, "w", encoding="utf-8") as file:
-                json.dump(record, file, indent=4, ensure_ascii=False)
-
-            return filename
-        else:
+        """Append the api invocation to the invocation log in the invoke
+        directory, which is written in the background.
+
+        Args:
+            prefix (`str`):
+                Not used, as the records are no longer saved in separate
+                files named by the prefix.
+            record (`dict`):
+                The invocation record.
+
+        Returns:
+            `Union[None, str]`: The id of the record in the invocation log,
+            or `None` if the api invocations are not saved.
+        """
+        if not self.save_api_invoke:
             return None
 
+        if self._invocation_log is None:
+            self._invocation_log = InvocationLog(
+                str(self.invoke_dir),
+                compression=self.invoke_compression,
+                run_id=(
+                    os.path.basename(self.run_dir)
+                    if self.run_dir is not None
+                    else None
+                ),
+            )
+        return self._invocation_log.append(record)
+
+    def flush_api_invocations(self) -> None:
+        """Wait until the saved api invocations are written to the disk."""
+        if self._invocation_log is not None:
+            self._invocation_log.flush()
+
+    def _close_invocation_log(self) -> None:
+        if self._invocation_log is not None:
+            self._invocation_log.close()
+            self._invocation_log = None
+
     def save_python_code(self) -> None:
         """Save the code locally."""
         # Copy python file in os.path.curdir into runtime directory
@@ -347,6 +400,7 @@ class FileManager:
 
     def load_dict(self, data: dict) -> None:
         """Load the configuration from a dict."""
+        self._close_invocation_log()
         for k in self.__serialized_attrs:
             assert k in data, f"Key {k} not found in data."
             setattr(self, k, data[k])
@@ -358,9 +412,12 @@ class FileManager:
 
     def flush(self) -> None:
         """Flush the file manager."""
+        self._close_invocation_log()
+
         self.save_log = False
         self.save_code = False
         self.save_api_invoke = False
+        self.invoke_compression = None
 
         self.cache_dir = None
         self.base_dir = None
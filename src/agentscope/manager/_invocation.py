@@ -0,0 +1,473 @@
+# -*- coding: utf-8 -*-
+"""An append-only log of the API invocations, which stores the records as
+compact JSON lines in rotating segments, together with a sidecar index per
+segment for looking them up by time, model and run."""
+import atexit
+import glob
+import gzip
+import io
+import json
+import os
+import queue
+import threading
+import weakref
+from typing import (
+    IO,
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Tuple,
+    cast,
+)
+
+from loguru import logger
+
+_SEGMENT_PREFIX = "invocations"
+_SEGMENT_SUFFIX = ".jsonl"
+_INDEX_SUFFIX = ".index.jsonl"
+_COMPRESSED_SUFFIXES: Dict[Literal["gzip", "zstd"], str] = {
+    "gzip": ".gz",
+    "zstd": ".zst",
+}
+
+_DEFAULT_MAX_SEGMENT_BYTES = 64 * 1024 * 1024
+_DEFAULT_MAX_QUEUE_SIZE = 4096
+
+# the sentinel to stop the writer thread
+_CLOSE = object()
+
+
+def _import_zstandard() -> Any:
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError(
+            "The package zstandard is not found. Please install it by "
+            "running command `pip install zstandard`, or use the gzip "
+            "compression instead.",
+        ) from e
+    return zstandard
+
+
+def _open_segment(
+    path: str,
+    mode: Literal["rb", "wb"],
+    compression: Optional[Literal["gzip", "zstd"]],
+) -> IO[bytes]:
+    """Open a segment with the given compression."""
+    if compression == "gzip":
+        return cast(IO[bytes], gzip.open(path, mode))
+    zstandard = _import_zstandard() if compression == "zstd" else None
+    # pylint: disable=R1732
+    file = open(path, "rb") if mode == "rb" else open(path, "wb")
+    if zstandard is None:
+        return file
+    if mode == "rb":
+        return io.BufferedReader(
+            zstandard.ZstdDecompressor().stream_reader(file),
+        )
+    return zstandard.ZstdCompressor().stream_writer(file)
+
+
+class InvocationLog:
+    """The writer of the invocation log of a process.
+
+    The records are serialized in the calling thread, and appended by a
+    background thread in batches, so that saving an invocation doesn't wait
+    for the disk. When the current segment exceeds `max_segment_bytes`,
+    the writer starts a new one, and compresses the previous one if
+    `compression` is given. Each segment
+    `invocations-<pid>-<number>.jsonl[.gz|.zst]` has a sidecar index
+    `invocations-<pid>-<number>.index.jsonl`, whose lines are the line
+    number, byte offset, run id and the `index_fields` (by default the
+    timestamp and the model class) of the records,
+    so that the readers can find the records without decompressing and
+    parsing all the segments. The processes sharing a run directory write
+    their own segments.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        compression: Optional[Literal["gzip", "zstd"]] = None,
+        run_id: Optional[str] = None,
+        max_segment_bytes: int = _DEFAULT_MAX_SEGMENT_BYTES,
+        max_queue_size: int = _DEFAULT_MAX_QUEUE_SIZE,
+        index_fields: Sequence[str] = ("timestamp", "model_class"),
+    ) -> None:
+        """Initialize the invocation log.
+
+        Args:
+            directory (`str`):
+                The directory to save the segments.
+            compression (`Optional[Literal["gzip", "zstd"]]`, defaults to
+            `None`):
+                The compression of the full segments. The zstd compression
+                requires the `zstandard` package.
+            run_id (`Optional[str]`, defaults to `None`):
+                The id of the run, recorded in the index.
+            max_segment_bytes (`int`, defaults to `64MB`):
+                The size of the uncompressed segments to start a new one.
+            max_queue_size (`int`, defaults to `4096`):
+                The maximum number of records waiting to be written, after
+                which saving a record blocks until the writer catches up.
+            index_fields (`Sequence[str]`, defaults to `("timestamp",
+            "model_class")`):
+                The fields of the records saved in the index.
+        """
+        if compression is not None and compression not in (
+            _COMPRESSED_SUFFIXES
+        ):
+            raise ValueError(
+                f"Unsupported compression {compression}, expected one of "
+                f"{list(_COMPRESSED_SUFFIXES)} or None.",
+            )
+        if compression == "zstd":
+            _import_zstandard()
+
+        self.directory = directory
+        self.compression = compression
+        self.run_id = run_id
+        self.max_segment_bytes = max_segment_bytes
+        self.max_queue_size = max_queue_size
+        self.index_fields = tuple(index_fields)
+
+        self._lock = threading.Lock()
+        self._queue: queue.Queue = queue.Queue(self.max_queue_size)
+        self._writer: Optional[threading.Thread] = None
+        self._closed = False
+
+        self._pid = os.getpid()
+        self._segment = 0
+        self._line = 0
+        self._offset = 0
+
+        _INVOCATION_LOGS.add(self)
+
+    def _reset(self) -> None:
+        """Reset the state of the writer in the child process after `fork`,
+        where the writer thread doesn't exist."""
+        self._lock = threading.Lock()
+        self._queue = queue.Queue(self.max_queue_size)
+        self._writer = None
+        self._closed = False
+
+        self._pid = os.getpid()
+        self._segment = 0
+        self._line = 0
+        self._offset = 0
+
+    def _segment_name(self, segment: int) -> str:
+        return f"{_SEGMENT_PREFIX}-{self._pid}-{segment:06d}"
+
+    def append(self, record: dict) -> str:
+        """Append a record to the log.
+
+        Args:
+            record (`dict`):
+                The invocation record, whose `index_fields` are indexed if
+                given.
+
+        Returns:
+            `str`: The id of the record, i.e. the name of its segment and
+            its line number, joined by "#".
+        """
+        data = (
+            json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+            + "\n"
+        ).encode("utf-8")
+
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("The invocation log has been closed.")
+
+            if self._line > 0 and (
+                self._offset + len(data) > self.max_segment_bytes
+            ):
+                self._segment += 1
+                self._line = 0
+                self._offset = 0
+
+            entry = {
+                "line": self._line,
+                "offset": self._offset,
+                **{_: record.get(_) for _ in self.index_fields},
+                "run_id": self.run_id,
+            }
+            self._line += 1
+            self._offset += len(data)
+
+            if self._writer is None:
+                self._writer = threading.Thread(
+                    target=self._write_loop,
+                    name="invocation-log-writer",
+                    daemon=True,
+                )
+                self._writer.start()
+            # put in the lock to keep the order of the records
+            self._queue.put((self._segment, data, entry))
+
+            return f"{self._segment_name(self._segment)}#{entry['line']}"
+
+    def flush(self) -> None:
+        """Wait until the appended records are written."""
+        if self._writer is not None:
+            self._queue.join()
+
+    def close(self) -> None:
+        """Write the remaining records, compress the last segment and stop
+        the writer. The log can't be appended after closing."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            writer = self._writer
+            if writer is not None:
+                self._queue.put(_CLOSE)
+        if writer is not None:
+            writer.join()
+        _INVOCATION_LOGS.discard(self)
+
+    def _write_loop(self) -> None:
+        """Write the queued records in batches."""
+        os.makedirs(self.directory, exist_ok=True)
+        current = -1
+        files: Optional[Tuple[IO, IO]] = None
+        closing = False
+        while not closing:
+            batch = [self._queue.get()]
+            while len(batch) < self.max_queue_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            try:
+                entries: List[dict] = []
+                for item in batch:
+                    if item is _CLOSE:
+                        closing = True
+                        continue
+                    segment, data, entry = item
+                    if segment != current or files is None:
+                        if files is not None:
+                            self._write_index(files, entries)
+                            self._seal(current, files)
+                        current = segment
+                        files = self._open(current)
+                    files[0].write(data)
+                    entries.append(entry)
+                if files is not None:
+                    self._write_index(files, entries)
+                    if closing:
+                        self._seal(current, files)
+            except Exception as e:  # pylint: disable=W0703
+                logger.error(f"Failed to write the invocation log: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _open(self, segment: int) -> Tuple[IO, IO]:
+        path = os.path.join(self.directory, self._segment_name(segment))
+        # pylint: disable=R1732
+        return (
+            open(path + _SEGMENT_SUFFIX, "ab"),
+            open(path + _INDEX_SUFFIX, "a", encoding="utf-8"),
+        )
+
+    @staticmethod
+    def _write_index(files: Tuple[IO, IO], entries: List[dict]) -> None:
+        """Flush the records before their index, so that the indexed
+        records are always complete for the readers."""
+        data_file, index_file = files
+        data_file.flush()
+        for entry in entries:
+            index_file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        index_file.flush()
+        entries.clear()
+
+    def _seal(self, segment: int, files: Tuple[IO, IO]) -> None:
+        """Close and compress a full segment."""
+        for file in files:
+            file.close()
+        if self.compression is None:
+            return
+        path = os.path.join(
+            self.directory,
+            self._segment_name(segment) + _SEGMENT_SUFFIX,
+        )
+        target = path + _COMPRESSED_SUFFIXES[self.compression]
+        with open(path, "rb") as src, _open_segment(
+            target + ".tmp",
+            "wb",
+            self.compression,
+        ) as dst:
+            for chunk in iter(lambda: src.read(1024 * 1024), b""):
+                dst.write(chunk)
+        os.replace(target + ".tmp", target)
+        os.remove(path)
+
+
+_INVOCATION_LOGS: "weakref.WeakSet[InvocationLog]" = weakref.WeakSet()
+
+
+def _close_invocation_logs() -> None:
+    """Write the remaining records before the interpreter exits, since the
+    writer threads are daemon threads."""
+    for invocation_log in list(_INVOCATION_LOGS):
+        invocation_log.close()
+
+
+def _reset_after_fork() -> None:
+    """The writer threads don't survive `fork`, and the child process writes
+    its own segments."""
+    for invocation_log in list(_INVOCATION_LOGS):
+        invocation_log._reset()  # pylint: disable=W0212
+
+
+atexit.register(_close_invocation_logs)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def read_invocation_index(directory: str) -> List[dict]:
+    """Read the index of all the segments in a directory.
+
+    Args:
+        directory (`str`):
+            The directory of the invocation log.
+
+    Returns:
+        `List[dict]`: The index entries, with the name of their segment in
+        the `segment` field.
+    """
+    entries = []
+    pattern = os.path.join(directory, f"{_SEGMENT_PREFIX}-*{_INDEX_SUFFIX}")
+    for path in sorted(glob.glob(pattern)):
+        segment = os.path.basename(path)[: -len(_INDEX_SUFFIX)]
+        with open(path, "r", encoding="utf-8") as file:
+            for line in file:
+                # skip the last line if it's being written
+                if line.endswith("\n"):
+                    entry = json.loads(line)
+                    entry["segment"] = segment
+                    entries.append(entry)
+    return entries
+
+
+def _read_segment(directory: str, segment: str, entries: List[dict]) -> None:
+    """Read the records of the entries in a segment into their `record`
+    field."""
+    path = os.path.join(directory, segment + _SEGMENT_SUFFIX)
+    try:
+        # an uncompressed segment is read by the offsets
+        with open(path, "rb") as file:
+            for entry in entries:
+                file.seek(entry["offset"])
+                entry["record"] = json.loads(file.readline())
+        return
+    except FileNotFoundError:
+        pass
+
+    for compression, suffix in _COMPRESSED_SUFFIXES.items():
+        if os.path.exists(path + suffix):
+            path += suffix
+            break
+    else:
+        raise FileNotFoundError(f"The segment {segment} is not found.")
+
+    wanted = {entry["line"]: entry for entry in entries}
+    with _open_segment(path, "rb", compression) as file:
+        for number, line in enumerate(file):
+            if number in wanted:
+                wanted.pop(number)["record"] = json.loads(line)
+                if not wanted:
+                    break
+
+
+def _read_legacy_invocations(directory: str) -> List[dict]:
+    """Read the records saved as one json file per invocation by the former
+    versions."""
+    entries = []
+    for path in glob.glob(os.path.join(directory, "*.json")):
+        with open(path, "r", encoding="utf-8") as file:
+            record = json.load(file)
+        entries.append(
+            {
+                "segment": os.path.basename(path),
+                "line": 0,
+                "timestamp": record.get("timestamp"),
+                "model_class": record.get("model_class"),
+                "run_id": None,
+                "record": record,
+            },
+        )
+    return entries
+
+
+def read_invocations(
+    directory: str,
+    offset: int = 0,
+    limit: Optional[int] = None,
+    model_class: Optional[str] = None,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    run_id: Optional[str] = None,
+) -> Tuple[int, List[dict]]:
+    """Read a page of the invocation records in a directory, ordered by
+    their timestamps. Only the segments containing the page are read.
+
+    Args:
+        directory (`str`):
+            The directory of the invocation log.
+        offset (`int`, defaults to `0`):
+            The number of the matched records to skip.
+        limit (`Optional[int]`, defaults to `None`):
+            The maximum number of records to return, all if `None`.
+        model_class (`Optional[str]`, defaults to `None`):
+            Only return the invocations of this model class.
+        start (`Optional[str]`, defaults to `None`):
+            Only return the invocations at or after this timestamp, in the
+            format of the records, e.g. "20240101-120000".
+        end (`Optional[str]`, defaults to `None`):
+            Only return the invocations at or before this timestamp.
+        run_id (`Optional[str]`, defaults to `None`):
+            Only return the invocations of this run.
+
+    Returns:
+        `Tuple[int, List[dict]]`: The number of the matched records, and
+        the records in the page.
+    """
+    if not os.path.isdir(directory):
+        return 0, []
+
+    entries: Iterable[dict] = read_invocation_index(
+        directory,
+    ) + _read_legacy_invocations(directory)
+    if model_class is not None:
+        entries = (_ for _ in entries if _["model_class"] == model_class)
+    if start is not None:
+        entries = (_ for _ in entries if (_["timestamp"] or "") >= start)
+    if end is not None:
+        entries = (_ for _ in entries if (_["timestamp"] or "") <= end)
+    if run_id is not None:
+        entries = (_ for _ in entries if _["run_id"] == run_id)
+
+    matched = sorted(
+        entries,
+        key=lambda _: (_["timestamp"] or "", _["segment"], _["line"]),
+    )
+    page = matched[offset : None if limit is None else offset + limit]
+
+    segments: dict = {}
+    for entry in page:
+        if "record" not in entry:
+            segments.setdefault(entry["segment"], []).append(entry)
+    for segment, segment_entries in segments.items():
+        _read_segment(directory, segment, segment_entries)
+
+    return len(matched), [entry["record"] for entry in page]
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 """A manager for AgentScope."""
 import os
-from typing import Union, Any
+from typing import Literal, Optional, Union, Any, Sequence
 from copy import deepcopy
 
 from loguru import logger
@@ -9,7 +9,14 @@ from loguru import logger
 from ._monitor import MonitorManager
 from ._file import FileManager
 from ._model import ModelManager
-from ..logging import LOG_LEVEL, setup_logger
+from ._replay import _recorder
+from ..logging import (
+    LOG_LEVEL,
+    FileSink,
+    flush_chat_log,
+    remove_chat_sink,
+    setup_logger,
+)
 from .._version import __version__
 from ..utils.common import (
     _generate_random_code,
@@ -18,6 +25,8 @@ from ..utils.common import (
 )
 from ..constants import _RUNTIME_ID_FORMAT, _RUNTIME_TIMESTAMP_FORMAT
 from ..studio._client import _studio_client
+from ..tracing._tracer import _tracer
+from ..profiling._profiler import _profiler
 
 
 class ASManager:
@@ -82,6 +91,13 @@ class ASManager:
         logger_level: LOG_LEVEL,
         run_id: Union[str, None],
         studio_url: Union[str, None],
+        invoke_compression: Optional[Literal["gzip", "zstd"]] = None,
+        trace: bool = False,
+        trace_exporters: Sequence[Any] = ("jsonl",),
+        profile: bool = False,
+        record_model_calls: bool = False,
+        replay: Optional[str] = None,
+        replay_speed: float = 0.0,
     ) -> None:
         """Initialize the package."""
         # =============== Init the runtime ===============
@@ -116,12 +132,25 @@ class ASManager:
             save_code=save_code,
             save_api_invoke=save_api_invoke,
             cache_dir=cache_dir,
+            invoke_compression=invoke_compression,
         )
         # Save the python code here to avoid duplicated saving in the child
         # process (when calling deserialize function)
         if save_code:
             self.file.save_python_code()
 
+        # ======= Init the tracer, the profiler and the recorder =======
+        # before saving the runtime information, which includes their states
+        _tracer.initialize(trace, self.file.run_dir, trace_exporters)
+        _profiler.initialize(profile, self.file.run_dir)
+        _recorder.initialize(
+            record_model_calls,
+            self.file.run_dir,
+            replay,
+            replay_speed,
+            invoke_compression,
+        )
+
         if not disable_saving:
             # Save the runtime information in .config file
             self.file.save_runtime_information(self.state_dict())
@@ -169,6 +198,9 @@ class ASManager:
         }
         serialized_data["studio"] = _studio_client.state_dict()
         serialized_data["monitor"] = self.monitor.state_dict()
+        serialized_data["tracing"] = _tracer.state_dict()
+        serialized_data["profiler"] = _profiler.state_dict()
+        serialized_data["replay"] = _recorder.state_dict()
 
         return deepcopy(serialized_data)
 
@@ -185,6 +217,9 @@ class ASManager:
         self.model.load_dict(data["model"])
         _studio_client.load_dict(data["studio"])
         self.monitor.load_dict(data["monitor"])
+        _tracer.load_dict(data["tracing"])
+        _profiler.load_dict(data["profiler"])
+        _recorder.load_dict(data["replay"])
 
     def flush(self) -> None:
         """Flush the runtime information."""
@@ -198,7 +233,20 @@ class ASManager:
         self.file.flush()
         self.model.flush()
         self.monitor.flush()
+        flush_chat_log()
+        remove_chat_sink(FileSink.name)
         logger.remove()
         _studio_client.flush()
+        _tracer.flush()
+        _profiler.flush()
+        _recorder.flush()
 
         self.logger_level = "INFO"
+
+
+# init the singleton class by default settings to avoid reinit in subprocess
+# especially in spawn mode, which will copy the object from the parent process
+# to the child process rather than re-import the module (fork mode). It's
+# done here rather than in `agentscope.init`, as `import agentscope` doesn't
+# import the managers any more.
+ASManager()
@@ -0,0 +1,364 @@
+# -*- coding: utf-8 -*-
+"""The in-memory histograms and counters of the model calls, e.g. the
+latency, the time to first token and the number of errors."""
+import math
+import threading
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+# The metrics recorded as histograms, and the scales to convert their values
+# into the integers stored in the histograms
+_HISTOGRAM_SCALES = {
+    # seconds, in microseconds
+    "latency": 1e6,
+    "ttft": 1e6,
+    "queue_wait": 1e6,
+    # tokens per second, in thousandths
+    "tokens_per_second": 1e3,
+}
+
+_COUNTERS = ("requests", "errors", "retries")
+
+# The help texts of the metrics in the Prometheus text exposition format
+_PROMETHEUS_METRICS = {
+    "latency": (
+        "agentscope_model_latency_seconds",
+        "The latency of the model calls.",
+    ),
+    "ttft": (
+        "agentscope_model_ttft_seconds",
+        "The time to first token of the streaming model calls.",
+    ),
+    "queue_wait": (
+        "agentscope_queue_wait_seconds",
+        "The time waiting in the queue before being processed.",
+    ),
+    "tokens_per_second": (
+        "agentscope_model_tokens_per_second",
+        "The completion tokens per second of the model calls.",
+    ),
+    "requests": (
+        "agentscope_model_requests_total",
+        "The number of the model calls.",
+    ),
+    "errors": (
+        "agentscope_model_errors_total",
+        "The number of the failed model calls.",
+    ),
+    "retries": (
+        "agentscope_model_retries_total",
+        "The number of the retried model requests.",
+    ),
+}
+
+_QUANTILES = (0.5, 0.95, 0.99)
+
+# The number of the sub-buckets of each power of two is 2 ** _SUB_BITS, so the
+# relative error of the percentiles is within 2 ** -_SUB_BITS (about 3%)
+_SUB_BITS = 5
+
+
+def _bucket_index(value: int) -> int:
+    """The index of the log-linear bucket containing a non-negative integer,
+    where the values below `2 ** (_SUB_BITS + 1)` have their own
+    buckets."""
+    exponent = value.bit_length() - _SUB_BITS - 1
+    if exponent <= 0:
+        return value
+    return (exponent << _SUB_BITS) + (value >> exponent)
+
+
+def _bucket_range(index: int) -> Tuple[int, int]:
+    """The range [low, high) of the values in a bucket."""
+    exponent = max(0, (index >> _SUB_BITS) - 1)
+    mantissa = index - (exponent << _SUB_BITS)
+    return mantissa << exponent, (mantissa + 1) << exponent
+
+
+class Histogram:
+    """A histogram in the style of HDR histogram, which counts the values in
+    log-linear buckets, so that it takes a constant time to record a value
+    and a small memory to cover a wide range with a bounded relative
+    error."""
+
+    __slots__ = ("scale", "counts", "count", "total", "min", "max")
+
+    def __init__(self, scale: float = 1.0) -> None:
+        """Initialize an empty histogram.
+
+        Args:
+            scale (`float`, defaults to `1.0`):
+                The values are multiplied by the scale and rounded into
+                integers before being counted, which decides the resolution
+                of the histogram.
+        """
+        self.scale = scale
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def record(self, value: float) -> None:
+        """Record a non-negative value."""
+        value = max(value, 0.0)
+        index = _bucket_index(int(value * self.scale + 0.5))
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Get the value at a percentile, e.g. 0.99 for p99, which is the
+        middle of the bucket containing it and within the recorded range.
+        `None` if the histogram is empty."""
+        if self.count == 0:
+            return None
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                low, high = _bucket_range(index)
+                value = (low + high - 1) / 2 / self.scale
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def merge(self, other: "Histogram") -> None:
+        """Add the values of another histogram with the same scale."""
+        if other.scale != self.scale:
+            raise ValueError(
+                f"Cannot merge histograms with different scales "
+                f"{self.scale} and {other.scale}.",
+            )
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def summary(self) -> dict:
+        """Summarize the histogram by the count, the sum, the mean, the
+        extremes and the p50, p95 and p99."""
+        empty = self.count == 0
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "mean": None if empty else self.total / self.count,
+            "min": None if empty else self.min,
+            "max": None if empty else self.max,
+            **{f"p{int(q * 100)}": self.percentile(q) for q in _QUANTILES},
+        }
+
+    def to_dict(self) -> dict:
+        """Serialize the histogram, e.g. into the snapshots."""
+        return {
+            "scale": self.scale,
+            "counts": {str(k): v for k, v in self.counts.items()},
+            "count": self.count,
+            "sum": self.total,
+            "min": None if self.count == 0 else self.min,
+            "max": None if self.count == 0 else self.max,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Histogram":
+        """Load a histogram serialized by `to_dict`."""
+        histogram = cls(data["scale"])
+        histogram.counts = {int(k): v for k, v in data["counts"].items()}
+        histogram.count = data["count"]
+        histogram.total = data["sum"]
+        if data["count"] > 0:
+            histogram.min = data["min"]
+            histogram.max = data["max"]
+        return histogram
+
+
+class MetricsStore:
+    """The thread-safe store of the histograms and the counters, which are
+    identified by a name (e.g. the config name of a model) and a metric."""
+
+    def __init__(self) -> None:
+        """Initialize an empty store."""
+        self._lock = threading.Lock()
+        self._histograms: Dict[Tuple[str, str], Histogram] = {}
+        self._counters: Dict[Tuple[str, str], int] = {}
+        self.version = 0
+        """Increased by each update, to skip the unchanged snapshots."""
+
+    def observe(self, name: str, metric: str, value: float) -> None:
+        """Record a value of a histogram metric, e.g. "latency"."""
+        key = (name, metric)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = Histogram(_HISTOGRAM_SCALES.get(metric, 1e6))
+                self._histograms[key] = histogram
+            histogram.record(value)
+            self.version += 1
+
+    def increment(self, name: str, counter: str, value: int = 1) -> None:
+        """Increase a counter, e.g. "errors"."""
+        key = (name, counter)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+            self.version += 1
+
+    def snapshot(self) -> Tuple[Dict[Tuple[str, str], dict], dict]:
+        """Copy the serialized histograms and the counters."""
+        with self._lock:
+            return (
+                {k: v.to_dict() for k, v in self._histograms.items()},
+                dict(self._counters),
+            )
+
+    def query(
+        self,
+        name: Optional[str] = None,
+        metric: Optional[str] = None,
+    ) -> List[dict]:
+        """Summarize the metrics of each name.
+
+        Args:
+            name (`Optional[str]`, defaults to `None`):
+                Only summarize the metrics of the given name.
+            metric (`Optional[str]`, defaults to `None`):
+                Only summarize the given metric.
+
+        Returns:
+            `List[dict]`: A dict for each name, which contains the counters
+            and the summaries of the histograms by their metrics, e.g.
+            `{"name": "gpt-4", "requests": 10, "errors": 0, "retries": 1,
+            "latency": {"count": 10, "p50": 1.2, ...}, ...}`.
+        """
+        with self._lock:
+            histograms = {
+                k: v.summary()
+                for k, v in self._histograms.items()
+                if (name is None or k[0] == name)
+                and (metric is None or k[1] == metric)
+            }
+            counters = {
+                k: v
+                for k, v in self._counters.items()
+                if (name is None or k[0] == name)
+                and (metric is None or k[1] == metric)
+            }
+
+        rows: Dict[str, dict] = {}
+        for (row_name, row_metric), value in [
+            *counters.items(),
+            *histograms.items(),
+        ]:
+            rows.setdefault(row_name, {"name": row_name})[row_metric] = value
+        return [rows[_] for _ in sorted(rows)]
+
+    def to_prometheus(self, labels: Optional[dict] = None) -> str:
+        """Expose the metrics in the Prometheus text format, where the
+        histograms are exposed as summaries with the p50, p95 and p99.
+
+        Args:
+            labels (`Optional[dict]`, defaults to `None`):
+                The extra labels of all the samples, e.g. the run id.
+        """
+        histograms, counters = self.snapshot()
+        return format_prometheus([(histograms, counters, labels or {})])
+
+    def clear(self) -> None:
+        """Remove all the metrics."""
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+            self.version += 1
+
+
+def _escape_label(value: object) -> str:
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace('"', '\\"')
+        .replace("\n", "\\n")
+    )
+
+
+def _format_labels(labels: dict) -> str:
+    return ",".join(f'{k}="{_escape_label(v)}"' for k, v in labels.items())
+
+
+def format_prometheus(
+    snapshots: List[Tuple[Dict[Tuple[str, str], dict], dict, dict]],
+) -> str:
+    """Format the snapshots of one or more `MetricsStore` in the Prometheus
+    text exposition format, where the samples of the same metric are
+    grouped together.
+
+    Args:
+        snapshots (`List[Tuple[Dict[Tuple[str, str], dict], dict, dict]]`):
+            The snapshots, each of which consists of the histograms
+            serialized by `Histogram.to_dict` and the counters by their
+            names and metrics, and the extra labels of their samples, e.g.
+            the run id.
+
+    Returns:
+        `str`: The metrics in the Prometheus text format.
+    """
+    lines = []
+    for metric, (prom_name, help_text) in _PROMETHEUS_METRICS.items():
+        is_counter = metric in _COUNTERS
+        samples = []
+        for histograms, counters, labels in snapshots:
+            values = counters if is_counter else histograms
+            samples.extend(
+                ({"name": key[0], **labels}, value)
+                for key, value in sorted(values.items())
+                if key[1] == metric
+            )
+        if not samples:
+            continue
+
+        lines.append(f"# HELP {prom_name} {help_text}")
+        lines.append(
+            f"# TYPE {prom_name} {'counter' if is_counter else 'summary'}",
+        )
+        for labels, value in samples:
+            if is_counter:
+                lines.append(
+                    f"{prom_name}{{{_format_labels(labels)}}} {value}",
+                )
+                continue
+
+            histogram = Histogram.from_dict(value)
+            for q in _QUANTILES:
+                percentile = histogram.percentile(q)
+                sample_labels = _format_labels({**labels, "quantile": q})
+                lines.append(
+                    f"{prom_name}{{{sample_labels}}} "
+                    f"{'NaN' if percentile is None else percentile}",
+                )
+            sample_labels = _format_labels(labels)
+            lines.append(
+                f"{prom_name}_sum{{{sample_labels}}} {histogram.total}",
+            )
+            lines.append(
+                f"{prom_name}_count{{{sample_labels}}} {histogram.count}",
+            )
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+class _ModelCall:
+    """The model call being processed in the current context, which
+    collects the completion tokens reported to the monitor."""
+
+    __slots__ = ("wrapper", "completion_tokens")
+
+    def __init__(self, wrapper: object) -> None:
+        self.wrapper = wrapper
+        self.completion_tokens = 0
+
+
+_current_model_call: ContextVar[Optional[_ModelCall]] = ContextVar(
+    "agentscope_current_model_call",
+    default=None,
+)
@@ -1,13 +1,16 @@
 # -*- coding: utf-8 -*-
 """The model manager for AgentScope."""
+from __future__ import annotations
+
 import importlib
 import json
 import os
-from typing import Any, Union, Type
+from typing import Any, Union, Type, TYPE_CHECKING
 
 from loguru import logger
 
-from ..models import ModelWrapperBase, _BUILD_IN_MODEL_WRAPPERS
+if TYPE_CHECKING:
+    from ..models import ModelWrapperBase
 
 
 class ModelManager:
@@ -20,7 +23,9 @@ class ModelManager:
     """The model configs"""
 
     model_wrapper_mapping: dict[str, Type[ModelWrapperBase]] = {}
-    """The registered model wrapper classes."""
+    """The registered model wrapper classes. The build-in model wrappers are
+    added when they're used for the first time, see
+    `get_model_wrapper_class`."""
 
     def __new__(cls, *args: Any, **kwargs: Any) -> Any:
         """Create a singleton instance."""
@@ -48,14 +53,10 @@ class ModelManager:
     ) -> None:
         """Initialize the model manager with model configs"""
         self.model_configs = {}
+        # the build-in model wrappers are imported on demand, so that the
+        # SDKs of the unused model providers are not imported
         self.model_wrapper_mapping = {}
 
-        for cls_name in _BUILD_IN_MODEL_WRAPPERS:
-            models_module = importlib.import_module("agentscope.models")
-            cls = getattr(models_module, cls_name)
-            if getattr(cls, "model_type", None):
-                self.register_model_wrapper_class(cls, exist_ok=False)
-
     def initialize(
         self,
         model_configs: Union[dict, str, list, None] = None,
@@ -160,17 +161,47 @@ class ModelManager:
                 f"Cannot find [{config_name}] in loaded configurations.",
             )
 
-        model_type = config["model_type"]
-        if model_type not in self.model_wrapper_mapping:
-            raise ValueError(
-                f"Unsupported model_type `{model_type}`, currently supported "
-                f"model types: "
-                f"{', '.join(list(self.model_wrapper_mapping.keys()))}. ",
-            )
-
+        model_wrapper_class = self.get_model_wrapper_class(
+            config["model_type"],
+        )
         kwargs = {k: v for k, v in config.items() if k != "model_type"}
 
-        return self.model_wrapper_mapping[model_type](**kwargs)
+        return model_wrapper_class(**kwargs)
+
+    def get_model_wrapper_class(
+        self,
+        model_type: str,
+    ) -> Type[ModelWrapperBase]:
+        """Get the registered or build-in model wrapper class of the model
+        type. A build-in model wrapper is imported and registered when it's
+        requested for the first time.
+
+        Args:
+            model_type (`str`):
+                The model type of the model wrapper.
+
+        Returns:
+            `Type[ModelWrapperBase]`: The model wrapper class.
+        """
+        # imported here, as the models import the managers
+        from ..models import _BUILD_IN_MODEL_TYPES
+
+        if model_type not in self.model_wrapper_mapping:
+            if model_type not in _BUILD_IN_MODEL_TYPES:
+                supported_types = sorted(
+                    set(self.model_wrapper_mapping)
+                    | set(_BUILD_IN_MODEL_TYPES),
+                )
+                raise ValueError(
+                    f"Unsupported model_type `{model_type}`, currently "
+                    f"supported model types: {', '.join(supported_types)}. ",
+                )
+            models_module = importlib.import_module("agentscope.models")
+            self.model_wrapper_mapping[model_type] = getattr(
+                models_module,
+                _BUILD_IN_MODEL_TYPES[model_type],
+            )
+        return self.model_wrapper_mapping[model_type]
 
     def get_config_by_name(self, config_name: str) -> Union[dict, None]:
         """Load the model config by name, and return the config dict."""
@@ -203,6 +234,7 @@ class ModelManager:
                 Whether to overwrite the existing model wrapper with the same
                 name.
         """
+        from ..models import ModelWrapperBase, _BUILD_IN_MODEL_TYPES
 
         if not issubclass(model_wrapper_class, ModelWrapperBase):
             raise TypeError(
@@ -217,7 +249,10 @@ class ModelManager:
             )
 
         model_type = model_wrapper_class.model_type
-        if model_type in self.model_wrapper_mapping:
+        if (
+            model_type in self.model_wrapper_mapping
+            or model_type in _BUILD_IN_MODEL_TYPES
+        ):
             if exist_ok:
                 logger.warning(
                     f'Model wrapper "{model_type}" '
@@ -1,20 +1,35 @@
 # -*- coding: utf-8 -*-
 """The manager of monitor module."""
+import atexit
+import json
 import os
-from typing import Any, Optional, List, Union
+import threading
+from typing import Any, Dict, Optional, List, Tuple, Union
 from pathlib import Path
 
 from loguru import logger
-from sqlalchemy import Column, Integer, String, create_engine, text
+from sqlalchemy import (
+    Column,
+    Float,
+    Integer,
+    String,
+    Text,
+    create_engine,
+    text,
+)
 from sqlalchemy.ext.declarative import declarative_base, DeclarativeMeta
 from sqlalchemy.orm import sessionmaker
 
 from ._file import FileManager
-from ..utils.common import _is_windows
+from ._metrics import Histogram, MetricsStore, _current_model_call
+from ..utils.common import _is_windows, _get_timestamp
+from ..tracing import add_tokens
 from ..constants import (
     _DEFAULT_SQLITE_DB_NAME,
     _DEFAULT_TABLE_NAME_FOR_CHAT_AND_EMBEDDING,
     _DEFAULT_TABLE_NAME_FOR_IMAGE,
+    _DEFAULT_TABLE_NAME_FOR_METRICS,
+    _DEFAULT_METRICS_SNAPSHOT_INTERVAL,
 )
 
 _Base: DeclarativeMeta = declarative_base()
@@ -43,6 +58,31 @@ class _ImageModelTable(_Base):
     image_count = Column(Integer, default=0)
 
 
+class _MetricsSnapshotTable(_Base):
+    """The table for the snapshots of the latency histograms and the
+    counters of the model calls, which are cumulative since the start of
+    the run."""
+
+    __tablename__ = _DEFAULT_TABLE_NAME_FOR_METRICS
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    timestamp = Column(String(32))
+    # the agent servers of a run save their own snapshots
+    pid = Column(Integer)
+    name = Column(String(100))
+    metric = Column(String(32))
+    # the number of the values in a histogram, or the value of a counter
+    count = Column(Integer, default=0)
+    sum = Column(Float)
+    min = Column(Float)
+    max = Column(Float)
+    p50 = Column(Float)
+    p95 = Column(Float)
+    p99 = Column(Float)
+    # the serialized histogram, which is null for a counter
+    histogram = Column(Text)
+
+
 class MonitorManager:
     """The manager of monitor module."""
 
@@ -79,18 +119,35 @@ class MonitorManager:
         self.view_chat_and_embedding = "view_chat_and_embedding"
         self.view_image = "view_image"
 
-    def initialize(self, use_monitor: bool) -> None:
+        # The latency histograms and the counters of the model calls, which
+        # are recorded in memory even if the monitor is not used
+        self.metrics = MetricsStore()
+        self.snapshot_interval = _DEFAULT_METRICS_SNAPSHOT_INTERVAL
+        self._snapshot_version = 0
+        self._snapshot_stop = threading.Event()
+        self._snapshot_thread: Optional[threading.Thread] = None
+
+    def initialize(
+        self,
+        use_monitor: bool,
+        snapshot_interval: float = _DEFAULT_METRICS_SNAPSHOT_INTERVAL,
+    ) -> None:
         """Initialize the monitor manager.
 
         Args:
             use_monitor (`bool`):
                 Whether to use the monitor.
+            snapshot_interval (`float`, defaults to `60`):
+                The interval in seconds to save the snapshots of the
+                metrics of the model calls into the database.
         """
 
         self.use_monitor = use_monitor
+        self.snapshot_interval = snapshot_interval
 
         if use_monitor:
             self._create_monitor_db()
+            self._start_snapshot_thread()
 
     @classmethod
     def get_instance(cls) -> "MonitorManager":
@@ -185,6 +242,8 @@ class MonitorManager:
     def _close_monitor_db(self) -> None:
         """Close the monitor database to avoid file occupation error in
         windows."""
+        self._stop_snapshot_thread()
+
         if self.session is not None:
             self.session.close_all()
 
@@ -222,6 +281,12 @@ class MonitorManager:
         total_tokens: Optional[int] = None,
     ) -> None:
         """Update the tokens of a given model."""
+        # record them in the span and the metrics of the model call as well
+        add_tokens(prompt_tokens, completion_tokens)
+        model_call = _current_model_call.get()
+        if model_call is not None and isinstance(completion_tokens, int):
+            model_call.completion_tokens += completion_tokens
+
         if not self.use_monitor:
             return
 
@@ -318,6 +383,249 @@ class MonitorManager:
             for _ in usage[1:]
         ]
 
+    def record_model_call(
+        self,
+        name: str,
+        latency: float,
+        ttft: Optional[float] = None,
+        completion_tokens: Optional[int] = None,
+        error: bool = False,
+    ) -> None:
+        """Record a model call in the metrics, which is done by the model
+        wrappers automatically.
+
+        Args:
+            name (`str`):
+                The config name of the model.
+            latency (`float`):
+                The seconds from calling the model to receiving the whole
+                response.
+            ttft (`Optional[float]`, defaults to `None`):
+                The seconds to receive the first chunk of a streaming
+                response.
+            completion_tokens (`Optional[int]`, defaults to `None`):
+                The number of the generated tokens, used to compute the
+                tokens per second.
+            error (`bool`, defaults to `False`):
+                Whether the call failed.
+        """
+        metrics = self.metrics
+        metrics.increment(name, "requests")
+        if error:
+            metrics.increment(name, "errors")
+        metrics.observe(name, "latency", latency)
+        if ttft is not None:
+            metrics.observe(name, "ttft", ttft)
+        if completion_tokens and latency > 0:
+            metrics.observe(
+                name,
+                "tokens_per_second",
+                completion_tokens / latency,
+            )
+
+    def record_retry(self, name: str, retries: int = 1) -> None:
+        """Record the retried requests of a model."""
+        self.metrics.increment(name, "retries", retries)
+
+    def record_queue_wait(self, name: str, seconds: float) -> None:
+        """Record the seconds that a request waits in a queue before being
+        processed, e.g. in the mailbox of an agent in the agent server."""
+        self.metrics.observe(name, "queue_wait", seconds)
+
+    def query_metrics(
+        self,
+        name: Optional[str] = None,
+        metric: Optional[str] = None,
+    ) -> List[dict]:
+        """Query the current metrics of the model calls.
+
+        Args:
+            name (`Optional[str]`, defaults to `None`):
+                Only query the metrics of the given model config name.
+            metric (`Optional[str]`, defaults to `None`):
+                Only query the given metric, e.g. "latency", "ttft",
+                "tokens_per_second", "queue_wait", "requests", "errors" or
+                "retries".
+
+        Returns:
+            `List[dict]`: The metrics of each name, where the counters are
+            integers and the histograms are summarized by their count, sum,
+            mean, min, max, p50, p95 and p99.
+        """
+        return self.metrics.query(name, metric)
+
+    def query_metric_snapshots(
+        self,
+        name: Optional[str] = None,
+        metric: Optional[str] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+    ) -> List[dict]:
+        """Query the snapshots of the metrics saved in the database.
+
+        Args:
+            name (`Optional[str]`, defaults to `None`):
+                Only query the snapshots of the given model config name.
+            metric (`Optional[str]`, defaults to `None`):
+                Only query the snapshots of the given metric.
+            start (`Optional[str]`, defaults to `None`):
+                The earliest timestamp of the snapshots, in the format of
+                "%Y-%m-%d %H:%M:%S".
+            end (`Optional[str]`, defaults to `None`):
+                The latest timestamp of the snapshots.
+
+        Returns:
+            `List[dict]`: The snapshots ordered by their timestamps.
+        """
+        if not self.use_monitor or self.session is None:
+            return []
+
+        columns = [
+            _.name
+            for _ in _MetricsSnapshotTable.__table__.columns
+            if _.name not in ("id", "histogram")
+        ]
+        with self.session() as sess:
+            query = sess.query(_MetricsSnapshotTable)
+            if name is not None:
+                query = query.filter(_MetricsSnapshotTable.name == name)
+            if metric is not None:
+                query = query.filter(_MetricsSnapshotTable.metric == metric)
+            if start is not None:
+                query = query.filter(_MetricsSnapshotTable.timestamp >= start)
+            if end is not None:
+                query = query.filter(_MetricsSnapshotTable.timestamp <= end)
+            return [
+                {k: getattr(row, k) for k in columns}
+                for row in query.order_by(_MetricsSnapshotTable.id)
+            ]
+
+    def snapshot_metrics(self) -> None:
+        """Save a snapshot of the metrics into the database, which is done
+        periodically when the monitor is used, and skipped if nothing
+        changed since the last snapshot."""
+        if not self.use_monitor or self.session is None:
+            return
+
+        version = self.metrics.version
+        if version == self._snapshot_version:
+            return
+        histograms, counters = self.metrics.snapshot()
+
+        timestamp = _get_timestamp()
+        pid = os.getpid()
+        rows = [
+            _MetricsSnapshotTable(
+                timestamp=timestamp,
+                pid=pid,
+                name=name,
+                metric=metric,
+                count=value,
+            )
+            for (name, metric), value in counters.items()
+        ]
+        for (name, metric), histogram in histograms.items():
+            summary = Histogram.from_dict(histogram).summary()
+            rows.append(
+                _MetricsSnapshotTable(
+                    timestamp=timestamp,
+                    pid=pid,
+                    name=name,
+                    metric=metric,
+                    count=summary["count"],
+                    sum=summary["sum"],
+                    min=summary["min"],
+                    max=summary["max"],
+                    p50=summary["p50"],
+                    p95=summary["p95"],
+                    p99=summary["p99"],
+                    histogram=json.dumps(histogram),
+                ),
+            )
+
+        with self.session() as sess:
+            sess.add_all(rows)
+            sess.commit()
+        self._snapshot_version = version
+
+    def _start_snapshot_thread(self) -> None:
+        """Start the daemon thread saving the snapshots periodically."""
+        self._stop_snapshot_thread()
+        self._snapshot_stop = threading.Event()
+        self._snapshot_thread = threading.Thread(
+            target=self._snapshot_loop,
+            args=(self._snapshot_stop,),
+            name="agentscope-metrics-snapshot",
+            daemon=True,
+        )
+        self._snapshot_thread.start()
+
+    def _snapshot_loop(self, stop: threading.Event) -> None:
+        while not stop.wait(self.snapshot_interval):
+            try:
+                self.snapshot_metrics()
+            except Exception as e:
+                logger.warning(f"Failed to save the metrics snapshot: {e}")
+
+    def _stop_snapshot_thread(self) -> None:
+        """Stop the snapshot thread and save the last snapshot."""
+        if self._snapshot_thread is None:
+            return
+        self._snapshot_stop.set()
+        if self._snapshot_thread is not threading.current_thread():
+            self._snapshot_thread.join()
+        self._snapshot_thread = None
+        try:
+            self.snapshot_metrics()
+        except Exception as e:
+            logger.warning(f"Failed to save the metrics snapshot: {e}")
+
+    def print_model_metrics(self) -> List[dict]:
+        """Print the latency, the throughput and the errors of the model
+        calls by their config names."""
+        metrics = self.query_metrics()
+
+        def _ms(row: dict, metric: str, quantile: str) -> str:
+            value = row.get(metric, {}).get(quantile)
+            return "-" if value is None else f"{value * 1000:.0f}"
+
+        table = [
+            [
+                "CONFIG NAME",
+                "REQUESTS",
+                "ERRORS",
+                "RETRIES",
+                "LATENCY P50/P95/P99 (MS)",
+                "TTFT P50/P95/P99 (MS)",
+                "TOKENS/S P50",
+                "QUEUE WAIT P95 (MS)",
+            ],
+        ]
+        for row in metrics:
+            tokens_per_second = row.get("tokens_per_second", {}).get("p50")
+            table.append(
+                [
+                    row["name"],
+                    row.get("requests", 0),
+                    row.get("errors", 0),
+                    row.get("retries", 0),
+                    "/".join(
+                        _ms(row, "latency", _) for _ in ["p50", "p95", "p99"]
+                    ),
+                    "/".join(
+                        _ms(row, "ttft", _) for _ in ["p50", "p95", "p99"]
+                    ),
+                    "-"
+                    if tokens_per_second is None
+                    else f"{tokens_per_second:.1f}",
+                    _ms(row, "queue_wait", "p95"),
+                ],
+            )
+
+        self._print_table("Model Metrics:", table)
+
+        return metrics
+
     def rm_database(self) -> None:
         """Remove the database."""
         if self.path_db is not None and os.path.exists(self.path_db):
@@ -340,6 +648,8 @@ class MonitorManager:
         """Flush the monitor manager."""
         # Close the database before flushing
         self._close_monitor_db()
+        self.metrics.clear()
+        self._snapshot_version = self.metrics.version
 
         self.use_monitor = False
         self.session = None
@@ -348,3 +658,70 @@ class MonitorManager:
         # The name of the views
         self.view_chat_and_embedding = "view_chat_and_embedding"
         self.view_image = "view_image"
+
+
+def read_metric_snapshots(
+    run_dir: str,
+) -> Dict[int, Tuple[Dict[Tuple[str, str], dict], dict]]:
+    """Read the latest snapshots of the metrics saved in the database of a
+    run, e.g. to aggregate the metrics of the runs in AgentScope Studio.
+
+    Args:
+        run_dir (`str`):
+            The directory of the run.
+
+    Returns:
+        `Dict[int, Tuple[Dict[Tuple[str, str], dict], dict]]`: The
+        serialized histograms and the counters by the name and the metric,
+        of each process saving the snapshots, which can be formatted by
+        `format_prometheus`.
+    """
+    path = os.path.abspath(os.path.join(run_dir, _DEFAULT_SQLITE_DB_NAME))
+    snapshots: Dict[int, Tuple[Dict[Tuple[str, str], dict], dict]] = {}
+    if not os.path.exists(path):
+        return snapshots
+
+    if _is_windows():
+        engine = create_engine(f"sqlite:///{path}")
+    else:
+        engine = create_engine(f"sqlite:////{path}")
+    table = _DEFAULT_TABLE_NAME_FOR_METRICS
+    try:
+        with engine.connect() as connection:
+            rows = connection.execute(
+                text(
+                    f"""
+                    SELECT pid, name, metric, count, histogram FROM {table}
+                    WHERE id IN (
+                        SELECT MAX(id) FROM {table}
+                        GROUP BY pid, name, metric
+                    )
+                    """,
+                ),
+            ).fetchall()
+    except Exception as e:
+        # the runs without the monitor or saved by the older versions
+        logger.debug(f"Failed to read the metrics snapshots of {path}: {e}")
+        rows = []
+    finally:
+        engine.dispose()
+
+    for pid, name, metric, count, histogram in rows:
+        histograms, counters = snapshots.setdefault(pid, ({}, {}))
+        if histogram is None:
+            counters[(name, metric)] = count
+        else:
+            histograms[(name, metric)] = json.loads(histogram)
+    return snapshots
+
+
+def _snapshot_metrics_at_exit() -> None:
+    """Save the last snapshot of the metrics before the interpreter exits,
+    since the snapshot thread is a daemon thread."""
+    # pylint: disable=protected-access
+    monitor = MonitorManager._instance
+    if monitor is not None:
+        monitor._stop_snapshot_thread()
+
+
+atexit.register(_snapshot_metrics_at_exit)
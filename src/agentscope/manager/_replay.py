@@ -0,0 +1,350 @@
+# -*- coding: utf-8 -*-
+"""Record the model calls of a run into an archive, and replay them in a
+later run without calling the model APIs."""
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Generator, List, Literal, Optional
+
+from loguru import logger
+
+from ._invocation import InvocationLog, _read_segment, read_invocation_index
+from ..constants import _DEFAULT_SUBDIR_REPLAY
+from ..exception import ReplayMissError
+from ..utils.common import _get_timestamp, _is_json_serializable
+
+
+def _canonical(obj: Any) -> Any:
+    """Convert the objects that are not json serializable in the requests,
+    e.g. the messages and the parse functions, into stable values."""
+    if hasattr(obj, "to_dict") and hasattr(obj, "content"):
+        # the messages, whose id and timestamp differ between runs
+        return {
+            "name": obj.name,
+            "role": obj.role,
+            "content": obj.content,
+            "url": obj.url,
+        }
+    if isinstance(obj, (set, frozenset)):
+        return sorted(obj, key=repr)
+    if isinstance(obj, bytes):
+        return hashlib.sha256(obj).hexdigest()
+    if callable(obj):
+        return getattr(obj, "__qualname__", type(obj).__qualname__)
+    text = str(obj)
+    if " at 0x" in text:
+        # the default repr of the objects differs between runs
+        return type(obj).__qualname__
+    return text
+
+
+def _request_payload(model: Any, args: tuple, kwargs: dict) -> str:
+    """The canonical json of a request, whose hash is the key to look it up
+    in the archive."""
+    return json.dumps(
+        [
+            type(model).__name__,
+            getattr(model, "model_name", None),
+            args,
+            kwargs,
+        ],
+        sort_keys=True,
+        ensure_ascii=False,
+        default=_canonical,
+    )
+
+
+def _record_stream(
+    stream: Generator,
+    record: dict,
+    start: float,
+    archive: InvocationLog,
+) -> Generator:
+    """Wrap the stream of a model response to record its chunks and their
+    time offsets, which is archived when the stream ends. As the chunks
+    are the accumulated texts, each one is saved as the length of the
+    previous one it extends and the new suffix."""
+    chunks: List[list] = []
+    last = ""
+    try:
+        for chunk in stream:
+            offset = time.perf_counter() - start
+            if isinstance(chunk, str) and chunk.startswith(last):
+                chunks.append([offset, len(last), chunk[len(last) :]])
+            else:
+                chunks.append([offset, 0, chunk])
+            last = chunk
+            yield chunk
+    finally:
+        record["latency"] = time.perf_counter() - start
+        record["response"] = {"text": last}
+        record["stream"] = chunks
+        archive.append(record)
+
+
+def _replay_stream(chunks: List[list], speed: float) -> Generator:
+    """Replay the recorded chunks of a stream."""
+    start = time.perf_counter()
+    text = ""
+    for offset, keep, suffix in chunks:
+        if speed > 0:
+            delay = start + offset / speed - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        text = text[:keep] + suffix if isinstance(suffix, str) else suffix
+        yield text
+
+
+class ModelCallRecorder:
+    """Record the requests and the responses of the model calls, including
+    the chunks of the streaming responses and their timing, into the
+    `replay` directory of the run, and serve the identical requests of a
+    later run from the archive of the recorded run.
+
+    The archive is an invocation log indexed by the hashes of the requests,
+    so that the replay loads the index only and reads the records on
+    demand. An identical request made several times, e.g. a retry, is
+    served by the recorded responses in order, and the last one is served
+    once they are used up.
+    """
+
+    def __init__(self) -> None:
+        """Initialize a disabled recorder."""
+        self.record = False
+        self.run_dir: Optional[str] = None
+        self.replay: Optional[str] = None
+        self.replay_speed = 0.0
+        self.compression: Optional[Literal["gzip", "zstd"]] = None
+
+        self._archive: Optional[InvocationLog] = None
+        self._replay_dir: Optional[str] = None
+        self._index: Dict[str, List[dict]] = {}
+        self._segments: Dict[str, List[dict]] = {}
+        self._served: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def active(self) -> bool:
+        """Whether the model calls are recorded or replayed."""
+        return self._archive is not None or self._replay_dir is not None
+
+    def initialize(
+        self,
+        record: bool,
+        run_dir: Optional[str],
+        replay: Optional[str] = None,
+        replay_speed: float = 0.0,
+        compression: Optional[Literal["gzip", "zstd"]] = None,
+    ) -> None:
+        """Initialize the recorder.
+
+        Args:
+            record (`bool`):
+                Whether to record the model calls.
+            run_dir (`Optional[str]`):
+                The directory of the run, where the model calls are recorded
+                into its `replay` sub-directory. If `None`, the recording is
+                skipped.
+            replay (`Optional[str]`, defaults to `None`):
+                The directory of a recorded run (or its `replay`
+                sub-directory) to replay the model calls from.
+            replay_speed (`float`, defaults to `0.0`):
+                The speed to replay the recorded latencies, e.g. `1.0` for
+                the original timing and `2.0` for twice as fast. The
+                responses are served without delay if `0`.
+            compression (`Optional[Literal["gzip", "zstd"]]`, defaults to
+            `None`):
+                The compression of the full segments of the archive.
+        """
+        self.flush()
+
+        if replay is not None:
+            self._load_index(replay)
+        if record and run_dir is None:
+            logger.warning(
+                "The recording of the model calls is skipped as saving "
+                "files is disabled.",
+            )
+            record = False
+
+        self.record = record
+        self.run_dir = run_dir if record else None
+        self.replay = replay
+        self.replay_speed = replay_speed
+        self.compression = compression
+        if record and run_dir is not None:
+            self._archive = InvocationLog(
+                os.path.join(run_dir, _DEFAULT_SUBDIR_REPLAY),
+                compression=compression,
+                run_id=os.path.basename(run_dir),
+                index_fields=("key", "time"),
+            )
+
+    def _load_index(self, replay: str) -> None:
+        """Load the index of the archive to replay."""
+        directory = os.path.join(replay, _DEFAULT_SUBDIR_REPLAY)
+        if not os.path.isdir(directory):
+            directory = replay
+        entries = read_invocation_index(directory)
+        if len(entries) == 0:
+            raise FileNotFoundError(
+                f"No recorded model calls are found in {replay}. Record "
+                f"them by `agentscope.init(record_model_calls=True)`.",
+            )
+
+        self._replay_dir = directory
+        # the records of the same request in the order they were made
+        for entry in sorted(entries, key=lambda _: _["time"]):
+            self._index.setdefault(entry["key"], []).append(entry)
+            self._segments.setdefault(entry["segment"], []).append(entry)
+        logger.info(
+            f"Replay {len(entries)} model calls from {directory}",
+        )
+
+    def _read_record(self, entry: dict) -> dict:
+        """Read the record of an index entry, together with the other
+        records in its segment, which is compressed if it's full."""
+        if "record" not in entry:
+            if self._replay_dir is None:
+                raise RuntimeError("No recorded run is being replayed.")
+            _read_segment(
+                self._replay_dir,
+                entry["segment"],
+                self._segments.pop(entry["segment"]),
+            )
+        return entry["record"]
+
+    def call(
+        self,
+        model: Any,
+        model_call: Callable,
+        args: tuple,
+        kwargs: dict,
+    ) -> Any:
+        """Call a model wrapper, where the request is replayed from the
+        archive or recorded into the archive if enabled."""
+        payload = _request_payload(model, args, kwargs)
+        key = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+        start = time.perf_counter()
+        if self._replay_dir is not None:
+            response = self._replay(model, key)
+        else:
+            response = model_call(model, *args, **kwargs)
+
+        archive = self._archive
+        if archive is None:
+            return response
+
+        # imported here to avoid the circular import
+        from ..models.response import ModelResponse
+
+        if not isinstance(response, ModelResponse):
+            return response
+        record = {
+            "key": key,
+            "time": time.time(),
+            "timestamp": _get_timestamp("%Y%m%d-%H%M%S"),
+            "model_class": type(model).__name__,
+            "config_name": getattr(model, "config_name", None),
+            "request": json.loads(payload),
+        }
+        # pylint: disable=protected-access
+        if response._stream is not None:
+            response._stream = _record_stream(
+                response._stream,
+                record,
+                start,
+                archive,
+            )
+            return response
+
+        record["latency"] = time.perf_counter() - start
+        record["response"] = {
+            "text": response.text,
+            "embedding": response.embedding,
+            "image_urls": response.image_urls,
+            "parsed": response.parsed
+            if _is_json_serializable(response.parsed)
+            else None,
+            "raw": response.raw
+            if _is_json_serializable(response.raw)
+            else None,
+        }
+        record["stream"] = None
+        archive.append(record)
+        return response
+
+    def _replay(self, model: Any, key: str) -> Any:
+        """Serve a request from the archive."""
+        # imported here to avoid the circular import
+        from ..models.response import ModelResponse
+
+        with self._lock:
+            entries = self._index.get(key)
+            if not entries:
+                raise ReplayMissError(
+                    type(model).__name__,
+                    getattr(model, "config_name", None),
+                    key,
+                )
+            served = self._served.get(key, 0)
+            self._served[key] = served + 1
+            record = self._read_record(entries[min(served, len(entries) - 1)])
+
+        if record["stream"] is not None:
+            return ModelResponse(
+                stream=_replay_stream(record["stream"], self.replay_speed),
+            )
+
+        if self.replay_speed > 0:
+            time.sleep(record["latency"] / self.replay_speed)
+        return ModelResponse(**record["response"])
+
+    def force_flush(self) -> None:
+        """Wait until the recorded model calls are written."""
+        if self._archive is not None:
+            self._archive.flush()
+
+    def state_dict(self) -> dict:
+        """Serialize the recorder."""
+        return {
+            "record": self.record,
+            "run_dir": self.run_dir,
+            "replay": self.replay,
+            "replay_speed": self.replay_speed,
+            "compression": self.compression,
+        }
+
+    def load_dict(self, data: dict) -> None:
+        """Load the recorder from a dictionary."""
+        for key in ["record", "run_dir", "replay", "replay_speed"]:
+            assert key in data, f"Key `{key}` not found in data."
+
+        self.initialize(
+            data["record"],
+            data["run_dir"],
+            data["replay"],
+            data["replay_speed"],
+            data.get("compression"),
+        )
+
+    def flush(self) -> None:
+        """Write the recorded model calls and disable the recorder."""
+        if self._archive is not None:
+            self._archive.close()
+            self._archive = None
+
+        self.record = False
+        self.run_dir = None
+        self.replay = None
+        self.replay_speed = 0.0
+        self.compression = None
+        self._replay_dir = None
+        self._index = {}
+        self._segments = {}
+        self._served = {}
+
+
+_recorder = ModelCallRecorder()
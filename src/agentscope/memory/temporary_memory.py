@@ -18,7 +18,6 @@ from ..serialize import serialize, deserialize
 from ..service.retrieval.retrieval_from_list import retrieve_from_list
 from ..service.retrieval.similarity import Embedding
 from ..message import Msg
-from ..rpc import AsyncResult
 
 
 class TemporaryMemory(MemoryBase):
@@ -73,6 +72,9 @@ class TemporaryMemory(MemoryBase):
         else:
             record_memories = memories
 
+        # imported here to avoid importing grpc for local agents
+        from ..rpc import AsyncResult
+
         # FIXME: a single message may be inserted multiple times
         # Assert the message types
         memories_idx = set(_.id for _ in self._content if hasattr(_, "id"))
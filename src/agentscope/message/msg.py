@@ -1,14 +1,18 @@
 # -*- coding: utf-8 -*-
 # mypy: disable-error-code="misc"
 """The base class for message unit"""
+import datetime
+import os
+import random
+import time
 from typing import (
     Any,
     Literal,
     Union,
     List,
     Optional,
+    cast,
 )
-from uuid import uuid4
 
 from loguru import logger
 
@@ -19,6 +23,61 @@ from ..utils.common import (
 )
 
 
+_ROLES = ("system", "user", "assistant")
+
+# the last formatted timestamp and its second, shared by the messages created
+# in the same second
+_last_timestamp = (-1, "")
+
+
+# a private generator of the message ids, which doesn't affect the seeded
+# global `random`, and is seeded by `os.urandom` so that the ids of
+# different runs and processes don't repeat
+_id_random = random.Random(os.urandom(32))
+
+
+def _reseed_id_random() -> None:
+    """Reseed the id generator in the child processes after `fork`."""
+    _id_random.seed(os.urandom(32))
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reseed_id_random)
+
+
+def _generate_id() -> str:
+    """Generate a random uuid4 hex string by a private `random.Random`, which
+    is several times faster than `uuid4` reading `os.urandom` each time."""
+    bits = _id_random.getrandbits(128)
+    # the version and the variant bits of uuid4
+    bits &= ~(0xF000 << 64) & ~(0xC000 << 48)
+    bits |= (0x4000 << 64) | (0x8000 << 48)
+    return f"{bits:032x}"
+
+
+def _format_timestamp(created_at: float) -> str:
+    """Format the creation time of a message as `_get_timestamp`."""
+    global _last_timestamp
+    second = int(created_at)
+    last = _last_timestamp
+    if last[0] != second:
+        last = (
+            second,
+            _get_timestamp(time=datetime.datetime.fromtimestamp(second)),
+        )
+        _last_timestamp = last
+    return last[1]
+
+
+def _check_content(content: Any) -> None:
+    """Warn if the content of a message is not serializable."""
+    if not is_serializable(content):
+        logger.warning(
+            f"The content of {type(content)} is not serializable, which "
+            f"may cause problems.",
+        )
+
+
 class Msg:
     """The message class for AgentScope, which is responsible for storing
     the information of a message, including
@@ -30,8 +89,29 @@ class Msg:
     - url:          the url(s) refers to multimodal content
     - metadata:     some additional information
     - timestamp:    when the message is created
+
+    As a large number of messages are created in the simulations, the
+    message only keeps its fields in slots, and its id and formatted
+    timestamp are generated when they are first used. The content is only
+    checked to be serializable if `Msg.validate` is set to `True`.
     """
 
+    __slots__ = (
+        "_id",
+        "_name",
+        "_content",
+        "_role",
+        "_url",
+        "_metadata",
+        "_timestamp",
+        "_created_at",
+        "embedding",
+    )
+
+    validate: bool = False
+    """Whether to check the content of the messages is serializable, which
+    is skipped by default as it dumps the content into json."""
+
     __serialized_attrs: set = {
         "id",
         "name",
@@ -84,13 +164,24 @@ class Msg:
                 Whether to print the message when initializing the message obj.
         """
 
-        self.id = uuid4().hex
-        self.name = name
-        self.content = content
-        self.role = role
-        self.url = url
-        self.metadata = metadata
-        self.timestamp = _get_timestamp()
+        if role not in _ROLES:
+            raise ValueError(
+                f"Invalid role {role}. The role must be one of "
+                f"['system', 'user', 'assistant']",
+            )
+        if self.validate:
+            _check_content(content)
+
+        # the id and the timestamp are generated on demand
+        self._id: Optional[str] = None
+        self._timestamp: Optional[str] = None
+        self._created_at = time.time()
+        self._name = name
+        self._content = content
+        self._role = cast(Literal["system", "user", "assistant"], role)
+        self._url = url
+        self._metadata = metadata
+        self.embedding = None
 
         if kwargs:
             logger.warning(
@@ -115,6 +206,8 @@ class Msg:
     @property
     def id(self) -> str:
         """The identity of the message."""
+        if self._id is None:
+            self._id = _generate_id()
         return self._id
 
     @property
@@ -153,6 +246,8 @@ class Msg:
     @property
     def timestamp(self) -> str:
         """The timestamp when the message is created."""
+        if self._timestamp is None:
+            self._timestamp = _format_timestamp(self._created_at)
         return self._timestamp
 
     @id.setter  # type: ignore[no-redef]
@@ -168,18 +263,15 @@ class Msg:
     @content.setter  # type: ignore[no-redef]
     def content(self, value: Any) -> None:
         """Set the content of the message."""
-        if not is_serializable(value):
-            logger.warning(
-                f"The content of {type(value)} is not serializable, which "
-                f"may cause problems.",
-            )
+        if self.validate:
+            _check_content(value)
         self._content = value
 
     @role.setter  # type: ignore[no-redef]
     def role(self, value: Literal["system", "user", "assistant"]) -> None:
         """Set the role of the message sender. The role must be one of
         'system', 'user', 'assistant'."""
-        if value not in ["system", "user", "assistant"]:
+        if value not in _ROLES:
             raise ValueError(
                 f"Invalid role {value}. The role must be one of "
                 f"['system', 'user', 'assistant']",
@@ -252,11 +344,28 @@ class Msg:
             "__name__": self.__class__.__name__,
         }
 
+        # read the properties, which generate the id and the timestamp
         for attr_name in self.__serialized_attrs:
-            serialized_dict[attr_name] = getattr(self, f"_{attr_name}")
+            serialized_dict[attr_name] = getattr(self, attr_name)
 
         return serialized_dict
 
+    def __getstate__(self) -> dict:
+        """The state to pickle and copy the message."""
+        state = {_: getattr(self, _) for _ in self.__slots__}
+        # generate the id and the timestamp, so that the copies share them
+        state["_id"] = self.id
+        state["_timestamp"] = self.timestamp
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """Restore the message from the pickled state, including the state
+        of the messages pickled before they have slots."""
+        self._created_at = 0.0
+        self.embedding = None
+        for key, value in state.items():
+            setattr(self, key, value)
+
     @classmethod
     def from_dict(cls, serialized_dict: dict) -> "Msg":
         """Deserialize the dictionary to a Msg object.
@@ -1,65 +1,100 @@
 # -*- coding: utf-8 -*-
 """ Import modules in models package."""
 
+from typing import TYPE_CHECKING
+
 from .model import ModelWrapperBase
 from .response import ModelResponse
-from .post_model import (
-    PostAPIModelWrapperBase,
-    PostAPIChatWrapper,
-)
-from .openai_model import (
-    OpenAIWrapperBase,
-    OpenAIChatWrapper,
-    OpenAIDALLEWrapper,
-    OpenAIEmbeddingWrapper,
-)
-from .dashscope_model import (
-    DashScopeChatWrapper,
-    DashScopeImageSynthesisWrapper,
-    DashScopeTextEmbeddingWrapper,
-    DashScopeMultiModalWrapper,
-)
-from .ollama_model import (
-    OllamaChatWrapper,
-    OllamaEmbeddingWrapper,
-    OllamaGenerationWrapper,
-)
-from .gemini_model import (
-    GeminiChatWrapper,
-    GeminiEmbeddingWrapper,
-)
-from .zhipu_model import (
-    ZhipuAIChatWrapper,
-    ZhipuAIEmbeddingWrapper,
-)
-from .litellm_model import (
-    LiteLLMChatWrapper,
-)
-from .yi_model import (
-    YiChatWrapper,
+from .._lazy import lazy_loader
+
+if TYPE_CHECKING:
+    from .post_model import (
+        PostAPIModelWrapperBase,
+        PostAPIChatWrapper,
+    )
+    from .openai_model import (
+        OpenAIWrapperBase,
+        OpenAIChatWrapper,
+        OpenAIDALLEWrapper,
+        OpenAIEmbeddingWrapper,
+    )
+    from .dashscope_model import (
+        DashScopeChatWrapper,
+        DashScopeImageSynthesisWrapper,
+        DashScopeTextEmbeddingWrapper,
+        DashScopeMultiModalWrapper,
+    )
+    from .ollama_model import (
+        OllamaChatWrapper,
+        OllamaEmbeddingWrapper,
+        OllamaGenerationWrapper,
+    )
+    from .gemini_model import (
+        GeminiChatWrapper,
+        GeminiEmbeddingWrapper,
+    )
+    from .zhipu_model import (
+        ZhipuAIChatWrapper,
+        ZhipuAIEmbeddingWrapper,
+    )
+    from .litellm_model import (
+        LiteLLMChatWrapper,
+    )
+    from .yi_model import (
+        YiChatWrapper,
+    )
+    from .anthropic_model import AnthropicChatWrapper
+
+# The model wrappers are imported on first access, so that the SDK of a
+# provider is only imported when its model wrapper is used.
+__getattr__, __dir__ = lazy_loader(
+    __name__,
+    attributes={
+        "PostAPIModelWrapperBase": ".post_model",
+        "PostAPIChatWrapper": ".post_model",
+        "OpenAIWrapperBase": ".openai_model",
+        "OpenAIChatWrapper": ".openai_model",
+        "OpenAIDALLEWrapper": ".openai_model",
+        "OpenAIEmbeddingWrapper": ".openai_model",
+        "DashScopeChatWrapper": ".dashscope_model",
+        "DashScopeImageSynthesisWrapper": ".dashscope_model",
+        "DashScopeTextEmbeddingWrapper": ".dashscope_model",
+        "DashScopeMultiModalWrapper": ".dashscope_model",
+        "OllamaChatWrapper": ".ollama_model",
+        "OllamaEmbeddingWrapper": ".ollama_model",
+        "OllamaGenerationWrapper": ".ollama_model",
+        "GeminiChatWrapper": ".gemini_model",
+        "GeminiEmbeddingWrapper": ".gemini_model",
+        "ZhipuAIChatWrapper": ".zhipu_model",
+        "ZhipuAIEmbeddingWrapper": ".zhipu_model",
+        "LiteLLMChatWrapper": ".litellm_model",
+        "YiChatWrapper": ".yi_model",
+        "AnthropicChatWrapper": ".anthropic_model",
+    },
 )
-from .anthropic_model import AnthropicChatWrapper
 
-_BUILD_IN_MODEL_WRAPPERS = [
-    "PostAPIChatWrapper",
-    "OpenAIChatWrapper",
-    "OpenAIDALLEWrapper",
-    "OpenAIEmbeddingWrapper",
-    "DashScopeChatWrapper",
-    "DashScopeImageSynthesisWrapper",
-    "DashScopeTextEmbeddingWrapper",
-    "DashScopeMultiModalWrapper",
-    "OllamaChatWrapper",
-    "OllamaEmbeddingWrapper",
-    "OllamaGenerationWrapper",
-    "GeminiChatWrapper",
-    "GeminiEmbeddingWrapper",
-    "ZhipuAIChatWrapper",
-    "ZhipuAIEmbeddingWrapper",
-    "LiteLLMChatWrapper",
-    "YiChatWrapper",
-    "AnthropicChatWrapper",
-]
+# The model types of the build-in model wrappers, so that a model wrapper
+# is registered without importing it
+_BUILD_IN_MODEL_TYPES = {
+    "post_api_chat": "PostAPIChatWrapper",
+    "openai_chat": "OpenAIChatWrapper",
+    "openai_dall_e": "OpenAIDALLEWrapper",
+    "openai_embedding": "OpenAIEmbeddingWrapper",
+    "dashscope_chat": "DashScopeChatWrapper",
+    "dashscope_image_synthesis": "DashScopeImageSynthesisWrapper",
+    "dashscope_text_embedding": "DashScopeTextEmbeddingWrapper",
+    "dashscope_multimodal": "DashScopeMultiModalWrapper",
+    "ollama_chat": "OllamaChatWrapper",
+    "ollama_embedding": "OllamaEmbeddingWrapper",
+    "ollama_generate": "OllamaGenerationWrapper",
+    "gemini_chat": "GeminiChatWrapper",
+    "gemini_embedding": "GeminiEmbeddingWrapper",
+    "zhipuai_chat": "ZhipuAIChatWrapper",
+    "zhipuai_embedding": "ZhipuAIEmbeddingWrapper",
+    "litellm_chat": "LiteLLMChatWrapper",
+    "yi_chat": "YiChatWrapper",
+    "anthropic_chat": "AnthropicChatWrapper",
+}
 
 __all__ = [
     "ModelWrapperBase",
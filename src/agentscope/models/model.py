@@ -5,7 +5,15 @@ from __future__ import annotations
 import inspect
 import time
 from functools import wraps
-from typing import Sequence, Any, Callable, Union, List, Optional
+from typing import (
+    Sequence,
+    Any,
+    Callable,
+    Generator,
+    Union,
+    List,
+    Optional,
+)
 
 from loguru import logger
 
@@ -18,6 +26,10 @@ from ..message import Msg
 from ..utils.common import _get_timestamp, _convert_to_str
 from ..constants import _DEFAULT_MAX_RETRIES
 from ..constants import _DEFAULT_RETRY_INTERVAL
+from ..manager._metrics import _ModelCall, _current_model_call
+from ..manager._replay import _recorder
+from ..tracing import start_span
+from ..tracing._span import Span, _NoopSpan, _current_span
 
 
 def _response_parse_decorator(
@@ -76,6 +88,10 @@ def _response_parse_decorator(
                         f"{response}.\n"
                         f"{e.__class__.__name__}: {e}",
                     )
+                    MonitorManager.get_instance().record_retry(
+                        getattr(self, "config_name", None)
+                        or type(self).__name__,
+                    )
                     time.sleep(_DEFAULT_RETRY_INTERVAL * itr)
                 else:
                     if fault_handler is not None and callable(fault_handler):
@@ -87,6 +103,130 @@ def _response_parse_decorator(
     return checking_wrapper
 
 
+def _measure_stream(
+    stream: Generator,
+    model_call: _ModelCall,
+    name: str,
+    start: float,
+    span: Union[Span, _NoopSpan],
+) -> Generator:
+    """Wrap the stream of a model response to record the time to first token
+    and the latency when it's exhausted, where the tokens are reported to
+    the monitor within the stream. The span of the model call is the current
+    span while reading the stream, and ends with the stream."""
+    monitor = MonitorManager.get_instance()
+    ttft = None
+    error = False
+    exc_info: tuple = (None, None, None)
+    try:
+        while True:
+            token = _current_model_call.set(model_call)
+            span_token = (
+                _current_span.set(span) if isinstance(span, Span) else None
+            )
+            try:
+                chunk = next(stream)
+            except StopIteration:
+                return
+            finally:
+                if span_token is not None:
+                    _current_span.reset(span_token)
+                _current_model_call.reset(token)
+            if ttft is None:
+                ttft = time.perf_counter() - start
+            yield chunk
+    except GeneratorExit:
+        stream.close()
+        raise
+    except Exception as e:
+        error = True
+        exc_info = (type(e), e, e.__traceback__)
+        raise
+    finally:
+        monitor.record_model_call(
+            name,
+            time.perf_counter() - start,
+            ttft=ttft,
+            completion_tokens=model_call.completion_tokens,
+            error=error,
+        )
+        span.__exit__(*exc_info)
+
+
+def _instrument_model_call(model_call: Callable) -> Callable:
+    """A decorator recording the `__call__` of a model wrapper as a span,
+    and its latency, time to first token and tokens per second in the
+    metrics of the monitor, where the token counts are reported to the
+    monitor by the wrapper. The calls are also recorded into or replayed
+    from an archive if enabled in `agentscope.init`."""
+
+    @wraps(model_call)
+    def instrumented_wrapper(
+        self: ModelWrapperBase,
+        *args: Any,
+        **kwargs: Any,
+    ) -> ModelResponse:
+        # the `__call__` of a subclass may call that of its parent class
+        current = _current_model_call.get()
+        if current is not None and current.wrapper is self:
+            return model_call(self, *args, **kwargs)
+
+        # the wrappers not calling `ModelWrapperBase.__init__` lack them
+        config_name = getattr(self, "config_name", None)
+        model_name = getattr(self, "model_name", None)
+        name = config_name or type(self).__name__
+
+        monitor = MonitorManager.get_instance()
+        call = _ModelCall(self)
+        token = _current_model_call.set(call)
+        start = time.perf_counter()
+        # the span is ended manually, as it lasts until the end of the
+        # stream if the response is streamed
+        span = start_span(
+            f"{type(self).__name__}.__call__",
+            "model",
+            config_name=config_name,
+            model_name=model_name,
+        )
+        span.__enter__()  # pylint: disable=unnecessary-dunder-call
+        try:
+            if _recorder.active:
+                response = _recorder.call(self, model_call, args, kwargs)
+            else:
+                response = model_call(self, *args, **kwargs)
+        except Exception as e:
+            span.__exit__(type(e), e, e.__traceback__)
+            monitor.record_model_call(
+                name,
+                time.perf_counter() - start,
+                error=True,
+            )
+            raise
+        finally:
+            _current_model_call.reset(token)
+
+        # pylint: disable=protected-access
+        if isinstance(response, ModelResponse) and response._stream:
+            span.detach()
+            response._stream = _measure_stream(
+                response._stream,
+                call,
+                name,
+                start,
+                span,
+            )
+        else:
+            span.__exit__(None, None, None)
+            monitor.record_model_call(
+                name,
+                time.perf_counter() - start,
+                completion_tokens=call.completion_tokens,
+            )
+        return response
+
+    return instrumented_wrapper
+
+
 class ModelWrapperBase:
     """The base class for model wrapper."""
 
@@ -132,6 +272,12 @@ class ModelWrapperBase:
 
         logger.debug(f"Initialize model by configuration [{config_name}]")
 
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        """Trace and measure the `__call__` of the model wrappers."""
+        super().__init_subclass__(**kwargs)
+        if "__call__" in cls.__dict__:
+            cls.__call__ = _instrument_model_call(cls.__dict__["__call__"])
+
     def __call__(self, *args: Any, **kwargs: Any) -> ModelResponse:
         """Processing input with the model."""
         raise NotImplementedError(
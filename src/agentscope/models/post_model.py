@@ -153,6 +153,7 @@ class PostAPIModelWrapperBase(ModelWrapperBase, ABC):
                     f"requests.codes == {response.status_code}, retry "
                     f"{i + 1}/{self.max_retries} times",
                 )
+                self.monitor.record_retry(self.config_name)
                 time.sleep(i * self.retry_interval)
 
         # step3: record model invocation
@@ -102,6 +102,11 @@ class ModelResponse:
             return
         except StopIteration:
             return
+        except GeneratorExit:
+            # The consumer stops early, e.g. a parser has got all the fields
+            # it needs, so stop the generation of the model as well
+            self._stream.close()
+            raise
 
     def __str__(self) -> str:
         if _is_json_serializable(self.raw):
@@ -2,12 +2,13 @@
 """MsgHub is designed to share messages among a group of agents.
 """
 from __future__ import annotations
-from typing import Any, Optional, Union, Sequence
+from typing import Any, Optional, Union, Sequence, TYPE_CHECKING
 
 from loguru import logger
 
-from .agents import AgentBase
-from .message import Msg
+if TYPE_CHECKING:
+    from .agents import AgentBase
+    from .message import Msg
 
 
 class MsgHubManager:
@@ -65,6 +66,8 @@ class MsgHubManager:
         new_participant: Union[Sequence[AgentBase], AgentBase],
     ) -> None:
         """Add new participant into this hub"""
+        from .agents import AgentBase
+
         if isinstance(new_participant, AgentBase):
             new_participant = [new_participant]
 
@@ -84,6 +87,8 @@ class MsgHubManager:
         participant: Union[Sequence[AgentBase], AgentBase],
     ) -> None:
         """Delete agents from participant."""
+        from .agents import AgentBase
+
         if isinstance(participant, AgentBase):
             participant = [participant]
 
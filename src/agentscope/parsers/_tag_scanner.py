@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""Find the content of multiple pairs of tags in one pass over the text."""
+import re
+from typing import List, Sequence, Tuple
+
+
+def _overlaps(a: str, b: str) -> bool:
+    """Whether an occurrence of `a` can overlap with a following occurrence
+    of `b`, i.e. a proper suffix of `a` is a prefix of `b`, or the strings
+    are different and one contains the other."""
+    if a != b and (a in b or b in a):
+        return True
+    return any(b.startswith(a[i:]) for i in range(1, len(a)))
+
+
+class _TagScanner:
+    """Locate the first content between each pair of begin and end tags.
+
+    All the begin tags are compiled into one regex at construction, and the
+    text is scanned once for all of them, then each end tag is searched
+    from its begin tag, which is usually close. The result is the same as
+    searching the begin tag and then the end tag for each pair separately.
+    If the occurrences of the begin tags can overlap (e.g. "```json" and
+    "```"), a single scan may miss some of them, and the pairs are searched
+    one by one instead.
+    """
+
+    def __init__(self, tags: Sequence[Tuple[str, str]]) -> None:
+        """Compile the tags.
+
+        Args:
+            tags (`Sequence[Tuple[str, str]]`):
+                The pairs of the begin and end tags.
+        """
+        self.tags = list(tags)
+
+        # the indices of the pairs by the distinct begin tags
+        self._pairs: dict = {}
+        for index, (begin, _) in enumerate(self.tags):
+            self._pairs.setdefault(begin, []).append(index)
+
+        begins = list(self._pairs)
+        if "" in self._pairs or any(
+            _overlaps(a, b) for a in begins for b in begins
+        ):
+            self._pattern = None
+        else:
+            self._pattern = re.compile("|".join(map(re.escape, begins)))
+
+    def scan(self, text: str) -> List[Tuple[int, int]]:
+        """Find the tags in the text.
+
+        Returns:
+            `List[Tuple[int, int]]`: The index of the begin tag and the end
+            tag of each pair, -1 if not found. If the begin tag is not
+            found, the index of the end tag is its first occurrence in the
+            text.
+        """
+        if self._pattern is None:
+            return [self._find(text, begin, end) for begin, end in self.tags]
+
+        found = {}
+        for match in self._pattern.finditer(text):
+            found.setdefault(match.group(), match.start())
+            if len(found) == len(self._pairs):
+                break
+
+        spans = []
+        for begin, end in self.tags:
+            index_begin = found.get(begin, -1)
+            if index_begin == -1:
+                spans.append((-1, text.find(end)))
+            else:
+                spans.append(
+                    (index_begin, text.find(end, index_begin + len(begin))),
+                )
+        return spans
+
+    @staticmethod
+    def _find(text: str, begin: str, end: str) -> Tuple[int, int]:
+        index_begin = text.find(begin)
+        if index_begin == -1:
+            return -1, text.find(end)
+        return index_begin, text.find(end, index_begin + len(begin))
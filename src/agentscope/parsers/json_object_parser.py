@@ -2,7 +2,6 @@
 """The parser for JSON object in the model response."""
 import inspect
 import json
-from copy import deepcopy
 from typing import Optional, Any, List, Sequence, Union
 
 from loguru import logger
@@ -16,10 +15,113 @@ from ..exception import (
 )
 from ..models import ModelResponse
 from ..parsers import ParserBase
-from ..parsers.parser_base import DictFilterMixin
+from ..parsers.parser_base import DictFilterMixin, IncrementalParser
 from ..utils.common import _join_str_with_comma_and
 
 
+class _IncrementalJsonDictParser(IncrementalParser):
+    """Incremental parser of `MarkdownJsonDictParser`, which scans the JSON
+    dictionary character by character, and emits a top-level field as soon
+    as its value is complete."""
+
+    def __init__(self, tag_begin: str, required_keys: List[str]) -> None:
+        super().__init__(required_keys)
+        self.tag_begin = tag_begin
+        # index of the next character to scan, -1 before the dictionary is
+        # found
+        self._index = -1
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._key: Optional[str] = None
+        self._token_start = 0
+        self._expect_key = True
+        self.closed = False
+
+    def _find_start(self) -> bool:
+        """Find the beginning of the dictionary."""
+        index = self.text.find(self.tag_begin)
+        if index != -1:
+            start = self.text.find("{", index + len(self.tag_begin))
+        elif self.text.lstrip().startswith("{"):
+            # the begin tag is missing, which is fixed in `parse`
+            start = self.text.find("{")
+        else:
+            start = -1
+        if start == -1:
+            return False
+        self._index = start
+        return True
+
+    def _emit(self, end: int, new_fields: dict) -> None:
+        if self._key is None:
+            return
+        try:
+            new_fields[self._key] = json.loads(
+                self.text[self._token_start : end],  # noqa: E203
+            )
+        except json.decoder.JSONDecodeError:
+            # leave the error to the final parsing
+            pass
+        self._key = None
+
+    def _consume(self) -> dict:
+        new_fields: dict = {}
+        if self.closed or (self._index < 0 and not self._find_start()):
+            return new_fields
+        text = self.text
+        index = self._index
+        while index < len(text) and not self.closed:
+            if self._in_string:
+                self._scan_string(index)
+            else:
+                self._scan_token(index, new_fields)
+            index += 1
+        self._index = index
+        return new_fields
+
+    def _scan_string(self, index: int) -> None:
+        """Scan a character inside a JSON string."""
+        char = self.text[index]
+        if self._escape:
+            self._escape = False
+        elif char == "\\":
+            self._escape = True
+        elif char == '"':
+            self._in_string = False
+            if self._depth == 1 and self._expect_key:
+                self._key = json.loads(
+                    self.text[self._token_start : index + 1],  # noqa: E203
+                )
+
+    def _scan_token(self, index: int, new_fields: dict) -> None:
+        """Scan a character outside the JSON strings."""
+        char = self.text[index]
+        if char == '"':
+            self._in_string = True
+            if self._depth == 1 and self._expect_key:
+                self._token_start = index
+        elif char in "{[":
+            self._depth += 1
+        elif char in "}]":
+            self._depth -= 1
+            if self._depth == 0:
+                self._emit(index, new_fields)
+                self.closed = True
+        elif self._depth == 1 and char == ":":
+            self._expect_key = False
+            self._token_start = index + 1
+        elif self._depth == 1 and char == ",":
+            self._emit(index, new_fields)
+            self._expect_key = True
+
+    @property
+    def is_complete(self) -> bool:
+        """Whether the dictionary is closed or the required keys are
+        available."""
+        return self.closed or super().is_complete
+
+
 class MarkdownJsonObjectParser(ParserBase):
     """A parser to parse the response text to a json object."""
 
@@ -74,25 +176,24 @@ class MarkdownJsonObjectParser(ParserBase):
         except TagNotFoundError as e:
             # Try to fix the missing tag error by adding the tag
             try:
-                response_copy = deepcopy(response)
+                # Only the text is needed, so don't copy the whole response
+                fixed_text = response.text
 
                 # Fix the missing tags
                 if e.missing_begin_tag:
-                    response_copy.text = (
-                        self.tag_begin + "\n" + response_copy.text
-                    )
+                    fixed_text = self.tag_begin + "\n" + fixed_text
                 if e.missing_end_tag:
-                    response_copy.text = response_copy.text + self.tag_end
+                    fixed_text = fixed_text + self.tag_end
 
                 # Try again to extract the content
                 extract_text = self._extract_first_content_by_tag(
-                    response_copy,
+                    ModelResponse(text=fixed_text),
                     self.tag_begin,
                     self.tag_end,
                 )
 
                 # replace the response with the fixed one
-                response.text = response_copy.text
+                response.text = fixed_text
 
                 logger.debug("Fix the missing tags by adding them manually.")
 
@@ -296,3 +397,10 @@ class MarkdownJsonDictParser(MarkdownJsonObjectParser, DictFilterMixin):
             )
 
         return response
+
+    def incremental_parser(self) -> IncrementalParser:
+        """Create an incremental parser, which emits each top-level field of
+        the JSON dictionary as soon as its value is complete. Note the
+        fields emitted before the dictionary is closed are not validated
+        by the pydantic model."""
+        return _IncrementalJsonDictParser(self.tag_begin, self.required_keys)
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 """The base class for model response parser."""
 from abc import ABC, abstractmethod
-from typing import Union, Sequence
+from typing import Any, Callable, Generator, Sequence, Tuple, Union
 
 from loguru import logger
 
@@ -13,6 +13,51 @@ _FIRST_TIME_TO_REPORT_CONTENT = True
 _FIRST_TIME_TO_REPORT_MEMORY = True
 
 
+class IncrementalParser(ABC):
+    """The state of parsing a streamed response incrementally. It's fed with
+    the text chunks one by one, and emits the fields as soon as they are
+    complete, without rescanning the text that has been processed."""
+
+    def __init__(self, required_keys: Sequence[str] = ()) -> None:
+        """Initialize the incremental parser.
+
+        Args:
+            required_keys (`Sequence[str]`, defaults to `()`):
+                The keys that should be available before the response is
+                considered complete.
+        """
+        self.text = ""
+        self.parsed: dict = {}
+        self.required_keys = list(required_keys)
+
+    def feed(self, chunk: str) -> dict:
+        """Feed a new chunk of the response text.
+
+        Args:
+            chunk (`str`):
+                The new text, which is appended to the received text.
+
+        Returns:
+            `dict`: The fields completed by this chunk.
+        """
+        self.text += chunk
+        new_fields = self._consume()
+        self.parsed.update(new_fields)
+        return new_fields
+
+    @abstractmethod
+    def _consume(self) -> dict:
+        """Scan the unprocessed part of `self.text`, and return the newly
+        completed fields."""
+
+    @property
+    def is_complete(self) -> bool:
+        """Whether all the required keys are available."""
+        return bool(self.required_keys) and all(
+            key in self.parsed for key in self.required_keys
+        )
+
+
 class ParserBase(ABC):
     """The base class for model response parser."""
 
@@ -21,6 +66,106 @@ class ParserBase(ABC):
         """Parse the response text to a specific object, and stored in the
         parsed field of the response object."""
 
+    def incremental_parser(self) -> IncrementalParser:
+        """Create an incremental parser for streamed responses. Parsers
+        that don't support incremental parsing raise `NotImplementedError`.
+        """
+        raise NotImplementedError(
+            f"{self.__class__.__name__} doesn't support incremental parsing.",
+        )
+
+    def parse_stream(
+        self,
+        response: ModelResponse,
+        stop_early: Union[bool, Callable[[dict], bool]] = False,
+    ) -> Generator[Tuple[str, Any], None, None]:
+        """Parse a (streamed) response incrementally, and yield the key and
+        value of each field as soon as it's complete.
+
+        When the generator is exhausted, the parsed result is stored in the
+        parsed field of the response. If the stream is consumed to the end,
+        the whole text is parsed by `parse`, so that the result and the
+        raised errors are the same as parsing a non-streamed response.
+        If the generation is stopped early, the text field holds the text
+        received so far, and the parsed field holds the fields parsed from
+        it.
+
+        Args:
+            response (`ModelResponse`):
+                The response to be parsed.
+            stop_early (`Union[bool, Callable[[dict], bool]]`, defaults to
+            `False`):
+                Whether to stop consuming the stream, which also stops the
+                generation, once the needed fields are available. If `True`,
+                stop when the required keys of the parser are available. If
+                it's a callable, it's called with the fields parsed so far,
+                and the stream is stopped when it returns `True`.
+        """
+        try:
+            incremental = self.incremental_parser()
+        except NotImplementedError:
+            incremental = None
+
+        stopped = False
+        if incremental is not None and response.stream is not None:
+            incremental, stopped = yield from self._feed_stream(
+                incremental,
+                response,
+                stop_early,
+            )
+        elif incremental is not None:
+            yield from incremental.feed(response.text).items()
+
+        if stopped:
+            response.parsed = dict(incremental.parsed)
+            return
+
+        self.parse(response)
+        if isinstance(response.parsed, dict):
+            emitted = incremental.parsed if incremental is not None else {}
+            for key, value in response.parsed.items():
+                if key not in emitted:
+                    yield key, value
+
+    def _feed_stream(
+        self,
+        incremental: IncrementalParser,
+        response: ModelResponse,
+        stop_early: Union[bool, Callable[[dict], bool]],
+    ) -> Generator[Tuple[str, Any], None, Tuple[IncrementalParser, bool]]:
+        """Feed the stream of the response to the incremental parser, and
+        yield the completed fields. The text field of the response is set
+        to the text consumed from the stream.
+
+        Returns:
+            `Tuple[IncrementalParser, bool]`: The incremental parser holding
+            the parsed fields, which is recreated if the stream is not
+            accumulated, and whether the stream is stopped early.
+        """
+        stream = response.stream
+        consumed = ""
+        stopped = False
+        try:
+            for _, text in stream:
+                if text.startswith(consumed):
+                    chunk = text[len(consumed) :]  # noqa: E203
+                else:
+                    # not an accumulated stream, start over
+                    incremental = self.incremental_parser()
+                    chunk = text
+                consumed = text
+                yield from incremental.feed(chunk).items()
+                if stop_early is True:
+                    stopped = incremental.is_complete
+                elif callable(stop_early):
+                    stopped = stop_early(incremental.parsed)
+                if stopped:
+                    break
+        finally:
+            stream.close()
+        response.text = consumed
+        return incremental, stopped
+
     def _extract_first_content_by_tag(
         self,
         response: ModelResponse,
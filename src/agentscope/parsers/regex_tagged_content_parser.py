@@ -9,7 +9,44 @@ from loguru import logger
 from ..exception import TagNotFoundError
 from ..models import ModelResponse
 from ..parsers import ParserBase
-from ..parsers.parser_base import DictFilterMixin
+from ..parsers.parser_base import DictFilterMixin, IncrementalParser
+
+
+class _IncrementalRegexTaggedContentParser(IncrementalParser):
+    """Incremental parser of `RegexTaggedContentParser`."""
+
+    def __init__(
+        self,
+        pattern: re.Pattern,
+        opening: Optional[re.Pattern],
+        try_parse_json: bool,
+        required_keys: List[str],
+    ) -> None:
+        super().__init__(required_keys)
+        self.pattern = pattern
+        self.opening = opening
+        self.try_parse_json = try_parse_json
+        self._position = 0
+
+    def _consume(self) -> dict:
+        new_fields = {}
+        while True:
+            match = self.pattern.search(self.text, self._position)
+            if match is None:
+                break
+            if self.opening is not None:
+                opening = self.opening.search(self.text, self._position)
+                if opening is not None and opening.start() < match.start():
+                    break
+            self._position = match.end()
+            content = match.group("content")
+            if self.try_parse_json:
+                try:
+                    content = json.loads(content)
+                except json.JSONDecodeError:
+                    pass
+            new_fields[match.group("name")] = content
+        return new_fields
 
 
 class RegexTaggedContentParser(ParserBase, DictFilterMixin):
@@ -110,6 +147,29 @@ class RegexTaggedContentParser(ParserBase, DictFilterMixin):
         self.try_parse_json = try_parse_json
         self.required_keys = required_keys or []
 
+    @property
+    def tagged_content_pattern(self) -> str:
+        """The regex pattern to extract tagged content, which is compiled
+        once when it's set."""
+        return self._tagged_content_pattern
+
+    @tagged_content_pattern.setter
+    def tagged_content_pattern(self, pattern: str) -> None:
+        self._tagged_content_pattern = pattern
+        self._pattern = re.compile(pattern, flags=re.DOTALL)
+        # The part of the pattern before the content group, which is used
+        # by the incremental parser to find where a match may begin. A match
+        # is emitted only if no earlier match is still open, e.g. the whole
+        # `<thought>...` is matched before the `<b>...</b>` inside it, as
+        # `parse` does.
+        try:
+            self._opening = re.compile(
+                pattern[: pattern.index("(?P<content>")],
+                flags=re.DOTALL,
+            )
+        except (ValueError, re.error):
+            self._opening = None
+
     @property
     def format_instruction(self) -> str:
         """The format instruction for the tagged content."""
@@ -134,14 +194,8 @@ class RegexTaggedContentParser(ParserBase, DictFilterMixin):
         """
         assert response.text is not None, "The response text is None."
 
-        matches = re.finditer(
-            self.tagged_content_pattern,
-            response.text,
-            flags=re.DOTALL,
-        )
-
         results = {}
-        for match in matches:
+        for match in self._pattern.finditer(response.text):
             results[match.group("name")] = match.group("content")
 
         keys_missing = [
@@ -169,3 +223,14 @@ class RegexTaggedContentParser(ParserBase, DictFilterMixin):
 
         response.parsed = results
         return response
+
+    def incremental_parser(self) -> IncrementalParser:
+        """Create an incremental parser, which emits each tagged content as
+        soon as it's matched. The response is complete when the required
+        keys are available."""
+        return _IncrementalRegexTaggedContentParser(
+            self._pattern,
+            self._opening,
+            self.try_parse_json,
+            self.required_keys,
+        )
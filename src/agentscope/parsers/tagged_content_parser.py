@@ -6,7 +6,8 @@ from typing import Union, Sequence, Optional, List
 from agentscope.exception import JsonParsingError, TagNotFoundError
 from agentscope.models import ModelResponse
 from agentscope.parsers import ParserBase
-from agentscope.parsers.parser_base import DictFilterMixin
+from agentscope.parsers.parser_base import DictFilterMixin, IncrementalParser
+from agentscope.parsers._tag_scanner import _TagScanner
 
 
 class TaggedContent:
@@ -63,6 +64,67 @@ class TaggedContent:
         return f"{self.tag_begin}{self.content_hint}{self.tag_end}"
 
 
+class _IncrementalTaggedContentParser(IncrementalParser):
+    """Incremental parser of `MultiTaggedContentParser`."""
+
+    def __init__(
+        self,
+        tagged_contents: List[TaggedContent],
+        required_keys: List[str],
+    ) -> None:
+        super().__init__(required_keys)
+        self.tagged_contents = tagged_contents
+        # the beginning index of each content, None if the begin tag is not
+        # found yet
+        self._begins: dict = {}
+        # where to continue searching for the tags of each content
+        self._positions = {_.name: 0 for _ in tagged_contents}
+
+    def _consume(self) -> dict:
+        new_fields = {}
+        for tagged_content in self.tagged_contents:
+            name = tagged_content.name
+            if name in self.parsed or name in new_fields:
+                continue
+            content = self._search(tagged_content)
+            if content is None:
+                continue
+            if tagged_content.parse_json:
+                try:
+                    content = json.loads(content)
+                except json.decoder.JSONDecodeError:
+                    # leave the error to the final parsing
+                    self._positions[name] = len(self.text)
+                    continue
+            new_fields[name] = content
+        return new_fields
+
+    def _search(self, tagged_content: TaggedContent) -> Optional[str]:
+        """Continue searching the tags, return the content if both the tags
+        are found."""
+        name = tagged_content.name
+        position = self._positions[name]
+        if name not in self._begins:
+            index = self.text.find(tagged_content.tag_begin, position)
+            if index == -1:
+                # the tag may be split across chunks
+                self._positions[name] = max(
+                    0,
+                    len(self.text) - len(tagged_content.tag_begin) + 1,
+                )
+                return None
+            self._begins[name] = index + len(tagged_content.tag_begin)
+            position = self._begins[name]
+        index = self.text.find(tagged_content.tag_end, position)
+        if index == -1:
+            self._positions[name] = max(
+                self._begins[name],
+                len(self.text) - len(tagged_content.tag_end) + 1,
+            )
+            return None
+        return self.text[self._begins[name] : index]  # noqa: E203
+
+
 class MultiTaggedContentParser(ParserBase, DictFilterMixin):
     """Parse response text by multiple tags, and return a dict of their
     content. Asking llm to generate JSON dictionary object directly maybe not a
@@ -137,6 +199,9 @@ class MultiTaggedContentParser(ParserBase, DictFilterMixin):
         self.keys_allow_missing = keys_allow_missing
 
         self.tagged_contents = list(tagged_contents)
+        self._scanner = _TagScanner(
+            [(_.tag_begin, _.tag_end) for _ in tagged_contents],
+        )
 
         # Prepare the format instruction according to the tagged contents
         tag_lines = "\n".join([str(_) for _ in tagged_contents])
@@ -165,19 +230,30 @@ class MultiTaggedContentParser(ParserBase, DictFilterMixin):
         """Parse the response text by tags, and return a dict of their content
         in the parsed field of the model response object. If the tagged content
         requires to parse as a JSON object by `parse_json` equals to `True`, it
-        will be parsed as a JSON object by `json.loads`."""
+        will be parsed as a JSON object by `json.loads`. All the tags are
+        located in one pass over the text."""
 
+        text = response.text
         tag_to_content = {}
-        for tagged_content in self.tagged_contents:
+        spans = self._scanner.scan(text)
+        for tagged_content, (index_start, index_end) in zip(
+            self.tagged_contents,
+            spans,
+        ):
             tag_begin = tagged_content.tag_begin
             tag_end = tagged_content.tag_end
 
             try:
-                extract_content = self._extract_first_content_by_tag(
-                    response,
-                    tag_begin,
-                    tag_end,
-                )
+                if index_start == -1 or index_end == -1:
+                    # raise the error with the missing tags
+                    self._extract_first_content_by_tag(
+                        response,
+                        tag_begin,
+                        tag_end,
+                    )
+                extract_content = text[
+                    index_start + len(tag_begin) : index_end
+                ]
 
                 if tagged_content.parse_json:
                     try:
@@ -207,3 +283,17 @@ class MultiTaggedContentParser(ParserBase, DictFilterMixin):
 
         response.parsed = tag_to_content
         return response
+
+    def incremental_parser(self) -> IncrementalParser:
+        """Create an incremental parser, which emits the content of a tag as
+        soon as its ending tag arrives. The keys not allowed to be missing
+        are required."""
+        allow_missing = self.keys_allow_missing or []
+        return _IncrementalTaggedContentParser(
+            self.tagged_contents,
+            required_keys=[
+                _.name
+                for _ in self.tagged_contents
+                if _.name not in allow_missing
+            ],
+        )
@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+"""The sampling profiler of the hot paths of the agents."""
+from ._profiler import Profiler
+from ._report import (
+    classify_frame,
+    classify_stack,
+    format_summary,
+    read_profiles,
+    summarize,
+    summarize_profile,
+)
+
+__all__ = [
+    "Profiler",
+    "classify_frame",
+    "classify_stack",
+    "format_summary",
+    "read_profiles",
+    "summarize",
+    "summarize_profile",
+]
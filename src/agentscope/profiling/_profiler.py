@@ -0,0 +1,312 @@
+# -*- coding: utf-8 -*-
+"""The sampling profiler, which samples the stacks of all the threads of the
+process periodically in a daemon thread."""
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from types import CodeType, FrameType
+from typing import Dict, Optional, Tuple
+
+from loguru import logger
+
+from ._report import format_summary, summarize, summarize_profile
+from ..constants import (
+    _DEFAULT_PROFILE_INTERVAL,
+    _DEFAULT_PROFILE_WRITE_INTERVAL,
+    _DEFAULT_SUBDIR_PROFILE,
+)
+
+# The threads of AgentScope itself, e.g. the profiler and the metrics
+# snapshot thread, are not sampled
+_SKIPPED_THREAD_PREFIX = "agentscope-"
+
+
+def _frame_label(frame: FrameType) -> Tuple[str, bool]:
+    """The label of the frames of a code object in the collapsed stacks, and
+    whether it's a frame of AgentScope."""
+    module = frame.f_globals.get("__name__") or "<unknown>"
+    code = frame.f_code
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{module}:{name}", module.startswith("agentscope.")
+
+
+class Profiler:
+    """The sampling profiler of AgentScope. It's disabled by default and can
+    be enabled by `agentscope.init(profile=True)`, when the stacks of the
+    threads running AgentScope code are sampled every `interval` seconds,
+    and written into the `profile` directory of the run as collapsed stacks
+    and a summary by the agents and the components."""
+
+    def __init__(self) -> None:
+        """Initialize a disabled profiler."""
+        self.active = False
+        self.run_dir: Optional[str] = None
+        self.interval = _DEFAULT_PROFILE_INTERVAL
+
+        self._counts: Counter = Counter()
+        self._labels: Dict[CodeType, Tuple[str, bool]] = {}
+        self._thread_names: Dict[int, str] = {}
+        self._agent_code: Optional[CodeType] = None
+
+        self._samples = 0
+        self._sampling_seconds = 0.0
+        self._start = 0.0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def initialize(
+        self,
+        active: bool,
+        run_dir: Optional[str],
+        interval: float = _DEFAULT_PROFILE_INTERVAL,
+    ) -> None:
+        """Initialize the profiler.
+
+        Args:
+            active (`bool`):
+                Whether to enable the profiling.
+            run_dir (`Optional[str]`):
+                The directory of the run, where the profiles are written
+                into its `profile` sub-directory. If `None`, the profiling
+                is skipped.
+            interval (`float`, defaults to `0.01`):
+                The interval in seconds between the samples.
+        """
+        self.flush()
+        if active and run_dir is None:
+            logger.warning(
+                "The profiling is skipped as saving files is disabled.",
+            )
+            active = False
+
+        self.interval = interval
+        if not active:
+            return
+
+        self.active = True
+        self.run_dir = run_dir
+
+        # imported here to avoid the circular import
+        from ..agents.agent import AgentBase
+
+        self._agent_code = AgentBase.__call__.__code__
+        self._start = time.perf_counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(self._stop,),
+            name=f"{_SKIPPED_THREAD_PREFIX}profiler",
+            daemon=True,
+        )
+        self._thread.start()
+
+    @property
+    def directory(self) -> Optional[str]:
+        """The directory of the profiles."""
+        if self.run_dir is None:
+            return None
+        return os.path.join(self.run_dir, _DEFAULT_SUBDIR_PROFILE)
+
+    def _run(self, stop: threading.Event) -> None:
+        """Sample the stacks until stopped, and write the profile
+        periodically, so that it's available if the process is killed."""
+        last_write = time.monotonic()
+        while not stop.wait(self.interval):
+            start = time.perf_counter()
+            try:
+                self._sample()
+            except Exception as e:
+                logger.warning(f"Failed to sample the stacks: {e}")
+                return
+            self._sampling_seconds += time.perf_counter() - start
+
+            now = time.monotonic()
+            if now - last_write > _DEFAULT_PROFILE_WRITE_INTERVAL:
+                self.write()
+                last_write = time.monotonic()
+
+    def _sample(self) -> None:
+        """Count the current stack of each thread running AgentScope."""
+        labels = self._labels
+        agent_code = self._agent_code
+        this_thread = threading.get_ident()
+        # pylint: disable=protected-access
+        frames = sys._current_frames()
+        keys = []
+        for ident, frame in frames.items():
+            if ident == this_thread:
+                continue
+            thread_name = self._thread_names.get(ident)
+            if thread_name is None:
+                self._thread_names = {
+                    _.ident: _.name for _ in threading.enumerate()
+                }
+                thread_name = self._thread_names.get(ident, str(ident))
+            if thread_name.startswith(_SKIPPED_THREAD_PREFIX):
+                continue
+
+            stack = []
+            agent = None
+            in_agentscope = False
+            while frame is not None:
+                code = frame.f_code
+                label = labels.get(code)
+                if label is None:
+                    label = labels[code] = _frame_label(frame)
+                stack.append(label[0])
+                in_agentscope = in_agentscope or label[1]
+                # the innermost agent
+                if agent is None and code is agent_code:
+                    agent = getattr(frame.f_locals.get("self"), "name", None)
+                frame = frame.f_back
+
+            # the idle threads, e.g. of the thread pools, are skipped
+            if not in_agentscope:
+                continue
+            stack.reverse()
+            if agent is None:
+                keys.append((f"thread:{thread_name}", tuple(stack)))
+            else:
+                keys.append((f"agent:{agent}", tuple(stack)))
+
+        with self._lock:
+            self._counts.update(keys)
+            self._samples += 1
+
+    def write(self) -> None:
+        """Write the collapsed stacks and the summary of this process into
+        the profile directory."""
+        directory = self.directory
+        if directory is None:
+            return
+        with self._lock:
+            counts = dict(self._counts)
+            meta = {
+                "pid": os.getpid(),
+                "interval": self.interval,
+                "samples": self._samples,
+                "duration": time.perf_counter() - self._start,
+                "sampling_seconds": self._sampling_seconds,
+            }
+        if not counts:
+            return
+
+        pid = os.getpid()
+        try:
+            os.makedirs(directory, exist_ok=True)
+            with open(
+                os.path.join(directory, f"profile-{pid}.collapsed"),
+                "w",
+                encoding="utf-8",
+            ) as file:
+                file.writelines(
+                    f"{';'.join((root, *stack))} {count}\n"
+                    for (root, stack), count in counts.items()
+                )
+            with open(
+                os.path.join(directory, f"profile-{pid}.json"),
+                "w",
+                encoding="utf-8",
+            ) as file:
+                json.dump(meta, file)
+            with open(
+                os.path.join(directory, f"profile-{pid}.txt"),
+                "w",
+                encoding="utf-8",
+            ) as file:
+                file.write(format_summary(summarize(counts, [meta])))
+        except OSError as e:
+            logger.warning(f"Failed to write the profile to {directory}: {e}")
+
+    def write_summary(self) -> Optional[str]:
+        """Write the summary of all the processes of the run, e.g. the agent
+        servers, into `summary.txt` of the profile directory.
+
+        Returns:
+            `Optional[str]`: The summary, or `None` if nothing is
+            profiled.
+        """
+        directory = self.directory
+        if directory is None:
+            return None
+        stats = summarize_profile(directory)
+        if stats is None:
+            return None
+        summary = format_summary(stats)
+        with open(
+            os.path.join(directory, "summary.txt"),
+            "w",
+            encoding="utf-8",
+        ) as file:
+            file.write(summary)
+        return summary
+
+    def state_dict(self) -> dict:
+        """Serialize the profiler."""
+        return {
+            "active": self.active,
+            "run_dir": self.run_dir,
+            "interval": self.interval,
+        }
+
+    def load_dict(self, data: dict) -> None:
+        """Load the profiler from a dictionary."""
+        assert "active" in data, "Key `active` not found in data."
+        assert "run_dir" in data, "Key `run_dir` not found in data."
+        assert "interval" in data, "Key `interval` not found in data."
+
+        self.initialize(data["active"], data["run_dir"], data["interval"])
+
+    def flush(self) -> None:
+        """Stop sampling, write the profile and disable the profiler."""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+            self.write()
+            self.write_summary()
+
+        self.active = False
+        self.run_dir = None
+        self._reset()
+
+    def _reset(self) -> None:
+        """Drop the samples, e.g. of the parent process after `fork`."""
+        self._lock = threading.Lock()
+        self._counts = Counter()
+        self._thread_names = {}
+        self._samples = 0
+        self._sampling_seconds = 0.0
+
+
+_profiler = Profiler()
+
+
+def _write_at_exit() -> None:
+    """Write the profile before the interpreter exits, since the sampling
+    thread is a daemon thread."""
+    # pylint: disable=protected-access
+    if _profiler._thread is not None:
+        _profiler._stop.set()
+        _profiler._thread.join()
+        _profiler._thread = None
+        _profiler.write()
+        _profiler.write_summary()
+
+
+def _reset_after_fork() -> None:
+    # the sampling thread isn't running in the child process
+    # pylint: disable=protected-access
+    _profiler._thread = None
+    _profiler.active = False
+    _profiler._reset()
+
+
+atexit.register(_write_at_exit)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+"""Read the collapsed stacks of the profiler, and summarize them by the
+agents, the components and the functions."""
+import json
+import os
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from ..constants import _DEFAULT_PROFILE_TOP_N
+
+# The components of AgentScope by the prefixes of the modules (and the
+# functions), where the first matched one is used
+_COMPONENT_RULES = (
+    ("formatting", ("agentscope.prompt",), None),
+    ("formatting", ("agentscope.models",), "format"),
+    ("parsing", ("agentscope.parsers",), None),
+    ("serialization", ("agentscope.serialize", "json", "pickle"), None),
+    ("serialization", ("cloudpickle",), None),
+    ("memory", ("agentscope.memory",), None),
+    ("rpc", ("agentscope.rpc", "agentscope.server", "grpc"), None),
+    ("logging", ("agentscope.logging", "loguru", "logging"), None),
+    ("model", ("agentscope.models", "openai", "httpx", "requests"), None),
+    ("model", ("urllib3", "http.client"), None),
+    ("tool", ("agentscope.service",), None),
+    ("rag", ("agentscope.rag", "llama_index"), None),
+)
+
+# The samples whose innermost frames are in these modules are waiting, e.g.
+# for a lock, a socket or a queue, rather than running on the CPU. Note the
+# calls of the C functions are not sampled, so the blocking calls elsewhere,
+# e.g. `time.sleep`, are counted as running in their callers
+_WAITING_MODULES = (
+    "threading",
+    "selectors",
+    "queue",
+    "socket",
+    "ssl",
+    "multiprocessing",
+    "subprocess",
+    "concurrent.futures",
+    "grpc._channel",
+)
+
+_AGENT_CALL = "agentscope.agents.agent:AgentBase.__call__"
+
+
+def _match(module: str, prefixes: Tuple[str, ...]) -> bool:
+    return any(
+        module == prefix or module.startswith(prefix + ".")
+        for prefix in prefixes
+    )
+
+
+def classify_frame(frame: str) -> Optional[str]:
+    """The component of a frame labelled as "module:function", or `None` if
+    it doesn't belong to any component."""
+    module, _, function = frame.partition(":")
+    for component, prefixes, keyword in _COMPONENT_RULES:
+        if _match(module, prefixes) and (
+            keyword is None or keyword in function.lower()
+        ):
+            return component
+    return None
+
+
+def classify_stack(stack: Tuple[str, ...]) -> str:
+    """The component of a stack from the outermost to the innermost frame,
+    which is decided by the outermost component within the innermost agent
+    reply, e.g. the time of parsing the response is counted as "parsing"
+    even if it's logged inside the parser."""
+    start = 0
+    for i, frame in enumerate(stack):
+        if frame == _AGENT_CALL:
+            start = i + 1
+    for frame in stack[start:]:
+        component = classify_frame(frame)
+        if component is not None:
+            return component
+    return "other"
+
+
+def is_waiting(stack: Tuple[str, ...]) -> bool:
+    """Whether the innermost frame of a stack is waiting."""
+    if not stack:
+        return False
+    return _match(stack[-1].partition(":")[0], _WAITING_MODULES)
+
+
+def read_profiles(
+    directory: str,
+) -> Tuple[Dict[Tuple[str, Tuple[str, ...]], int], List[dict]]:
+    """Read and merge the profiles of all the processes in a directory.
+
+    Args:
+        directory (`str`):
+            The profile directory, i.e. the `profile` sub-directory of the
+            run directory.
+
+    Returns:
+        `Tuple[Dict[Tuple[str, Tuple[str, ...]], int], List[dict]]`: The
+        number of the samples by the root (i.e. the agent or the thread) and
+        the frames of the stacks, and the metadata of the processes.
+    """
+    counts: Counter = Counter()
+    metas = []
+    for filename in sorted(os.listdir(directory)):
+        path = os.path.join(directory, filename)
+        if filename.endswith(".collapsed"):
+            with open(path, "r", encoding="utf-8") as file:
+                for line in file:
+                    stack, _, count = line.rstrip("\n").rpartition(" ")
+                    if not stack:
+                        continue
+                    root, *frames = stack.split(";")
+                    counts[(root, tuple(frames))] += int(count)
+        elif filename.startswith("profile-") and filename.endswith(".json"):
+            with open(path, "r", encoding="utf-8") as file:
+                metas.append(json.load(file))
+    return dict(counts), metas
+
+
+def summarize(
+    counts: Dict[Tuple[str, Tuple[str, ...]], int],
+    metas: List[dict],
+    top_n: int = _DEFAULT_PROFILE_TOP_N,
+) -> dict:
+    """Summarize the samples by the components, the agents and the
+    functions.
+
+    Args:
+        counts (`Dict[Tuple[str, Tuple[str, ...]], int]`):
+            The number of the samples by the roots and the stacks.
+        metas (`List[dict]`):
+            The metadata of the profiled processes.
+        top_n (`int`, defaults to `20`):
+            The number of the hottest functions in the summary.
+
+    Returns:
+        `dict`: The summary, where the components and the agents are
+        counted by `[running, waiting]` samples, and the functions by their
+        self (i.e. innermost) and total samples of the running stacks.
+    """
+    components: Dict[str, List[int]] = {}
+    agents: Dict[str, List[int]] = {}
+    self_counts: Counter = Counter()
+    total_counts: Counter = Counter()
+    for (root, stack), count in counts.items():
+        waiting = is_waiting(stack)
+        components.setdefault(classify_stack(stack), [0, 0])[waiting] += count
+        agents.setdefault(root, [0, 0])[waiting] += count
+        if waiting or not stack:
+            continue
+        self_counts[stack[-1]] += count
+        for frame in set(stack):
+            total_counts[frame] += count
+
+    interval = max((_["interval"] for _ in metas), default=0.0)
+    return {
+        "processes": len(metas),
+        "interval": interval,
+        "samples": sum(counts.values()),
+        "duration": sum(_["duration"] for _ in metas),
+        "sampling_seconds": sum(_["sampling_seconds"] for _ in metas),
+        "components": components,
+        "agents": agents,
+        "self": self_counts.most_common(top_n),
+        "total": total_counts.most_common(top_n),
+    }
+
+
+def _format_table(
+    title: str,
+    rows: Dict[str, List[int]],
+    interval: float,
+) -> List[str]:
+    total = sum(sum(_) for _ in rows.values()) or 1
+    lines = [
+        title,
+        f"  {'':<40} {'running(s)':>11} {'waiting(s)':>11} {'share':>7}",
+    ]
+    for name, (running, waiting) in sorted(
+        rows.items(),
+        key=lambda _: -sum(_[1]),
+    ):
+        lines.append(
+            f"  {name:<40} {running * interval:>11.2f} "
+            f"{waiting * interval:>11.2f} "
+            f"{(running + waiting) / total:>7.1%}",
+        )
+    return lines
+
+
+def format_summary(summary: dict) -> str:
+    """Format a summary by `summarize` as a readable report."""
+    interval = summary["interval"]
+    running = sum(_[0] for _ in summary["components"].values()) or 1
+    duration = summary["duration"]
+    lines = [
+        f"Profiled {summary['processes']} process(es) for "
+        f"{duration:.1f}s, {summary['samples']} stack samples every "
+        f"{interval * 1000:.0f}ms, sampling took "
+        f"{summary['sampling_seconds']:.2f}s "
+        f"({summary['sampling_seconds'] / (duration or 1):.2%}).",
+        "",
+        *_format_table("By component:", summary["components"], interval),
+        "",
+        *_format_table("By agent:", summary["agents"], interval),
+        "",
+        "Top functions by self samples (running):",
+    ]
+    for frame, count in summary["self"]:
+        lines.append(f"  {count / running:>7.1%}  {frame}")
+    lines.append("")
+    lines.append("Top functions by total samples (running):")
+    for frame, count in summary["total"]:
+        lines.append(f"  {count / running:>7.1%}  {frame}")
+    return "\n".join(lines) + "\n"
+
+
+def summarize_profile(
+    directory: str,
+    top_n: int = _DEFAULT_PROFILE_TOP_N,
+) -> Optional[dict]:
+    """Summarize the profiles of all the processes of a run.
+
+    Args:
+        directory (`str`):
+            The profile directory, i.e. the `profile` sub-directory of the
+            run directory.
+        top_n (`int`, defaults to `20`):
+            The number of the hottest functions in the summary.
+
+    Returns:
+        `Optional[dict]`: The summary, or `None` if there is no profile.
+    """
+    if not os.path.isdir(directory):
+        return None
+    counts, metas = read_profiles(directory)
+    if not counts:
+        return None
+    return summarize(counts, metas, top_n)
@@ -14,10 +14,12 @@ generate an answer.
 
 import importlib
 from abc import ABC, abstractmethod
-from typing import Any, Optional, Union
+from functools import wraps
+from typing import Any, Callable, Optional, Union
 from dataclasses import dataclass, asdict
 from loguru import logger
 from agentscope.models import ModelWrapperBase
+from agentscope.tracing import start_span
 
 
 @dataclass
@@ -49,6 +51,23 @@ class RetrievedChunk:
         return asdict(self)
 
 
+def _trace_retrieve(retrieve: Callable) -> Callable:
+    """A decorator recording the `retrieve` of a knowledge as a span."""
+
+    @wraps(retrieve)
+    def tracing_wrapper(self: "Knowledge", *args: Any, **kwargs: Any) -> Any:
+        with start_span(
+            f"{type(self).__name__}.retrieve",
+            "rag",
+            knowledge_id=self.knowledge_id,
+        ) as span:
+            retrieved = retrieve(self, *args, **kwargs)
+            span.set_attribute("n_retrieved", len(retrieved))
+            return retrieved
+
+    return tracing_wrapper
+
+
 class Knowledge(ABC):
     """
     Base class for RAG, CANNOT be instantiated directly
@@ -84,6 +103,12 @@ class Knowledge(ABC):
         self.knowledge_config = knowledge_config or {}
         self.postprocessing_model = model
 
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        """Trace the `retrieve` of the knowledge classes."""
+        super().__init_subclass__(**kwargs)
+        if "retrieve" in cls.__dict__:
+            cls.retrieve = _trace_retrieve(cls.__dict__["retrieve"])
+
     @abstractmethod
     def _init_rag(
         self,
@@ -1,10 +1,26 @@
 # -*- coding: utf-8 -*-
-"""Import all rpc related modules in the package."""
-from .rpc_client import RpcClient
+"""Import all rpc related modules in the package. The modules depending on
+grpc are imported on first access, so that the local agents don't import
+it."""
+from typing import TYPE_CHECKING
+
 from .rpc_meta import async_func, sync_func, RpcMeta
 from .rpc_config import DistConf
-from .rpc_async import AsyncResult
-from .rpc_object import RpcObject
+from .._lazy import lazy_loader
+
+if TYPE_CHECKING:
+    from .rpc_client import RpcClient
+    from .rpc_async import AsyncResult
+    from .rpc_object import RpcObject
+
+__getattr__, __dir__ = lazy_loader(
+    __name__,
+    attributes={
+        "RpcClient": ".rpc_client",
+        "AsyncResult": ".rpc_async",
+        "RpcObject": ".rpc_object",
+    },
+)
 
 
 __all__ = [
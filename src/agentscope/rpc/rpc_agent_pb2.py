@@ -17,7 +17,7 @@ from google.protobuf import empty_pb2 as google_dot_protobuf_dot_empty__pb2
 
 
 DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(
-    b'\n\x0frpc_agent.proto\x1a\x1bgoogle/protobuf/empty.proto".\n\x0fGeneralResponse\x12\n\n\x02ok\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t"Z\n\x12\x43reateAgentRequest\x12\x10\n\x08\x61gent_id\x18\x01 \x01(\t\x12\x17\n\x0f\x61gent_init_args\x18\x02 \x01(\x0c\x12\x19\n\x11\x61gent_source_code\x18\x03 \x01(\x0c"/\n\x0b\x41gentStatus\x12\x10\n\x08\x61gent_id\x18\x01 \x01(\t\x12\x0e\n\x06status\x18\x02 \x01(\t"+\n\x18UpdatePlaceholderRequest\x12\x0f\n\x07task_id\x18\x01 \x01(\x03"\x1a\n\tStringMsg\x12\r\n\x05value\x18\x01 \x01(\t"\x17\n\x07\x42yteMsg\x12\x0c\n\x04\x64\x61ta\x18\x01 \x01(\x0c"G\n\x0f\x43\x61llFuncRequest\x12\x13\n\x0btarget_func\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\x0c\x12\x10\n\x08\x61gent_id\x18\x03 \x01(\t">\n\x10\x43\x61llFuncResponse\x12\n\n\x02ok\x18\x01 \x01(\x08\x12\r\n\x05value\x18\x02 \x01(\x0c\x12\x0f\n\x07message\x18\x03 \x01(\t2\xe0\x05\n\x08RpcAgent\x12\x36\n\x08is_alive\x12\x16.google.protobuf.Empty\x1a\x10.GeneralResponse"\x00\x12\x32\n\x04stop\x12\x16.google.protobuf.Empty\x1a\x10.GeneralResponse"\x00\x12\x37\n\x0c\x63reate_agent\x12\x13.CreateAgentRequest\x1a\x10.GeneralResponse"\x00\x12.\n\x0c\x64\x65lete_agent\x12\n.StringMsg\x1a\x10.GeneralResponse"\x00\x12?\n\x11\x64\x65lete_all_agents\x12\x16.google.protobuf.Empty\x1a\x10.GeneralResponse"\x00\x12-\n\x0b\x63lone_agent\x12\n.StringMsg\x1a\x10.GeneralResponse"\x00\x12<\n\x0eget_agent_list\x12\x16.google.protobuf.Empty\x1a\x10.GeneralResponse"\x00\x12=\n\x0fget_server_info\x12\x16.google.protobuf.Empty\x1a\x10.GeneralResponse"\x00\x12\x33\n\x11set_model_configs\x12\n.StringMsg\x1a\x10.GeneralResponse"\x00\x12\x32\n\x10get_agent_memory\x12\n.StringMsg\x1a\x10.GeneralResponse"\x00\x12\x38\n\x0f\x63\x61ll_agent_func\x12\x10.CallFuncRequest\x1a\x11.CallFuncResponse"\x00\x12\x44\n\x12update_placeholder\x12\x19.UpdatePlaceholderRequest\x1a\x11.CallFuncResponse"\x00\x12)\n\rdownload_file\x12\n.StringMsg\x1a\x08.ByteMsg"\x00\x30\x01\x62\x06proto3',
+    b'\n\x0frpc_agent.proto\x1a\x1bgoogle/protobuf/empty.proto".\n\x0fGeneralResponse\x12\n\n\x02ok\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t"Z\n\x12\x43reateAgentRequest\x12\x10\n\x08\x61gent_id\x18\x01 \x01(\t\x12\x17\n\x0f\x61gent_init_args\x18\x02 \x01(\x0c\x12\x19\n\x11\x61gent_source_code\x18\x03 \x01(\x0c":\n\x13\x43reateAgentsRequest\x12#\n\x06\x61gents\x18\x01 \x03(\x0b\x32\x13.CreateAgentRequest"9\n\x14\x43reateAgentsResponse\x12!\n\x07results\x18\x01 \x03(\x0b\x32\x10.GeneralResponse"/\n\x0b\x41gentStatus\x12\x10\n\x08\x61gent_id\x18\x01 \x01(\t\x12\x0e\n\x06status\x18\x02 \x01(\t"+\n\x18UpdatePlaceholderRequest\x12\x0f\n\x07task_id\x18\x01 \x01(\x03"\x1a\n\tStringMsg\x12\r\n\x05value\x18\x01 \x01(\t"\x17\n\x07\x42yteMsg\x12\x0c\n\x04\x64\x61ta\x18\x01 \x01(\x0c"G\n\x0f\x43\x61llFuncRequest\x12\x13\n\x0btarget_func\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\x0c\x12\x10\n\x08\x61gent_id\x18\x03 \x01(\t"S\n\x10\x43\x61llFuncResponse\x12\n\n\x02ok\x18\x01 \x01(\x08\x12\r\n\x05value\x18\x02 \x01(\x0c\x12\x0f\n\x07message\x18\x03 \x01(\t\x12\x13\n\x0bqueue_depth\x18\x04 \x01(\x03\x32\xa0\x06\n\x08RpcAgent\x12\x36\n\x08is_alive\x12\x16.google.protobuf.Empty\x1a\x10.GeneralResponse"\x00\x12\x32\n\x04stop\x12\x16.google.protobuf.Empty\x1a\x10.GeneralResponse"\x00\x12\x37\n\x0c\x63reate_agent\x12\x13.CreateAgentRequest\x1a\x10.GeneralResponse"\x00\x12>\n\rcreate_agents\x12\x14.CreateAgentsRequest\x1a\x15.CreateAgentsResponse"\x00\x12.\n\x0c\x64\x65lete_agent\x12\n.StringMsg\x1a\x10.GeneralResponse"\x00\x12?\n\x11\x64\x65lete_all_agents\x12\x16.google.protobuf.Empty\x1a\x10.GeneralResponse"\x00\x12-\n\x0b\x63lone_agent\x12\n.StringMsg\x1a\x10.GeneralResponse"\x00\x12<\n\x0eget_agent_list\x12\x16.google.protobuf.Empty\x1a\x10.GeneralResponse"\x00\x12=\n\x0fget_server_info\x12\x16.google.protobuf.Empty\x1a\x10.GeneralResponse"\x00\x12\x33\n\x11set_model_configs\x12\n.StringMsg\x1a\x10.GeneralResponse"\x00\x12\x32\n\x10get_agent_memory\x12\n.StringMsg\x1a\x10.GeneralResponse"\x00\x12\x38\n\x0f\x63\x61ll_agent_func\x12\x10.CallFuncRequest\x1a\x11.CallFuncResponse"\x00\x12\x44\n\x12update_placeholder\x12\x19.UpdatePlaceholderRequest\x1a\x11.CallFuncResponse"\x00\x12)\n\rdownload_file\x12\n.StringMsg\x1a\x08.ByteMsg"\x00\x30\x01\x62\x06proto3'
 )
 
 _globals = globals()
@@ -29,18 +29,22 @@ if _descriptor._USE_C_DESCRIPTORS == False:
     _globals["_GENERALRESPONSE"]._serialized_end = 94
     _globals["_CREATEAGENTREQUEST"]._serialized_start = 96
     _globals["_CREATEAGENTREQUEST"]._serialized_end = 186
-    _globals["_AGENTSTATUS"]._serialized_start = 188
-    _globals["_AGENTSTATUS"]._serialized_end = 235
-    _globals["_UPDATEPLACEHOLDERREQUEST"]._serialized_start = 237
-    _globals["_UPDATEPLACEHOLDERREQUEST"]._serialized_end = 280
-    _globals["_STRINGMSG"]._serialized_start = 282
-    _globals["_STRINGMSG"]._serialized_end = 308
-    _globals["_BYTEMSG"]._serialized_start = 310
-    _globals["_BYTEMSG"]._serialized_end = 333
-    _globals["_CALLFUNCREQUEST"]._serialized_start = 335
-    _globals["_CALLFUNCREQUEST"]._serialized_end = 406
-    _globals["_CALLFUNCRESPONSE"]._serialized_start = 408
-    _globals["_CALLFUNCRESPONSE"]._serialized_end = 470
-    _globals["_RPCAGENT"]._serialized_start = 473
-    _globals["_RPCAGENT"]._serialized_end = 1209
+    _globals["_CREATEAGENTSREQUEST"]._serialized_start = 188
+    _globals["_CREATEAGENTSREQUEST"]._serialized_end = 246
+    _globals["_CREATEAGENTSRESPONSE"]._serialized_start = 248
+    _globals["_CREATEAGENTSRESPONSE"]._serialized_end = 305
+    _globals["_AGENTSTATUS"]._serialized_start = 307
+    _globals["_AGENTSTATUS"]._serialized_end = 354
+    _globals["_UPDATEPLACEHOLDERREQUEST"]._serialized_start = 356
+    _globals["_UPDATEPLACEHOLDERREQUEST"]._serialized_end = 399
+    _globals["_STRINGMSG"]._serialized_start = 401
+    _globals["_STRINGMSG"]._serialized_end = 427
+    _globals["_BYTEMSG"]._serialized_start = 429
+    _globals["_BYTEMSG"]._serialized_end = 452
+    _globals["_CALLFUNCREQUEST"]._serialized_start = 454
+    _globals["_CALLFUNCREQUEST"]._serialized_end = 525
+    _globals["_CALLFUNCRESPONSE"]._serialized_start = 527
+    _globals["_CALLFUNCRESPONSE"]._serialized_end = 610
+    _globals["_RPCAGENT"]._serialized_start = 613
+    _globals["_RPCAGENT"]._serialized_end = 1413
 # @@protoc_insertion_point(module_scope)
@@ -39,6 +39,11 @@ class RpcAgentStub(object):
             request_serializer=rpc__agent__pb2.CreateAgentRequest.SerializeToString,
             response_deserializer=rpc__agent__pb2.GeneralResponse.FromString,
         )
+        self.create_agents = channel.unary_unary(
+            "/RpcAgent/create_agents",
+            request_serializer=rpc__agent__pb2.CreateAgentsRequest.SerializeToString,
+            response_deserializer=rpc__agent__pb2.CreateAgentsResponse.FromString,
+        )
         self.delete_agent = channel.unary_unary(
             "/RpcAgent/delete_agent",
             request_serializer=rpc__agent__pb2.StringMsg.SerializeToString,
@@ -112,6 +117,12 @@ class RpcAgentServicer(object):
         context.set_details("Method not implemented!")
         raise NotImplementedError("Method not implemented!")
 
+    def create_agents(self, request, context):
+        """create multiple objects on the server in one call"""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
     def delete_agent(self, request, context):
         """delete agent from the server"""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
@@ -190,6 +201,11 @@ def add_RpcAgentServicer_to_server(servicer, server):
             request_deserializer=rpc__agent__pb2.CreateAgentRequest.FromString,
             response_serializer=rpc__agent__pb2.GeneralResponse.SerializeToString,
         ),
+        "create_agents": grpc.unary_unary_rpc_method_handler(
+            servicer.create_agents,
+            request_deserializer=rpc__agent__pb2.CreateAgentsRequest.FromString,
+            response_serializer=rpc__agent__pb2.CreateAgentsResponse.SerializeToString,
+        ),
         "delete_agent": grpc.unary_unary_rpc_method_handler(
             servicer.delete_agent,
             request_deserializer=rpc__agent__pb2.StringMsg.FromString,
@@ -339,6 +355,35 @@ class RpcAgent(object):
             metadata,
         )
 
+    @staticmethod
+    def create_agents(
+        request,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            "/RpcAgent/create_agents",
+            rpc__agent__pb2.CreateAgentsRequest.SerializeToString,
+            rpc__agent__pb2.CreateAgentsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+        )
+
     @staticmethod
     def delete_agent(
         request,
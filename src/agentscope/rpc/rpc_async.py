@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 """Async related modules."""
-from typing import Any
+from typing import Any, Callable, Optional
 from concurrent.futures import Future
 from loguru import logger
 
@@ -16,6 +16,42 @@ from .rpc_client import RpcClient
 from ..utils.common import _is_web_url
 from .retry_strategy import RetryBase, _DEFAULT_RETRY_STRATEGY
 
+# Resolvers of the agent servers running in the current process, indexed by
+# "host:port". They are used to read async results produced by co-located
+# agents directly from the result pool instead of through rpc.
+_LOCAL_RESULT_RESOLVERS: dict[str, Callable[[int], Any]] = {}
+
+
+def _register_local_resolver(
+    host: str,
+    port: int,
+    resolver: Callable[[int], Any],
+) -> None:
+    """Register the result resolver of an agent server running in the
+    current process. Only the results addressed by the host that the server
+    is bound to are resolved locally.
+
+    Args:
+        host (`str`): The hostname of the agent server.
+        port (`int`): The port of the agent server.
+        resolver (`Callable[[int], Any]`): A function that takes a task id
+            and returns the result of the task, blocking until it's ready.
+    """
+    _LOCAL_RESULT_RESOLVERS[f"{host}:{port}"] = resolver
+
+
+def _unregister_local_resolver(host: str, port: int) -> None:
+    """Remove the result resolver registered by `_register_local_resolver`."""
+    _LOCAL_RESULT_RESOLVERS.pop(f"{host}:{port}", None)
+
+
+def _get_local_resolver(host: str, port: int) -> Optional[Callable]:
+    """Get the result resolver of the agent server at `host:port` if it runs
+    in the current process, otherwise return `None`."""
+    if not _LOCAL_RESULT_RESOLVERS:
+        return None
+    return _LOCAL_RESULT_RESOLVERS.get(f"{host}:{port}")
+
 
 class AsyncResult:
     """Use this class to get the the async result from rpc server."""
@@ -39,6 +75,7 @@ class AsyncResult:
             self._stub = stub
         self._ready = False
         self._data = None
+        self._queue_depth: Optional[int] = None
 
     def _fetch_result(
         self,
@@ -46,6 +83,17 @@ class AsyncResult:
         """Fetch result from the server."""
         if self._task_id is None:
             self._task_id = self._get_task_id()
+        resolver = _get_local_resolver(self._host, self._port)
+        if resolver is not None:
+            # the result is produced by a server in this process, read it
+            # from the result pool directly
+            self._data = self._retry.retry(
+                resolver,
+                self._task_id,
+                expect_exception_type=TimeoutError,
+            )
+            self._ready = True
+            return
         self._data = pickle.loads(
             RpcClient(self._host, self._port).update_result(
                 self._task_id,
@@ -61,10 +109,25 @@ class AsyncResult:
         """Update the value. For compatibility with old version."""
         self._fetch_result()
 
+    @property
+    def queue_depth(self) -> Optional[int]:
+        """The number of calls waiting in the mailbox of the called agent
+        (including this one) when the call is submitted, which can be used as
+        a back-pressure signal to slow down the following calls. It's `None`
+        if unknown, e.g. for a result created from a task id."""
+        if self._task_id is None:
+            self._task_id = self._get_task_id()
+        return self._queue_depth
+
     def _get_task_id(self) -> str:
         """get the task_id."""
         try:
-            return self._stub.result()
+            task_id = self._stub.result()
+            # the calls of `RpcObject` are resolved with the task id and the
+            # queue depth of the agent
+            if isinstance(task_id, tuple):
+                task_id, self._queue_depth = task_id
+            return task_id
         except Exception as e:
             logger.error(
                 f"Failed to get task_id: {self._stub.result()}",
@@ -3,7 +3,7 @@
 
 import json
 import os
-from typing import Optional, Sequence, Union, Generator, Any
+from typing import Optional, Sequence, Tuple, Union, Generator, Any
 from concurrent.futures import ThreadPoolExecutor
 from loguru import logger
 
@@ -29,6 +29,7 @@ from ..exception import AgentServerNotAliveError
 from ..constants import _DEFAULT_RPC_OPTIONS, _DEFAULT_RPC_TIMEOUT
 from ..exception import AgentCallError, AgentCreationError
 from ..manager import FileManager
+from ..tracing import get_traceparent
 
 
 class RpcClient:
@@ -83,17 +84,56 @@ class RpcClient:
         Returns:
             bytes: serialized return data.
         """
+        return self._call_agent_func(func_name, agent_id, value, timeout).value
+
+    def call_agent_async_func(
+        self,
+        func_name: str,
+        agent_id: str,
+        value: Optional[bytes] = None,
+        timeout: int = 300,
+    ) -> Tuple[bytes, int]:
+        """Submit a call of an async function of an agent running on the
+        server.
+
+        Args:
+            func_name (`str`): The name of the function being called.
+            value (`bytes`, optional): The serialized function input value.
+            Defaults to None.
+            timeout (`int`, optional): The timeout for the RPC call in seconds.
+            Defaults to 300.
+
+        Returns:
+            `Tuple[bytes, int]`: The serialized task id, and the number of
+            calls waiting in the mailbox of the agent (including this one)
+            when the call is submitted.
+        """
+        response = self._call_agent_func(func_name, agent_id, value, timeout)
+        return response.value, response.queue_depth
+
+    def _call_agent_func(
+        self,
+        func_name: str,
+        agent_id: str,
+        value: Optional[bytes],
+        timeout: int,
+    ) -> Any:
+        """Call the function of an agent and return the response."""
+        # continue the trace of the current span in the server
+        traceparent = get_traceparent()
         try:
             stub = RpcAgentStub(RpcClient._get_channel(self.url))
-            result_msg = stub.call_agent_func(
+            return stub.call_agent_func(
                 agent_pb2.CallFuncRequest(
                     target_func=func_name,
                     value=value,
                     agent_id=agent_id,
                 ),
                 timeout=timeout,
+                metadata=(
+                    (("traceparent", traceparent),) if traceparent else None
+                ),
             )
-            return result_msg.value
         except Exception as e:
             if not self.is_alive():
                 raise AgentServerNotAliveError(
@@ -191,6 +231,57 @@ class RpcClient:
                 ) from e
             raise AgentCreationError(host=self.host, port=self.port) from e
 
+    def create_agents(
+        self,
+        agents: Sequence[tuple[Union[dict, bytes], str]],
+    ) -> list[bool]:
+        """Create multiple agents on the server with one rpc call.
+
+        Args:
+            agents (`Sequence[tuple[Union[dict, bytes], str]]`): The init
+                configs (generated by `RpcMeta`, optionally already
+                serialized) and agent_id of the agents to be created.
+
+        Returns:
+            `list[bool]`: Whether the creation of each agent is successful.
+        """
+        requests = [
+            agent_pb2.CreateAgentRequest(
+                agent_id=agent_id,
+                agent_init_args=(
+                    agent_configs
+                    if isinstance(agent_configs, bytes)
+                    else pickle.dumps(agent_configs)
+                ),
+            )
+            for agent_configs, agent_id in agents
+        ]
+        try:
+            stub = RpcAgentStub(RpcClient._get_channel(self.url))
+            try:
+                results = stub.create_agents(
+                    agent_pb2.CreateAgentsRequest(agents=requests),
+                ).results
+            except grpc.RpcError as e:
+                if e.code() != grpc.StatusCode.UNIMPLEMENTED:
+                    raise
+                # the server is an older version without batch creation
+                results = [stub.create_agent(req) for req in requests]
+        except Exception as e:
+            if not self.is_alive():
+                raise AgentServerNotAliveError(
+                    host=self.host,
+                    port=self.port,
+                    message=str(e),
+                ) from e
+            raise AgentCreationError(host=self.host, port=self.port) from e
+        for status in results:
+            if not status.ok:
+                logger.error(
+                    f"Error when creating agent: {status.message}",
+                )
+        return [status.ok for status in results]
+
     def delete_agent(
         self,
         agent_id: str = None,
@@ -346,6 +437,18 @@ class RpcClient:
         )
 
 
+def _reset_executor_after_fork() -> None:
+    """Threads of the shared executor don't survive `fork`, so the child
+    process needs its own executor."""
+    RpcClient._EXECUTOR = ThreadPoolExecutor(  # pylint: disable=W0212
+        max_workers=32,
+    )
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_executor_after_fork)
+
+
 class RpcAgentClient(RpcClient):
     """`RpcAgentClient` has renamed to `RpcClient`.
     This class is kept for backward compatibility, please use `RpcClient`
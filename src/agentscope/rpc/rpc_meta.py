@@ -5,10 +5,35 @@ from typing import Any, Callable
 import uuid
 from loguru import logger
 
-from .rpc_object import RpcObject, _ClassInfo
 from .retry_strategy import RetryBase, _DEFAULT_RETRY_STRATEGY
 
 
+class _ClassInfo:
+    def __init__(self) -> None:
+        self.async_func = set()
+        self.sync_func = set()
+        # TODO: we don't record attributes here, because we don't know how to
+        # handle them for now.
+
+    def update(self, info: "_ClassInfo") -> None:
+        """Update the class info with the given info."""
+        self.async_func.update(info.async_func)
+        self.sync_func.update(info.sync_func)
+
+    def detect(self, attrs: dict) -> None:
+        """Detect the public async/sync method in the given attrs."""
+        for key, value in attrs.items():
+            if callable(value):
+                if getattr(value, "_is_async", False):
+                    # add all functions with @async_func to the async_func set
+                    self.async_func.add(key)
+                elif getattr(value, "_is_sync", False) or not key.startswith(
+                    "_",
+                ):
+                    # add all other public functions to the sync_func set
+                    self.sync_func.add(key)
+
+
 # Decorator for async and sync functions
 
 
@@ -87,6 +112,9 @@ class RpcMeta(ABCMeta):
         if to_dist is True:
             to_dist = {}
         if to_dist is not False and to_dist is not None:
+            # imported here to avoid importing grpc for local agents
+            from .rpc_object import RpcObject
+
             if cls is not RpcObject:
                 return RpcObject(
                     cls=cls,
@@ -210,6 +238,7 @@ class RpcMeta(ABCMeta):
             `RpcObject`: the wrapped agent instance with distributed
             functionality
         """
+        from .rpc_object import RpcObject
 
         if isinstance(self, RpcObject):
             return self
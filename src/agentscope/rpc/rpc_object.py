@@ -5,7 +5,9 @@ from typing import Any, Callable, Union
 from abc import ABC
 from inspect import getmembers, isfunction
 from types import FunctionType
-from concurrent.futures import ThreadPoolExecutor, Future
+from concurrent.futures import Future
+import contextvars
+import os
 import threading
 
 try:
@@ -19,6 +21,7 @@ from .rpc_client import RpcClient
 from .rpc_async import AsyncResult
 from .retry_strategy import RetryBase, _DEFAULT_RETRY_STRATEGY
 from ..exception import AgentCreationError, AgentServerNotAliveError
+from ..tracing import start_span
 
 
 def get_public_methods(cls: type) -> list[str]:
@@ -47,30 +50,184 @@ def _call_func_in_thread(func: Callable, *args: Any, **kwargs: Any) -> Any:
     return future
 
 
-class _ClassInfo:
-    def __init__(self) -> None:
-        self.async_func = set()
-        self.sync_func = set()
-        # TODO: we don't record attributes here, because we don't know how to
-        # handle them for now.
-
-    def update(self, info: _ClassInfo) -> None:
-        """Update the class info with the given info."""
-        self.async_func.update(info.async_func)
-        self.sync_func.update(info.sync_func)
-
-    def detect(self, attrs: dict) -> None:
-        """Detect the public async/sync method in the given attrs."""
-        for key, value in attrs.items():
-            if callable(value):
-                if getattr(value, "_is_async", False):
-                    # add all functions with @async_func to the async_func set
-                    self.async_func.add(key)
-                elif getattr(value, "_is_sync", False) or not key.startswith(
-                    "_",
-                ):
-                    # add all other public functions to the sync_func set
-                    self.sync_func.add(key)
+class _CreationBatcher:
+    """Merge the `create_agent` calls to the same server into bulk creation
+    rpc calls.
+
+    Requests submitted while a bulk call is in flight are collected and
+    sent together in the next call, so creating many objects costs a few
+    rpc calls instead of one call (and one thread) per object.
+    """
+
+    _BATCHERS: dict[str, _CreationBatcher] = {}
+    _BATCHERS_LOCK = threading.Lock()
+
+    def __init__(self, client: RpcClient) -> None:
+        self.client = client
+        self._pending: list[tuple[bytes, str, Future]] = []
+        self._lock = threading.Lock()
+        self._flushing = False
+
+    @classmethod
+    def get(cls, client: RpcClient) -> _CreationBatcher:
+        """Get the batcher of the server that the client connects to."""
+        with cls._BATCHERS_LOCK:
+            if client.url not in cls._BATCHERS:
+                cls._BATCHERS[client.url] = _CreationBatcher(client)
+            return cls._BATCHERS[client.url]
+
+    def submit(self, configs: dict, oid: str) -> Future:
+        """Request to create an object, the returned future is resolved
+        with the result of `RpcClient.create_agent`."""
+        future = Future()
+        # serialize in the caller thread, since the configs may contain
+        # other objects whose creation is still pending in this batcher
+        data = pickle.dumps(configs)
+        with self._lock:
+            self._pending.append((data, oid, future))
+            if not self._flushing:
+                self._flushing = True
+                RpcClient._EXECUTOR.submit(  # pylint: disable=W0212
+                    self._flush,
+                )
+        return future
+
+    def _flush(self) -> None:
+        while True:
+            with self._lock:
+                batch, self._pending = self._pending, []
+                if not batch:
+                    self._flushing = False
+                    return
+            try:
+                results = self.client.create_agents(
+                    [(configs, oid) for configs, oid, _ in batch],
+                )
+                for (_, _, future), result in zip(batch, results):
+                    future.set_result(result)
+            except Exception as err:
+                for _, _, future in batch:
+                    future.set_exception(err)
+
+
+class _LocalServerPool:
+    """Agent servers launched automatically for `RpcObject`s created without
+    a port.
+
+    Instead of launching a dedicated server for every object, servers are
+    shared by objects of the same class (and launch settings). A new server
+    is launched only when the least loaded one holds `capacity` objects and
+    the number of servers is below `max_servers`, otherwise the least
+    loaded server is reused. A server is shut down when the last object
+    using it is stopped.
+    """
+
+    def __init__(self, max_servers: int = None, capacity: int = 32) -> None:
+        """Init the pool.
+
+        Args:
+            max_servers (`int`, defaults to `None`):
+                Max number of servers launched for the same class. Defaults
+                to the number of cpus.
+            capacity (`int`, defaults to `32`):
+                The capacity of each launched server, which is also the
+                number of objects placed on a server before another one is
+                launched.
+        """
+        self.max_servers = max_servers or os.cpu_count() or 1
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        self._servers: dict[tuple, list[list]] = {}
+
+    def acquire(self, cls: type, **launch_kwargs: Any) -> Any:
+        """Get a launched server for objects of `cls`.
+
+        Returns:
+            `RpcAgentServerLauncher`: the launcher of the server.
+        """
+        from ..server import RpcAgentServerLauncher
+
+        key = (cls, tuple(sorted(launch_kwargs.items())))
+        with self._lock:
+            servers = self._servers.setdefault(key, [])
+            # drop servers that have exited unexpectedly, the servers being
+            # launched have no process yet
+            servers[:] = [
+                s
+                for s in servers
+                if s[0].server is None or s[0].server.is_alive()
+            ]
+            if servers:
+                entry = min(servers, key=lambda s: s[1])
+            launching = not servers or (
+                entry[1] >= self.capacity and len(servers) < self.max_servers
+            )
+            if launching:
+                launcher = RpcAgentServerLauncher(
+                    host="localhost",
+                    port=None,
+                    capacity=self.capacity,
+                    custom_agent_classes=[cls],
+                    **launch_kwargs,
+                )
+                # the objects acquiring the server during the launch wait
+                # for the future
+                entry = [launcher, 0, Future()]
+                servers.append(entry)
+            entry[1] += 1
+
+        # launch the server without the lock, so that the other objects
+        # don't wait for it
+        if launching:
+            try:
+                entry[0].launch()
+            except Exception as err:
+                with self._lock:
+                    if entry in servers:
+                        servers.remove(entry)
+                entry[2].set_exception(err)
+                raise
+            entry[2].set_result(None)
+        else:
+            entry[2].result()
+        return entry[0]
+
+    def release(self, launcher: Any) -> None:
+        """Release a server acquired by `acquire`, and shut it down if it's
+        no longer used by any object."""
+        unused = False
+        with self._lock:
+            for servers in self._servers.values():
+                for entry in servers:
+                    if entry[0] is launcher:
+                        entry[1] -= 1
+                        if entry[1] <= 0:
+                            servers.remove(entry)
+                            unused = True
+                        break
+                else:
+                    continue
+                break
+        # shut down without the lock, so that the other objects don't wait
+        # for it
+        if unused:
+            launcher.shutdown()
+
+
+_LOCAL_SERVER_POOL = _LocalServerPool()
+
+
+def _reset_after_fork() -> None:
+    """The batchers and servers of the parent process are not usable in a
+    forked child process."""
+    global _LOCAL_SERVER_POOL
+    _CreationBatcher._BATCHERS = {}  # pylint: disable=W0212
+    _CreationBatcher._BATCHERS_LOCK = threading.Lock()  # pylint: disable=W0212
+    _LOCAL_SERVER_POOL = _LocalServerPool()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
 
 
 class RpcObject(ABC):
@@ -128,7 +285,6 @@ class RpcObject(ABC):
         self._oid = oid
         self._cls = cls
         self.connect_existing = connect_existing
-        self.executor = ThreadPoolExecutor(max_workers=1)
         if isinstance(retry_strategy, RetryBase):
             self.retry_strategy = retry_strategy
         else:
@@ -148,23 +304,18 @@ class RpcObject(ABC):
         launch_server = self.port is None
         self.server_launcher = None
         if launch_server:
-            from ..server import RpcAgentServerLauncher
-
             # check studio first
             self.host = "localhost"
             studio_url = None
             if _studio_client.active:
                 studio_url = _studio_client.studio_url
-            self.server_launcher = RpcAgentServerLauncher(
-                host=self.host,
-                port=self.port,
-                capacity=2,
+            self.server_launcher = _LOCAL_SERVER_POOL.acquire(
+                cls,
                 max_pool_size=max_pool_size,
                 max_expire_time=max_expire_time,
                 max_timeout_seconds=max_timeout_seconds,
                 local_mode=local_mode,
-                custom_agent_classes=[cls],
-                studio_url=studio_url,  # type: ignore[arg-type]
+                studio_url=studio_url,
             )
             self._launch_server()
         else:
@@ -178,8 +329,7 @@ class RpcObject(ABC):
 
     def create(self, configs: dict) -> None:
         """create the object on the rpc server."""
-        self._creating_stub = _call_func_in_thread(
-            self.client.create_agent,
+        self._creating_stub = _CreationBatcher.get(self.client).submit(
             configs,
             self._oid,
         )
@@ -202,8 +352,8 @@ class RpcObject(ABC):
         return self._call_func("__getitem__", {"args": (item,)})
 
     def _launch_server(self) -> None:
-        """Launch a rpc server and update the port and the client"""
-        self.server_launcher.launch()
+        """Connect to the launched rpc server and update the port and the
+        client"""
         self.port = self.server_launcher.port
         self.client = RpcClient(
             host=self.host,
@@ -213,9 +363,11 @@ class RpcObject(ABC):
             raise AgentServerNotAliveError(self.host, self.port)
 
     def stop(self) -> None:
-        """Stop the RpcAgent and the rpc server."""
+        """Stop the RpcAgent and the rpc server if it was launched
+        automatically and is no longer used by other objects."""
         if self.server_launcher is not None:
-            self.server_launcher.shutdown()
+            launcher, self.server_launcher = self.server_launcher, None
+            _LOCAL_SERVER_POOL.release(launcher)
 
     def _check_created(self) -> None:
         """Check if the object is created on the rpc server."""
@@ -229,23 +381,50 @@ class RpcObject(ABC):
 
     def _call_func(self, func_name: str, args: dict) -> Any:
         """Call a function in rpc server."""
-        return pickle.loads(
-            self.client.call_agent_func(
+        with start_span(
+            f"rpc {self._cls.__name__}.{func_name}",
+            "client",
+            agent_id=self._oid,
+            server=f"{self.host}:{self.port}",
+        ):
+            return pickle.loads(
+                self.client.call_agent_func(
+                    agent_id=self._oid,
+                    func_name=func_name,
+                    value=pickle.dumps(args),
+                ),
+            )
+
+    def _call_async_func(self, func_name: str, args: dict) -> tuple:
+        """Submit a call of an async function in rpc server, and return the
+        task id and the queue depth of the agent."""
+        with start_span(
+            f"rpc {self._cls.__name__}.{func_name}",
+            "client",
+            agent_id=self._oid,
+            server=f"{self.host}:{self.port}",
+        ):
+            task_id, queue_depth = self.client.call_agent_async_func(
                 agent_id=self._oid,
                 func_name=func_name,
                 value=pickle.dumps(args),
-            ),
-        )
+            )
+            return pickle.loads(task_id), queue_depth
 
     def _async_func(self, name: str) -> Callable:
         def async_wrapper(*args, **kwargs) -> Any:  # type: ignore[no-untyped-def]
+            # run in the current context to keep the current span as the
+            # parent
+            context = contextvars.copy_context()
             return AsyncResult(
                 host=self.host,
                 port=self.port,
-                stub=_call_func_in_thread(
-                    self._call_func,
-                    func_name=name,
-                    args={"args": args, "kwargs": kwargs},
+                stub=RpcClient._EXECUTOR.submit(  # pylint: disable=W0212
+                    lambda: context.run(
+                        self._call_async_func,
+                        func_name=name,
+                        args={"args": args, "kwargs": kwargs},
+                    ),
                 ),
                 retry=self.retry_strategy,
             )
@@ -1,7 +1,11 @@
 # -*- coding: utf-8 -*-
 """A pool used to store the async result."""
 import threading
+import time
 from abc import ABC, abstractmethod
+from typing import Any, Sequence
+
+from loguru import logger
 
 try:
     import redis
@@ -34,12 +38,12 @@ class AsyncResultPool(ABC):
         """
 
     @abstractmethod
-    def get(self, key: int, timeout: int = 5) -> bytes:
+    def get(self, key: int, timeout: float = 5) -> bytes:
         """Get a value from the pool.
 
         Args:
             key (`int`): The key of the value
-            timeout (`int`): The timeout seconds to wait for the value.
+            timeout (`float`): The timeout seconds to wait for the value.
 
         Returns:
             `bytes`: The value
@@ -48,6 +52,25 @@ class AsyncResultPool(ABC):
             `TimeoutError`: When the timeout is reached.
         """
 
+    def get_many(self, keys: Sequence[int], timeout: float = 5) -> list[bytes]:
+        """Get multiple values from the pool.
+
+        Args:
+            keys (`Sequence[int]`): The keys of the values.
+            timeout (`float`): The timeout seconds to wait for all the values.
+
+        Returns:
+            `list[bytes]`: The values in the same order as `keys`.
+
+        Raises:
+            `TimeoutError`: When the timeout is reached.
+        """
+        deadline = time.time() + timeout
+        return [
+            self.get(key, timeout=max(deadline - time.time(), 0))
+            for key in keys
+        ]
+
 
 class LocalPool(AsyncResultPool):
     """Local pool for storing results."""
@@ -76,7 +99,7 @@ class LocalPool(AsyncResultPool):
         with cond:
             cond.notify_all()
 
-    def get(self, key: int, timeout: int = 5) -> bytes:
+    def get(self, key: int, timeout: float = 5) -> bytes:
         """Get the value with timeout"""
         value = self.pool.get(key)
         if isinstance(value, threading.Condition):
@@ -92,15 +115,23 @@ class LocalPool(AsyncResultPool):
 
 
 class RedisPool(AsyncResultPool):
-    """Redis pool for storing results."""
+    """Redis pool for storing results.
+
+    Results are written with a single transaction that stores the value and
+    publishes the key to a notification channel. All pending `get` calls of
+    the pool share one pub/sub connection, which is listened by a
+    background thread, instead of blocking a connection per waiter.
+    """
 
     INCR_KEY = "as_obj_id"
-    TASK_QUEUE_PREFIX = "as_task_"
+    NOTIFY_CHANNEL = "as_task_done"
+    ID_BLOCK_SIZE = 64
 
     def __init__(
         self,
         url: str,
         max_expire: int,
+        max_connections: int = 64,
     ) -> None:
         """
         Init redis pool.
@@ -109,51 +140,145 @@ class RedisPool(AsyncResultPool):
             url (`str`): The url of the redis server.
             max_expire (`int`): The max timeout of the result in the pool,
             when it is reached, the oldest item will be removed.
+            max_connections (`int`, defaults to `64`): The max number of
+            connections to the redis server. Callers wait for a free
+            connection when the limit is reached.
         """
         try:
-            self.pool = redis.from_url(url)
+            self.pool = redis.Redis(
+                connection_pool=redis.BlockingConnectionPool.from_url(
+                    url,
+                    max_connections=max_connections,
+                ),
+            )
             self.pool.ping()
         except Exception as e:
             raise ConnectionError(
                 f"Redis server at [{url}] is not available.",
             ) from e
         self.max_expire = max_expire
+        # object ids are reserved from redis in blocks
+        self._id_lock = threading.Lock()
+        self._next_id = 0
+        self._id_limit = 0
+        # waiters of the keys, which are woken up by the listener thread
+        self._waiters: dict[int, list[threading.Event]] = {}
+        self._waiter_lock = threading.Lock()
+        self._pubsub = None
+        self._listener = None
 
     def _get_object_id(self) -> int:
-        return self.pool.incr(RedisPool.INCR_KEY)
+        with self._id_lock:
+            if self._next_id >= self._id_limit:
+                self._id_limit = self.pool.incrby(
+                    RedisPool.INCR_KEY,
+                    RedisPool.ID_BLOCK_SIZE,
+                )
+                self._next_id = self._id_limit - RedisPool.ID_BLOCK_SIZE
+            self._next_id += 1
+            return self._next_id
 
     def prepare(self) -> int:
         return self._get_object_id()
 
     def set(self, key: int, value: bytes) -> None:
-        qkey = RedisPool.TASK_QUEUE_PREFIX + str(key)
-        self.pool.set(key, value, ex=self.max_expire)
-        self.pool.rpush(qkey, key)
-        self.pool.expire(qkey, self.max_expire)
-
-    def get(self, key: int, timeout: int = 5) -> bytes:
-        result = self.pool.get(key)
-        if result:
-            return result
-        else:
-            keys = self.pool.blpop(
-                keys=RedisPool.TASK_QUEUE_PREFIX + str(key),
-                timeout=timeout,
-            )
-            if keys is None:
-                raise TimeoutError(
-                    f"Waiting timeout for async result of task[{key}]",
+        with self.pool.pipeline(transaction=True) as pipe:
+            pipe.set(key, value, ex=self.max_expire)
+            pipe.publish(RedisPool.NOTIFY_CHANNEL, key)
+            pipe.execute()
+
+    def _ensure_listener(self) -> None:
+        """Subscribe to the notification channel and start the listener
+        thread if they are not ready yet. Should be called with
+        `_waiter_lock` held."""
+        if self._listener is not None and self._listener.is_alive():
+            return
+        pubsub = self.pool.pubsub()
+        pubsub.subscribe(RedisPool.NOTIFY_CHANNEL)
+        # wait for the confirmation, so that no notification published after
+        # this point can be missed
+        while True:
+            msg = pubsub.get_message(timeout=5)
+            if msg is None:
+                pubsub.close()
+                raise ConnectionError(
+                    "Failed to subscribe to the notification channel.",
                 )
-            self.pool.rpush(RedisPool.TASK_QUEUE_PREFIX + str(key), key)
-            if int(keys[1]) == key:
-                res = self.pool.get(key)
-                if res is None:
+            if msg["type"] == "subscribe":
+                break
+        self._pubsub = pubsub
+        self._listener = threading.Thread(
+            target=self._listen,
+            args=(pubsub,),
+            daemon=True,
+        )
+        self._listener.start()
+
+    def _listen(self, pubsub: Any) -> None:
+        """Wake up the waiters of the keys published to the channel."""
+        try:
+            while True:
+                msg = pubsub.get_message(timeout=1)
+                if msg is None or msg["type"] != "message":
+                    continue
+                with self._waiter_lock:
+                    events = self._waiters.get(int(msg["data"]), ())
+                    for event in events:
+                        event.set()
+        except Exception as e:
+            logger.warning(f"Redis notification listener stopped: {e}")
+            with self._waiter_lock:
+                # let the waiters check the values by themselves
+                for events in self._waiters.values():
+                    for event in events:
+                        event.set()
+
+    def _add_waiter(self, key: int, event: threading.Event) -> None:
+        with self._waiter_lock:
+            self._ensure_listener()
+            self._waiters.setdefault(key, []).append(event)
+
+    def _remove_waiter(self, key: int, event: threading.Event) -> None:
+        with self._waiter_lock:
+            events = self._waiters.get(key)
+            if events is None:
+                return
+            events.remove(event)
+            if not events:
+                self._waiters.pop(key)
+
+    def get(self, key: int, timeout: float = 5) -> bytes:
+        return self.get_many([key], timeout=timeout)[0]
+
+    def get_many(self, keys: Sequence[int], timeout: float = 5) -> list[bytes]:
+        values = dict(zip(keys, self.pool.mget(keys)))
+        missing = [k for k, v in values.items() if v is None]
+        if not missing:
+            return [values[k] for k in keys]
+        deadline = time.time() + timeout
+        event = threading.Event()
+        waiting = list(missing)
+        for k in waiting:
+            self._add_waiter(k, event)
+        try:
+            while True:
+                # check again after the waiter is registered, in case the
+                # value is set in between
+                for k, v in zip(missing, self.pool.mget(missing)):
+                    values[k] = v
+                missing = [k for k in missing if values[k] is None]
+                if not missing:
+                    return [values[k] for k in keys]
+                remaining = deadline - time.time()
+                if remaining <= 0 or not event.wait(remaining):
                     raise TimeoutError(
-                        f"Async Result of task[{key}] not found.",
+                        f"Waiting timeout for async result of tasks "
+                        f"{missing}",
                     )
-                return res
-            else:
-                raise TimeoutError(f"Async Result of task[{key}] not found.")
+                event.clear()
+        finally:
+            for k in waiting:
+                self._remove_waiter(k, event)
 
 
 def get_pool(
@@ -161,6 +286,7 @@ def get_pool(
     max_expire: int = 7200,
     max_len: int = 8192,
     redis_url: str = "redis://localhost:6379",
+    max_connections: int = 64,
 ) -> AsyncResultPool:
     """Get the pool according to the type.
 
@@ -171,8 +297,14 @@ def get_pool(
             when it is reached, the oldest item will be removed.
         max_len (`int`): The max length of the pool.
         redis_url (`str`): The address of the redis server.
+        max_connections (`int`): The max number of connections to the redis
+            server, only used by the redis pool.
     """
     if pool_type == "redis":
-        return RedisPool(url=redis_url, max_expire=max_expire)
+        return RedisPool(
+            url=redis_url,
+            max_expire=max_expire,
+            max_connections=max_connections,
+        )
     else:
         return LocalPool(max_len=max_len, max_expire=max_expire)
@@ -1,5 +1,5 @@
 # -*- coding: utf-8 -*-
-""" Server of distributed agent"""
+"""Server of distributed agent"""
 import os
 import sys
 import asyncio
@@ -8,8 +8,10 @@ import argparse
 import time
 import importlib
 import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from multiprocessing import Process, Event, Pipe
 from multiprocessing.synchronize import Event as EventClass
+from threading import Thread
 from concurrent import futures
 from loguru import logger
 
@@ -31,6 +33,62 @@ from ..rpc.rpc_meta import RpcMeta
 from ..server.servicer import AgentServerServicer
 from ..utils.common import _check_port, _generate_id_from_seed
 from ..constants import _DEFAULT_RPC_OPTIONS
+from ..tracing._tracer import _tracer
+from ..profiling._profiler import _profiler
+from ..manager._replay import _recorder
+from ..logging import flush_chat_log
+
+
+def _start_metrics_server(
+    host: str,
+    port: int,
+    server_id: str,
+) -> ThreadingHTTPServer:
+    """Serve the model metrics of the agent server at `/metrics` in the
+    Prometheus text format, in a daemon thread.
+
+    Args:
+        host (`str`):
+            The host to listen to.
+        port (`int`):
+            The port of the metrics endpoint.
+        server_id (`str`):
+            The id of the agent server, added as a label of the samples.
+    """
+    from agentscope.manager import MonitorManager
+
+    class _MetricsHandler(BaseHTTPRequestHandler):
+        """Respond the metrics of the monitor."""
+
+        def do_GET(self) -> None:  # pylint: disable=C0103
+            """Handle the GET requests."""
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = (
+                MonitorManager.get_instance()
+                .metrics.to_prometheus({"server_id": server_id})
+                .encode("utf-8")
+            )
+            self.send_response(200)
+            self.send_header(
+                "Content-Type",
+                "text/plain; version=0.0.4; charset=utf-8",
+            )
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args: object) -> None:
+            """Skip logging each scrape."""
+
+    metrics_server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    Thread(target=metrics_server.serve_forever, daemon=True).start()
+    logger.info(
+        f"Serving the metrics of agent server [{server_id}] at "
+        f"http://{host}:{port}/metrics",
+    )
+    return metrics_server
 
 
 def _setup_agent_server(
@@ -43,6 +101,7 @@ def _setup_agent_server(
     pipe: int = None,
     local_mode: bool = True,
     capacity: int = 32,
+    max_concurrency_per_agent: int = 1,
     pool_type: str = "local",
     redis_url: str = "redis://localhost:6379",
     max_pool_size: int = 8192,
@@ -51,6 +110,7 @@ def _setup_agent_server(
     studio_url: str = None,
     custom_agent_classes: list = None,
     agent_dir: str = None,
+    metrics_port: int = None,
 ) -> None:
     """Setup agent server.
 
@@ -75,6 +135,9 @@ def _setup_agent_server(
             Only listen to local requests.
         capacity (`int`, default to `32`):
             The number of concurrent agents in the server.
+        max_concurrency_per_agent (`int`, defaults to `1`):
+            The max number of async calls of the same agent that can run
+            at the same time.
         pool_type (`str`, defaults to `"local"`): The type of the async
             message pool, which can be `local` or `redis`. If `redis` is
             specified, you need to start a redis server before launching
@@ -97,6 +160,9 @@ def _setup_agent_server(
         agent_dir (`str`, defaults to `None`):
             The abs path to the directory containing customized agent python
             files.
+        metrics_port (`int`, defaults to `None`):
+            The port to serve the model metrics at `/metrics` in the
+            Prometheus text format. If `None`, the metrics are not served.
     """
     asyncio.run(
         _setup_agent_server_async(
@@ -109,6 +175,7 @@ def _setup_agent_server(
             pipe=pipe,
             local_mode=local_mode,
             capacity=capacity,
+            max_concurrency_per_agent=max_concurrency_per_agent,
             pool_type=pool_type,
             redis_url=redis_url,
             max_pool_size=max_pool_size,
@@ -117,6 +184,7 @@ def _setup_agent_server(
             studio_url=studio_url,
             custom_classes=custom_agent_classes,
             agent_dir=agent_dir,
+            metrics_port=metrics_port,
         ),
     )
 
@@ -131,6 +199,7 @@ async def _setup_agent_server_async(  # pylint: disable=R0912
     pipe: int = None,
     local_mode: bool = True,
     capacity: int = 32,
+    max_concurrency_per_agent: int = 1,
     pool_type: str = "local",
     redis_url: str = "redis://localhost:6379",
     max_pool_size: int = 8192,
@@ -139,6 +208,7 @@ async def _setup_agent_server_async(  # pylint: disable=R0912
     studio_url: str = None,
     custom_classes: list = None,
     agent_dir: str = None,
+    metrics_port: int = None,
 ) -> None:
     """Setup agent server in an async way.
 
@@ -161,6 +231,9 @@ async def _setup_agent_server_async(  # pylint: disable=R0912
             listen to requests from all hosts.
         capacity (`int`, default to `32`):
             The number of concurrent agents in the server.
+        max_concurrency_per_agent (`int`, defaults to `1`):
+            The max number of async calls of the same agent that can run
+            at the same time.
         pool_type (`str`, defaults to `"local"`): The type of the async
             message pool, which can be `local` or `redis`. If `redis` is
             specified, you need to start a redis server before launching
@@ -185,6 +258,9 @@ async def _setup_agent_server_async(  # pylint: disable=R0912
         agent_dir (`str`, defaults to `None`):
             The abs path to the directory containing customized agent python
             files.
+        metrics_port (`int`, defaults to `None`):
+            The port to serve the model metrics at `/metrics` in the
+            Prometheus text format. If `None`, the metrics are not served.
     """
 
     if init_settings is not None:
@@ -199,12 +275,17 @@ async def _setup_agent_server_async(  # pylint: disable=R0912
         server_id=server_id,
         studio_url=studio_url,
         capacity=capacity,
+        max_concurrency_per_agent=max_concurrency_per_agent,
         pool_type=pool_type,
         redis_url=redis_url,
         max_pool_size=max_pool_size,
         max_expire_time=max_expire_time,
         max_timeout_seconds=max_timeout_seconds,
     )
+    # register the built-in agents, which aren't imported by the server
+    # modules since they're imported on demand, and take precedence over the
+    # custom classes with the same names
+    importlib.import_module("agentscope.agents")
     if custom_classes is None:
         custom_classes = []
     if agent_dir is not None:
@@ -245,6 +326,7 @@ async def _setup_agent_server_async(  # pylint: disable=R0912
             else:
                 server.add_insecure_port(f"0.0.0.0:{port}")
             await server.start()
+            servicer.register_local()
             break
         except OSError:
             logger.warning(
@@ -254,20 +336,41 @@ async def _setup_agent_server_async(  # pylint: disable=R0912
     logger.info(
         f"agent server [{server_id}] at {host}:{port} started successfully",
     )
+    metrics_server = None
+    if metrics_port is not None:
+        metrics_server = _start_metrics_server(
+            "localhost" if local_mode else "0.0.0.0",
+            metrics_port,
+            server_id,
+        )
     if start_event is not None:
         pipe.send(port)
         start_event.set()
     while not stop_event.is_set():
         await asyncio.sleep(1)
+        _tracer.force_flush()
     logger.info(
         f"Stopping agent server at [{host}:{port}]",
     )
     await server.stop(grace=10.0)
+    if metrics_server is not None:
+        metrics_server.shutdown()
+    servicer.unregister_local()
+    _flush_before_exit()
     logger.info(
         f"agent server [{server_id}] at {host}:{port} stopped successfully",
     )
 
 
+def _flush_before_exit() -> None:
+    """Flush the traces, the profile, the recorded calls and the chat log,
+    since the server process may exit without calling the atexit handlers."""
+    _tracer.force_flush()
+    _profiler.write()
+    _recorder.force_flush()
+    flush_chat_log()
+
+
 def load_custom_class_from_file(agent_file: str) -> list:
     """Load AgentBase sub classes from a python file.
 
@@ -335,6 +438,7 @@ class RpcAgentServerLauncher:
         host: str = "localhost",
         port: int = None,
         capacity: int = 32,
+        max_concurrency_per_agent: int = 1,
         pool_type: str = "local",
         redis_url: str = "redis://localhost:6379",
         max_pool_size: int = 8192,
@@ -345,6 +449,7 @@ class RpcAgentServerLauncher:
         custom_agent_classes: list = None,
         server_id: str = None,
         studio_url: str = None,
+        metrics_port: int = None,
     ) -> None:
         """Init a launcher of agent server.
 
@@ -355,6 +460,9 @@ class RpcAgentServerLauncher:
                 Socket port of the agent server.
             capacity (`int`, default to `32`):
                 The number of concurrent agents in the server.
+            max_concurrency_per_agent (`int`, defaults to `1`):
+                The max number of async calls of the same agent that can run
+                at the same time.
             pool_type (`str`, defaults to `"local"`): The type of the async
                 message pool, which can be `local` or `redis`. If `redis` is
                 specified, you need to start a redis server before launching
@@ -383,10 +491,15 @@ class RpcAgentServerLauncher:
                 will be generated.
             studio_url (`Optional[str]`, defaults to `None`):
                 The url of the agentscope studio.
+            metrics_port (`int`, defaults to `None`):
+                The port to serve the model metrics at `/metrics` in the
+                Prometheus text format. If `None`, the metrics are not
+                served.
         """
         self.host = host
         self.port = _check_port(port)
         self.capacity = capacity
+        self.max_concurrency_per_agent = max_concurrency_per_agent
         self.pool_type = pool_type
         self.redis_url = redis_url
         self.max_pool_size = max_pool_size
@@ -406,6 +519,7 @@ class RpcAgentServerLauncher:
             else server_id
         )
         self.studio_url = studio_url
+        self.metrics_port = metrics_port
 
     @classmethod
     def generate_server_id(cls, host: str, port: int) -> str:
@@ -422,6 +536,7 @@ class RpcAgentServerLauncher:
                 host=self.host,
                 port=self.port,
                 capacity=self.capacity,
+                max_concurrency_per_agent=self.max_concurrency_per_agent,
                 stop_event=self.stop_event,
                 server_id=self.server_id,
                 pool_type=self.pool_type,
@@ -433,6 +548,7 @@ class RpcAgentServerLauncher:
                 custom_classes=self.custom_agent_classes,
                 agent_dir=self.agent_dir,
                 studio_url=self.studio_url,
+                metrics_port=self.metrics_port,
             ),
         )
 
@@ -463,6 +579,8 @@ class RpcAgentServerLauncher:
                 "start_event": start_event,
                 "stop_event": self.stop_event,
                 "pipe": child_con,
+                "capacity": self.capacity,
+                "max_concurrency_per_agent": self.max_concurrency_per_agent,
                 "pool_type": self.pool_type,
                 "redis_url": self.redis_url,
                 "max_pool_size": self.max_pool_size,
@@ -472,6 +590,7 @@ class RpcAgentServerLauncher:
                 "studio_url": self.studio_url,
                 "custom_agent_classes": self.custom_agent_classes,
                 "agent_dir": self.agent_dir,
+                "metrics_port": self.metrics_port,
             },
         )
         server_process.start()
@@ -525,6 +644,8 @@ def as_server() -> None:
         * `--host`: the hostname of the server.
         * `--port`: the socket port of the server.
         * `--capacity`: the number of concurrent agents in the server.
+        * `--max-concurrency-per-agent`: the max number of async calls of the
+          same agent that can run at the same time, defaults to 1.
         * `--pool-type`: the type of the async message pool, which can be
           `local` or `redis`. If `redis` is specified, you need to start a
           redis server before launching the server. Defaults to `local`.
@@ -541,6 +662,8 @@ def as_server() -> None:
         * `--agent-dir`: the directory containing your customized agent python
           files
         * `--studio-url`: the url of agentscope studio
+        * `--metrics-port`: the port to serve the model metrics at
+          `/metrics` in the Prometheus text format
 
         In most cases, you only need to specify the `--host`, `--port` and
         `--model-config-path`, and `--agent-dir`.
@@ -584,6 +707,15 @@ def as_server() -> None:
             "may cause severe performance degradation or even deadlock."
         ),
     )
+    start_parser.add_argument(
+        "--max-concurrency-per-agent",
+        type=int,
+        default=1,
+        help=(
+            "the max number of async calls of the same agent that can run "
+            "at the same time"
+        ),
+    )
     start_parser.add_argument(
         "--pool-type",
         type=str,
@@ -646,6 +778,12 @@ def as_server() -> None:
         default=None,
         help="the url of agentscope studio",
     )
+    start_parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=None,
+        help="the port to serve the model metrics in the Prometheus format",
+    )
     start_parser.add_argument(
         "--agent-dir",
         type=str,
@@ -702,6 +840,7 @@ def as_server() -> None:
             port=args.port,
             server_id=args.server_id,
             capacity=args.capacity,
+            max_concurrency_per_agent=args.max_concurrency_per_agent,
             pool_type=args.pool_type,
             redis_url=args.redis_url,
             max_pool_size=args.max_pool_size,
@@ -709,6 +848,7 @@ def as_server() -> None:
             max_timeout_seconds=args.max_timeout_seconds,
             local_mode=args.local_mode,
             studio_url=args.studio_url,
+            metrics_port=args.metrics_port,
         )
         launcher.launch(in_subprocess=False)
         launcher.wait_until_terminate()
@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+"""An actor-style scheduler used by the agent server to run async calls."""
+import threading
+from collections import deque
+from typing import Any, Callable, Optional
+
+from loguru import logger
+
+
+class _Mailbox:
+    """The ordered mailbox of a single agent."""
+
+    __slots__ = ("tasks", "running", "limit", "scheduled")
+
+    def __init__(self, limit: int) -> None:
+        self.tasks: deque = deque()
+        self.running = 0
+        self.limit = limit
+        # whether the mailbox is already in the ready queue
+        self.scheduled = False
+
+    def dispatchable(self) -> bool:
+        """Whether a task of this mailbox can be started now."""
+        return len(self.tasks) > 0 and self.running < self.limit
+
+
+class MailboxScheduler:
+    """A scheduler that keeps one ordered mailbox per agent and dispatches
+    tasks across agents in a round-robin manner.
+
+    Tasks submitted to the same agent are started in the order they are
+    received, and at most `max_concurrency_per_agent` of them run at the
+    same time (by default one, so that the memory of an agent is never
+    modified concurrently). Agents with pending tasks are served in turn,
+    therefore a single slow or busy agent cannot occupy all worker threads
+    of the server.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 32,
+        max_concurrency_per_agent: int = 1,
+    ) -> None:
+        """Init the scheduler.
+
+        Args:
+            capacity (`int`, defaults to `32`):
+                The number of worker threads.
+            max_concurrency_per_agent (`int`, defaults to `1`):
+                The default max number of tasks of the same agent that can
+                run concurrently.
+        """
+        if capacity < 1:
+            raise ValueError(f"capacity must be positive, got {capacity}")
+        if max_concurrency_per_agent < 1:
+            raise ValueError(
+                "max_concurrency_per_agent must be positive, got "
+                f"{max_concurrency_per_agent}",
+            )
+        self.capacity = capacity
+        self.max_concurrency_per_agent = max_concurrency_per_agent
+        self._mailboxes: dict[str, _Mailbox] = {}
+        self._limits: dict[str, int] = {}
+        self._ready: deque = deque()
+        self._cond = threading.Condition()
+        self._workers: list[threading.Thread] = []
+        self._idle_workers = 0
+        self._pending = 0
+        self._shutdown = False
+
+    def set_limit(self, agent_id: str, limit: Optional[int]) -> None:
+        """Set the max concurrency of a specific agent.
+
+        Args:
+            agent_id (`str`): The id of the agent.
+            limit (`Optional[int]`): The max number of concurrent tasks of
+                the agent. Use `None` to restore the default value.
+        """
+        if limit is not None and limit < 1:
+            raise ValueError(f"limit must be positive, got {limit}")
+        with self._cond:
+            if limit is None:
+                self._limits.pop(agent_id, None)
+                limit = self.max_concurrency_per_agent
+            else:
+                self._limits[agent_id] = limit
+            mailbox = self._mailboxes.get(agent_id)
+            if mailbox is not None:
+                mailbox.limit = limit
+                self._schedule(agent_id, mailbox)
+
+    def remove_agent(self, agent_id: str) -> None:
+        """Forget the concurrency setting of an agent. Tasks that are
+        already queued are still executed."""
+        with self._cond:
+            self._limits.pop(agent_id, None)
+
+    def queue_depth(self, agent_id: str = None) -> int:
+        """Get the number of tasks that are waiting to be started.
+
+        Args:
+            agent_id (`str`, defaults to `None`):
+                The id of the agent. If not specified, the number of all
+                waiting tasks on the server is returned.
+        """
+        with self._cond:
+            if agent_id is None:
+                return self._pending
+            mailbox = self._mailboxes.get(agent_id)
+            return len(mailbox.tasks) if mailbox is not None else 0
+
+    def submit(
+        self,
+        agent_id: str,
+        func: Callable,
+        *args: Any,
+        **kwargs: Any,
+    ) -> int:
+        """Put a task into the mailbox of the agent.
+
+        Args:
+            agent_id (`str`): The id of the agent that the task belongs to.
+            func (`Callable`): The function to be executed.
+
+        Returns:
+            `int`: The number of tasks waiting in the mailbox of the agent
+            (including this one) at the time of submission, which can be used
+            by callers as a back-pressure signal.
+        """
+        with self._cond:
+            if self._shutdown:
+                raise RuntimeError("The scheduler has been shut down.")
+            mailbox = self._mailboxes.get(agent_id)
+            if mailbox is None:
+                mailbox = _Mailbox(
+                    self._limits.get(
+                        agent_id,
+                        self.max_concurrency_per_agent,
+                    ),
+                )
+                self._mailboxes[agent_id] = mailbox
+            mailbox.tasks.append((func, args, kwargs))
+            self._pending += 1
+            depth = len(mailbox.tasks)
+            self._schedule(agent_id, mailbox)
+            self._adjust_workers()
+            return depth
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker threads after all queued tasks are finished."""
+        with self._cond:
+            self._shutdown = True
+            self._cond.notify_all()
+            workers = list(self._workers)
+        if wait:
+            for worker in workers:
+                worker.join()
+
+    def _schedule(self, agent_id: str, mailbox: _Mailbox) -> None:
+        """Put the agent into the ready queue if it has a dispatchable task.
+        Should be called with the lock held."""
+        if not mailbox.scheduled and mailbox.dispatchable():
+            mailbox.scheduled = True
+            self._ready.append(agent_id)
+            self._cond.notify()
+
+    def _adjust_workers(self) -> None:
+        """Start a new worker thread if all existing ones are busy. Should
+        be called with the lock held."""
+        if self._idle_workers < len(self._ready) and (
+            len(self._workers) < self.capacity
+        ):
+            worker = threading.Thread(
+                target=self._worker_loop,
+                name=f"agent-scheduler-{len(self._workers)}",
+                daemon=True,
+            )
+            self._workers.append(worker)
+            worker.start()
+
+    def _next_task(self) -> Optional[tuple]:
+        """Wait for and take the next task in round-robin order."""
+        with self._cond:
+            while not self._ready:
+                if self._shutdown and self._pending == 0:
+                    return None
+                self._idle_workers += 1
+                self._cond.wait()
+                self._idle_workers -= 1
+            agent_id = self._ready.popleft()
+            mailbox = self._mailboxes[agent_id]
+            mailbox.scheduled = False
+            func, args, kwargs = mailbox.tasks.popleft()
+            mailbox.running += 1
+            self._pending -= 1
+            # move the agent to the tail of the ready queue so that other
+            # agents are served before its next task
+            self._schedule(agent_id, mailbox)
+            return agent_id, mailbox, func, args, kwargs
+
+    def _worker_loop(self) -> None:
+        """The main loop of the worker threads."""
+        while True:
+            task = self._next_task()
+            if task is None:
+                return
+            agent_id, mailbox, func, args, kwargs = task
+            try:
+                func(*args, **kwargs)
+            except Exception as e:
+                logger.error(
+                    f"Uncaught error in task of agent [{agent_id}]: {e}",
+                )
+            finally:
+                with self._cond:
+                    mailbox.running -= 1
+                    if mailbox.running == 0 and not mailbox.tasks:
+                        # release the empty mailbox
+                        if self._mailboxes.get(agent_id) is mailbox:
+                            self._mailboxes.pop(agent_id)
+                    else:
+                        self._schedule(agent_id, mailbox)
+                    if self._shutdown:
+                        self._cond.notify_all()
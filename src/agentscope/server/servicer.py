@@ -1,12 +1,12 @@
 # -*- coding: utf-8 -*-
-""" Server of distributed agent"""
+"""Server of distributed agent"""
 import os
 import threading
+import time
 import traceback
 import json
-from concurrent import futures
 from multiprocessing.synchronize import Event as EventClass
-from typing import Any
+from typing import Any, Optional
 from loguru import logger
 import requests
 
@@ -14,6 +14,7 @@ try:
     import cloudpickle as pickle
     import psutil
     import grpc
+    import expiringdict
     from grpc import ServicerContext
     from google.protobuf.empty_pb2 import Empty
 except ImportError as import_error:
@@ -22,6 +23,7 @@ except ImportError as import_error:
     pickle = ImportErrorReporter(import_error, "distribute")
     psutil = ImportErrorReporter(import_error, "distribute")
     grpc = ImportErrorReporter(import_error, "distribute")
+    expiringdict = ImportErrorReporter(import_error, "distribute")
     ServicerContext = ImportErrorReporter(import_error, "distribute")
     Empty = ImportErrorReporter(  # type: ignore[misc]
         import_error,
@@ -31,12 +33,19 @@ except ImportError as import_error:
 from agentscope.rpc.rpc_object import RpcObject
 from agentscope.rpc.rpc_meta import RpcMeta
 import agentscope.rpc.rpc_agent_pb2 as agent_pb2
+from agentscope.manager import MonitorManager
 from agentscope.studio._client import _studio_client
-from agentscope.exception import StudioRegisterError
+from agentscope.exception import StudioRegisterError, AgentCallError
 from agentscope.rpc import AsyncResult
+from agentscope.rpc.rpc_async import (
+    _register_local_resolver,
+    _unregister_local_resolver,
+)
 from agentscope.rpc.rpc_agent_pb2_grpc import RpcAgentServicer
 from agentscope.server.async_result_pool import get_pool
+from agentscope.server.scheduler import MailboxScheduler
 from agentscope.serialize import serialize
+from agentscope.tracing import remote_parent, start_span
 
 
 def _register_server_to_studio(
@@ -64,6 +73,17 @@ def _register_server_to_studio(
 # todo: opt this
 MAGIC_PREFIX = b"$$AS$$"
 
+_NOT_CACHED = object()
+
+_IMMUTABLE_TYPES = (type(None), bool, int, float, complex, str, bytes)
+
+
+def _is_immutable(value: Any) -> bool:
+    """Whether the value can be shared by its consumers without copying."""
+    if type(value) in (tuple, frozenset):
+        return all(_is_immutable(_) for _ in value)
+    return type(value) in _IMMUTABLE_TYPES
+
 
 class AgentServerServicer(RpcAgentServicer):
     """A Servicer for RPC Agent Server (formerly RpcServerSideWrapper)"""
@@ -81,6 +101,7 @@ class AgentServerServicer(RpcAgentServicer):
         max_pool_size: int = 8192,
         max_expire_time: int = 7200,
         max_timeout_seconds: int = 5,
+        max_concurrency_per_agent: int = 1,
     ):
         """Init the AgentServerServicer.
 
@@ -106,6 +127,11 @@ class AgentServerServicer(RpcAgentServicer):
             max_timeout_seconds (`int`, defaults to `5`):
                 The maximum time (in seconds) that the server will wait for
                 the result of an async call.
+            max_concurrency_per_agent (`int`, defaults to `1`):
+                The max number of async calls of the same agent that can
+                run at the same time. Calls of the same agent are started in
+                the order they arrive, and different agents are served in a
+                round-robin manner.
         """
         self.host = host
         self.port = port
@@ -129,7 +155,17 @@ class AgentServerServicer(RpcAgentServicer):
             max_len=max_pool_size,
             max_expire=max_expire_time,
         )
-        self.executor = futures.ThreadPoolExecutor(max_workers=capacity)
+        # immutable results of the tasks executed by this server, so that
+        # co-located agents can use them without deserialization, the other
+        # results are deserialized for every consumer to get its own copy
+        self.local_results = expiringdict.ExpiringDict(
+            max_len=max_pool_size,
+            max_age_seconds=max_expire_time,
+        )
+        self.scheduler = MailboxScheduler(
+            capacity=capacity,
+            max_concurrency_per_agent=max_concurrency_per_agent,
+        )
         self.task_id_lock = threading.Lock()
         self.agent_id_lock = threading.Lock()
         self.task_id_counter = 0
@@ -138,6 +174,20 @@ class AgentServerServicer(RpcAgentServicer):
         self.stop_event = stop_event
         self.timeout = max_timeout_seconds
 
+    def register_local(self) -> None:
+        """Allow `AsyncResult` instances in the current process that point to
+        this server to be resolved without rpc. Should be called after the
+        port of the server is determined."""
+        _register_local_resolver(
+            self.host,
+            self.port,
+            self._get_local_result,
+        )
+
+    def unregister_local(self) -> None:
+        """Undo `register_local`."""
+        _unregister_local_resolver(self.host, self.port)
+
     def agent_exists(self, agent_id: str) -> bool:
         """Check whether the agent exists.
 
@@ -184,13 +234,33 @@ class AgentServerServicer(RpcAgentServicer):
         context: ServicerContext,
     ) -> agent_pb2.GeneralResponse:
         """Create a new agent on the server."""
-        agent_id = request.agent_id
-        agent_configs = pickle.loads(request.agent_init_args)
+        return self._create_agent(request.agent_id, request.agent_init_args)
+
+    def create_agents(
+        self,
+        request: agent_pb2.CreateAgentsRequest,
+        context: ServicerContext,
+    ) -> agent_pb2.CreateAgentsResponse:
+        """Create multiple agents on the server in one call."""
+        return agent_pb2.CreateAgentsResponse(
+            results=[
+                self._create_agent(req.agent_id, req.agent_init_args)
+                for req in request.agents
+            ],
+        )
+
+    def _create_agent(
+        self,
+        agent_id: str,
+        agent_init_args: bytes,
+    ) -> agent_pb2.GeneralResponse:
+        """Create a new agent with the given id and serialized init args."""
+        agent_configs = pickle.loads(agent_init_args)
         cls_name = agent_configs["class_name"]
         try:
             cls = RpcMeta.get_class(cls_name)
         except ValueError as e:
-            err_msg = (f"Class [{cls_name}] not found: {str(e)}",)
+            err_msg = f"Class [{cls_name}] not found: {str(e)}"
             logger.error(err_msg)
             return agent_pb2.GeneralResponse(ok=False, message=err_msg)
         try:
@@ -236,6 +306,11 @@ class AgentServerServicer(RpcAgentServicer):
                     message=f"Agent with agent_id [{agent_id}] already exists",
                 )
             self.agent_pool[agent_id] = instance
+        # classes can override the default limit with `_max_concurrency`
+        self.scheduler.set_limit(
+            agent_id,
+            getattr(cls, "_max_concurrency", None),
+        )
         logger.info(f"create agent instance <{cls_name}>[{agent_id}]")
         return agent_pb2.GeneralResponse(ok=True)
 
@@ -254,6 +329,7 @@ class AgentServerServicer(RpcAgentServicer):
         with self.agent_id_lock:
             if aid in self.agent_pool:
                 agent = self.agent_pool.pop(aid)
+                self.scheduler.remove_agent(aid)
                 logger.info(
                     f"delete agent instance <{agent.__class__.__name__}>"
                     f"[{aid}]",
@@ -289,6 +365,7 @@ class AgentServerServicer(RpcAgentServicer):
         agent_id = request.agent_id
         func_name = request.target_func
         raw_value = request.value
+        traceparent = dict(context.invocation_metadata()).get("traceparent")
         agent = self.get_agent(request.agent_id)
         if agent is None:
             return context.abort(
@@ -302,16 +379,20 @@ class AgentServerServicer(RpcAgentServicer):
             ):
                 # async function
                 task_id = self.result_pool.prepare()
-                self.executor.submit(
+                queue_depth = self.scheduler.submit(
+                    agent_id,
                     self._process_task,
                     task_id,
                     agent_id,
                     func_name,
                     raw_value,
+                    traceparent,
+                    time.perf_counter(),
                 )
                 return agent_pb2.CallFuncResponse(
                     ok=True,
                     value=pickle.dumps(task_id),
+                    queue_depth=queue_depth,
                 )
             elif (
                 func_name
@@ -319,10 +400,15 @@ class AgentServerServicer(RpcAgentServicer):
             ):
                 # sync function
                 args = pickle.loads(raw_value)
-                res = getattr(agent, func_name)(
-                    *args.get("args", ()),
-                    **args.get("kwargs", {}),
-                )
+                with remote_parent(traceparent), start_span(
+                    f"{agent.__class__.__name__}.{func_name}",
+                    "server",
+                    agent_id=agent_id,
+                ):
+                    res = getattr(agent, func_name)(
+                        *args.get("args", ()),
+                        **args.get("kwargs", {}),
+                    )
             else:
                 res = getattr(agent, func_name)
             return agent_pb2.CallFuncResponse(
@@ -396,6 +482,7 @@ class AgentServerServicer(RpcAgentServicer):
         status["cpu"] = process.cpu_percent(interval=1)
         status["mem"] = process.memory_info().rss / (1024**2)
         status["size"] = len(self.agent_pool)
+        status["queue_depth"] = self.scheduler.queue_depth()
         return agent_pb2.GeneralResponse(ok=True, message=serialize(status))
 
     def set_model_configs(
@@ -459,12 +546,43 @@ class AgentServerServicer(RpcAgentServicer):
                     break
                 yield agent_pb2.ByteMsg(data=piece)
 
+    def _get_local_result(self, task_id: int) -> Any:
+        """Get the result of a task executed by this server for a co-located
+        consumer. Immutable results are shared without deserialization,
+        while each consumer gets its own deserialized copy of the other
+        results, e.g. the `Msg` replies of the agents, as they may be
+        modified by the consumers or by the agents.
+
+        Args:
+            task_id (`int`): the id of the task.
+
+        Returns:
+            `Any`: the result of the task.
+
+        Raises:
+            `TimeoutError`: the result is not ready within the timeout.
+            `AgentCallError`: the task failed.
+        """
+        result = self.result_pool.get(task_id, timeout=self.timeout)
+        if result[:6] == MAGIC_PREFIX:
+            raise AgentCallError(
+                host=self.host,
+                port=self.port,
+                message=result[6:].decode("utf-8"),
+            )
+        value = self.local_results.get(task_id, _NOT_CACHED)
+        if value is _NOT_CACHED:
+            value = pickle.loads(result)
+        return value
+
     def _process_task(
         self,
         task_id: int,
         agent_id: str,
         target_func: str,
         raw_args: bytes,
+        traceparent: Optional[str] = None,
+        submit_time: Optional[float] = None,
     ) -> None:
         """Processing the submitted task.
 
@@ -473,28 +591,46 @@ class AgentServerServicer(RpcAgentServicer):
             agent_id (`str`): the id of the agent that will be called.
             target_func (`str`): the name of the function that will be called.
             raw_args (`bytes`): the serialized input args.
+            traceparent (`Optional[str]`): the span of the caller.
+            submit_time (`Optional[float]`): the `time.perf_counter()` when
+                the task was submitted, to record its waiting time in the
+                mailbox.
         """
+        agent = self.get_agent(agent_id)
+        if submit_time is not None:
+            MonitorManager.get_instance().record_queue_wait(
+                agent.__class__.__name__,
+                time.perf_counter() - submit_time,
+            )
         if raw_args is not None:
             args = pickle.loads(raw_args)
         else:
             args = None
-        agent = self.get_agent(agent_id)
         if isinstance(args, AsyncResult):
             args = args.result()  # pylint: disable=W0212
-        try:
-            if target_func == "reply":
-                result = getattr(agent, target_func)(*args.get("args", ()))
-            else:
-                result = getattr(agent, target_func)(
-                    *args.get("args", ()),
-                    **args.get("kwargs", {}),
+        with remote_parent(traceparent), start_span(
+            f"{agent.__class__.__name__}.{target_func}",
+            "server",
+            agent_id=agent_id,
+        ):
+            try:
+                if target_func == "reply":
+                    result = getattr(agent, target_func)(
+                        *args.get("args", ()),
+                    )
+                else:
+                    result = getattr(agent, target_func)(
+                        *args.get("args", ()),
+                        **args.get("kwargs", {}),
+                    )
+                if _is_immutable(result):
+                    self.local_results[task_id] = result
+                self.result_pool.set(task_id, pickle.dumps(result))
+            except Exception:
+                trace = traceback.format_exc()
+                error_msg = f"Agent[{agent_id}] error: {trace}"
+                logger.error(error_msg)
+                self.result_pool.set(
+                    task_id,
+                    MAGIC_PREFIX + error_msg.encode("utf-8"),
                 )
-            self.result_pool.set(task_id, pickle.dumps(result))
-        except Exception:
-            trace = traceback.format_exc()
-            error_msg = f"Agent[{agent_id}] error: {trace}"
-            logger.error(error_msg)
-            self.result_pool.set(
-                task_id,
-                MAGIC_PREFIX + error_msg.encode("utf-8"),
-            )
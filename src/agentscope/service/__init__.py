@@ -1,67 +1,147 @@
 # -*- coding: utf-8 -*-
 """ Import all service-related modules in the package."""
+from typing import TYPE_CHECKING
+
 from loguru import logger
 
-from .execute_code.exec_python import execute_python_code
-from .execute_code.exec_shell import execute_shell_command
-from .execute_code.exec_notebook import NoteBookExecutor
-from .file.common import (
-    create_file,
-    delete_file,
-    move_file,
-    create_directory,
-    delete_directory,
-    move_directory,
-    list_directory_content,
-    get_current_directory,
-)
-from .file.text import read_text_file, write_text_file
-from .file.json import read_json_file, write_json_file
-from .sql_query.mysql import query_mysql
-from .sql_query.sqlite import query_sqlite
-from .sql_query.mongodb import query_mongodb
-from .web.search import bing_search, google_search
-from .web.arxiv import arxiv_search
-from .web.tripadvisor import (
-    tripadvisor_search_location_photos,
-    tripadvisor_search,
-    tripadvisor_search_location_details,
-)
-from .web.dblp import (
-    dblp_search_publications,
-    dblp_search_authors,
-    dblp_search_venues,
-)
-from .multi_modality.dashscope_services import (
-    dashscope_image_to_text,
-    dashscope_text_to_image,
-    dashscope_text_to_audio,
-)
-from .multi_modality.openai_services import (
-    openai_audio_to_text,
-    openai_text_to_audio,
-    openai_text_to_image,
-    openai_image_to_text,
-    openai_edit_image,
-    openai_create_image_variation,
-)
+from .._lazy import lazy_loader
+
+if TYPE_CHECKING:
+    from .execute_code.exec_python import execute_python_code
+    from .execute_code.exec_shell import execute_shell_command
+    from .execute_code.exec_notebook import (
+        NoteBookExecutor,
+        NoteBookKernelPool,
+    )
+    from .file.common import (
+        create_file,
+        delete_file,
+        move_file,
+        create_directory,
+        delete_directory,
+        move_directory,
+        list_directory_content,
+        get_current_directory,
+    )
+    from .file.text import read_text_file, write_text_file
+    from .file.json import read_json_file, write_json_file
+    from .sql_query.mysql import query_mysql
+    from .sql_query.sqlite import query_sqlite
+    from .sql_query.mongodb import query_mongodb, close_mongodb_clients
+    from .sql_query._common import close_sql_connections
+    from .web.search import bing_search, google_search
+    from .web.arxiv import arxiv_search
+    from .web.tripadvisor import (
+        tripadvisor_search_location_photos,
+        tripadvisor_search,
+        tripadvisor_search_location_details,
+    )
+    from .web.dblp import (
+        dblp_search_publications,
+        dblp_search_authors,
+        dblp_search_venues,
+    )
+    from .multi_modality.dashscope_services import (
+        dashscope_image_to_text,
+        dashscope_text_to_image,
+        dashscope_text_to_audio,
+    )
+    from .multi_modality.openai_services import (
+        openai_audio_to_text,
+        openai_text_to_audio,
+        openai_text_to_image,
+        openai_image_to_text,
+        openai_edit_image,
+        openai_create_image_variation,
+    )
 
-from .service_response import ServiceResponse
-from .service_toolkit import ServiceToolkit
-from .service_toolkit import ServiceFactory
-from .retrieval.similarity import cos_sim
-from .text_processing.summarization import summarization
-from .retrieval.retrieval_from_list import retrieve_from_list
-from .service_status import ServiceExecStatus
-from .web.web_digest import digest_webpage, load_web, parse_html_to_text
-from .web.download import download_from_url
+    from .service_response import ServiceResponse
+    from .service_toolkit import ServiceToolkit
+    from .service_toolkit import ServiceFactory
+    from .retrieval.similarity import cos_sim
+    from .text_processing.summarization import summarization
+    from .retrieval.retrieval_from_list import retrieve_from_list
+    from .service_status import ServiceExecStatus
+    from .web.web_digest import (
+        digest_webpage,
+        load_web,
+        load_web_many,
+        parse_html_to_text,
+    )
+    from .web.download import download_from_url
 
-from .web.wikipedia import (
-    wikipedia_search,
-    wikipedia_search_categories,
-)
+    from .web.wikipedia import (
+        wikipedia_search,
+        wikipedia_search_categories,
+    )
 
-from .browser.web_browser import WebBrowser, WebElementInfo
+    from .browser.web_browser import WebBrowser, WebElementInfo
+    from .browser.browser_pool import WebBrowserPool
+
+# The services are imported on first access, so that the dependencies of
+# the unused services (e.g. playwright and the SDKs of the multi-modality
+# services) are not imported.
+__getattr__, __dir__ = lazy_loader(
+    __name__,
+    attributes={
+        "execute_python_code": ".execute_code.exec_python",
+        "execute_shell_command": ".execute_code.exec_shell",
+        "NoteBookExecutor": ".execute_code.exec_notebook",
+        "NoteBookKernelPool": ".execute_code.exec_notebook",
+        "create_file": ".file.common",
+        "delete_file": ".file.common",
+        "move_file": ".file.common",
+        "create_directory": ".file.common",
+        "delete_directory": ".file.common",
+        "move_directory": ".file.common",
+        "list_directory_content": ".file.common",
+        "get_current_directory": ".file.common",
+        "read_text_file": ".file.text",
+        "write_text_file": ".file.text",
+        "read_json_file": ".file.json",
+        "write_json_file": ".file.json",
+        "query_mysql": ".sql_query.mysql",
+        "query_sqlite": ".sql_query.sqlite",
+        "query_mongodb": ".sql_query.mongodb",
+        "close_mongodb_clients": ".sql_query.mongodb",
+        "close_sql_connections": ".sql_query._common",
+        "bing_search": ".web.search",
+        "google_search": ".web.search",
+        "arxiv_search": ".web.arxiv",
+        "tripadvisor_search_location_photos": ".web.tripadvisor",
+        "tripadvisor_search": ".web.tripadvisor",
+        "tripadvisor_search_location_details": ".web.tripadvisor",
+        "dblp_search_publications": ".web.dblp",
+        "dblp_search_authors": ".web.dblp",
+        "dblp_search_venues": ".web.dblp",
+        "dashscope_image_to_text": ".multi_modality.dashscope_services",
+        "dashscope_text_to_image": ".multi_modality.dashscope_services",
+        "dashscope_text_to_audio": ".multi_modality.dashscope_services",
+        "openai_audio_to_text": ".multi_modality.openai_services",
+        "openai_text_to_audio": ".multi_modality.openai_services",
+        "openai_text_to_image": ".multi_modality.openai_services",
+        "openai_image_to_text": ".multi_modality.openai_services",
+        "openai_edit_image": ".multi_modality.openai_services",
+        "openai_create_image_variation": ".multi_modality.openai_services",
+        "ServiceResponse": ".service_response",
+        "ServiceToolkit": ".service_toolkit",
+        "ServiceFactory": ".service_toolkit",
+        "cos_sim": ".retrieval.similarity",
+        "summarization": ".text_processing.summarization",
+        "retrieve_from_list": ".retrieval.retrieval_from_list",
+        "ServiceExecStatus": ".service_status",
+        "digest_webpage": ".web.web_digest",
+        "load_web": ".web.web_digest",
+        "load_web_many": ".web.web_digest",
+        "parse_html_to_text": ".web.web_digest",
+        "download_from_url": ".web.download",
+        "wikipedia_search": ".web.wikipedia",
+        "wikipedia_search_categories": ".web.wikipedia",
+        "WebBrowser": ".browser.web_browser",
+        "WebElementInfo": ".browser.web_browser",
+        "WebBrowserPool": ".browser.browser_pool",
+    },
+)
 
 
 def get_help() -> None:
@@ -100,17 +180,21 @@ __all__ = [
     "query_mysql",
     "query_sqlite",
     "query_mongodb",
+    "close_sql_connections",
+    "close_mongodb_clients",
     "cos_sim",
     "summarization",
     "retrieve_from_list",
     "digest_webpage",
     "load_web",
+    "load_web_many",
     "parse_html_to_text",
     "download_from_url",
     "dblp_search_publications",
     "dblp_search_authors",
     "dblp_search_venues",
     "NoteBookExecutor",
+    "NoteBookKernelPool",
     "dashscope_image_to_text",
     "dashscope_text_to_image",
     "dashscope_text_to_audio",
@@ -124,6 +208,7 @@ __all__ = [
     "tripadvisor_search_location_photos",
     "tripadvisor_search_location_details",
     "WebBrowser",
+    "WebBrowserPool",
     "WebElementInfo",
     # to be deprecated
     "ServiceFactory",
@@ -0,0 +1,436 @@
+# -*- coding: utf-8 -*-
+"""A pool of headless browser pages shared by multiple web browsers."""
+import asyncio
+import inspect
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from typing import Any, Callable, Generator, Optional
+
+from loguru import logger
+
+try:
+    from playwright.async_api import async_playwright
+except ImportError as import_error:
+    from agentscope.utils.common import ImportErrorReporter
+
+    async_playwright = ImportErrorReporter(import_error, "full")
+
+
+class _PlaywrightProxy:
+    """Expose an object of the async playwright API like the sync API.
+
+    The method calls are run in the event loop of the pool, and the returned
+    playwright objects are wrapped again, so that an object can be used from
+    any thread, e.g. by the agents running in different threads.
+    """
+
+    __slots__ = ("_obj", "_pool", "__weakref__")
+
+    def __init__(self, obj: Any, pool: "WebBrowserPool") -> None:
+        object.__setattr__(self, "_obj", obj)
+        object.__setattr__(self, "_pool", pool)
+
+    def __getattr__(self, name: str) -> Any:
+        value = getattr(self._obj, name)
+        if inspect.ismethod(value):
+
+            def _method(*args: Any, **kwargs: Any) -> Any:
+                return self._pool._call(  # pylint: disable=W0212
+                    value,
+                    *args,
+                    **kwargs,
+                )
+
+            return _method
+        return self._pool._wrap(value)  # pylint: disable=W0212
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"Cannot set attribute {name} of the proxy")
+
+    def __eq__(self, other: Any) -> bool:
+        return self._obj == _unwrap(other)
+
+    def __hash__(self) -> int:
+        return hash(self._obj)
+
+    def __repr__(self) -> str:
+        return f"<_PlaywrightProxy of {self._obj!r}>"
+
+
+def _unwrap(value: Any) -> Any:
+    """Get the playwright objects from the proxies in the value."""
+    if isinstance(value, _PlaywrightProxy):
+        return value._obj  # pylint: disable=W0212
+    if isinstance(value, (list, tuple)):
+        return type(value)(_unwrap(_) for _ in value)
+    if isinstance(value, dict):
+        return {k: _unwrap(v) for k, v in value.items()}
+    return value
+
+
+class WebBrowserPool:
+    """A pool of headless browser pages, so that many `WebBrowser`s (e.g.
+    one per browsing agent) share one or a few browser processes instead of
+    starting their own.
+
+    Each leased page lives in its own browser context, i.e. cookies and
+    storage are isolated between the lessees. The pool runs the async
+    playwright API in a background thread, and the leased pages can be used
+    with the sync API from any thread, so that agents in different threads
+    browse concurrently.
+
+    Example:
+
+        .. code-block:: python
+
+            pool = WebBrowserPool(max_pages=20, warm_pages=2)
+            browser = WebBrowser(pool=pool)
+            browser.action_visit_url("https://www.bing.com")
+            # give the page back to the pool
+            browser.close()
+
+            pool.close()
+    """
+
+    def __init__(
+        self,
+        max_pages: int = 20,
+        num_browsers: int = 1,
+        warm_pages: int = 1,
+        idle_timeout: float = 300,
+        reset_on_release: bool = True,
+        headless: bool = True,
+        launch_kwargs: Optional[dict] = None,
+        **context_kwargs: Any,
+    ) -> None:
+        """Start the pool and pre-create the warm pages.
+
+        Args:
+            max_pages (`int`, defaults to `20`):
+                The max number of pages, including the leased and the idle
+                ones. `lease` waits when the limit is reached.
+            num_browsers (`int`, defaults to `1`):
+                The max number of browser processes. The browsers are
+                launched on demand, and the pages are spread over them.
+            warm_pages (`int`, defaults to `1`):
+                The number of idle pages created in advance, so that a lease
+                doesn't wait for the creation of the context and the page.
+            idle_timeout (`float`, defaults to `300`):
+                The seconds after which the idle pages beyond `warm_pages`,
+                and the browsers without pages except the first one, are
+                closed.
+            reset_on_release (`bool`, defaults to `True`):
+                Whether to close the browser context of a released page, so
+                that the next lessee starts from a clean state. If `False`,
+                the page is kept for the next lessee as it is.
+            headless (`bool`, defaults to `True`):
+                Whether to launch the browsers in headless mode.
+            launch_kwargs (`Optional[dict]`, defaults to `None`):
+                The extra arguments to launch the chromium browsers.
+            **context_kwargs (`Any`):
+                The arguments to create the browser contexts, e.g.
+                `viewport`, `user_agent` and `locale`.
+        """
+        self.max_pages = max_pages
+        self.num_browsers = num_browsers
+        self.warm_pages = min(warm_pages, max_pages)
+        self.idle_timeout = idle_timeout
+        self.reset_on_release = reset_on_release
+        self._launch_kwargs = dict(launch_kwargs or {}, headless=headless)
+        self._context_kwargs = context_kwargs
+
+        # the idle pages as (page, the time it becomes idle)
+        self._idle: list[tuple[Any, float]] = []
+        # the number of idle, leased and creating pages
+        self._total = 0
+        self._creating_warm = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        # the wrappers of the callbacks given to the pages by the ids of the
+        # callbacks, which live as long as they are registered
+        self._callbacks = weakref.WeakValueDictionary()
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever,
+            name="browser-pool",
+            daemon=True,
+        )
+        self._thread.start()
+        self._browsers: list = []
+        # the time since when the browsers have no pages
+        self._browser_idle_since: dict = {}
+        self._launch_lock = asyncio.Lock()
+        try:
+            self._playwright = self._run(async_playwright().start())
+        except BaseException:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            raise
+        self._reaper = self._run(self._start_reaper())
+        self._fill_warm_pages()
+
+    # ------ Called by the users ----------------------------------------------
+    def lease(self, timeout: Optional[float] = None) -> Any:
+        """Lease a page from the pool, wait until one is available.
+
+        Args:
+            timeout (`Optional[float]`, defaults to `None`):
+                The max seconds to wait, `None` means wait forever.
+
+        Returns:
+            `Any`: The leased page, which can be used like a
+            `playwright.sync_api.Page` and should be given back by
+            `release`.
+        """
+        with self._cond:
+            if not self._cond.wait_for(
+                lambda: self._closed
+                or self._idle
+                or self._total < self.max_pages,
+                timeout=timeout,
+            ):
+                raise TimeoutError("No browser page is available.")
+            if self._closed:
+                raise RuntimeError("The browser pool is closed.")
+            page = self._idle.pop()[0] if self._idle else None
+            if page is None:
+                self._total += 1
+        if page is None:
+            try:
+                page = self._run(self._new_page())
+            except BaseException:
+                with self._cond:
+                    self._total -= 1
+                    self._cond.notify()
+                raise
+        self._fill_warm_pages()
+        return self._wrap(page)
+
+    def release(self, page: Any) -> None:
+        """Give back a leased page."""
+        page = _unwrap(page)
+        if self.reset_on_release or page.is_closed():
+            self._run(self._close_context(page.context))
+            with self._cond:
+                self._total -= 1
+                self._cond.notify()
+            self._fill_warm_pages()
+        else:
+            with self._cond:
+                self._idle.append((page, time.monotonic()))
+                self._cond.notify()
+
+    @contextmanager
+    def leased(
+        self,
+        timeout: Optional[float] = None,
+    ) -> Generator[Any, None, None]:
+        """Lease a page within the context."""
+        page = self.lease(timeout=timeout)
+        try:
+            yield page
+        finally:
+            self.release(page)
+
+    @property
+    def num_idle_pages(self) -> int:
+        """The number of idle pages."""
+        with self._cond:
+            return len(self._idle)
+
+    @property
+    def num_pages(self) -> int:
+        """The number of idle, leased and creating pages."""
+        with self._cond:
+            return self._total
+
+    def close(self) -> None:
+        """Close all browsers of the pool, the leased pages can no longer be
+        used."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._idle.clear()
+            self._cond.notify_all()
+
+        async def _close() -> None:
+            self._reaper.cancel()
+            for browser in self._browsers:
+                await browser.close()
+            await self._playwright.stop()
+
+        try:
+            self._run(_close())
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5)
+
+    # ------ Run the async api in the loop ------------------------------------
+    def _run(self, coro: Any) -> Any:
+        """Run the coroutine in the loop of the pool and wait for it."""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def _call(self, func: Callable, *args: Any, **kwargs: Any) -> Any:
+        """Call a method of the async api in the loop and wait for the
+        result."""
+        args = [self._wrap_callback(_) for _ in _unwrap(args)]
+        kwargs = {k: self._wrap_callback(v) for k, v in kwargs.items()}
+        kwargs = _unwrap(kwargs)
+        if threading.current_thread() is self._thread:
+            # e.g. called by the event handlers, which cannot wait for the
+            # loop
+            result = func(*args, **kwargs)
+            if inspect.isawaitable(result):
+                if inspect.iscoroutine(result):
+                    result.close()
+                raise RuntimeError(
+                    f"Cannot wait for {func.__name__} in the event handlers "
+                    f"of the browser pool.",
+                )
+            return self._wrap(result)
+
+        async def _await() -> Any:
+            result = func(*args, **kwargs)
+            if inspect.isawaitable(result):
+                result = await result
+            return result
+
+        return self._wrap(self._run(_await()))
+
+    def _wrap(self, value: Any) -> Any:
+        """Wrap the playwright objects in the value with proxies."""
+        if isinstance(value, (list, tuple)):
+            return type(value)(self._wrap(_) for _ in value)
+        if type(value).__module__.startswith("playwright."):
+            return _PlaywrightProxy(value, self)
+        return value
+
+    def _wrap_callback(self, value: Any) -> Any:
+        """Wrap the callbacks, e.g. the event handlers, so that they receive
+        proxies. The same wrapper is used for the same callback, so that it
+        can be removed by `remove_listener`."""
+        if not inspect.isfunction(value) and not inspect.ismethod(value):
+            return value
+        wrapper = self._callbacks.get(id(value))
+        if wrapper is None:
+
+            def wrapper(*args: Any) -> Any:
+                return value(*(self._wrap(_) for _ in args))
+
+            self._callbacks[id(value)] = wrapper
+        return wrapper
+
+    # ------ Manage the pages in the loop -------------------------------------
+    async def _get_browser(self) -> Any:
+        """Get the browser with the fewest contexts, a new browser is
+        launched if all the browsers are in use and the limit is not
+        reached."""
+        async with self._launch_lock:
+            if not self._browsers or (
+                len(self._browsers) < self.num_browsers
+                and all(browser.contexts for browser in self._browsers)
+            ):
+                self._browsers.append(
+                    await self._playwright.chromium.launch(
+                        **self._launch_kwargs,
+                    ),
+                )
+            return min(self._browsers, key=lambda b: len(b.contexts))
+
+    async def _new_page(self) -> Any:
+        """Create a page within a new browser context."""
+        browser = await self._get_browser()
+        context = await browser.new_context(**self._context_kwargs)
+        try:
+            return await context.new_page()
+        except BaseException:
+            await context.close()
+            raise
+
+    async def _close_context(self, context: Any) -> None:
+        try:
+            await context.close()
+        except Exception as e:
+            logger.debug(f"Error when closing the browser context: {e}")
+
+    async def _new_warm_page(self) -> None:
+        """Create a warm page and put it to the idle pages."""
+        try:
+            page = await self._new_page()
+        except Exception as e:
+            logger.warning(f"Fail to create a warm browser page: {e}")
+            with self._cond:
+                self._total -= 1
+                self._creating_warm -= 1
+                self._cond.notify()
+            return
+        with self._cond:
+            self._creating_warm -= 1
+            if not self._closed:
+                self._idle.append((page, time.monotonic()))
+                self._cond.notify()
+                return
+        await self._close_context(page.context)
+
+    def _fill_warm_pages(self) -> None:
+        """Create pages in background until there are `warm_pages` idle
+        pages."""
+        with self._cond:
+            if self._closed:
+                return
+            num = min(
+                self.warm_pages - len(self._idle) - self._creating_warm,
+                self.max_pages - self._total,
+            )
+            if num <= 0:
+                return
+            self._total += num
+            self._creating_warm += num
+        for _ in range(num):
+            asyncio.run_coroutine_threadsafe(
+                self._new_warm_page(),
+                self._loop,
+            )
+
+    async def _start_reaper(self) -> asyncio.Task:
+        return asyncio.ensure_future(self._reap_forever())
+
+    async def _reap_forever(self) -> None:
+        """Close the expired idle pages and the unused browsers
+        periodically."""
+        interval = min(max(self.idle_timeout / 2, 0.1), 30)
+        while True:
+            await asyncio.sleep(interval)
+            await self._reap()
+
+    async def _reap(self) -> None:
+        now = time.monotonic()
+        with self._cond:
+            # keep the most recent `warm_pages` idle pages
+            self._idle.sort(key=lambda _: _[1])
+            num_reapable = max(len(self._idle) - self.warm_pages, 0)
+            expired = [
+                page
+                for page, since in self._idle[:num_reapable]
+                if now - since >= self.idle_timeout
+            ]
+            self._idle = self._idle[len(expired) :]
+            self._total -= len(expired)
+            if expired:
+                self._cond.notify(len(expired))
+        for page in expired:
+            await self._close_context(page.context)
+
+        async with self._launch_lock:
+            for browser in self._browsers[1:]:
+                if browser.contexts:
+                    self._browser_idle_since.pop(browser, None)
+                    continue
+                since = self._browser_idle_since.setdefault(browser, now)
+                if now - since >= self.idle_timeout:
+                    self._browsers.remove(browser)
+                    self._browser_idle_since.pop(browser)
+                    await browser.close()
@@ -62,51 +62,89 @@ function getInteractiveElements() {
     return items;
 }
 
-// Set interactive marks on the current web page
-function setInteractiveMarks() {
-    var items = getInteractiveElements();
-
-    // Init an array to record the item information
-    var itemsInfo = [];
-    items.forEach(function(item, index) {
-        item.rects.forEach((bbox) => {
-            // Create a mark element for each interactive element
-            let newElement = document.createElement("div");
-            newElement.classList.add("agentscope-interactive-mark")
-
-            // border
-            var borderColor = "#000000";
-            newElement.style.outline = `2px dashed ${borderColor}`;
-            newElement.style.position = "fixed";
-            newElement.style.left = bbox.left + "px";
-            newElement.style.top = bbox.top + "px";
-            newElement.style.width = bbox.width + "px";
-            newElement.style.height = bbox.height + "px";
-            newElement.style.pointerEvents = "none";
-            newElement.style.boxSizing = "border-box";
-            newElement.style.zIndex = 2147483647;
-
-            // index label
-            var label = document.createElement("span");
-            label.textContent = index;
-            label.style.position = "absolute";
-            label.style.top = Math.max(-19, -bbox.top) + "px";
-            label.style.left = Math.min(Math.floor(bbox.width / 5), 2) + "px";
-            label.style.background = borderColor;
-            label.style.color = "white";
-            label.style.padding = "2px 4px";
-            label.style.fontSize = "12px";
-            label.style.borderRadius = "2px";
-            newElement.appendChild(label);
-
-            document.body.appendChild(newElement);
-        });
+// Draw the marks of an interactive element with its id as the label
+function drawInteractiveMarks(id, rects) {
+    rects.forEach((bbox) => {
+        // Create a mark element for each interactive element
+        let newElement = document.createElement("div");
+        newElement.classList.add("agentscope-interactive-mark")
+
+        // border
+        var borderColor = "#000000";
+        newElement.style.outline = `2px dashed ${borderColor}`;
+        newElement.style.position = "fixed";
+        newElement.style.left = bbox.left + "px";
+        newElement.style.top = bbox.top + "px";
+        newElement.style.width = bbox.width + "px";
+        newElement.style.height = bbox.height + "px";
+        newElement.style.pointerEvents = "none";
+        newElement.style.boxSizing = "border-box";
+        newElement.style.zIndex = 2147483647;
 
-        // Record the item information
-        itemsInfo[index] = getElementInfo(index, item.element);
+        // index label
+        var label = document.createElement("span");
+        label.textContent = id;
+        label.style.position = "absolute";
+        label.style.top = Math.max(-19, -bbox.top) + "px";
+        label.style.left = Math.min(Math.floor(bbox.width / 5), 2) + "px";
+        label.style.background = borderColor;
+        label.style.color = "white";
+        label.style.padding = "2px 4px";
+        label.style.fontSize = "12px";
+        label.style.borderRadius = "2px";
+        newElement.appendChild(label);
+
+        document.body.appendChild(newElement);
     });
-    return {items, itemsInfo};
 }
+
+// Set interactive marks on the current web page. The marked elements keep
+// their ids until they disappear from the page, and in incremental mode only
+// the added and removed elements since the last call are returned.
+function setInteractiveMarks(incremental) {
+    removeInteractiveMarks();
+
+    var state = window.__agentscopeMarkState;
+    var reset = !incremental || !state;
+    if (reset) {
+        state = window.__agentscopeMarkState = {
+            ids: new Map(),
+            elements: new Map(),
+            nextId: 0
+        };
+    }
+
+    var elements = new Map();
+    var added = {};
+    getInteractiveElements().forEach(function(item) {
+        var id = state.ids.get(item.element);
+        if (id === undefined) {
+            id = state.nextId++;
+            state.ids.set(item.element, id);
+            // Record the information of the new element
+            added[id] = getElementInfo(id, item.element);
+        }
+        elements.set(id, item.element);
+        drawInteractiveMarks(id, item.rects);
+    });
+
+    var removed = [];
+    state.elements.forEach(function(element, id) {
+        if (!elements.has(id)) {
+            removed.push(id);
+            state.ids.delete(element);
+        }
+    });
+    state.elements = elements;
+    return {added, removed, reset};
+}
+
+// Get the marked element by its id
+function getInteractiveElement(id) {
+    var state = window.__agentscopeMarkState;
+    return state ? state.elements.get(id) || null : null;
+}
+
 // <a hre="
 function getElementInfo(index, element) {
     const rect = element.getBoundingClientRect();
@@ -133,4 +171,50 @@ function removeInteractiveMarks() {
     while (marks.length > 0) {
         marks[0].parentNode.removeChild(marks[0]);
     }
-}
\ No newline at end of file
+}
+
+// Remove all interactive marks and forget the marked elements
+function clearInteractiveMarks() {
+    removeInteractiveMarks();
+    window.__agentscopeMarkState = undefined;
+}
+
+// Wait until the page is loaded and quiet, i.e. neither the DOM nor the
+// network has changed for `quietMs`, or `timeoutMs` is reached. Resolves to
+// whether the page became quiet.
+function waitForPageQuiet(quietMs, timeoutMs) {
+    return new Promise(function(resolve) {
+        var start = performance.now();
+        var last = start;
+        var touch = function() { last = performance.now(); };
+
+        var mutationObserver = new MutationObserver(touch);
+        mutationObserver.observe(document, {
+            childList: true,
+            subtree: true,
+            characterData: true
+        });
+        var resourceObserver = null;
+        try {
+            resourceObserver = new PerformanceObserver(touch);
+            resourceObserver.observe({type: "resource"});
+        } catch (e) {
+            resourceObserver = null;
+        }
+
+        var check = function() {
+            var now = performance.now();
+            var quiet = document.readyState === "complete" && now - last >= quietMs;
+            if (quiet || now - start >= timeoutMs) {
+                mutationObserver.disconnect();
+                if (resourceObserver) {
+                    resourceObserver.disconnect();
+                }
+                resolve(quiet);
+            } else {
+                setTimeout(check, Math.min(quietMs, 50));
+            }
+        };
+        setTimeout(check, Math.min(quietMs, 50));
+    });
+}
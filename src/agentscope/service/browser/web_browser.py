@@ -2,14 +2,24 @@
 # pylint: disable=C0301
 """The web browser module for agent to interact with web pages."""
 import time
+from functools import lru_cache
 from pathlib import Path
-from typing import Union, Callable, Optional
+from typing import Any, Union, Callable, Optional
 
 import requests
 from loguru import logger
 from pydantic import BaseModel
 
 from agentscope.service import ServiceResponse, ServiceExecStatus
+from agentscope.service.browser.browser_pool import WebBrowserPool
+
+
+@lru_cache(maxsize=None)
+def _read_mark_page_js() -> str:
+    """Read the JavaScript once, which is shared by all the browsers."""
+    js_file_path = Path(__file__).parent / "markpage.js"
+    with open(js_file_path, "r", encoding="utf-8") as file:
+        return file.read()
 
 
 class WebElementInfo(BaseModel):
@@ -94,16 +104,18 @@ class WebBrowser:
         .. code-block:: python
 
             from agentscope.service import WebBrowser
-            import time
 
             if __name__ == "__main__":
                 browser = WebBrowser()
-                # Visit the specific web page
+                # Visit the specific web page, which returns when the page
+                # is loaded and quiet
                 browser.action_visit_url("https://www.bing.com")
                 # Set the interactive marks on the web page
-                browser.set_interactive_marks()
+                elements = browser.set_interactive_marks()
 
-                time.sleep(5)
+                browser.action_type(0, "agentscope", submit=True)
+                # Only the changed elements are returned
+                diff = browser.update_interactive_marks()
 
                 browser.close()
 
@@ -119,10 +131,11 @@ class WebBrowser:
     ]
     """The available actions for the web browser that agent can takes."""
 
-    _interactive_elements: list
-    """To record the interactive elements on the current page, which will be
-    set after calling the `set_interactive_marks` method, and cleared after
-    calling the `remove_interactive_marks` method."""
+    _interactive_elements: dict[int, WebElementInfo]
+    """To record the ids and information of the interactive elements on the
+    current page, which will be set after calling the `set_interactive_marks`
+    or `update_interactive_marks` method, and cleared after calling the
+    `remove_interactive_marks` method."""
 
     def __init__(
         self,
@@ -130,6 +143,9 @@ class WebBrowser:
         browser_visible: bool = True,
         browser_width: int = 1280,
         browser_height: int = 1080,
+        quiet_period: float = 0.2,
+        max_quiet_wait: float = 5,
+        pool: Optional[WebBrowserPool] = None,
     ) -> None:
         """Initialize the web browser module.
 
@@ -143,6 +159,17 @@ class WebBrowser:
                 The width of the browser. Defaults to 1280.
             browser_height (`int`, defaults to `1080`):
                 The height of the browser. Defaults to 1080.
+            quiet_period (`float`, defaults to `0.2`):
+                After an action, the browser waits until neither the DOM nor
+                the network of the page has changed for `quiet_period`
+                seconds.
+            max_quiet_wait (`float`, defaults to `5`):
+                The upper bound (in seconds) of waiting for the page to be
+                quiet, e.g. for pages with animations or polling requests.
+            pool (`Optional[WebBrowserPool]`, defaults to `None`):
+                If given, a page is leased from the pool instead of
+                launching a new browser, and `browser_visible` is ignored.
+                The page is given back to the pool by `close`.
         """
 
         try:
@@ -156,13 +183,28 @@ class WebBrowser:
                 "https://playwright.dev/python/docs/intro.",
             ) from e
 
-        # Init a web page
-        playwright_process = sync_playwright().start()
-        self.browser = playwright_process.chromium.launch(
-            headless=not browser_visible,
-        )
+        self.timeout = timeout
+        self.quiet_period = quiet_period
+        self.max_quiet_wait = max_quiet_wait
+        self._pool = pool
+
+        if pool is not None:
+            self._playwright = None
+            self.browser = None
+            self._page = pool.lease()
+        else:
+            # Init a web page
+            self._playwright = sync_playwright().start()
+            try:
+                self.browser = self._playwright.chromium.launch(
+                    headless=not browser_visible,
+                )
+            except Exception:
+                # stop the event loop of playwright in this thread
+                self._playwright.stop()
+                raise
+            self._page = self.browser.new_page()
 
-        self._page = self.browser.new_page()
         self._page.set_default_timeout(timeout * 1000)
         self._page.set_viewport_size(
             {
@@ -172,10 +214,13 @@ class WebBrowser:
         )
 
         # Init a dictionary to store the interactive elements on the page
-        self._interactive_elements = []
+        self._interactive_elements = {}
+        # Whether a navigation of the main frame is started but not loaded
+        self._pending_navigation = False
 
         # Load the external JavaScript to crawl the page
         self._load_external_js()
+        self._setup_page()
 
     @property
     def url(self) -> str:
@@ -222,15 +267,10 @@ class WebBrowser:
             `ServiceResponse`:
                 The response of the click action.
         """
-        if not self._verify_element_id(element_id):
-            return ServiceResponse(
-                status=ServiceExecStatus.ERROR,
-                content=f"ElementIDError: The element id must be in the range "
-                f"[0, {len(self._interactive_elements) - 1}], but "
-                f"got {element_id}.",
-            )
+        element_handle = self._get_element_handle(element_id)
+        if element_handle is None:
+            return self._element_id_error(element_id)
 
-        element_handle = self._interactive_elements[element_id]
         element_handle.evaluate(
             "element => element.setAttribute('target', '_self')",
         )
@@ -267,16 +307,11 @@ class WebBrowser:
             `ServiceResponse`:
                 The response of the type action.
         """
-        if not self._verify_element_id(element_id):
-            return ServiceResponse(
-                status=ServiceExecStatus.ERROR,
-                content=f"ElementIDError: The element id must be in the range "
-                f"[0, {len(self._interactive_elements) - 1}], but "
-                f"got {element_id}.",
-            )
+        web_ele = self._get_element_handle(element_id)
+        if web_ele is None:
+            return self._element_id_error(element_id)
 
         self.action_click(element_id)
-        web_ele = self._interactive_elements[element_id]
 
         # Try to clear the text within the given elements
         try:
@@ -334,11 +369,8 @@ class WebBrowser:
         """  # noqa
         self._page.keyboard.press(key)
 
-        # TODO: in a more elegant way to wait for the page to be loaded rather
-        #  then using time.sleep
-        # Wait for the page to be loaded
-        time.sleep(2)
-
+        # Wait for the page to be loaded, including the navigation triggered
+        # by the key
         self._wait_for_load(
             f"Wait for press key: {key}",
             "Finished",
@@ -377,50 +409,134 @@ class WebBrowser:
 
     # ------ Set or remove marks of interactive elements on the web page ------
     def set_interactive_marks(self) -> list[WebElementInfo]:
-        """Mark the interactive elements on the current web page."""
+        """Mark the interactive elements on the current web page. The
+        elements are numbered from 0 in the order of the page."""
+        self._mark_interactive_elements(incremental=False)
+        return list(self._interactive_elements.values())
+
+    def update_interactive_marks(self) -> dict:
+        """Update the marks of the interactive elements on the current web
+        page incrementally. The elements that are still on the page keep
+        their ids, and the new elements get new ids, so that only the changes
+        since the last call of `set_interactive_marks` or
+        `update_interactive_marks` are returned.
 
-        # Remove the existing interactive elements on the current web page
-        self.remove_interactive_marks()
+        Returns:
+            `dict`: A dict with key "added", a dict from the ids of the new
+            elements to their `WebElementInfo`, and key "removed", the ids of
+            the elements that are no longer on the page (all the previous
+            ids if a new page is loaded).
+        """
+        return self._mark_interactive_elements(incremental=True)
+
+    def _mark_interactive_elements(self, incremental: bool) -> dict:
+        """Mark the interactive elements by the injected JavaScript, and
+        record their information. The element handles are not fetched until
+        they are used by the actions, which saves a round trip per
+        element."""
+        result = self._page.evaluate(
+            "incremental => setInteractiveMarks(incremental)",
+            incremental,
+        )
+        if result["reset"]:
+            removed = list(self._interactive_elements)
+            self._interactive_elements.clear()
+        else:
+            removed = result["removed"]
+            for element_id in removed:
+                self._interactive_elements.pop(element_id, None)
+        added = {
+            int(element_id): WebElementInfo(**info)
+            for element_id, info in result["added"].items()
+        }
+        self._interactive_elements.update(added)
+        return {"added": added, "removed": removed}
 
-        # Load the javascript to crawl the page
-        self._page.evaluate(self._mark_page_js)
+    def remove_interactive_marks(self) -> None:
+        """Remove the interactive elements on the current web page."""
+        # Remove the interactive elements on the web page by calling the
+        # JavaScript function `clearInteractiveMarks`
+        self._page.evaluate("clearInteractiveMarks()")
 
-        # Mark the interactive elements on the web page by calling the
-        # JavaScript function `crawlPage`
-        result_handle = self._page.evaluate_handle("setInteractiveMarks()")
+        self._interactive_elements.clear()
 
-        # Record the interactive elements on the current page
-        interactive_items_handle = result_handle.get_property("items")
-        items_info_handle = result_handle.get_property("itemsInfo")
+    def wait_for_ready(
+        self,
+        selector: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> bool:
+        """Wait until the current page is loaded and quiet, or the element
+        of the given selector is available.
 
-        js_handles = (
-            interactive_items_handle.evaluate_handle("items => items")
-            .get_properties()
-            .values()
-        )
-        self._interactive_elements = [
-            item.get_property("element").as_element() for item in js_handles
-        ]
+        Args:
+            selector (`Optional[str]`, defaults to `None`):
+                The CSS selector of the element to wait for. If given, the
+                method returns once the element is attached to the page,
+                without waiting for the page to be quiet.
+            timeout (`Optional[float]`, defaults to `None`):
+                The timeout in seconds, defaults to the `timeout` of the
+                browser.
 
-        # Get the interactive items
-        return [
-            WebElementInfo(**info) for info in items_info_handle.json_value()
-        ]
+        Returns:
+            `bool`: Whether the page is ready before the timeout.
+        """
+        from playwright.sync_api import Error as PlaywrightError
 
-    def remove_interactive_marks(self) -> None:
-        """Remove the interactive elements on the current web page."""
-        # Load the javascript to crawl the page
-        self._page.evaluate(self._mark_page_js)
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
 
-        # Remove the interactive elements on the web page by calling the
-        # JavaScript function `rmInteractiveMarks`
-        self._page.evaluate("removeInteractiveMarks()")
+        def _remaining_ms() -> float:
+            return max(deadline - time.monotonic(), 0) * 1000
 
-        self._interactive_elements.clear()
+        try:
+            self._page.wait_for_load_state("load", timeout=_remaining_ms())
+            if selector is not None:
+                self._page.wait_for_selector(
+                    selector,
+                    state="attached",
+                    timeout=_remaining_ms(),
+                )
+                return True
+
+            quiet = False
+            # the page may navigate in between, then wait for the new page
+            for _ in range(3):
+                try:
+                    quiet = self._page.evaluate(
+                        "([quietMs, timeoutMs]) => "
+                        "waitForPageQuiet(quietMs, timeoutMs)",
+                        [
+                            self.quiet_period * 1000,
+                            min(self.max_quiet_wait * 1000, _remaining_ms()),
+                        ],
+                    )
+                except PlaywrightError as e:
+                    logger.debug(f"Page changed while waiting: {e}")
+                    self._page.wait_for_load_state(
+                        "load",
+                        timeout=_remaining_ms(),
+                    )
+                    continue
+                if not self._pending_navigation:
+                    return quiet
+                # a navigation is started, e.g. by submitting a form
+                self._page.wait_for_event("load", timeout=_remaining_ms())
+            return quiet
+        except PlaywrightError as e:
+            logger.debug(f"Page is not ready: {e}")
+            self._pending_navigation = False
+            return False
 
     def close(self) -> None:
-        """Close the browser"""
+        """Close the browser, or give the page back if it's leased from a
+        pool."""
+        if self._pool is not None:
+            for event, listener in self._page_listeners:
+                self._page.remove_listener(event, listener)
+            self._pool.release(self._page)
+            return
         self.browser.close()
+        self._playwright.stop()
 
     def _wait_for_load(
         self,
@@ -439,27 +555,85 @@ class WebBrowser:
                     The timeout for the page to load (in seconds)
         """
         logger.debug(hint_s)
-
-        if timeout is not None:
-            timeout = timeout * 1000
-
-        self._page.wait_for_load_state("load", timeout=timeout)
+        self.wait_for_ready(timeout=timeout)
         logger.debug(hint_e)
 
     def _verify_element_id(self, element_id: int) -> bool:
         """Verify the given element id is valid or not."""
-        return 0 <= element_id < len(self._interactive_elements)
+        return element_id in self._interactive_elements
+
+    def _get_element_handle(self, element_id: int) -> Optional[Any]:
+        """Get the handle of the marked element, or `None` if the id is
+        invalid or the element is no longer on the page."""
+        if not self._verify_element_id(element_id):
+            return None
+        return self._page.evaluate_handle(
+            "id => getInteractiveElement(id)",
+            element_id,
+        ).as_element()
+
+    def _element_id_error(self, element_id: int) -> ServiceResponse:
+        """The error response of an invalid element id."""
+        return ServiceResponse(
+            status=ServiceExecStatus.ERROR,
+            content=f"ElementIDError: The element id must be one of the "
+            f"marked elements {sorted(self._interactive_elements)}, but "
+            f"got {element_id}.",
+        )
+
+    def _setup_page(self) -> None:
+        """Inject the JavaScript into every document of the page, and track
+        the navigation of the main frame."""
+        # the page from a pool may have been set up by a previous browser
+        if not self._page.evaluate(
+            "typeof setInteractiveMarks === 'function'",
+        ):
+            self._page.add_init_script(script=self._mark_page_js)
+            # the current document is loaded already
+            self._page.evaluate(self._mark_page_js)
+
+        def _on_request(request: Any) -> None:
+            if (
+                request.is_navigation_request()
+                and request.frame == self._page.main_frame
+            ):
+                self._pending_navigation = True
+
+        def _on_navigation_end(*_args: Any) -> None:
+            self._pending_navigation = False
+
+        def _on_request_failed(request: Any) -> None:
+            if (
+                request.is_navigation_request()
+                and request.frame == self._page.main_frame
+            ):
+                self._pending_navigation = False
+
+        def _on_response(response: Any) -> None:
+            # no new document is loaded for responses without content
+            if (
+                response.status in (204, 205)
+                and response.request.is_navigation_request()
+                and response.frame == self._page.main_frame
+            ):
+                self._pending_navigation = False
+
+        self._page_listeners = [
+            ("request", _on_request),
+            ("requestfailed", _on_request_failed),
+            ("response", _on_response),
+            ("load", _on_navigation_end),
+            ("download", _on_navigation_end),
+        ]
+        for event, listener in self._page_listeners:
+            self._page.on(event, listener)
 
     def _load_external_js(self) -> None:
         """Read the JavaScript from local file. The JavaScript written in
         markpage.js will crawl all the interactive elements on the page,
         and mark them on with square marks.
         """
-        current_file_path = Path(__file__)
-        js_file_path = current_file_path.parent / "markpage.js"
-
-        with open(js_file_path, "r", encoding="utf-8") as file:
-            self._mark_page_js = file.read()
+        self._mark_page_js = _read_mark_page_js()
 
     def _get_jina_page(self) -> str:
         """Return the formatted current page text, using api from jina"""
@@ -6,6 +6,18 @@ https://github.com/geekan/MetaGPT/blob/main/metagpt/actions/di/execute_nb_code.p
 """
 import base64
 import asyncio
+import os
+import threading
+from contextlib import contextmanager
+from typing import (
+    Any,
+    AsyncGenerator,
+    Callable,
+    Coroutine,
+    Generator,
+    List,
+    Optional,
+)
 from loguru import logger
 
 try:
@@ -20,6 +32,55 @@ from ..service_status import ServiceExecStatus
 from ..service_response import ServiceResponse
 
 
+_LOOP: Optional[asyncio.AbstractEventLoop] = None
+_LOOP_LOCK = threading.Lock()
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    """Get the long-lived event loop shared by all notebook executors, which
+    runs in a background thread and owns the kernel connections."""
+    global _LOOP
+    with _LOOP_LOCK:
+        if _LOOP is None:
+            _LOOP = asyncio.new_event_loop()
+            threading.Thread(
+                target=_LOOP.run_forever,
+                name="notebook-executor",
+                daemon=True,
+            ).start()
+        return _LOOP
+
+
+def _reset_loop() -> None:
+    """The loop thread doesn't survive `fork`."""
+    global _LOOP, _LOOP_LOCK
+    _LOOP = None
+    _LOOP_LOCK = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_loop)
+
+
+def _run_sync(coro: Coroutine) -> Any:
+    """Run the coroutine in the executor loop and wait for the result."""
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop()).result()
+
+
+async def _run_async(coro: Coroutine) -> Any:
+    """Run the coroutine in the executor loop and await it from the loop of
+    the caller."""
+    loop = _get_loop()
+    try:
+        if asyncio.get_running_loop() is loop:
+            return await coro
+    except RuntimeError:
+        pass
+    return await asyncio.wrap_future(
+        asyncio.run_coroutine_threadsafe(coro, loop),
+    )
+
+
 class NoteBookExecutor:
     """
     Class for executing jupyter notebooks block interactively.
@@ -54,6 +115,9 @@ class NoteBookExecutor:
     def __init__(
         self,
         timeout: int = 300,
+        max_cells: Optional[int] = None,
+        max_output_length: Optional[int] = None,
+        output_callback: Optional[Callable[[Any], None]] = None,
     ) -> None:
         """
         The construct function of the NoteBookExecutor.
@@ -61,6 +125,19 @@ class NoteBookExecutor:
             timeout (Optional`int`):
                 The timeout for each cell execution.
                 Default to 300.
+            max_cells (`Optional[int]`, defaults to `None`):
+                The max number of executed cells kept in the notebook. The
+                oldest cells (and their outputs) are evicted when it's
+                exceeded, while the kernel state is kept. `None` means no
+                limit.
+            max_output_length (`Optional[int]`, defaults to `None`):
+                The max length of each returned text output, longer
+                outputs are truncated. `None` means no limit.
+            output_callback (`Optional[Callable[[Any], None]]`, defaults to
+            `None`):
+                Called with each parsed output as soon as the cell
+                produces it, e.g. to stream the outputs of long-running
+                cells.
         """
 
         if nbclient is None or nbformat is None:
@@ -70,10 +147,53 @@ class NoteBookExecutor:
             )
 
         self.nb = nbformat.v4.new_notebook()
-        self.nb_client = nbclient.NotebookClient(nb=self.nb)
         self.timeout = timeout
+        self.max_cells = max_cells
+        self.max_output_length = max_output_length
+        self.output_callback = output_callback
+        self.nb_client = self._new_client()
+        # the sink of the outputs of the running cell
+        self._sink: Optional[Callable[[Any], None]] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+        _run_sync(self._start_client())
+
+    def _new_client(self) -> Any:
+        """Create a notebook client that reports outputs as they arrive."""
+        client = nbclient.NotebookClient(nb=self.nb, timeout=self.timeout)
+        output = client.output
 
-        asyncio.run(self._start_client())
+        def streaming_output(  # type: ignore[no-untyped-def]
+            outs,
+            msg,
+            display_id,
+            cell_index,
+        ) -> Any:
+            out = output(outs, msg, display_id, cell_index)
+            if out is not None and self._sink is not None:
+                try:
+                    self._sink(self._parse(out))
+                except Exception as e:
+                    logger.warning(f"Error when streaming output: {e}")
+            return out
+
+        client.output = streaming_output
+        return client
+
+    def _parse(self, output: dict) -> Any:
+        """Parse the output and truncate it if necessary."""
+        parsed = self._output_parser(output)
+        if (
+            self.max_output_length is not None
+            and isinstance(parsed, str)
+            and len(parsed) > self.max_output_length
+        ):
+            parsed = (
+                parsed[: self.max_output_length]
+                + f"\n...[{len(parsed) - self.max_output_length} characters "
+                "truncated]"
+            )
+        return parsed
 
     def _output_parser(self, output: dict) -> str:
         """Parse the output of the notebook cell and return str"""
@@ -97,8 +217,8 @@ class NoteBookExecutor:
         """start notebook client"""
         if self.nb_client.kc is None or not await self.nb_client.kc.is_alive():
             self.nb_client.create_kernel_manager()
-            self.nb_client.start_new_kernel()
-            self.nb_client.start_new_kernel_client()
+            await self.nb_client.async_start_new_kernel()
+            await self.nb_client.async_start_new_kernel_client()
 
     async def _kill_client(self) -> None:
         """kill notebook client"""
@@ -109,29 +229,28 @@ class NoteBookExecutor:
             await self.nb_client.km.shutdown_kernel(now=True)
             await self.nb_client.km.cleanup_resources()
 
-        self.nb_client.kc.stop_channels()
+        if self.nb_client.kc is not None:
+            self.nb_client.kc.stop_channels()
         self.nb_client.kc = None
         self.nb_client.km = None
 
     async def _restart_client(self) -> None:
         """Restart the notebook client"""
         await self._kill_client()
-        self.nb_client = nbclient.NotebookClient(self.nb, timeout=self.timeout)
+        self.nb_client = self._new_client()
         await self._start_client()
 
     async def _run_cell(self, cell_index: int) -> ServiceResponse:
         """Run a cell in the notebook by its index"""
         try:
-            self.nb_client.execute_cell(self.nb.cells[cell_index], cell_index)
+            cell = self.nb.cells[cell_index]
+            await self.nb_client.async_execute_cell(cell, cell_index)
             return ServiceResponse(
                 status=ServiceExecStatus.SUCCESS,
-                content=[
-                    self._output_parser(output)
-                    for output in self.nb.cells[cell_index].outputs
-                ],
+                content=[self._parse(output) for output in cell.outputs],
             )
         except nbclient.exceptions.DeadKernelError:
-            await self.reset()
+            await self._restart_client()
             return ServiceResponse(
                 status=ServiceExecStatus.ERROR,
                 content="DeadKernelError when executing cell, reset kernel",
@@ -152,18 +271,111 @@ class NoteBookExecutor:
                 content=str(e),
             )
 
+    def _evict_cells(self) -> None:
+        """Drop the oldest cells if there are more than `max_cells`."""
+        if self.max_cells is None:
+            return
+        excess = len(self.nb.cells) - self.max_cells
+        if excess > 0:
+            del self.nb.cells[:excess]
+            # the recorded display ids refer to the old cell indexes
+            self.nb_client._display_id_map = {}  # pylint: disable=W0212
+
+    def _get_lock(self) -> asyncio.Lock:
+        """The lock that serializes the operations on the kernel, should be
+        called in the executor loop."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    async def _locked(self, coro: Coroutine) -> Any:
+        async with self._get_lock():
+            return await coro
+
+    async def _execute(
+        self,
+        code: str,
+        sink: Optional[Callable[[Any], None]] = None,
+    ) -> ServiceResponse:
+        """Execute the code in the executor loop."""
+        async with self._get_lock():
+            self.nb.cells.append(nbformat.v4.new_code_cell(code))
+            cell_index = self.cells_length - 1
+
+            def _sink(output: Any) -> None:
+                if self.output_callback is not None:
+                    self.output_callback(output)
+                if sink is not None:
+                    sink(output)
+
+            self._sink = _sink
+            try:
+                return await self._run_cell(cell_index)
+            finally:
+                self._sink = None
+                self._evict_cells()
+
     @property
     def cells_length(self) -> int:
         """return cell length"""
         return len(self.nb.cells)
 
-    async def async_run_code_on_notebook(self, code: str) -> ServiceResponse:
+    async def async_run_code_on_notebook(
+        self,
+        code: str,
+        on_output: Optional[Callable[[Any], None]] = None,
+    ) -> ServiceResponse:
+        """
+        Run the code on interactive notebook. It can be awaited from any
+        event loop.
+
+        Args:
+            code (`str`):
+                The Python code to be executed in the interactive notebook.
+            on_output (`Optional[Callable[[Any], None]]`, defaults to
+            `None`):
+                Called with each parsed output as soon as it's produced.
+                Note it's called in the thread of the executor loop.
         """
-        Run the code on interactive notebook
+        return await _run_async(self._execute(code, on_output))
+
+    async def stream_code_on_notebook(
+        self,
+        code: str,
+    ) -> AsyncGenerator[Any, None]:
+        """
+        Run the code on interactive notebook, and yield the parsed outputs
+        as soon as the cell produces them.
+
+        Args:
+            code (`str`):
+                The Python code to be executed in the interactive notebook.
         """
-        self.nb.cells.append(nbformat.v4.new_code_cell(code))
-        cell_index = self.cells_length - 1
-        return await self._run_cell(cell_index)
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        done = object()
+
+        def _sink(output: Any) -> None:
+            loop.call_soon_threadsafe(queue.put_nowait, output)
+
+        future = asyncio.run_coroutine_threadsafe(
+            self._execute(code, _sink),
+            _get_loop(),
+        )
+        future.add_done_callback(
+            lambda _: loop.call_soon_threadsafe(queue.put_nowait, done),
+        )
+        while True:
+            output = await queue.get()
+            if output is done:
+                break
+            yield output
+        response = future.result()
+        if response.status == ServiceExecStatus.ERROR and not isinstance(
+            response.content,
+            list,
+        ):
+            yield response.content
 
     def run_code_on_notebook(self, code: str) -> ServiceResponse:
         """
@@ -177,21 +389,119 @@ class NoteBookExecutor:
             `ServiceResponse`: whether the code execution was successful,
             and the output of the code execution.
         """
-        return asyncio.run(self.async_run_code_on_notebook(code))
+        return _run_sync(self._execute(code))
 
     def reset_notebook(self) -> ServiceResponse:
         """
         Reset the notebook
         """
-        asyncio.run(self._restart_client())
+        _run_sync(self._locked(self._restart_client()))
         return ServiceResponse(
             status=ServiceExecStatus.SUCCESS,
             content="Reset notebook",
         )
 
+    def close(self) -> None:
+        """Shut down the kernel of the notebook."""
+        _run_sync(self._locked(self._kill_client()))
+
     def _save_image(self, image_base64: str) -> str:
         """Save image data to a file.
         The image name is generated randomly here"""
         image_data = base64.b64decode(image_base64)
         file_manager = FileManager.get_instance()
         return file_manager.save_image(image_data)
+
+
+class NoteBookKernelPool:
+    """A pool of warm notebook executors that multiple agents can lease
+    from, so that an agent doesn't pay for the kernel start-up.
+
+    Example:
+
+        ```python
+        pool = NoteBookKernelPool(size=4)
+        with pool.leased() as executor:
+            executor.run_code_on_notebook("print('hello')")
+        ```
+    """
+
+    def __init__(
+        self,
+        size: int = 2,
+        reset_on_release: bool = True,
+        **executor_kwargs: Any,
+    ) -> None:
+        """Init the pool and start the kernels.
+
+        Args:
+            size (`int`, defaults to `2`):
+                The number of kernels in the pool.
+            reset_on_release (`bool`, defaults to `True`):
+                Whether to restart the kernel and clear the notebook when an
+                executor is released, so that the next lessee starts from a
+                clean state. The restart is done in background.
+            **executor_kwargs (`Any`):
+                The arguments used to init the `NoteBookExecutor`s.
+        """
+        self.reset_on_release = reset_on_release
+        self._executors: List[NoteBookExecutor] = [
+            NoteBookExecutor(**executor_kwargs) for _ in range(size)
+        ]
+        self._idle: List[NoteBookExecutor] = list(self._executors)
+        self._resetting: dict = {}
+        self._cond = threading.Condition()
+
+    def lease(self, timeout: Optional[float] = None) -> NoteBookExecutor:
+        """Lease an executor from the pool, wait until one is available.
+
+        Args:
+            timeout (`Optional[float]`, defaults to `None`):
+                The max seconds to wait, `None` means wait forever.
+
+        Returns:
+            `NoteBookExecutor`: The leased executor, which should be given
+            back by `release`.
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._idle, timeout=timeout):
+                raise TimeoutError("No notebook kernel is available.")
+            executor = self._idle.pop()
+            resetting = self._resetting.pop(id(executor), None)
+        if resetting is not None:
+            resetting.result()
+        return executor
+
+    def release(self, executor: NoteBookExecutor) -> None:
+        """Give back a leased executor."""
+        if self.reset_on_release:
+            executor.nb.cells.clear()
+            # pylint: disable=W0212
+            resetting = asyncio.run_coroutine_threadsafe(
+                executor._locked(executor._restart_client()),
+                _get_loop(),
+            )
+        else:
+            resetting = None
+        with self._cond:
+            if resetting is not None:
+                self._resetting[id(executor)] = resetting
+            self._idle.append(executor)
+            self._cond.notify()
+
+    @contextmanager
+    def leased(
+        self,
+        timeout: Optional[float] = None,
+    ) -> Generator[NoteBookExecutor, None, None]:
+        """Lease an executor within the context."""
+        executor = self.lease(timeout=timeout)
+        try:
+            yield executor
+        finally:
+            self.release(executor)
+
+    def close(self) -> None:
+        """Shut down all kernels of the pool."""
+        for executor in self._executors:
+            executor.close()
@@ -11,9 +11,11 @@ import re
 import shutil
 import subprocess
 import sys
+import threading
 import traceback
+from collections import deque
 from hashlib import md5
-from typing import Optional, Union, Tuple
+from typing import Any, Optional, Union, Tuple
 
 from loguru import logger
 
@@ -132,8 +134,7 @@ def _sys_execute(
 
     Parameters:
         code (str): The Python code to be executed.
-        shared_list (ListProxy): A list proxy managed by a
-            multiprocessing.Manager to which the output and error messages
+        shared_list (list): A list to which the output and error messages
             will be appended, along with a success flag.
         maximum_memory_bytes (int): The maximum amount of memory in bytes
             that the execution is allowed to use.
@@ -171,6 +172,141 @@ def _sys_execute(
     )
 
 
+def _sandbox_worker(conn: Any, parent_pid: int) -> None:
+    """The main function of a pre-forked sandbox process, which waits for
+    a single job, sends back the result through the pipe and exits."""
+    try:
+        while not conn.poll(1):
+            if os.getppid() != parent_pid:
+                # the parent process has exited
+                return
+        code, maximum_memory_bytes, timeout = conn.recv()
+    except (EOFError, OSError):
+        return
+    result: list = []
+    _sys_execute(code, result, maximum_memory_bytes, timeout)
+    conn.send(result)
+    conn.close()
+
+
+class _SandboxPool:
+    """A pool of pre-forked sandbox processes used by
+    `_execute_python_code_sys`.
+
+    Since `sys_python_guard` changes the global state of the interpreter
+    irreversibly, every process runs one job only. The processes are started
+    ahead of time, and a replacement is started while a job is running, so
+    that the process creation is not on the critical path of the call.
+    Results are sent back through a pipe.
+    """
+
+    # extra seconds to wait for the result after the timeout of the code,
+    # before the process is considered hung and killed
+    KILL_GRACE = 5
+
+    def __init__(self, size: int = 2) -> None:
+        """Init the pool.
+
+        Args:
+            size (`int`, defaults to `2`):
+                The number of idle processes to keep.
+        """
+        self.size = size
+        self._idle: deque = deque()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _spawn() -> Tuple[multiprocessing.Process, Any]:
+        parent_conn, child_conn = multiprocessing.Pipe()
+        process = multiprocessing.Process(
+            target=_sandbox_worker,
+            args=(child_conn, os.getpid()),
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+        return process, parent_conn
+
+    def _take(self) -> Tuple[multiprocessing.Process, Any]:
+        with self._lock:
+            while self._idle:
+                process, conn = self._idle.popleft()
+                if process.is_alive():
+                    return process, conn
+                conn.close()
+        return self._spawn()
+
+    def _refill(self) -> None:
+        while True:
+            with self._lock:
+                if len(self._idle) >= self.size:
+                    return
+            worker = self._spawn()
+            with self._lock:
+                self._idle.append(worker)
+
+    def run(
+        self,
+        code: str,
+        timeout: Optional[Union[int, float]],
+        maximum_memory_bytes: Optional[int],
+    ) -> Tuple[str, str, bool]:
+        """Run the code in a sandbox process.
+
+        Returns:
+            `Tuple[str, str, bool]`: The output, the error and whether the
+            execution is successful.
+        """
+        process, conn = self._take()
+        try:
+            conn.send((code, maximum_memory_bytes, timeout))
+            # start the replacement while the code is running
+            self._refill()
+            wait = None if timeout is None else timeout + self.KILL_GRACE
+            if not conn.poll(wait):
+                process.kill()
+                return "", f"TimeoutError: timed out after {timeout}s", False
+            output, error, status = conn.recv()
+            # the process exits by itself after sending the result, and is
+            # reaped by multiprocessing when the next process is started
+            return output, error, status
+        except (EOFError, OSError):
+            process.join(1)
+            if process.is_alive():
+                process.kill()
+            return (
+                "",
+                "The sandbox process exited unexpectedly with exit code "
+                f"{process.exitcode}.",
+                False,
+            )
+        finally:
+            conn.close()
+
+
+_SANDBOX_POOL: Optional[_SandboxPool] = None
+_SANDBOX_POOL_LOCK = threading.Lock()
+
+
+def _get_sandbox_pool() -> _SandboxPool:
+    global _SANDBOX_POOL
+    with _SANDBOX_POOL_LOCK:
+        if _SANDBOX_POOL is None:
+            _SANDBOX_POOL = _SandboxPool()
+        return _SANDBOX_POOL
+
+
+def _reset_sandbox_pool() -> None:
+    """The idle processes belong to the parent process."""
+    global _SANDBOX_POOL, _SANDBOX_POOL_LOCK
+    _SANDBOX_POOL = None
+    _SANDBOX_POOL_LOCK = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_sandbox_pool)
+
+
 def _execute_python_code_sys(
     code: str = "",
     timeout: Optional[Union[int, float]] = None,
@@ -190,23 +326,11 @@ def _execute_python_code_sys(
         "containerized environment.",
     )
 
-    manager = multiprocessing.Manager()
-    shared_list = manager.list()
-
-    p = multiprocessing.Process(
-        target=_sys_execute,
-        args=(
-            code,
-            shared_list,
-            maximum_memory_bytes,
-            timeout,
-        ),
+    output, error, status = _get_sandbox_pool().run(
+        code,
+        timeout,
+        maximum_memory_bytes,
     )
-    p.start()
-    p.join()
-    if p.is_alive():
-        p.kill()
-    output, error, status = shared_list[0], shared_list[1], shared_list[2]
     if status:
         return ServiceResponse(
             status=ServiceExecStatus.SUCCESS,
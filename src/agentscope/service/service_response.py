@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 """ Service response module """
-from typing import Any
+from typing import Any, Optional
 
 from agentscope.service.service_status import ServiceExecStatus
 
@@ -15,6 +15,7 @@ class ServiceResponse(dict):
         self,
         status: ServiceExecStatus,
         content: Any,
+        metadata: Optional[dict] = None,
     ):
         """Constructor of ServiceResponse
 
@@ -26,6 +27,11 @@ class ServiceResponse(dict):
                 response. We use `object` here to support various objects,
                 e.g. str, dict, image, video, etc.
                 Otherwise, `content` is the error message.
+            metadata (`Optional[dict]`, defaults to `None`):
+                Additional information about the execution, e.g. the
+                statistics of the service. Only stored when given.
         """
         self.status = status
         self.content = content
+        if metadata is not None:
+            self.metadata = metadata
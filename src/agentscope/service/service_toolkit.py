@@ -25,6 +25,7 @@ from ..exception import (
 from .service_response import ServiceResponse
 from .service_response import ServiceExecStatus
 from ..message import Msg
+from ..tracing import start_span
 
 try:
     from docstring_parser import parse
@@ -386,13 +387,15 @@ class ServiceToolkit:
             kwargs = cmd.get("arguments", {})
 
             # Execute the function
-            try:
-                func_res = service_func.processed_func(**kwargs)
-            except Exception as e:
-                func_res = ServiceResponse(
-                    status=ServiceExecStatus.ERROR,
-                    content=str(e),
-                )
+            with start_span(cmd["name"], "tool") as span:
+                try:
+                    func_res = service_func.processed_func(**kwargs)
+                except Exception as e:
+                    func_res = ServiceResponse(
+                        status=ServiceExecStatus.ERROR,
+                        content=str(e),
+                    )
+                span.set_attribute("status", func_res.status.name)
 
             status = (
                 "SUCCESS"
@@ -519,7 +522,12 @@ class ServiceToolkit:
 
         # The arguments that requires the agent to specify
         # to support class method, the self args are deprecated
-        args_agent = set(argsspec.args) - set(kwargs.keys()) - {"self", "cls"}
+        # (kept in the order of the signature for a deterministic prompt)
+        args_agent = [
+            _
+            for _ in argsspec.args
+            if _ not in kwargs and _ not in ("self", "cls")
+        ]
 
         # Check if the arguments from agent have descriptions in docstring
         args_description = {
@@ -677,7 +685,12 @@ class ServiceFactory:
 
         # The arguments that requires the agent to specify
         # we remove the self argument, for class methods
-        args_agent = set(argsspec.args) - set(kwargs.keys()) - {"self", "cls"}
+        # (kept in the order of the signature for a deterministic prompt)
+        args_agent = [
+            _
+            for _ in argsspec.args
+            if _ not in kwargs and _ not in ("self", "cls")
+        ]
 
         # Check if the arguments from agent have descriptions in docstring
         args_description = {
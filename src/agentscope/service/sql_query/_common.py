@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""Connection pool and result fetching shared by the database services."""
+import contextlib
+import os
+import threading
+from typing import Any, Callable, Generator, Hashable, Optional
+
+from loguru import logger
+
+
+def _close_quietly(conn: Any) -> None:
+    """Close the connection and ignore the errors."""
+    try:
+        conn.close()
+    except Exception as e:
+        logger.debug(f"Error when closing the connection: {e}")
+
+
+class _ConnectionPool:
+    """A pool of reusable connections keyed by the database/DSN and the
+    connection arguments.
+
+    A connection is leased to one caller at a time, and is put back to the
+    pool after use, so that the connection setup and the statement cache of
+    the connection are shared by the following queries. Connections that
+    fail to roll back after an error are discarded.
+    """
+
+    def __init__(self, max_idle: int = 4) -> None:
+        """Initialize the pool.
+
+        Args:
+            max_idle (`int`, defaults to `4`):
+                The max number of idle connections kept for each key.
+        """
+        self.max_idle = max_idle
+        self._idle: dict[Hashable, list] = {}
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def connection(
+        self,
+        key: Hashable,
+        connect: Callable[[], Any],
+        validate: Optional[Callable[[Any], None]] = None,
+    ) -> Generator[Any, None, None]:
+        """Lease a connection of the key, a new connection is created by
+        `connect` if no idle connection is available.
+
+        Args:
+            key (`Hashable`):
+                The key of the connection.
+            connect (`Callable[[], Any]`):
+                The function to create a new connection.
+            validate (`Optional[Callable[[Any], None]]`, defaults to `None`):
+                The function to check an idle connection before reusing it,
+                which should raise an exception if the connection is broken.
+        """
+        conn = None
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                conn = idle.pop()
+        if conn is not None and validate is not None:
+            try:
+                validate(conn)
+            except Exception:
+                _close_quietly(conn)
+                conn = None
+        if conn is None:
+            conn = connect()
+
+        try:
+            yield conn
+        except BaseException:
+            try:
+                conn.rollback()
+            except Exception:
+                _close_quietly(conn)
+                raise
+            self._release(key, conn)
+            raise
+        self._release(key, conn)
+
+    def _release(self, key: Hashable, conn: Any) -> None:
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle:
+                idle.append(conn)
+                return
+        _close_quietly(conn)
+
+    def close_all(self) -> None:
+        """Close all the idle connections."""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn in conns:
+                _close_quietly(conn)
+
+    def _reset_after_fork(self) -> None:
+        """The connections of the parent process must not be used by the
+        child process."""
+        self._idle = {}
+        self._lock = threading.Lock()
+
+
+_POOL = _ConnectionPool()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(
+        after_in_child=_POOL._reset_after_fork,  # pylint: disable=W0212
+    )
+
+
+def _pool_key(*args: Any, **kwargs: Any) -> str:
+    """Generate the pool key from the connection arguments."""
+    return repr((args, sorted(kwargs.items())))
+
+
+def close_sql_connections() -> None:
+    """Close the pooled idle connections of `query_sqlite` and
+    `query_mysql`."""
+    _POOL.close_all()
+
+
+def _fetch_preview(
+    cursor: Any,
+    max_preview_rows: int,
+    fetch_size: int = 1000,
+) -> dict:
+    """Fetch the result of the executed cursor chunk by chunk, and only keep
+    the first `max_preview_rows` rows, so that the memory usage doesn't
+    depend on the size of the result.
+
+    Returns:
+        `dict`: A dict with keys "columns" (`None` if the statement returns
+        no rows), "rows" (the preview), "row_count" (the number of returned
+        or affected rows) and "truncated".
+    """
+    if cursor.description is None:
+        return {
+            "columns": None,
+            "rows": [],
+            "row_count": cursor.rowcount,
+            "truncated": False,
+        }
+    columns = [col[0] for col in cursor.description]
+    rows = []
+    row_count = 0
+    while True:
+        chunk = cursor.fetchmany(fetch_size)
+        if not chunk:
+            break
+        row_count += len(chunk)
+        if len(rows) < max_preview_rows:
+            rows.extend(chunk[: max_preview_rows - len(rows)])
+    return {
+        "columns": columns,
+        "rows": rows,
+        "row_count": row_count,
+        "truncated": row_count > len(rows),
+    }
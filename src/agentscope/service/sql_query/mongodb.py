@@ -1,7 +1,10 @@
 # -*- coding: utf-8 -*-
 """query in MongoDB """
+import os
+import threading
 from typing import Optional, Any
 
+from ._common import _pool_key
 from ..service_response import ServiceResponse
 from ...service.service_status import ServiceExecStatus
 
@@ -10,6 +13,41 @@ try:
 except ImportError:
     pymongo = None
 
+# `MongoClient` maintains a connection pool itself and is thread-safe, so a
+# client is shared by the queries to the same server
+_CLIENTS: dict[str, Any] = {}
+_CLIENTS_LOCK = threading.Lock()
+
+
+def _get_client(host: str, port: int, **kwargs: Any) -> Any:
+    """Get the shared client of the server."""
+    key = _pool_key(host, port, **kwargs)
+    with _CLIENTS_LOCK:
+        if key not in _CLIENTS:
+            _CLIENTS[key] = pymongo.MongoClient(host=host, port=port, **kwargs)
+        return _CLIENTS[key]
+
+
+def close_mongodb_clients() -> None:
+    """Close the shared clients of `query_mongodb`."""
+    with _CLIENTS_LOCK:
+        clients = list(_CLIENTS.values())
+        _CLIENTS.clear()
+    for client in clients:
+        client.close()
+
+
+def _reset_clients_after_fork() -> None:
+    """MongoClient is not fork-safe, the child process creates its own
+    clients."""
+    global _CLIENTS_LOCK
+    _CLIENTS.clear()
+    _CLIENTS_LOCK = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_clients_after_fork)
+
 
 def query_mongodb(
     database: str,
@@ -18,6 +56,8 @@ def query_mongodb(
     host: str,
     port: int,
     maxcount_results: Optional[int] = None,
+    max_preview_rows: Optional[int] = None,
+    fetch_size: int = 1000,
     **kwargs: Any,
 ) -> ServiceResponse:
     """Execute query within MongoDB database.
@@ -36,7 +76,18 @@ def query_mongodb(
         maxcount_results (`int`, defaults to `None`):
             The maximum number of results to return. Defaults to `100` to
             avoid too many results.
+        max_preview_rows (`Optional[int]`, defaults to `None`):
+            If given, the documents are fetched in batches of `fetch_size`
+            and only the first `max_preview_rows` documents are kept, and
+            the content is a dict with keys "rows", "row_count" and
+            "truncated". Otherwise, the content is the list of all
+            documents.
+        fetch_size (`int`, defaults to `1000`):
+            The batch size of the cursor when `max_preview_rows` is given.
         **kwargs:
+            The arguments of `pymongo.MongoClient`. The client is shared by
+            the queries with the same host, port and arguments, call
+            `close_mongodb_clients` to close them.
 
     Returns:
         `ServiceResponse`: A `ServiceResponse` object that contains execution
@@ -48,32 +99,38 @@ def query_mongodb(
         `find` query and leave other operations in the future.
     """
     try:
-        # Establish connection to MongoDB
-        with pymongo.MongoClient(
-            host=host,
-            port=port,
-            **kwargs,
-        ) as mongo_client:
-            db = mongo_client[database]
-            coll = db[collection]
-
-            # Perform the query
-            if maxcount_results is not None:
-                results = coll.find(query).limit(maxcount_results)
-            else:
-                results = coll.find(query)
-
-            # mongo_client.close()
+        # Reuse the client of the server
+        mongo_client = _get_client(host=host, port=port, **kwargs)
+        db = mongo_client[database]
+        coll = db[collection]
 
+        # Perform the query
+        if maxcount_results is not None:
+            results = coll.find(query).limit(maxcount_results)
+        else:
+            results = coll.find(query)
+
+        if max_preview_rows is None:
             # Convert the cursor to a list
-            documents = list(results)
-            return ServiceResponse(
-                status=ServiceExecStatus.SUCCESS,
-                content=documents,
-            )
+            content = list(results)
+        else:
+            documents = []
+            count = 0
+            for document in results.batch_size(fetch_size):
+                count += 1
+                if len(documents) < max_preview_rows:
+                    documents.append(document)
+            content = {
+                "rows": documents,
+                "row_count": count,
+                "truncated": count > len(documents),
+            }
+        return ServiceResponse(
+            status=ServiceExecStatus.SUCCESS,
+            content=content,
+        )
 
     except Exception as e:
-        # mongo_client.close()
         return ServiceResponse(
             status=ServiceExecStatus.ERROR,
             # TODO: more specific error message
@@ -1,14 +1,16 @@
 # -*- coding: utf-8 -*-
 """query in Mysql """
-from typing import Optional
+from typing import Optional, Union
 from typing import Any
 
+from ._common import _POOL, _fetch_preview, _pool_key
 from ..service_response import ServiceResponse
 from ...utils.common import _if_change_database
 from ...service.service_status import ServiceExecStatus
 
 try:
     import pymysql
+    import pymysql.cursors
 except ImportError:
     pymysql = None
 
@@ -22,6 +24,9 @@ def query_mysql(
     port: int,
     allow_change_data: bool = False,
     maxcount_results: Optional[int] = None,
+    params: Optional[Union[list, dict]] = None,
+    max_preview_rows: Optional[int] = None,
+    fetch_size: int = 1000,
     **kwargs: Any,
 ) -> ServiceResponse:
     """
@@ -46,10 +51,27 @@ def query_mysql(
         maxcount_results (`int`, defaults to `None`):
             The maximum number of results to return. Defaults to `100` to
             avoid too many results.
+        params (`Optional[Union[list, dict]]`, defaults to `None`):
+            The parameters bound to the placeholders (`%s` or `%(name)s`)
+            in the query, which are escaped by the driver.
+        max_preview_rows (`Optional[int]`, defaults to `None`):
+            If given, the result is streamed from the server with an
+            unbuffered cursor in chunks of `fetch_size` rows and only the
+            first `max_preview_rows` rows are kept, and the content is a
+            dict with keys "columns", "rows", "row_count" and "truncated".
+            Otherwise, the content is the list of all rows.
+        fetch_size (`int`, defaults to `1000`):
+            The number of rows fetched at a time when `max_preview_rows` is
+            given.
 
     Returns:
         `ServiceResponse`: A `ServiceResponse` object that contains
         execution results or error message.
+
+    Note:
+        Connections are pooled by the server, user, database and `kwargs`,
+        and are pinged before being reused. Call `close_sql_connections` to
+        close them.
     """
 
     # Check if the query is safe
@@ -67,27 +89,54 @@ def query_mysql(
 
     # Execute the query
     try:
-        # Establish a connection to the database
-        conn = pymysql.connect(
-            host=host,
-            port=port,
-            user=user,
-            password=password,
-            database=database,
-            **kwargs,
-        )
+        # Reuse a pooled connection to the database if possible
+        with _POOL.connection(
+            key=_pool_key(
+                "mysql",
+                host,
+                port,
+                user,
+                password,
+                database,
+                **kwargs,
+            ),
+            connect=lambda: pymysql.connect(
+                host=host,
+                port=port,
+                user=user,
+                password=password,
+                database=database,
+                **kwargs,
+            ),
+            validate=lambda conn: conn.ping(reconnect=False),
+        ) as conn:
+            if max_preview_rows is None:
+                cursor = conn.cursor()
+            else:
+                # a server-side cursor, which doesn't load the whole result
+                cursor = conn.cursor(pymysql.cursors.SSCursor)
+            try:
+                if params is None:
+                    cursor.execute(query)
+                else:
+                    cursor.execute(query, params)
 
-        cursor = conn.cursor()
-        cursor.execute(query)
+                # Fetch the results
+                if max_preview_rows is None:
+                    results = cursor.fetchall()
+                else:
+                    results = _fetch_preview(
+                        cursor,
+                        max_preview_rows,
+                        fetch_size,
+                    )
+            finally:
+                cursor.close()
 
-        if _if_change_database(query):
+            # end the transaction before the connection is reused, which
+            # commits the change if there is any
             conn.commit()
 
-        cursor.close()
-        conn.close()
-
-        # Fetch the results
-        results = cursor.fetchall()
         return ServiceResponse(
             status=ServiceExecStatus.SUCCESS,
             content=results,
@@ -1,8 +1,10 @@
 # -*- coding: utf-8 -*-
 """ Query in sqlite """
-from typing import Optional
+import contextlib
+from typing import Optional, Union
 from typing import Any
 
+from ._common import _POOL, _fetch_preview, _pool_key
 from ...service.service_response import ServiceResponse
 from ...utils.common import _if_change_database
 from ...service.service_status import ServiceExecStatus
@@ -13,11 +15,25 @@ except ImportError:
     sqlite3 = None
 
 
+def _is_memory_database(database: Any) -> bool:
+    """Whether the database is an in-memory or temporary database, which is
+    private to its connection."""
+    database = str(database)
+    return (
+        database in ("", ":memory:")
+        or database.startswith("file::memory:")
+        or "mode=memory" in database
+    )
+
+
 def query_sqlite(
     database: str,
     query: str,
     allow_change_data: bool = False,
     maxcount_results: Optional[int] = None,
+    params: Optional[Union[list, dict]] = None,
+    max_preview_rows: Optional[int] = None,
+    fetch_size: int = 1000,
     **kwargs: Any,
 ) -> ServiceResponse:
     """Executes query within sqlite database.
@@ -32,10 +48,30 @@ def query_sqlite(
             `False` to avoid accidental changes to the database.
         maxcount_results (`int`, defaults to `None`):
             The maximum number of results to return.
+        params (`Optional[Union[list, dict]]`, defaults to `None`):
+            The parameters bound to the placeholders in the query. Repeated
+            queries with different parameters reuse the cached prepared
+            statement of the pooled connection.
+        max_preview_rows (`Optional[int]`, defaults to `None`):
+            If given, the result is fetched in chunks of `fetch_size` rows
+            and only the first `max_preview_rows` rows are kept, and the
+            content is a dict with keys "columns", "rows", "row_count" and
+            "truncated". Otherwise, the content is the list of all rows.
+        fetch_size (`int`, defaults to `1000`):
+            The number of rows fetched at a time when `max_preview_rows` is
+            given.
 
     Returns:
         `ServiceResponse`: A `ServiceResponse` object that contains
         execution results or error message.
+
+    Note:
+        Connections are pooled by the database and `kwargs`, and are
+        created with `check_same_thread=False` unless specified, as a
+        pooled connection can be reused by another thread. Call
+        `close_sql_connections` to close them. In-memory and temporary
+        databases are private to their connections, so they are not pooled,
+        and a new connection is opened and closed for each query.
     """
 
     # Check if the query is safe
@@ -52,17 +88,38 @@ def query_sqlite(
             query += f" LIMIT {maxcount_results}"
 
     try:
-        conn = sqlite3.connect(database, **kwargs)
-        cursor = conn.cursor()
-        cursor.execute(query)
-        results = cursor.fetchall()
+        if _is_memory_database(database):
+            connection = contextlib.closing(
+                sqlite3.connect(database, **kwargs),
+            )
+        else:
+            kwargs.setdefault("check_same_thread", False)
+            connection = _POOL.connection(
+                key=_pool_key("sqlite", database, **kwargs),
+                connect=lambda: sqlite3.connect(database, **kwargs),
+            )
 
-        # commit the change if needed
-        if _if_change_database(query):
-            conn.commit()
+        with connection as conn:
+            cursor = conn.cursor()
+            try:
+                if params is None:
+                    cursor.execute(query)
+                else:
+                    cursor.execute(query, params)
+                if max_preview_rows is None:
+                    results = cursor.fetchall()
+                else:
+                    results = _fetch_preview(
+                        cursor,
+                        max_preview_rows,
+                        fetch_size,
+                    )
+            finally:
+                cursor.close()
 
-        cursor.close()
-        conn.close()
+            # end the transaction before the connection is reused, which
+            # commits the change if there is any
+            conn.commit()
 
         return ServiceResponse(
             status=ServiceExecStatus.SUCCESS,
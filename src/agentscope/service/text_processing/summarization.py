@@ -2,8 +2,12 @@
 """
 Service for text processing
 """
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
 from loguru import logger
 
+from agentscope import tokens
 from agentscope.models import ModelWrapperBase
 from agentscope.service.service_status import ServiceExecStatus
 from agentscope.service.service_response import ServiceResponse
@@ -18,6 +22,9 @@ def summarization(
     system_prompt: str = _DEFAULT_SYSTEM_PROMPT,
     max_return_token: int = -1,
     token_limit_prompt: str = _DEFAULT_TOKEN_LIMIT_PROMPT,
+    chunk_size: Optional[int] = None,
+    fan_out: int = 4,
+    max_parallel: int = 4,
 ) -> ServiceResponse:
     """Summarize the input text.
 
@@ -37,6 +44,18 @@ def summarization(
             number of tokens in summarization returned by the model.
         token_limit_prompt (`str`, defaults to `_DEFAULT_TOKEN_LIMIT_PROMPT`):
             Prompt to instruct the model follow token limitation.
+        chunk_size (`Optional[int]`, defaults to `None`):
+            The max number of tokens of the text in one model call. If
+            given and the text is longer, the text is split into chunks that
+            are summarized concurrently, and the partial summaries are
+            merged hierarchically (map-reduce). If `None`, the whole text is
+            summarized by a single model call.
+        fan_out (`int`, defaults to `4`):
+            The number of partial summaries merged by one model call in the
+            reduce stage. Only used when `chunk_size` is given.
+        max_parallel (`int`, defaults to `4`):
+            The max number of concurrent model calls. Only used when
+            `chunk_size` is given.
 
     Returns:
         `ServiceResponse`: If the model successfully summarized the text, and
@@ -44,7 +63,12 @@ def summarization(
         `ServiceResponse` with `ServiceExecStatus.SUCCESS`; otherwise return
         `ServiceResponse` with `ServiceExecStatus.ERROR` (if the summary is
         return successfully but exceed the token limits, the content
-        contains the summary as well).
+        contains the summary as well). In chunked mode, the metadata of a
+        successful response holds the number of tokens of the text
+        (`n_tokens`), the number of model calls (`n_calls`), the tokens of
+        text sent in all calls (`n_sent_tokens`), and the context tokens
+        saved by the largest call compared to summarizing the whole text
+        at once (`n_saved_tokens`).
 
     Example:
 
@@ -69,6 +93,17 @@ def summarization(
 
     Messages will be processed by model.format() before feeding to models.
     """
+    if chunk_size is not None:
+        return _chunked_summarization(
+            model=model,
+            text=text,
+            system_prompt=system_prompt,
+            max_return_token=max_return_token,
+            token_limit_prompt=token_limit_prompt,
+            chunk_size=chunk_size,
+            fan_out=fan_out,
+            max_parallel=max_parallel,
+        )
     if max_return_token > 0:
         system_prompt += token_limit_prompt.format(max_return_token)
     try:
@@ -89,3 +124,209 @@ def summarization(
             ServiceExecStatus.ERROR,
             content=f"Summarization by model {model.model} fail",
         )
+
+
+# Used to estimate the number of tokens when the model is not supported by
+# `agentscope.tokens`
+_APPROX_CHARS_PER_TOKEN = 4
+
+# Separators to end a chunk at, in order of preference
+_CHUNK_SEPARATORS = ("\n\n", "\n", ". ", " ")
+
+
+def _count_tokens(model_name: str, text: str) -> int:
+    """Count the tokens of the text, or estimate it by the number of
+    characters if the model is not supported by `agentscope.tokens`."""
+    try:
+        return tokens.count(
+            model_name,
+            [{"role": "user", "content": text}],
+        )
+    except Exception as e:
+        logger.debug(
+            f"Estimate the number of tokens by characters as counting "
+            f"tokens for model [{model_name}] failed: {e}",
+        )
+        return len(text) // _APPROX_CHARS_PER_TOKEN + 1
+
+
+def _split_text(text: str, n_tokens: int, chunk_size: int) -> list[str]:
+    """Split the text into chunks of about `chunk_size` tokens.
+
+    The text is counted only once, and the chunk length in characters is
+    derived from its average characters per token. Chunks end at paragraph,
+    line, sentence or word boundaries when possible.
+    """
+    if n_tokens <= chunk_size:
+        return [text]
+    max_chars = max(int(len(text) * chunk_size / n_tokens), 1)
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = start + max_chars
+        if end < len(text):
+            # don't move the boundary back more than half a chunk
+            floor = start + max_chars // 2
+            for sep in _CHUNK_SEPARATORS:
+                # the separator itself may exceed the chunk
+                pos = text.rfind(sep, floor, end + len(sep))
+                if pos != -1:
+                    end = pos + len(sep)
+                    break
+        chunk = text[start:end].strip()
+        if chunk:
+            chunks.append(chunk)
+        start = end
+    return chunks
+
+
+def _summarize_once(
+    model: ModelWrapperBase,
+    text: str,
+    system_prompt: str,
+) -> str:
+    """Summarize the text with a single model call."""
+    msgs = [
+        Msg(name="system", role="system", content=system_prompt),
+        Msg(name="user", role="user", content=text),
+    ]
+    return model(model.format(msgs)).text
+
+
+def _group_summaries(
+    summaries: list[str],
+    counts: list[int],
+    chunk_size: int,
+    fan_out: int,
+) -> list[tuple[str, int]]:
+    """Merge consecutive partial summaries into groups of at most `fan_out`
+    summaries and about `chunk_size` tokens, and split the groups that
+    still exceed `chunk_size`.
+
+    Returns:
+        `list[tuple[str, int]]`: The texts of the groups and their numbers
+        of tokens.
+    """
+    groups: list[list[str]] = []
+    sizes: list[int] = []
+    for summary, n_tokens in zip(summaries, counts):
+        if (
+            groups
+            and len(groups[-1]) < fan_out
+            and sizes[-1] + n_tokens <= chunk_size
+        ):
+            groups[-1].append(summary)
+            sizes[-1] += n_tokens
+        else:
+            groups.append([summary])
+            sizes.append(n_tokens)
+
+    pieces = []
+    for members, n_tokens in zip(groups, sizes):
+        text = "\n\n".join(members)
+        chunks = _split_text(text, n_tokens, chunk_size)
+        pieces.extend(
+            (chunk, _estimate_tokens(chunk, text, n_tokens))
+            for chunk in chunks
+        )
+    return pieces
+
+
+def _estimate_tokens(part: str, text: str, n_tokens: int) -> int:
+    """Estimate the tokens of a part of the text, which has `n_tokens`
+    tokens in total."""
+    if part == text:
+        return n_tokens
+    return max(len(part) * n_tokens // max(len(text), 1), 1)
+
+
+def _chunked_summarization(
+    model: ModelWrapperBase,
+    text: str,
+    system_prompt: str,
+    max_return_token: int,
+    token_limit_prompt: str,
+    chunk_size: int,
+    fan_out: int,
+    max_parallel: int,
+) -> ServiceResponse:
+    """Summarize a long text by summarizing its chunks concurrently and
+    merging the partial summaries in groups of at most `fan_out` summaries
+    and `chunk_size` tokens until a single summary is left."""
+    if chunk_size <= 0 or fan_out < 2 or max_parallel <= 0:
+        return ServiceResponse(
+            ServiceExecStatus.ERROR,
+            content="`chunk_size` and `max_parallel` should be positive and "
+            "`fan_out` should be at least 2.",
+        )
+    model_name = getattr(model, "model_name", None) or ""
+    n_tokens = _count_tokens(model_name, text)
+    pieces = [
+        (chunk, _estimate_tokens(chunk, text, n_tokens))
+        for chunk in _split_text(text, n_tokens, chunk_size)
+    ]
+
+    final_prompt = system_prompt
+    if max_return_token > 0:
+        final_prompt += token_limit_prompt.format(max_return_token)
+
+    n_chunks = len(pieces)
+    n_calls = 0
+    n_sent = 0
+    max_call = 0
+    try:
+        with ThreadPoolExecutor(max_workers=max_parallel) as executor:
+            while len(pieces) > 1:
+                n_calls += len(pieces)
+                n_sent += sum(n for _, n in pieces)
+                max_call = max([max_call] + [n for _, n in pieces])
+                summaries = list(
+                    executor.map(
+                        lambda piece: _summarize_once(
+                            model,
+                            piece[0],
+                            system_prompt,
+                        ),
+                        pieces,
+                    ),
+                )
+                counts = [_count_tokens(model_name, _) for _ in summaries]
+                if sum(counts) >= sum(n for _, n in pieces):
+                    raise ValueError(
+                        "The partial summaries are not shorter than the "
+                        "summarized text.",
+                    )
+                pieces = _group_summaries(
+                    summaries,
+                    counts,
+                    chunk_size,
+                    fan_out,
+                )
+        # the last call gets the token limitation
+        summary = _summarize_once(model, pieces[0][0], final_prompt)
+        n_calls += 1
+        n_sent += pieces[0][1]
+        max_call = max(max_call, pieces[0][1])
+    except Exception as e:
+        logger.exception(e)
+        return ServiceResponse(
+            ServiceExecStatus.ERROR,
+            content=f"Summarization by model {model_name} fail",
+        )
+    n_saved = max(n_tokens - max_call, 0)
+    logger.info(
+        f"Summarized {n_tokens} tokens in {n_chunks} chunk(s) of at most "
+        f"about {chunk_size} tokens, with {n_calls} model call(s) taking "
+        f"{n_sent} tokens of text in total, and {n_saved} fewer context "
+        f"tokens in the largest call than a single call.",
+    )
+    return ServiceResponse(
+        ServiceExecStatus.SUCCESS,
+        content=summary,
+        metadata={
+            "n_tokens": n_tokens,
+            "n_calls": n_calls,
+            "n_sent_tokens": n_sent,
+            "n_saved_tokens": n_saved,
+        },
+    )
@@ -1,15 +1,23 @@
 # -*- coding: utf-8 -*-
 """parsing and digesting the web pages"""
+import codecs
+import hashlib
 import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
 from urllib.parse import urlparse
-from typing import Optional, Callable, Sequence, Any
+from typing import Optional, Callable, Sequence, Any, Union
 import requests
+from requests.adapters import HTTPAdapter
 from loguru import logger
 
 
 from agentscope.service.service_response import ServiceResponse
 from agentscope.service.service_status import ServiceExecStatus
 from agentscope.models.model import ModelWrapperBase
+from agentscope.manager import FileManager
 from agentscope.service import summarization
 
 
@@ -18,6 +26,38 @@ DEFAULT_WEB_SYS_PROMPT = (
     "and useful information from html or webpage description.\n"
 )
 
+_DEFAULT_HEADER = {
+    "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8,en-GB;q=0.7,en-US;q=0.6",
+    "Cache-Control": "max-age=0",
+    "Upgrade-Insecure-Requests": "1",
+    "User-Agent": "Mozilla/5.0 (X11; Linux x86_64)"
+    " AppleWebKit/537.36 (KHTML, like Gecko) ",
+}
+
+# Elements without end tags, which cannot contain any text
+_VOID_ELEMENTS = frozenset(
+    (
+        "area",
+        "base",
+        "br",
+        "col",
+        "embed",
+        "hr",
+        "img",
+        "input",
+        "link",
+        "meta",
+        "param",
+        "source",
+        "track",
+        "wbr",
+    ),
+)
+
+# Elements whose text, including the text of their descendants, is not
+# taken as the text of the page
+_HIDDEN_TEXT_ELEMENTS = frozenset(("script", "style", "template", "rt", "rp"))
+
 
 def is_valid_url(url: str) -> bool:
     """
@@ -87,15 +127,12 @@ def load_web(
                 "selected_tags_text": xxxxx
             }
     """
-    header = {
-        "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8,en-GB;q=0.7,en-US;q=0.6",
-        "Cache-Control": "max-age=0",
-        "Upgrade-Insecure-Requests": "1",
-        "User-Agent": "Mozilla/5.0 (X11; Linux x86_64)"
-        " AppleWebKit/537.36 (KHTML, like Gecko) ",
-    }
     try:
-        response = requests.get(url=url, headers=header, timeout=timeout)
+        response = requests.get(
+            url=url,
+            headers=_DEFAULT_HEADER,
+            timeout=timeout,
+        )
 
         if response.status_code == 200:
             results = {}
@@ -150,6 +187,99 @@ def load_web(
         return ServiceResponse(ServiceExecStatus.ERROR, content="")
 
 
+class _HTMLTextExtractor(HTMLParser):
+    """Extract the text of the selected tags from html incrementally.
+
+    Only the names of the open tags are kept, and the text out of the
+    selected tags is dropped once it is read, so that the html can be fed
+    chunk by chunk while it is downloaded, without building the document
+    tree. The text of a selected tag contains the text of all its
+    descendants, with whitespaces normalized within each tag, and links
+    formatted as `[text](href)`.
+    """
+
+    def __init__(self, html_selected_tags: Sequence[str]) -> None:
+        super().__init__(convert_charrefs=True)
+        self._selected = frozenset(html_selected_tags)
+        # (tag, text parts or None if not in a selected tag, href)
+        self._stack: list[tuple[str, Optional[list], Optional[str]]] = []
+        self._pending: list[str] = []
+        self._results: list[str] = []
+        # the number of open hidden text elements
+        self._hidden = 0
+
+    @property
+    def text(self) -> str:
+        """The text extracted so far."""
+        return "".join(self._results)
+
+    def _flush(self) -> None:
+        """Append the pending text to the current tag."""
+        if not self._pending:
+            return
+        text = "".join(self._pending)
+        self._pending.clear()
+        tag, parts, href = self._stack[-1]
+        if tag == "a" and href:
+            if is_valid_url(href):
+                parts.append(f"[{text.strip()}]({href})")
+        else:
+            parts.append(text)
+
+    def _pop(self) -> None:
+        """Close the innermost open tag."""
+        tag, parts, _ = self._stack.pop()
+        if tag in _HIDDEN_TEXT_ELEMENTS:
+            self._hidden -= 1
+        if parts is None:
+            return
+        text = " ".join("".join(parts).split())
+        if self._stack and self._stack[-1][1] is not None:
+            self._stack[-1][1].append(text)
+        else:
+            self._results.append(text)
+
+    def handle_starttag(self, tag: str, attrs: list) -> None:
+        self._flush()
+        if tag in _VOID_ELEMENTS:
+            return
+        if tag in _HIDDEN_TEXT_ELEMENTS:
+            self._hidden += 1
+        if tag in self._selected or (
+            self._stack and self._stack[-1][1] is not None
+        ):
+            href = dict(attrs).get("href") if tag == "a" else None
+            self._stack.append((tag, [], href))
+        else:
+            self._stack.append((tag, None, None))
+
+    def handle_endtag(self, tag: str) -> None:
+        self._flush()
+        # close the unclosed tags within it, and ignore stray end tags
+        for i in range(len(self._stack) - 1, -1, -1):
+            if self._stack[i][0] == tag:
+                while len(self._stack) > i:
+                    self._pop()
+                return
+
+    def handle_data(self, data: str) -> None:
+        if (
+            self._hidden == 0
+            and self._stack
+            and self._stack[-1][1] is not None
+        ):
+            self._pending.append(data)
+
+    def handle_comment(self, data: str) -> None:
+        self._flush()
+
+    def close(self) -> None:
+        super().close()
+        self._flush()
+        while self._stack:
+            self._pop()
+
+
 def parse_html_to_text(
     html_text: str,
     html_selected_tags: Optional[Sequence[str]] = None,
@@ -168,47 +298,288 @@ def parse_html_to_text(
         `ServiceResponse`: If successful, `ServiceResponse` object is returned
         with `content` field is processed text content of the selected tags,
     """
-    if html_selected_tags:
-        logger.info(
-            f"extracting text information from tags: " f"{html_selected_tags}",
+    if not html_selected_tags:
+        return ""
+    logger.info(
+        f"extracting text information from tags: " f"{html_selected_tags}",
+    )
+    extractor = _HTMLTextExtractor(html_selected_tags)
+    extractor.feed(html_text)
+    extractor.close()
+    return extractor.text
+
+
+class _WebCache:
+    """Cache of the web pages on disk, which is validated by conditional
+    GET requests with the `ETag` and `Last-Modified` of the pages."""
+
+    def __init__(self, cache_dir: str) -> None:
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, url: str) -> str:
+        return os.path.join(
+            self.cache_dir,
+            hashlib.sha256(url.encode("utf-8")).hexdigest(),
         )
+
+    def get(self, url: str) -> Optional[tuple[dict, bytes]]:
+        """Get the metadata and the body of the cached page."""
+        path = self._path(url)
         try:
-            from bs4 import BeautifulSoup, NavigableString, Tag
-        except ImportError as exc:
-            raise ImportError(
-                "BeautifulSoup4 is required for processing the "
-                "web page without model."
-                "Please install with `pip install bs4` .",
-            ) from exc
-
-        doc = BeautifulSoup(html_text, "html.parser")
-
-        def get_navigable_strings(
-            e: Tag,
-        ) -> str:
-            # pylint: disable=cell-var-from-loop
-            text = ""
-            for child in e.children:
-                if isinstance(child, Tag):
-                    # pylint: disable=cell-var-from-loop
-                    text += get_navigable_strings(child).strip(" \n\t")
-                elif isinstance(child, NavigableString):
-                    if (e.name == "a") and (href := e.get("href")):
-                        if is_valid_url(href):
-                            text += f"[{child.strip()}]({href})"
-                    else:
-                        text += child.text
-            return " ".join(text.split())
-
-        text_parts = ""
-        for element in doc.find_all(recursive=True):
-            if element.name in html_selected_tags:
-                text_parts += get_navigable_strings(element).strip(" \n\t")
-                element.decompose()
+            with open(path + ".json", "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(path + ".body", "rb") as f:
+                body = f.read()
+        except (OSError, ValueError):
+            return None
+        if meta.get("url") != url:
+            return None
+        return meta, body
+
+    def put(self, url: str, meta: dict, body: bytes) -> None:
+        """Cache the page, the metadata is written at last so that an
+        incomplete entry is never read."""
+        path = self._path(url)
+        suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(path + ".body" + suffix, "wb") as f:
+                f.write(body)
+            os.replace(path + ".body" + suffix, path + ".body")
+            with open(path + ".json" + suffix, "w", encoding="utf-8") as f:
+                json.dump(dict(meta, url=url), f)
+            os.replace(path + ".json" + suffix, path + ".json")
+        except OSError as e:
+            logger.warning(f"Fail to cache web page {url}: {e}")
+
+
+def _decode_chunks(
+    chunks: Any,
+    encoding: Optional[str],
+) -> Any:
+    """Decode the byte chunks incrementally."""
+    try:
+        decoder = codecs.getincrementaldecoder(encoding or "utf-8")(
+            errors="replace",
+        )
+    except LookupError:
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    for chunk in chunks:
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+    text = decoder.decode(b"", final=True)
+    if text:
+        yield text
+
+
+def _revalidation_header(cached: Optional[tuple[dict, bytes]]) -> dict:
+    """Get the request header, which makes the request conditional on the
+    `ETag` and `Last-Modified` of the cached page if there is one."""
+    if cached is None:
+        return _DEFAULT_HEADER
+    header = dict(_DEFAULT_HEADER)
+    if cached[0].get("etag"):
+        header["If-None-Match"] = cached[0]["etag"]
+    if cached[0].get("last_modified"):
+        header["If-Modified-Since"] = cached[0]["last_modified"]
+    return header
+
+
+def _parse_web_content(
+    url: str,
+    meta: dict,
+    body: Optional[bytes],
+    extractor: Optional[_HTMLTextExtractor],
+    keep_raw: bool,
+) -> dict:
+    """Get the results of a fetched page in the format of `load_web`."""
+    content_type = meta["content_type"].lower()
+    results: dict = {}
+    if keep_raw:
+        results["raw"] = body
+    if extractor is not None:
+        extractor.close()
+        results["html_to_text"] = extractor.text
+    elif "html" in content_type:
+        pass
+    elif "json" in content_type:
+        results["json"] = json.loads(
+            "".join(_decode_chunks([body], meta["encoding"])),
+        )
+    elif "pdf" in content_type or "image" in content_type:
+        logger.warning(
+            f"Current version does not parse url with {content_type} "
+            f"Content-Types",
+        )
     else:
-        text_parts = ""
+        raise NotImplementedError(
+            f"Unsupported content type ({content_type}) with url: ({url})",
+        )
+    return results
+
 
-    return text_parts
+def _fetch_web(
+    session: requests.Session,
+    url: str,
+    keep_raw: bool,
+    html_selected_tags: Optional[Sequence[str]],
+    timeout: int,
+    cache: Optional[_WebCache],
+) -> ServiceResponse:
+    """Fetch a web page for `load_web_many`."""
+    cached = cache.get(url) if cache is not None else None
+    body: Optional[bytes]
+    with session.get(
+        url=url,
+        headers=_revalidation_header(cached),
+        timeout=timeout,
+        stream=True,
+    ) as response:
+        if response.status_code == 304 and cached is not None:
+            meta, body = cached
+            chunks = [body]
+        elif response.status_code == 200:
+            meta = {
+                "content_type": response.headers.get("Content-Type", ""),
+                "encoding": response.encoding,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+            }
+            body = None
+            chunks = response.iter_content(chunk_size=16384)
+        else:
+            logger.warning(
+                f"Fail to load web page {url}, "
+                f"status code {response.status_code}",
+            )
+            return ServiceResponse(ServiceExecStatus.ERROR, content="")
+
+        to_cache = (
+            body is None
+            and cache is not None
+            and bool(meta["etag"] or meta["last_modified"])
+        )
+        extractor = None
+        if "html" in meta["content_type"].lower() and html_selected_tags:
+            extractor = _HTMLTextExtractor(html_selected_tags)
+
+        # feed the html to the extractor while downloading, and keep the
+        # body only when it's needed
+        if extractor is not None and not keep_raw and not to_cache:
+            for text in _decode_chunks(chunks, meta["encoding"]):
+                extractor.feed(text)
+        else:
+            if body is None:
+                body = b"".join(chunks)
+            if extractor is not None:
+                for text in _decode_chunks([body], meta["encoding"]):
+                    extractor.feed(text)
+
+    results = _parse_web_content(url, meta, body, extractor, keep_raw)
+    # the body is kept when the page is to be cached
+    if to_cache and cache is not None and body is not None:
+        cache.put(url, meta, body)
+    return ServiceResponse(ServiceExecStatus.SUCCESS, content=results)
+
+
+def load_web_many(
+    urls: Sequence[str],
+    keep_raw: bool = False,
+    html_selected_tags: Optional[Sequence[str]] = ("h", "p", "li", "div", "a"),
+    timeout: int = 5,
+    max_workers: int = 16,
+    max_per_host: int = 4,
+    cache_dir: Union[str, bool, None] = None,
+) -> ServiceResponse:
+    """Load multiple web pages concurrently.
+
+    Compared with calling `load_web` for each url, the pages are fetched in
+    parallel with pooled connections, the html is converted into text while
+    it is downloaded, and the pages are cached on disk and revalidated with
+    conditional requests (`ETag` and `Last-Modified`).
+
+    Args:
+        urls (`Sequence[str]`):
+            The urls of the web pages.
+        keep_raw (`bool`, defaults to `False`):
+            Whether to keep the raw content with key "raw".
+        html_selected_tags (`Optional[Sequence[str]]`, defaults to
+        `("h", "p", "li", "div", "a")`):
+            The text in elements of `html_selected_tags` will be extracted
+            and stored with key "html_to_text".
+        timeout (`int`, defaults to `5`):
+            The timeout of each request in seconds.
+        max_workers (`int`, defaults to `16`):
+            The max number of concurrent requests.
+        max_per_host (`int`, defaults to `4`):
+            The max number of concurrent requests to the same host.
+        cache_dir (`Union[str, bool, None]`, defaults to `None`):
+            The directory to cache the web pages. If `None` or `True`, the
+            cache directory of agentscope is used if it's initialized. If
+            `False`, the pages are not cached.
+
+    Returns:
+        `ServiceResponse`: The status is `SUCCESS` if any page is loaded,
+        and the `content` field is a dict from the urls to their results,
+        which are `ServiceResponse` objects with the same content as
+        `load_web`.
+    """
+    cache = None
+    if cache_dir is None or cache_dir is True:
+        try:
+            cache = _WebCache(FileManager.get_instance().web_cache_dir)
+        except ValueError:
+            pass
+    elif isinstance(cache_dir, str) and cache_dir:
+        cache = _WebCache(cache_dir)
+
+    unique_urls = list(dict.fromkeys(urls))
+    host_limits = {
+        host: threading.BoundedSemaphore(max_per_host)
+        for host in {urlparse(url).netloc for url in unique_urls}
+    }
+
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=max(len(host_limits), 1),
+        pool_maxsize=max_per_host,
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    def _load(url: str) -> ServiceResponse:
+        if not is_valid_url(url):
+            return ServiceResponse(
+                ServiceExecStatus.ERROR,
+                content=f"Invalid url: {url}",
+            )
+        with host_limits[urlparse(url).netloc]:
+            try:
+                return _fetch_web(
+                    session,
+                    url,
+                    keep_raw,
+                    html_selected_tags,
+                    timeout,
+                    cache,
+                )
+            except Exception as e:
+                logger.warning(f"Fail to load web page {url}: {e}")
+                return ServiceResponse(ServiceExecStatus.ERROR, content="")
+
+    with session, ThreadPoolExecutor(
+        max_workers=max(min(max_workers, len(unique_urls)), 1),
+    ) as executor:
+        results = dict(zip(unique_urls, executor.map(_load, unique_urls)))
+
+    success = any(
+        res.status == ServiceExecStatus.SUCCESS for res in results.values()
+    )
+    return ServiceResponse(
+        ServiceExecStatus.SUCCESS if success else ServiceExecStatus.ERROR,
+        content=results,
+    )
 
 
 def digest_webpage(
@@ -216,6 +587,8 @@ def digest_webpage(
     model: ModelWrapperBase = None,
     html_selected_tags: Sequence[str] = ("h", "p", "li", "div", "a"),
     digest_prompt: str = DEFAULT_WEB_SYS_PROMPT,
+    chunk_size: Optional[int] = None,
+    fan_out: int = 4,
 ) -> ServiceResponse:
     """Digest the given webpage.
 
@@ -227,6 +600,12 @@ def digest_webpage(
             be extracted and feed to the model
         digest_prompt (str): system prompt for the model to digest
             the web content
+        chunk_size (Optional[int]):
+            if given, long web pages are split into chunks of at most
+            `chunk_size` tokens, which are digested concurrently and then
+            merged, see `summarization` for details
+        fan_out (int): the number of partial digests merged by one
+            model call when `chunk_size` is given
 
     Returns:
         `ServiceResponse`: If successful, `ServiceResponse` object is returned
@@ -251,4 +630,6 @@ def digest_webpage(
         model=model,
         text=web_text,
         system_prompt=digest_prompt,
+        chunk_size=chunk_size,
+        fan_out=fan_out,
     )
@@ -1,5 +1,16 @@
 # -*- coding: utf-8 -*-
-"""Import the entry point of AgentScope Studio."""
-from ._app import init, as_studio
+"""Import the entry point of AgentScope Studio. The server is imported on
+first access, so that the client used by the logging doesn't import it."""
+from typing import TYPE_CHECKING
+
+from .._lazy import lazy_loader
+
+if TYPE_CHECKING:
+    from ._app import init, as_studio
+
+__getattr__, __dir__ = lazy_loader(
+    __name__,
+    attributes={"init": "._app", "as_studio": "._app"},
+)
 
 __all__ = ["init", "as_studio"]
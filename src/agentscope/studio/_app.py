@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 """The Web Server of the AgentScope Studio."""
 # pylint: disable=C0302
+import atexit
+import base64
 import json
 import os
 import re
@@ -8,8 +10,9 @@ import subprocess
 import tempfile
 import threading
 import traceback
+from collections import OrderedDict
 from datetime import datetime
-from typing import Tuple, Union, Any, Optional
+from typing import Tuple, Union, Any, Optional, List
 from pathlib import Path
 from random import choice
 import argparse
@@ -33,10 +36,22 @@ from ..constants import (
     _DEFAULT_CACHE_DIR,
     _DEFAULT_SUBDIR_CODE,
     _DEFAULT_SUBDIR_INVOKE,
+    _DEFAULT_SUBDIR_TRACE,
     FILE_SIZE_LIMIT,
     FILE_COUNT_LIMIT,
 )
-from ._studio_utils import _check_and_convert_id_type
+from ._studio_utils import (
+    _add_sequence_column,
+    _check_and_convert_id_type,
+    _CoalescingBuffer,
+    _LineOffsetIndex,
+)
+from ..manager import (
+    format_prometheus,
+    read_invocations,
+    read_metric_snapshots,
+)
+from ..tracing import read_spans, to_chrome_trace
 from ..utils.common import (
     _is_process_alive,
     _is_windows,
@@ -66,6 +81,17 @@ CORS(_app)
 
 _RUNS_DIRS = []
 
+# The line offset indexes of the recently read `logging.chat` files
+_CHAT_INDEXES: "OrderedDict[str, _LineOffsetIndex]" = OrderedDict()
+_CHAT_INDEXES_LOCK = threading.Lock()
+_MAX_CHAT_INDEXES = 64
+
+# The seconds that a pushed message waits before being written into the
+# database or emitted, and the number of pending messages to write at once
+_MESSAGE_WRITE_INTERVAL = 0.2
+_MESSAGE_EMIT_INTERVAL = 0.05
+_MESSAGE_BATCH_SIZE = 500
+
 
 class _UserInputRequestQueue:
     """A queue to store the user input requests."""
@@ -156,6 +182,22 @@ class _MessageTable(_db.Model):  # type: ignore[name-defined]
     url = _db.Column(_db.String)
     meta = _db.Column(_db.String)
     timestamp = _db.Column(_db.String)
+    # the order that the messages are first received, as the timestamps are
+    # in seconds and the ids are random
+    seq = _db.Column(_db.Integer)
+
+    # for the pagination of the messages in a run
+    __table_args__ = (
+        _db.Index("ix_message_table_run_id_seq", "run_id", "seq"),
+    )
+
+
+def _create_indexes() -> None:
+    """Create the indexes missing in the tables created by former versions,
+    which `create_all` doesn't do for existing tables."""
+    for table in _db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(_db.engine, checkfirst=True)
 
 
 def _get_all_runs_from_dir() -> dict:
@@ -396,82 +438,350 @@ def _alloc_server() -> Response:
         return jsonify({"status": "fail"})
 
 
+# The last sequence number of the messages, loaded from the database when
+# the first message is written
+_last_message_seq: Optional[int] = None
+_message_seq_lock = threading.Lock()
+
+
+def _assign_message_seqs(rows: List[dict]) -> None:
+    """Assign the sequence numbers to the messages in the order they are
+    received, where a replaced message keeps its sequence number."""
+    global _last_message_seq
+    with _message_seq_lock:
+        existing = dict(
+            _db.session.query(_MessageTable.id, _MessageTable.seq).filter(
+                _MessageTable.id.in_([_["id"] for _ in rows]),
+            ),
+        )
+        if _last_message_seq is None:
+            _last_message_seq = (
+                _db.session.query(_db.func.max(_MessageTable.seq)).scalar()
+                or 0
+            )
+        for row in rows:
+            if existing.get(row["id"]) is not None:
+                row["seq"] = existing[row["id"]]
+            elif row.get("seq") is None:
+                _last_message_seq += 1
+                row["seq"] = _last_message_seq
+
+
+def _replace_messages(rows: List[dict]) -> None:
+    """Replace the messages with the same ids in one transaction."""
+    try:
+        _assign_message_seqs(rows)
+        _MessageTable.query.filter(
+            _MessageTable.id.in_([_["id"] for _ in rows]),
+        ).delete(synchronize_session=False)
+        _db.session.execute(_MessageTable.__table__.insert(), rows)
+        _db.session.commit()
+    except Exception:
+        _db.session.rollback()
+        raise
+
+
+def _write_messages(rows: List[dict]) -> None:
+    """Write a batch of messages into the database. If the batch fails, the
+    messages are written one by one, so that an invalid message doesn't
+    drop the others."""
+    with _app.app_context():
+        if len(rows) > 1:
+            try:
+                _replace_messages(rows)
+                return
+            except Exception:
+                pass
+        for row in rows:
+            try:
+                _replace_messages([row])
+            except Exception as e:
+                _app.logger.error(
+                    "Fail to put message %s with error: %s",
+                    row["id"],
+                    e,
+                )
+
+
+def _emit_messages(messages: List[dict]) -> None:
+    """Emit the latest version of the buffered messages to their rooms."""
+    for message in messages:
+        _socketio.emit(
+            "display_message",
+            message,
+            room=message["run_id"],
+        )
+    _app.logger.debug("Flask: send %d display_message", len(messages))
+
+
+# The messages are written and emitted in batches in the background, where
+# the repeated updates of a streaming message are merged into the latest one
+_message_buffer = _CoalescingBuffer(
+    _write_messages,
+    interval=_MESSAGE_WRITE_INTERVAL,
+    max_size=_MESSAGE_BATCH_SIZE,
+    name="studio-message-writer",
+)
+_emit_buffer = _CoalescingBuffer(
+    _emit_messages,
+    interval=_MESSAGE_EMIT_INTERVAL,
+    max_size=_MESSAGE_BATCH_SIZE,
+    name="studio-message-emitter",
+)
+atexit.register(_message_buffer.flush)
+
+
+def _put_message(data: dict) -> None:
+    """Validate a pushed message, and put it into the buffers to be
+    written into the database and displayed on the web UI."""
+    try:
+        message = {
+            "id": data["id"],
+            "run_id": data["run_id"],
+            "name": data["name"],
+            "role": data["role"],
+            "content": data["content"],
+            "url": data["url"],
+            "metadata": data["metadata"],
+            "timestamp": data["timestamp"],
+        }
+        row = {
+            "id": message["id"],
+            "run_id": message["run_id"],
+            "name": message["name"],
+            "role": message["role"],
+            "content": message["content"],
+            # Before storing into the database, we need to convert the url
+            # into a string
+            "meta": json.dumps(message["metadata"], ensure_ascii=False),
+            "url": json.dumps(message["url"], ensure_ascii=False),
+            "timestamp": message["timestamp"],
+        }
+    except (KeyError, TypeError, ValueError) as e:
+        abort(400, "Fail to put message with error: " + str(e))
+
+    _message_buffer.put(message["id"], row)
+    _emit_buffer.put(message["id"], message)
+
+
 @_app.route("/api/messages/push", methods=["POST"])
 def _push_message() -> Response:
     """Receive a message from the agentscope application, and display it on
-    the web UI."""
+    the web UI. The message is written into the database in the background,
+    replacing the existing message with the same id."""
     _app.logger.debug("Flask: receive push_message")
+    _put_message(request.json)
+    return jsonify(status="ok")
+
+
+@_app.route("/api/messages/push_batch", methods=["POST"])
+def _push_messages() -> Response:
+    """Receive a list of messages from the agentscope application, e.g. the
+    updates of streaming messages, which are handled in the same way as
+    `/api/messages/push`."""
     data = request.json
+    if not isinstance(data, list):
+        abort(400, "Expect a list of messages.")
+    _app.logger.debug("Flask: receive %d push_message", len(data))
+    for message in data:
+        _put_message(message)
+    return jsonify(status="ok", count=len(data))
 
-    run_id = data["run_id"]
-    msg_id = data["id"]
-    name = data["name"]
-    role = data["role"]
-    content = data["content"]
-    metadata = data["metadata"]
-    timestamp = data["timestamp"]
-    url = data["url"]
 
-    # First check if the message exists in the database, if exists, we update
-    # it, otherwise, we add it.
-    _MessageTable.query.filter_by(id=msg_id).delete()
-    _db.session.commit()
+def _encode_cursor(position: list) -> str:
+    """Encode the position of a message into an opaque cursor."""
+    return base64.urlsafe_b64encode(
+        json.dumps(position, ensure_ascii=False).encode("utf-8"),
+    ).decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> list:
+    """Decode a cursor, and abort the request if it's invalid."""
     try:
-        new_message = _MessageTable(
-            id=msg_id,
-            run_id=run_id,
-            name=name,
-            role=role,
-            content=content,
-            # Before storing into the database, we need to convert the url into
-            # a string
-            meta=json.dumps(metadata, ensure_ascii=False),
-            url=json.dumps(url, ensure_ascii=False),
-            timestamp=timestamp,
-        )
-        _db.session.add(new_message)
-        _db.session.commit()
-    except Exception as e:
-        abort(400, "Fail to put message with error: " + str(e))
+        position = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except ValueError:
+        position = None
+    if not isinstance(position, list):
+        abort(400, f"Invalid cursor: {cursor}")
+    return position
+
+
+def _decode_seq_cursor(cursor: str) -> int:
+    """Decode the sequence number of a message from a cursor."""
+    position = _decode_cursor(cursor)
+    if len(position) != 1 or not isinstance(position[0], int):
+        abort(400, f"Invalid cursor: {cursor}")
+    return position[0]
+
+
+def _get_chat_index(path: str) -> _LineOffsetIndex:
+    """Get the up-to-date line offset index of a `logging.chat` file."""
+    with _CHAT_INDEXES_LOCK:
+        index = _CHAT_INDEXES.pop(path, None) or _LineOffsetIndex(path)
+        _CHAT_INDEXES[path] = index
+        if len(_CHAT_INDEXES) > _MAX_CHAT_INDEXES:
+            _CHAT_INDEXES.popitem(last=False)
+    index.refresh()
+    return index
+
+
+def _get_messages_page_from_db(
+    run_id: str,
+    limit: int,
+    after: Optional[str],
+    before: Optional[str],
+    start: Optional[str],
+    end: Optional[str],
+    backward: bool,
+) -> Tuple[List[dict], List[str], bool]:
+    """Get a page of the messages of a registered run in the order they are
+    received, by the index on the run ids and the sequence numbers."""
+    query = _MessageTable.query.filter_by(run_id=run_id)
+    if start is not None:
+        query = query.filter(_MessageTable.timestamp >= start)
+    if end is not None:
+        query = query.filter(_MessageTable.timestamp <= end)
+    if after is not None:
+        query = query.filter(_MessageTable.seq > _decode_seq_cursor(after))
+    if before is not None:
+        query = query.filter(_MessageTable.seq < _decode_seq_cursor(before))
+
+    if backward:
+        query = query.order_by(_MessageTable.seq.desc())
+    else:
+        query = query.order_by(_MessageTable.seq)
+    messages = query.limit(limit + 1).all()
+
+    has_more = len(messages) > limit
+    messages = messages[:limit]
+    if backward:
+        messages.reverse()
+
+    return (
+        [_message_to_dict(_) for _ in messages],
+        [_encode_cursor([_.seq]) for _ in messages],
+        has_more,
+    )
 
-    data = {
-        "id": msg_id,
-        "run_id": run_id,
-        "name": name,
-        "role": role,
-        "content": content,
-        "url": url,
-        "metadata": metadata,
-        "timestamp": timestamp,
-    }
 
-    _socketio.emit(
-        "display_message",
-        data,
-        room=run_id,
+def _get_messages_page_from_file(
+    path: str,
+    limit: int,
+    after: Optional[str],
+    before: Optional[str],
+    start: Optional[str],
+    end: Optional[str],
+    backward: bool,
+) -> Tuple[List[dict], List[str], bool]:
+    """Get a page of the messages in a `logging.chat` file, whose lines are
+    read by their offsets. The messages are in the order they are logged,
+    which is assumed to be the order of their timestamps when filtering by
+    time."""
+    index = _get_chat_index(path)
+
+    def _bisect(timestamp: str, low: int, high: int, right: bool) -> int:
+        # `bisect` supports the key function since python 3.10
+        while low < high:
+            middle = (low + high) // 2
+            line = index.read_lines(middle, middle + 1)[0]
+            value = json.loads(line).get("timestamp") or ""
+            if value < timestamp or (right and value == timestamp):
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    # the range of lines to read
+    low, high = 0, len(index)
+    if start is not None:
+        low = _bisect(start, low, high, right=False)
+    if end is not None:
+        high = _bisect(end, low, high, right=True)
+    if after is not None:
+        low = max(low, _decode_cursor(after)[0] + 1)
+    if before is not None:
+        high = min(high, _decode_cursor(before)[0])
+
+    if backward:
+        first = max(low, high - limit)
+        has_more = first > low
+    else:
+        first = low
+        has_more = low + limit < high
+    last = min(high, first + limit)
+
+    return (
+        [json.loads(_) for _ in index.read_lines(first, last)],
+        [_encode_cursor([_]) for _ in range(first, max(first, last))],
+        has_more,
     )
-    _app.logger.debug("Flask: send display_message")
-    return jsonify(status="ok")
+
+
+def _message_to_dict(message: _MessageTable) -> dict:
+    """Convert a row of the message table into a message dict."""
+    return {
+        "id": message.id,
+        "name": message.name,
+        "role": message.role,
+        "content": message.content,
+        "url": json.loads(message.url),
+        "metadata": json.loads(message.meta),
+        "timestamp": message.timestamp,
+    }
 
 
 @_app.route("/api/messages/run/<run_id>", methods=["GET"])
 def _get_messages(run_id: str) -> Response:
-    """Get the history messages of specific run_id."""
-    # From registered runtime instances
-    if len(_RunTable.query.filter_by(run_id=run_id).all()) > 0:
-        messages = _MessageTable.query.filter_by(run_id=run_id).all()
-        msgs = [
+    """Get the history messages of specific run_id.
+
+    Without the `limit` argument, all the messages are returned in a list.
+    Otherwise, a page of at most `limit` messages is returned, together with
+    the cursor of each message, and whether there are more messages in the
+    direction of the query:
+
+    - `after`: the messages after a cursor,
+    - `before`: the messages right before a cursor,
+    - `tail`: if "true" and no cursor is given, the latest messages,
+    - `start` and `end`: the time range of the messages, in the format of
+      the message timestamps.
+    """
+    limit = request.args.get("limit", type=int)
+    page_args = {
+        "limit": max(limit or 0, 1),
+        "after": request.args.get("after"),
+        "before": request.args.get("before"),
+        "start": request.args.get("start"),
+        "end": request.args.get("end"),
+    }
+    page_args["backward"] = page_args["before"] is not None or (
+        page_args["after"] is None
+        and request.args.get("tail", "false").lower() == "true"
+    )
+
+    def _page_response(page: tuple) -> Response:
+        messages, cursors, has_more = page
+        return jsonify(
             {
-                "name": message.name,
-                "role": message.role,
-                "content": message.content,
-                "url": json.loads(message.url),
-                "metadata": json.loads(message.meta),
-                "timestamp": message.timestamp,
-            }
-            for message in messages
-        ]
-        return jsonify(msgs)
+                "messages": messages,
+                "cursors": cursors,
+                "has_more": has_more,
+            },
+        )
+
+    # From registered runtime instances
+    if _RunTable.query.filter_by(run_id=run_id).first() is not None:
+        # Include the messages waiting to be written
+        _message_buffer.flush()
+        if limit is not None:
+            return _page_response(
+                _get_messages_page_from_db(run_id, **page_args),
+            )
+        messages = (
+            _MessageTable.query.filter_by(run_id=run_id)
+            .order_by(_MessageTable.seq)
+            .all()
+        )
+        return jsonify([_message_to_dict(_) for _ in messages])
 
     # From the local file
     run_dir = request.args.get("run_dir", default=None, type=str)
@@ -483,13 +793,21 @@ def _get_messages(run_id: str) -> Response:
             run_dir = runtime_configs_from_dir[run_id]["run_dir"]
 
     # Load the messages from the local file
-    path_messages = os.path.join(run_dir, "logging.chat")
-    if run_dir is None or not os.path.exists(path_messages):
+    if run_dir is None or not os.path.exists(
+        os.path.join(run_dir, "logging.chat"),
+    ):
+        if limit is not None:
+            return _page_response(([], [], False))
         return jsonify([])
-    else:
-        with open(path_messages, "r", encoding="utf-8") as file:
-            msgs = [json.loads(_) for _ in file.readlines()]
-            return jsonify(msgs)
+
+    path_messages = os.path.join(run_dir, "logging.chat")
+    if limit is not None:
+        return _page_response(
+            _get_messages_page_from_file(path_messages, **page_args),
+        )
+    with open(path_messages, "r", encoding="utf-8") as file:
+        msgs = [json.loads(_) for _ in file.readlines()]
+        return jsonify(msgs)
 
 
 @_app.route("/api/runs/get/<run_id>", methods=["GET"])
@@ -555,20 +873,94 @@ def _get_all_runs() -> Response:
 
 @_app.route("/api/invocation", methods=["GET"])
 def _get_invocations() -> Response:
-    """Get all API invocations in a run instance."""
+    """Get the API invocations in a run instance. If the `page` argument is
+    given, return a page of `size` invocations and the number of pages, in
+    the format of the remote pagination of Tabulator, otherwise return all
+    the invocations. They can be filtered by the `model_class`, `start` and
+    `end` arguments."""
     run_dir = request.args.get("run_dir")
     path_invocations = os.path.join(run_dir, _DEFAULT_SUBDIR_INVOKE)
 
-    invocations = []
-    if os.path.exists(path_invocations):
-        for filename in os.listdir(path_invocations):
-            with open(
-                os.path.join(path_invocations, filename),
-                "r",
-                encoding="utf-8",
-            ) as file:
-                invocations.append(json.load(file))
-    return jsonify(invocations)
+    filters = {
+        "model_class": request.args.get("model_class"),
+        "start": request.args.get("start"),
+        "end": request.args.get("end"),
+    }
+    page = request.args.get("page", type=int)
+    if page is None:
+        _, invocations = read_invocations(path_invocations, **filters)
+        return jsonify(invocations)
+
+    size = max(request.args.get("size", 50, type=int), 1)
+    total, invocations = read_invocations(
+        path_invocations,
+        offset=(max(page, 1) - 1) * size,
+        limit=size,
+        **filters,
+    )
+    return jsonify(
+        {
+            "last_page": max((total + size - 1) // size, 1),
+            "total": total,
+            "data": invocations,
+        },
+    )
+
+
+@_app.route("/api/trace", methods=["GET"])
+def _get_trace() -> Response:
+    """Get the spans in a run instance, which can be filtered by the
+    `trace_id` argument. If the `format` argument is "chrome", return them in
+    the Chrome trace format as an attachment."""
+    run_dir = request.args.get("run_dir")
+    spans = read_spans(
+        os.path.join(run_dir, _DEFAULT_SUBDIR_TRACE),
+        trace_id=request.args.get("trace_id"),
+    )
+    if request.args.get("format") != "chrome":
+        return jsonify(spans)
+
+    response = jsonify(to_chrome_trace(spans))
+    response.headers["Content-Disposition"] = "attachment; filename=trace.json"
+    return response
+
+
+@_app.route("/metrics", methods=["GET"])
+def _get_metrics() -> Response:
+    """Expose the latest metrics snapshots of the model calls of the running
+    runs in the Prometheus text format, labeled by the run id and the pid of
+    the processes (e.g. the agent servers). If the `all` argument is
+    "true", the finished runs are included as well."""
+    include_finished = request.args.get("all", "false").lower() == "true"
+    runs = {
+        _["run_id"]: _
+        for _ in _get_all_runs_from_dir().values()
+        if "run_id" in _
+    }
+    for run in _RunTable.query.all():
+        runs[run.run_id] = {
+            "run_id": run.run_id,
+            "run_dir": run.run_dir,
+            "status": run.status,
+        }
+
+    snapshots = []
+    for run_id, run in sorted(runs.items()):
+        if run.get("run_dir") is None or (
+            not include_finished and run.get("status") == "finished"
+        ):
+            continue
+        for pid, (histograms, counters) in read_metric_snapshots(
+            run["run_dir"],
+        ).items():
+            snapshots.append(
+                (histograms, counters, {"run_id": run_id, "pid": pid}),
+            )
+
+    return Response(
+        format_prometheus(snapshots),
+        mimetype="text/plain; version=0.0.4",
+    )
 
 
 @_app.route("/api/code", methods=["GET"])
@@ -1001,6 +1393,9 @@ def init(
     # To be compatible with the old table schema, we need to check and convert
     # the id column of the message_table from INTEGER to VARCHAR.
     _check_and_convert_id_type(str(_cache_db), "message_table")
+    _add_sequence_column(str(_cache_db), "message_table")
+    with _app.app_context():
+        _create_indexes()
 
     _socketio.run(
         _app,
@@ -1,10 +1,9 @@
 # -*- coding: utf-8 -*-
 """The client for AgentScope Studio."""
 from threading import Event
-from typing import Optional, Union
+from typing import Optional, Sequence, Union
 import requests
 
-import socketio
 from loguru import logger
 
 from agentscope.message import Msg
@@ -26,6 +25,9 @@ class _WebSocketClient:
         self.name = name
         self.agent_id = agent_id
 
+        # imported here, as the client is only used with the studio
+        import socketio
+
         self.user_input = None
         self.sio = socketio.Client()
         self.input_event = Event()
@@ -168,6 +170,35 @@ class StudioClient:
         if response.status_code != 200:
             logger.error(f"Fail to push message to studio: {response.text}")
 
+    def push_messages(self, messages: Sequence[dict]) -> None:
+        """Push a batch of messages to the studio in one request.
+
+        Args:
+            messages (`Sequence[dict]`):
+                The messages serialized by `Msg.to_dict`.
+        """
+        send_url = f"{self.studio_url}/api/messages/push_batch"
+        response = requests.post(
+            send_url,
+            json=[
+                {
+                    "run_id": self.runtime_id,
+                    "id": _["id"],
+                    "name": _["name"],
+                    "role": _["role"],
+                    "content": str(_["content"]),
+                    "timestamp": _["timestamp"],
+                    "metadata": _["metadata"],
+                    "url": _["url"],
+                }
+                for _ in messages
+            ],
+            timeout=10,
+        )
+
+        if response.status_code != 200:
+            logger.error(f"Fail to push messages to studio: {response.text}")
+
     def get_user_input(
         self,
         agent_id: str,
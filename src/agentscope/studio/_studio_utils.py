@@ -2,6 +2,11 @@
 """The utility functions for AgentScope Studio."""
 import os.path
 import sqlite3
+import threading
+from array import array
+from typing import Any, Callable, Hashable, List, Optional
+
+from loguru import logger
 
 
 def _check_and_convert_id_type(db_path: str, table_name: str) -> None:
@@ -75,3 +80,193 @@ def _check_and_convert_id_type(db_path: str, table_name: str) -> None:
         print(f"SQLite error: {e}")
     finally:
         conn.close()
+
+
+def _add_sequence_column(db_path: str, table_name: str) -> None:
+    """Add the `seq` column of the insertion order to a table created by
+    former versions, which is filled by the row ids of the existing rows,
+    i.e. the order they were inserted in SQLite.
+
+    Args:
+        db_path (`str`):
+            The path of the SQLite database file.
+        table_name (`str`):
+            The name of the table.
+    """
+    if not os.path.exists(db_path):
+        return
+
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"PRAGMA table_info({table_name});")
+        columns = [col[1] for col in cursor.fetchall()]
+        if not columns or "seq" in columns:
+            return
+        cursor.execute(f"ALTER TABLE {table_name} ADD COLUMN seq INTEGER;")
+        cursor.execute(f"UPDATE {table_name} SET seq = rowid;")
+        conn.commit()
+    except sqlite3.Error as e:
+        print(f"SQLite error: {e}")
+    finally:
+        conn.close()
+
+
+class _LineOffsetIndex:
+    """The byte offsets of the lines of an append-only file, e.g.
+    `logging.chat`, so that a range of lines can be read by seeking to its
+    offset instead of reading the whole file. The index is extended from the
+    last indexed offset when the file grows, and rebuilt if the file is
+    replaced or truncated. An incomplete last line is not indexed until its
+    newline is written."""
+
+    _CHUNK_SIZE = 1024 * 1024
+
+    def __init__(self, path: str) -> None:
+        """Initialize the index of a file.
+
+        Args:
+            path (`str`):
+                The path of the file.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        # the device and inode of the indexed file
+        self._identity: Optional[tuple] = None
+        # the start offsets of the complete lines
+        self._offsets = array("q")
+        # the start offset of the incomplete last line, i.e. the end offset
+        # of the complete lines
+        self._end = 0
+        self._scanned = 0
+
+    def _reset(self, identity: Optional[tuple]) -> None:
+        self._identity = identity
+        self._offsets = array("q")
+        self._end = 0
+        self._scanned = 0
+
+    def refresh(self) -> int:
+        """Index the new lines of the file, and return the number of the
+        complete lines."""
+        with self._lock:
+            stat = os.stat(self.path)
+            identity = (stat.st_dev, stat.st_ino)
+            if identity != self._identity or stat.st_size < self._scanned:
+                self._reset(identity)
+
+            if stat.st_size > self._scanned:
+                with open(self.path, "rb") as file:
+                    file.seek(self._scanned)
+                    position = self._scanned
+                    while True:
+                        chunk = file.read(self._CHUNK_SIZE)
+                        if not chunk:
+                            break
+                        index = chunk.find(b"\n")
+                        while index != -1:
+                            self._offsets.append(self._end)
+                            self._end = position + index + 1
+                            index = chunk.find(b"\n", index + 1)
+                        position += len(chunk)
+                    self._scanned = position
+            return len(self._offsets)
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def read_lines(self, start: int, stop: int) -> List[str]:
+        """Read the complete lines in `[start, stop)` without the newlines,
+        where the indices are clipped to the indexed lines."""
+        with self._lock:
+            start = max(start, 0)
+            stop = min(stop, len(self._offsets))
+            if start >= stop:
+                return []
+            begin = self._offsets[start]
+            end = (
+                self._offsets[stop] if stop < len(self._offsets) else self._end
+            )
+
+        with open(self.path, "rb") as file:
+            file.seek(begin)
+            data = file.read(end - begin)
+        # not `splitlines`, which also splits at the unicode line separators
+        # in the content
+        return data.decode("utf-8").split("\n")[:-1]
+
+
+class _CoalescingBuffer:
+    """Buffer the items put by the request handlers, and pass them to
+    `flush_func` in batches from a background thread, every `interval`
+    seconds or once `max_size` items are pending. An item replaces the
+    pending item with the same key, e.g. the repeated updates of a
+    streaming message, keeping the position of the first one."""
+
+    def __init__(
+        self,
+        flush_func: Callable[[List[Any]], None],
+        interval: float,
+        max_size: int,
+        name: str,
+    ) -> None:
+        """Initialize the buffer.
+
+        Args:
+            flush_func (`Callable[[List[Any]], None]`):
+                The function to handle a batch of items.
+            interval (`float`):
+                The maximum seconds that an item waits in the buffer.
+            max_size (`int`):
+                The number of the pending items to flush immediately.
+            name (`str`):
+                The name of the background thread.
+        """
+        self.flush_func = flush_func
+        self.interval = interval
+        self.max_size = max_size
+        self.name = name
+
+        self._pending: dict = {}
+        self._condition = threading.Condition()
+        # serialize the flushes of the background thread and `flush`
+        self._flush_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def put(self, key: Hashable, item: Any) -> None:
+        """Put an item into the buffer."""
+        with self._condition:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name=self.name,
+                    daemon=True,
+                )
+                self._thread.start()
+
+            self._pending[key] = item
+            # wake up the thread waiting for the first item, or the thread
+            # waiting for the interval when the buffer is full
+            if len(self._pending) in (1, self.max_size):
+                self._condition.notify()
+
+    def flush(self) -> None:
+        """Handle the pending items in the calling thread."""
+        with self._flush_lock:
+            with self._condition:
+                items = list(self._pending.values())
+                self._pending = {}
+            if items:
+                self.flush_func(items)
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._pending:
+                    self._condition.wait()
+                if len(self._pending) < self.max_size:
+                    self._condition.wait(self.interval)
+            try:
+                self.flush()
+            except Exception as e:  # pylint: disable=W0703
+                logger.error(f"Failed to flush the {self.name} buffer: {e}")
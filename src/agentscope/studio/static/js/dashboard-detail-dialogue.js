@@ -363,6 +363,26 @@ function addFileListItem(url) {
 }
 
 // Turn a list of dom elements to a list of html strings
+const messagesPageSize = 200;
+
+function fetchMessagesPage(pRuntimeInfo, params) {
+    // Fetch a page of the history messages, see the `/api/messages/run`
+    // route for the parameters
+    let query = new URLSearchParams({
+        run_dir: pRuntimeInfo.run_dir,
+        limit: messagesPageSize,
+        ...params,
+    });
+    return fetch(
+        "/api/messages/run/" + pRuntimeInfo.run_id + "?" + query.toString()
+    ).then((response) => {
+        if (!response.ok) {
+            throw new Error("Failed to fetch messages data");
+        }
+        return response.json();
+    });
+}
+
 function _turnDom2HTML(domList) {
     return Array.from(domList).map((dom) => dom.outerHTML);
 }
@@ -442,22 +462,12 @@ function initializeDashboardDetailDialoguePage(pRuntimeInfo) {
 
             disableInput();
 
-            // Fetch the chat history from backend
-            fetch(
-                "/api/messages/run/" +
-                pRuntimeInfo.run_id +
-                "?run_dir=" +
-                pRuntimeInfo.run_dir
-            )
-                .then((response) => {
-                    if (!response.ok) {
-                        throw new Error("Failed to fetch messages data");
-                    }
-                    return response.json();
-                })
-                .then((data) => {
+            // Fetch the latest page of the chat history from backend, and the
+            // earlier pages when scrolling to the top
+            fetchMessagesPage(pRuntimeInfo, {tail: "true"})
+                .then((page) => {
                     // Load the chat history
-                    let chatRows = data.map((msg, index) =>
+                    let chatRows = page.messages.map((msg, index) =>
                         addChatRow(index, msg)
                     );
                     var clusterize = new Clusterize({
@@ -465,6 +475,43 @@ function initializeDashboardDetailDialoguePage(pRuntimeInfo) {
                         scrollId: "chat-box",
                         contentId: "chat-box-content",
                     });
+                    let chatBox = document.getElementById("chat-box");
+                    chatBox.scrollTop = chatBox.scrollHeight;
+
+                    let earliestCursor = page.cursors[0];
+                    let hasEarlier = page.has_more;
+                    let loadingEarlier = false;
+                    chatBox.addEventListener("scroll", () => {
+                        if (
+                            chatBox.scrollTop > 0 ||
+                            !hasEarlier ||
+                            loadingEarlier
+                        ) {
+                            return;
+                        }
+                        loadingEarlier = true;
+                        fetchMessagesPage(pRuntimeInfo, {before: earliestCursor})
+                            .then((earlierPage) => {
+                                let earlierRows = earlierPage.messages.map(
+                                    (msg, index) => addChatRow(index, msg)
+                                );
+                                chatRows = earlierRows.concat(chatRows);
+                                earliestCursor = earlierPage.cursors[0];
+                                hasEarlier = earlierPage.has_more;
+
+                                // Keep the visible rows in place
+                                let previousHeight = chatBox.scrollHeight;
+                                clusterize.prepend(_turnDom2HTML(earlierRows));
+                                chatBox.scrollTop =
+                                    chatBox.scrollHeight - previousHeight;
+                            })
+                            .catch((error) => {
+                                console.error(error);
+                            })
+                            .finally(() => {
+                                loadingEarlier = false;
+                            });
+                    });
                     document.getElementById("chat-box-content");
                     addEventListener("click", function (event) {
                         let target = event.target;
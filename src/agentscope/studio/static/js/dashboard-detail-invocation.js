@@ -22,54 +22,38 @@ function initializeDashboardDetailInvocationPage(runDir) {
         );
     });
 
-    // fetch data from server
-    fetch("/api/invocation?run_dir=" + runDir)
-        .then((response) => {
-            if (response.ok) {
-                return response.json();
-            } else {
-                throw new Error("Failed to fetch invocation detail");
-            }
-        })
-        .then((data) => {
-            console.log(data);
-            var invocationTable = new Tabulator("#invocation-list", {
-                data: data,
-                columns: [
-                    {
-                        title: "Model Wrapper",
-                        field: "model_class",
-                        editor: false,
-                        vertAlign: "middle",
-                    },
-                    {
-                        title: "Timestamp",
-                        field: "timestamp",
-                        editor: false,
-                        vertAlign: "middle",
-                    },
-                ],
-                layout: "fitColumns",
-                placeholder:
-                    "<div class='content-placeholder'>No invocation records available.</div>",
-                initialSort: [
-                    {
-                        column: "timestamp",
-                        dir: "asc",
-                    },
-                ],
-            });
+    // fetch the invocations page by page from server
+    var invocationTable = new Tabulator("#invocation-list", {
+        ajaxURL: "/api/invocation",
+        ajaxParams: { run_dir: runDir },
+        pagination: true,
+        paginationMode: "remote",
+        paginationSize: 50,
+        columns: [
+            {
+                title: "Model Wrapper",
+                field: "model_class",
+                editor: false,
+                vertAlign: "middle",
+                headerSort: false,
+            },
+            {
+                title: "Timestamp",
+                field: "timestamp",
+                editor: false,
+                vertAlign: "middle",
+                headerSort: false,
+            },
+        ],
+        layout: "fitColumns",
+        placeholder:
+            "<div class='content-placeholder'>No invocation records available.</div>",
+    });
 
-            // Set up row click event
-            invocationTable.on("rowClick", function (e, row) {
-                // Jump to the run detail page
-                console.log(row.getData());
-                invocationEditor.setValue(
-                    JSON.stringify(row.getData(), null, 2)
-                );
-            });
-        })
-        .catch((error) => {
-            console.error(error);
-        });
+    // Set up row click event
+    invocationTable.on("rowClick", function (e, row) {
+        // Jump to the run detail page
+        console.log(row.getData());
+        invocationEditor.setValue(JSON.stringify(row.getData(), null, 2));
+    });
 }
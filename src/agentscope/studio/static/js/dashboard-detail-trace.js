@@ -0,0 +1,115 @@
+let traceSpans = [];
+
+// The height of a span in the flame view in pixels
+const traceSpanHeight = 22;
+
+function initializeDashboardDetailTracePage(runDir) {
+    const params = "run_dir=" + encodeURIComponent(runDir);
+    document.getElementById("trace-download").href =
+        "/api/trace?format=chrome&" + params;
+
+    fetch("/api/trace?" + params)
+        .then((response) => {
+            if (!response.ok) {
+                throw new Error("Connection error, cannot load the web page.");
+            }
+            return response.json();
+        })
+        .then((spans) => {
+            traceSpans = spans;
+            constructTraceList(spans);
+        })
+        .catch((error) => {
+            console.error("Error encountered while loading page: ", error);
+        });
+}
+
+// Each root span (e.g. a reply of an agent) starts a trace, and the traces are
+// listed by their start time
+function constructTraceList(spans) {
+    const select = document.getElementById("trace-select");
+    const flame = document.getElementById("trace-flame");
+    const traces = new Map();
+    spans.forEach((span) => {
+        if (!traces.has(span.trace_id)) {
+            traces.set(span.trace_id, span);
+        }
+        // prefer the root span as the title of the trace
+        if (span.parent_id === null) {
+            traces.set(span.trace_id, span);
+        }
+    });
+
+    if (traces.size === 0) {
+        select.style.display = "none";
+        flame.innerHTML =
+            "<div class='content-placeholder'>No trace available. Enable it by agentscope.init(trace=True).</div>";
+        return;
+    }
+
+    select.innerHTML = "";
+    traces.forEach((span, traceId) => {
+        const option = document.createElement("option");
+        option.value = traceId;
+        option.textContent = `${formatTraceTime(span.start_ns)} ${
+            span.name
+        } (${formatTraceDuration(span.duration_ns)})`;
+        select.appendChild(option);
+    });
+    select.onchange = () => renderTraceFlame(select.value);
+    renderTraceFlame(select.value);
+}
+
+// Render the spans of a trace as an icicle chart, where the children are
+// placed under their parents and the widths are proportional to the wall time
+function renderTraceFlame(traceId) {
+    const flame = document.getElementById("trace-flame");
+    const spans = traceSpans.filter((span) => span.trace_id === traceId);
+
+    let start = Infinity;
+    let end = -Infinity;
+    spans.forEach((span) => {
+        start = Math.min(start, span.start_ns);
+        end = Math.max(end, span.start_ns + span.duration_ns);
+    });
+    const total = Math.max(end - start, 1);
+
+    // the spans are sorted by their start time, so the parents come first
+    const depths = new Map();
+    flame.innerHTML = "";
+    spans.forEach((span) => {
+        const depth = depths.has(span.parent_id)
+            ? depths.get(span.parent_id) + 1
+            : 0;
+        depths.set(span.span_id, depth);
+
+        const div = document.createElement("div");
+        div.className = `trace-span trace-span-${span.kind}`;
+        if (span.status === "error") {
+            div.classList.add("trace-span-error");
+        }
+        div.style.left = ((span.start_ns - start) / total) * 100 + "%";
+        div.style.width = (span.duration_ns / total) * 100 + "%";
+        div.style.top = depth * traceSpanHeight + "px";
+        div.textContent = span.name;
+        div.title = `${span.name}\nwall: ${formatTraceDuration(
+            span.duration_ns
+        )}\ncpu: ${formatTraceDuration(span.cpu_ns)}`;
+        div.onclick = () => {
+            document.getElementById("trace-span-detail").textContent =
+                JSON.stringify(span, null, 2);
+        };
+        flame.appendChild(div);
+    });
+}
+
+function formatTraceDuration(ns) {
+    if (ns >= 1e9) {
+        return (ns / 1e9).toFixed(2) + " s";
+    }
+    return (ns / 1e6).toFixed(2) + " ms";
+}
+
+function formatTraceTime(ns) {
+    return new Date(ns / 1e6).toLocaleTimeString();
+}
@@ -12,17 +12,22 @@ function initializeDashboardDetailPageByUrl(pageUrl) {
         case "static/html/dashboard-detail-invocation.html":
             initializeDashboardDetailInvocationPage(runtimeInfo["run_dir"]);
             break;
+        case "static/html/dashboard-detail-trace.html":
+            initializeDashboardDetailTracePage(runtimeInfo["run_dir"]);
+            break;
     }
 }
 
-// The dashboard detail page supports three tabs:
+// The dashboard detail page supports four tabs:
 // 1. dialogue tab: the conversation history of the runtime instance
 // 2. code tab: the code files
 // 3. invocation tab: the model invocation records
+// 4. trace tab: the flame view of the spans
 function loadDashboardDetailContent(pageUrl, javascriptUrl) {
     const dialogueTabBtn = document.getElementById("dialogue-tab-btn");
     const codeTabBtn = document.getElementById("code-tab-btn");
     const invocationTabBtn = document.getElementById("invocation-tab-btn");
+    const traceTabBtn = document.getElementById("trace-tab-btn");
     if (currentContent === pageUrl) {
         return;
     } else {
@@ -34,16 +39,25 @@ function loadDashboardDetailContent(pageUrl, javascriptUrl) {
             dialogueTabBtn.classList.add("selected");
             codeTabBtn.classList.remove("selected");
             invocationTabBtn.classList.remove("selected");
+            traceTabBtn.classList.remove("selected");
             break;
         case "static/html/dashboard-detail-code.html":
             dialogueTabBtn.classList.remove("selected");
             codeTabBtn.classList.add("selected");
             invocationTabBtn.classList.remove("selected");
+            traceTabBtn.classList.remove("selected");
             break;
         case "static/html/dashboard-detail-invocation.html":
             dialogueTabBtn.classList.remove("selected");
             codeTabBtn.classList.remove("selected");
             invocationTabBtn.classList.add("selected");
+            traceTabBtn.classList.remove("selected");
+            break;
+        case "static/html/dashboard-detail-trace.html":
+            dialogueTabBtn.classList.remove("selected");
+            codeTabBtn.classList.remove("selected");
+            invocationTabBtn.classList.remove("selected");
+            traceTabBtn.classList.add("selected");
             break;
     }
 
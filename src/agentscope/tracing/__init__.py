@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+"""Tracing of the agent replies, the model calls and the tool calls."""
+from ._span import Span, SpanKind, current_span
+from ._exporter import (
+    SpanExporterBase,
+    JsonlExporter,
+    ChromeTraceExporter,
+    OpenTelemetryExporter,
+    read_spans,
+    to_chrome_trace,
+)
+from ._tracer import (
+    Tracer,
+    start_span,
+    add_tokens,
+    get_traceparent,
+    remote_parent,
+)
+
+__all__ = [
+    "Span",
+    "SpanKind",
+    "current_span",
+    "SpanExporterBase",
+    "JsonlExporter",
+    "ChromeTraceExporter",
+    "OpenTelemetryExporter",
+    "read_spans",
+    "to_chrome_trace",
+    "Tracer",
+    "start_span",
+    "add_tokens",
+    "get_traceparent",
+    "remote_parent",
+]
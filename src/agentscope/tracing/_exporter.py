@@ -0,0 +1,382 @@
+# -*- coding: utf-8 -*-
+"""The exporters of the finished spans."""
+import atexit
+import glob
+import json
+import os
+import threading
+import time
+import weakref
+from typing import Any, List, Optional
+
+from loguru import logger
+
+from ._span import Span
+
+_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+
+class SpanExporterBase:
+    """The base class of the span exporters, which are called with every
+    finished span, so `export` should be cheap."""
+
+    def export(self, span: Span) -> None:
+        """Export a finished span."""
+        raise NotImplementedError(
+            f"Span exporter [{type(self).__name__}] is missing the required "
+            f"`export` method.",
+        )
+
+    def flush(self) -> None:
+        """Export the buffered spans."""
+
+    def shutdown(self) -> None:
+        """Flush and release the resources of the exporter."""
+        self.flush()
+
+
+class _FileExporter(SpanExporterBase):
+    """Buffer the spans in memory and append them to a file per process in
+    batches, so that exporting a span doesn't touch the disk."""
+
+    suffix: str
+    """The suffix of the file names."""
+
+    def __init__(
+        self,
+        directory: str,
+        batch_size: int = 256,
+        flush_interval: float = 1.0,
+    ) -> None:
+        """Initialize the exporter.
+
+        Args:
+            directory (`str`):
+                The directory of the trace files, where each process writes
+                its own file named by its pid.
+            batch_size (`int`, defaults to `256`):
+                The number of the buffered spans to write at once.
+            flush_interval (`float`, defaults to `1.0`):
+                The buffer is written when a span finishes if the last write
+                is older than this number of seconds, so that the spans of a
+                running process can be viewed in time.
+        """
+        self.directory = directory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._last_write = time.monotonic()
+        self._buffer: List[Span] = []
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._closed = False
+        _FILE_EXPORTERS.add(self)
+
+    @property
+    def path(self) -> str:
+        """The path of the trace file of this process."""
+        return os.path.join(
+            self.directory,
+            f"trace-{os.getpid()}{self.suffix}",
+        )
+
+    def export(self, span: Span) -> None:
+        """Buffer the span, and write the buffer if it's full."""
+        now = time.monotonic()
+        with self._lock:
+            self._buffer.append(span)
+            if (
+                len(self._buffer) < self.batch_size
+                and now - self._last_write < self.flush_interval
+            ):
+                return
+            spans, self._buffer = self._buffer, []
+            self._last_write = now
+        self._write(spans)
+
+    def flush(self) -> None:
+        """Write the buffered spans."""
+        with self._lock:
+            spans, self._buffer = self._buffer, []
+            self._last_write = time.monotonic()
+        if spans:
+            self._write(spans)
+
+    def shutdown(self) -> None:
+        """Write the buffered spans and stop exporting."""
+        self.flush()
+        self._closed = True
+        _FILE_EXPORTERS.discard(self)
+
+    def _header(self) -> str:
+        """The text written at the beginning of a new file."""
+        return ""
+
+    def _format(self, span: Span) -> str:
+        """Format a span into the text written to the file."""
+        raise NotImplementedError
+
+    def _write(self, spans: List[Span]) -> None:
+        if self._closed:
+            return
+        path = self.path
+        text = "".join(self._format(_) for _ in spans)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with self._write_lock, open(path, "a", encoding="utf-8") as file:
+                if file.tell() == 0:
+                    file.write(self._header())
+                file.write(text)
+        except OSError as e:
+            logger.warning(f"Failed to write the spans to {path}: {e}")
+
+    def _reset(self) -> None:
+        """Drop the spans buffered by the parent process after `fork`."""
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._buffer = []
+
+
+class JsonlExporter(_FileExporter):
+    """Export the spans into `trace-<pid>.jsonl` files, one span per line,
+    which can be read by `read_spans`."""
+
+    suffix = ".jsonl"
+
+    def _format(self, span: Span) -> str:
+        return _ENCODER.encode(span.to_dict()) + "\n"
+
+
+class ChromeTraceExporter(_FileExporter):
+    """Export the spans into `trace-<pid>.json` files in the JSON array
+    format of the Chrome trace events, which can be opened by
+    `chrome://tracing` or Perfetto. The closing bracket is optional in this
+    format, so the file is appended in batches as well."""
+
+    suffix = ".json"
+
+    def _header(self) -> str:
+        return "[\n"
+
+    def _format(self, span: Span) -> str:
+        return _ENCODER.encode(_to_chrome_event(span.to_dict())) + ",\n"
+
+
+_FILE_EXPORTERS: "weakref.WeakSet[_FileExporter]" = weakref.WeakSet()
+
+
+def _flush_file_exporters() -> None:
+    """Write the buffered spans before the interpreter exits."""
+    for exporter in list(_FILE_EXPORTERS):
+        exporter.flush()
+
+
+def _reset_after_fork() -> None:
+    for exporter in list(_FILE_EXPORTERS):
+        exporter._reset()  # pylint: disable=W0212
+
+
+atexit.register(_flush_file_exporters)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+class OpenTelemetryExporter(SpanExporterBase):
+    """Export the spans to OpenTelemetry, keeping their trace and span ids,
+    so that the spans are linked with the spans of the other services.
+    Requires the `opentelemetry-sdk` package."""
+
+    def __init__(
+        self,
+        span_exporter: Any = None,
+        service_name: str = "agentscope",
+    ) -> None:
+        """Initialize the exporter.
+
+        Args:
+            span_exporter (`Any`, defaults to `None`):
+                The span exporter of OpenTelemetry SDK, e.g.
+                `OTLPSpanExporter`. If `None`, the OTLP exporter configured
+                by the `OTEL_EXPORTER_OTLP_*` environment variables is used.
+            service_name (`str`, defaults to `"agentscope"`):
+                The service name in the resource of the spans.
+        """
+        try:
+            from opentelemetry import trace
+            from opentelemetry.sdk.resources import Resource
+            from opentelemetry.sdk.trace import TracerProvider
+            from opentelemetry.sdk.trace.export import BatchSpanProcessor
+            from opentelemetry.sdk.trace.id_generator import IdGenerator
+        except ImportError as e:
+            raise ImportError(
+                "OpenTelemetryExporter requires the opentelemetry sdk, try "
+                "to install it by `pip install opentelemetry-sdk "
+                "opentelemetry-exporter-otlp`",
+            ) from e
+
+        if span_exporter is None:
+            try:
+                from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import (  # noqa: E501 # pylint: disable=C0301
+                    OTLPSpanExporter,
+                )
+            except ImportError as e:
+                raise ImportError(
+                    "Without a given span exporter, OpenTelemetryExporter "
+                    "exports the spans by OTLP, try to install it by `pip "
+                    "install opentelemetry-exporter-otlp`",
+                ) from e
+            span_exporter = OTLPSpanExporter()
+
+        local = threading.local()
+
+        class _GivenIdGenerator(IdGenerator):
+            """Generate the ids of the span being exported."""
+
+            def generate_span_id(self) -> int:
+                """The id of the span being exported."""
+                return local.span_id
+
+            def generate_trace_id(self) -> int:
+                """The id of the trace of the span being exported."""
+                return local.trace_id
+
+        self._trace = trace
+        self._kinds = {
+            "client": trace.SpanKind.CLIENT,
+            "server": trace.SpanKind.SERVER,
+        }
+        self._local = local
+        self._provider = TracerProvider(
+            resource=Resource.create({"service.name": service_name}),
+            id_generator=_GivenIdGenerator(),
+        )
+        self._provider.add_span_processor(BatchSpanProcessor(span_exporter))
+        self._tracer = self._provider.get_tracer("agentscope")
+
+    def export(self, span: Span) -> None:
+        """Re-create the span in OpenTelemetry with the same ids."""
+        trace = self._trace
+        self._local.trace_id = int(span.trace_id, 16)
+        self._local.span_id = int(span.span_id, 16)
+        context = None
+        if span.parent_id is not None:
+            context = trace.set_span_in_context(
+                trace.NonRecordingSpan(
+                    trace.SpanContext(
+                        trace_id=self._local.trace_id,
+                        span_id=int(span.parent_id, 16),
+                        is_remote=True,
+                        trace_flags=trace.TraceFlags(
+                            trace.TraceFlags.SAMPLED,
+                        ),
+                    ),
+                ),
+            )
+        otel_span = self._tracer.start_span(
+            span.name,
+            context=context,
+            kind=self._kinds.get(span.kind, trace.SpanKind.INTERNAL),
+            attributes=_to_otel_attributes(span),
+            start_time=span.start_ns,
+        )
+        if span.status == "error":
+            otel_span.set_status(
+                trace.Status(
+                    trace.StatusCode.ERROR,
+                    span.attributes.get("error"),
+                ),
+            )
+        otel_span.end(end_time=span.start_ns + span.duration_ns)
+
+    def flush(self) -> None:
+        """Export the spans queued in the batch processor."""
+        self._provider.force_flush()
+
+    def shutdown(self) -> None:
+        """Flush and shut down the tracer provider."""
+        self._provider.shutdown()
+
+
+def _to_otel_attributes(span: Span) -> dict:
+    """Convert the attributes into the primitive values supported by
+    OpenTelemetry, and add the kind and the CPU time of the span."""
+    attributes = {
+        "agentscope.kind": span.kind,
+        "agentscope.cpu_ns": span.cpu_ns,
+    }
+    for key, value in span.attributes.items():
+        if isinstance(value, (str, bool, int, float)):
+            attributes[key] = value
+        elif value is not None:
+            attributes[key] = str(value)
+    return attributes
+
+
+def _to_chrome_event(span: dict) -> dict:
+    """Convert a serialized span into a complete event of the Chrome trace
+    format."""
+    return {
+        "name": span["name"],
+        "cat": span["kind"],
+        "ph": "X",
+        "ts": span["start_ns"] / 1000,
+        "dur": span["duration_ns"] / 1000,
+        "pid": span["pid"],
+        "tid": span["tid"],
+        "args": {
+            "trace_id": span["trace_id"],
+            "span_id": span["span_id"],
+            "parent_id": span["parent_id"],
+            "cpu_ms": span["cpu_ns"] / 1e6,
+            "status": span["status"],
+            **span["attributes"],
+        },
+    }
+
+
+def to_chrome_trace(spans: List[dict]) -> dict:
+    """Convert the serialized spans into the Chrome trace format, which can
+    be opened by `chrome://tracing` or Perfetto.
+
+    Args:
+        spans (`List[dict]`):
+            The serialized spans, e.g. returned by `read_spans`.
+
+    Returns:
+        `dict`: The trace in the JSON object format of the Chrome trace
+        events.
+    """
+    return {
+        "traceEvents": [_to_chrome_event(_) for _ in spans],
+        "displayTimeUnit": "ms",
+    }
+
+
+def read_spans(
+    directory: str,
+    trace_id: Optional[str] = None,
+) -> List[dict]:
+    """Read the spans exported by `JsonlExporter` of all the processes in a
+    directory, sorted by their start time.
+
+    Args:
+        directory (`str`):
+            The directory of the trace files.
+        trace_id (`Optional[str]`, defaults to `None`):
+            Only read the spans of the given trace.
+
+    Returns:
+        `List[dict]`: The serialized spans.
+    """
+    spans = []
+    for path in glob.glob(os.path.join(directory, "trace-*.jsonl")):
+        with open(path, "r", encoding="utf-8") as file:
+            for line in file:
+                try:
+                    span = json.loads(line)
+                except json.JSONDecodeError:
+                    # the last line being written by a running process
+                    continue
+                if trace_id is None or span["trace_id"] == trace_id:
+                    spans.append(span)
+    spans.sort(key=lambda _: _["start_ns"])
+    return spans
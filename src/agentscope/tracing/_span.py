@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+"""The spans of the tracing, which record the wall time, the CPU time and
+the token counts of the agent replies, the model calls and the tool
+calls."""
+import os
+import re
+import threading
+import time
+from contextvars import ContextVar, Token
+from typing import Any, Callable, Optional, Literal, Union
+
+SpanKind = Literal[
+    "agent",
+    "model",
+    "tool",
+    "rag",
+    "client",
+    "server",
+    "internal",
+]
+"""The kinds of the spans."""
+
+_current_span: ContextVar[
+    Optional[Union["Span", "_RemoteParent"]]
+] = ContextVar(
+    "agentscope_current_span",
+    default=None,
+)
+
+_TRACEPARENT_PATTERN = re.compile(
+    r"^00-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$",
+)
+
+
+def _new_id(n_bytes: int) -> str:
+    """Generate a random hex id, where `os.urandom` is about ten times
+    faster than `uuid.uuid4`."""
+    return os.urandom(n_bytes).hex()
+
+
+class Span:
+    """A span of the tracing, which is a context manager that records the
+    wall and CPU time of the code within it, and becomes the parent of the
+    spans started within it in the same context (thread or task)."""
+
+    __slots__ = (
+        "name",
+        "kind",
+        "trace_id",
+        "span_id",
+        "parent_id",
+        "attributes",
+        "status",
+        "start_ns",
+        "duration_ns",
+        "cpu_ns",
+        "pid",
+        "tid",
+        "_on_end",
+        "_perf_ns",
+        "_thread_ns",
+        "_token",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        kind: SpanKind,
+        trace_id: str,
+        parent_id: Optional[str],
+        attributes: dict,
+        on_end: Callable[["Span"], None],
+    ) -> None:
+        """Create a span, which is started when entering it.
+
+        Args:
+            name (`str`):
+                The name of the span.
+            kind (`SpanKind`):
+                The kind of the span.
+            trace_id (`str`):
+                The 32-digit hex id of the trace that the span belongs to.
+            parent_id (`Optional[str]`):
+                The 16-digit hex id of the parent span, `None` for a root
+                span.
+            attributes (`dict`):
+                The attributes of the span, which should be json
+                serializable.
+            on_end (`Callable[["Span"], None]`):
+                The function called with the span when it ends.
+        """
+        self.name = name
+        self.kind = kind
+        self.trace_id = trace_id
+        self.span_id = _new_id(8)
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.status = "ok"
+        self.start_ns = 0
+        self.duration_ns = 0
+        self.cpu_ns = 0
+        self.pid = 0
+        self.tid = 0
+        self._on_end = on_end
+        self._perf_ns = 0
+        self._thread_ns = 0
+        self._token: Optional[Token] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Set an attribute of the span."""
+        self.attributes[key] = value
+
+    def add_tokens(
+        self,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+    ) -> None:
+        """Add the token counts of a model call to the span."""
+        attributes = self.attributes
+        attributes["prompt_tokens"] = (
+            attributes.get("prompt_tokens", 0) + prompt_tokens
+        )
+        attributes["completion_tokens"] = (
+            attributes.get("completion_tokens", 0) + completion_tokens
+        )
+
+    def __enter__(self) -> "Span":
+        self.pid = os.getpid()
+        self.tid = threading.get_ident()
+        self._token = _current_span.set(self)
+        self.start_ns = time.time_ns()
+        self._thread_ns = time.thread_time_ns()
+        self._perf_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
+        self.duration_ns = time.perf_counter_ns() - self._perf_ns
+        self.cpu_ns = time.thread_time_ns() - self._thread_ns
+        if exc_type is not None:
+            self.status = "error"
+            self.attributes["error"] = f"{exc_type.__name__}: {exc_value}"
+        if self._token is not None:
+            try:
+                _current_span.reset(self._token)
+            except ValueError:
+                # exited in another context, e.g. by a generator
+                pass
+            self._token = None
+        self._on_end(self)
+
+    def detach(self) -> None:
+        """Restore the current span to the parent without ending the span,
+        which is ended by `__exit__` later, e.g. the span of a model call
+        returning a stream ends when the stream is exhausted."""
+        if self._token is not None:
+            try:
+                _current_span.reset(self._token)
+            except ValueError:
+                pass
+            self._token = None
+
+    @property
+    def traceparent(self) -> str:
+        """The W3C `traceparent` header of the span, which is used to
+        propagate the span as a parent to another process."""
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def to_dict(self) -> dict:
+        """Serialize the span into a dict."""
+        return {
+            "name": self.name,
+            "kind": self.kind,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_ns": self.start_ns,
+            "duration_ns": self.duration_ns,
+            "cpu_ns": self.cpu_ns,
+            "pid": self.pid,
+            "tid": self.tid,
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+class _NoopSpan:
+    """The span returned when the tracing is disabled, which does nothing,
+    so that the instrumented code costs one attribute lookup."""
+
+    __slots__ = ()
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Do nothing."""
+
+    def add_tokens(
+        self,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+    ) -> None:
+        """Do nothing."""
+
+    def detach(self) -> None:
+        """Do nothing."""
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class _RemoteParent:
+    """The parent span in another process, which is extracted from the
+    `traceparent` header and only carries the ids."""
+
+    __slots__ = ("trace_id", "span_id")
+
+    def __init__(self, trace_id: str, span_id: str) -> None:
+        self.trace_id = trace_id
+        self.span_id = span_id
+
+
+def parse_traceparent(traceparent: Optional[str]) -> Optional[_RemoteParent]:
+    """Parse a W3C `traceparent` header, and return `None` if it's missing
+    or malformed."""
+    if not traceparent:
+        return None
+    match = _TRACEPARENT_PATTERN.match(traceparent.strip().lower())
+    if match is None:
+        return None
+    return _RemoteParent(match.group(1), match.group(2))
+
+
+def current_span() -> Optional[Span]:
+    """Get the current span in this context, `None` if there is no span or
+    the tracing is disabled."""
+    span = _current_span.get()
+    return span if isinstance(span, Span) else None
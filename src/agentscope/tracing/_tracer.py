@@ -0,0 +1,246 @@
+# -*- coding: utf-8 -*-
+"""The tracer, which creates the spans and passes the finished ones to the
+exporters."""
+import os
+from contextlib import contextmanager
+from typing import Generator, List, Optional, Sequence, Union
+
+from loguru import logger
+
+from ._exporter import (
+    ChromeTraceExporter,
+    JsonlExporter,
+    OpenTelemetryExporter,
+    SpanExporterBase,
+)
+from ._span import (
+    Span,
+    SpanKind,
+    _NOOP_SPAN,
+    _NoopSpan,
+    _current_span,
+    _new_id,
+    parse_traceparent,
+)
+from ..constants import _DEFAULT_SUBDIR_TRACE
+
+_EXPORTER_NAMES = ("jsonl", "chrome", "otel")
+
+
+class Tracer:
+    """The tracer of AgentScope. It's disabled by default, when the
+    instrumented code only checks a flag, and can be enabled by
+    `agentscope.init(trace=True)`."""
+
+    def __init__(self) -> None:
+        """Initialize a disabled tracer."""
+        self.active = False
+        self.run_dir: Optional[str] = None
+        self.exporter_names: List[str] = []
+        self._exporters: List[SpanExporterBase] = []
+
+    def initialize(
+        self,
+        active: bool,
+        run_dir: Optional[str],
+        exporters: Sequence[Union[str, SpanExporterBase]] = ("jsonl",),
+    ) -> None:
+        """Initialize the tracer.
+
+        Args:
+            active (`bool`):
+                Whether to enable the tracing.
+            run_dir (`Optional[str]`):
+                The directory of the run, where the spans are exported into
+                its `trace` sub-directory by the "jsonl" and "chrome"
+                exporters. If `None`, these exporters are skipped.
+            exporters (`Sequence[Union[str, SpanExporterBase]]`, defaults
+            to `("jsonl",)`):
+                The exporters, either "jsonl", "chrome", "otel" or exporter
+                objects. Only the exporters given by names are passed to the
+                agent servers.
+        """
+        self.flush()
+        self.run_dir = run_dir
+        self.active = active
+        if not active:
+            return
+
+        for exporter in exporters:
+            if isinstance(exporter, SpanExporterBase):
+                self._exporters.append(exporter)
+                continue
+            if exporter not in _EXPORTER_NAMES:
+                raise ValueError(
+                    f"Unsupported span exporter [{exporter}], expected one "
+                    f"of {_EXPORTER_NAMES} or a SpanExporterBase object.",
+                )
+            self.exporter_names.append(exporter)
+            if exporter == "otel":
+                self._exporters.append(OpenTelemetryExporter())
+            elif run_dir is None:
+                logger.warning(
+                    f"The span exporter [{exporter}] is skipped as saving "
+                    f"files is disabled.",
+                )
+            else:
+                exporter_cls = (
+                    JsonlExporter
+                    if exporter == "jsonl"
+                    else ChromeTraceExporter
+                )
+                self._exporters.append(
+                    exporter_cls(os.path.join(run_dir, _DEFAULT_SUBDIR_TRACE)),
+                )
+
+    def start_span(
+        self,
+        name: str,
+        kind: SpanKind = "internal",
+        **attributes: object,
+    ) -> Union[Span, _NoopSpan]:
+        """Create a span as a child of the current span, which should be
+        used as a context manager.
+
+        Args:
+            name (`str`):
+                The name of the span.
+            kind (`SpanKind`, defaults to `"internal"`):
+                The kind of the span.
+            **attributes (`object`):
+                The attributes of the span.
+
+        Returns:
+            `Union[Span, _NoopSpan]`: The span, or a span doing nothing if
+            the tracing is disabled.
+        """
+        if not self.active:
+            return _NOOP_SPAN
+        parent = _current_span.get()
+        if parent is None:
+            return Span(name, kind, _new_id(16), None, attributes, self._end)
+        return Span(
+            name,
+            kind,
+            parent.trace_id,
+            parent.span_id,
+            attributes,
+            self._end,
+        )
+
+    def _end(self, span: Span) -> None:
+        """Pass the finished span to the exporters."""
+        for exporter in self._exporters:
+            try:
+                exporter.export(span)
+            except Exception as e:
+                logger.warning(
+                    f"Failed to export span [{span.name}] by "
+                    f"{type(exporter).__name__}: {e}",
+                )
+
+    def force_flush(self) -> None:
+        """Export the spans buffered by the exporters."""
+        for exporter in self._exporters:
+            exporter.flush()
+
+    def state_dict(self) -> dict:
+        """Serialize the tracer."""
+        return {
+            "active": self.active,
+            "run_dir": self.run_dir,
+            "exporters": list(self.exporter_names),
+        }
+
+    def load_dict(self, data: dict) -> None:
+        """Load the tracer from a dictionary."""
+        assert "active" in data, "Key `active` not found in data."
+        assert "run_dir" in data, "Key `run_dir` not found in data."
+        assert "exporters" in data, "Key `exporters` not found in data."
+
+        self.initialize(data["active"], data["run_dir"], data["exporters"])
+
+    def flush(self) -> None:
+        """Shut down the exporters and disable the tracer."""
+        self.active = False
+        for exporter in self._exporters:
+            try:
+                exporter.shutdown()
+            except Exception as e:
+                logger.warning(
+                    f"Failed to shut down {type(exporter).__name__}: {e}",
+                )
+        self._exporters = []
+        self.exporter_names = []
+        self.run_dir = None
+
+
+_tracer = Tracer()
+
+
+def start_span(
+    name: str,
+    kind: SpanKind = "internal",
+    **attributes: object,
+) -> Union[Span, _NoopSpan]:
+    """Create a span as a child of the current span, which does nothing if
+    the tracing is disabled.
+
+    Example:
+
+        .. code-block:: python
+
+            with start_span("retrieve", "rag", query=query) as span:
+                ...
+                span.set_attribute("n_nodes", len(nodes))
+
+    Args:
+        name (`str`):
+            The name of the span.
+        kind (`SpanKind`, defaults to `"internal"`):
+            The kind of the span.
+        **attributes (`object`):
+            The attributes of the span, which should be json serializable.
+
+    Returns:
+        `Union[Span, _NoopSpan]`: The span used as a context manager.
+    """
+    return _tracer.start_span(name, kind, **attributes)
+
+
+def add_tokens(prompt_tokens: int = 0, completion_tokens: int = 0) -> None:
+    """Add the token counts to the current span, if any."""
+    span = _current_span.get()
+    if isinstance(span, Span):
+        span.add_tokens(prompt_tokens, completion_tokens)
+
+
+def get_traceparent() -> Optional[str]:
+    """Get the W3C `traceparent` header of the current span, which is sent
+    to the agent servers to continue the trace, `None` if there is no
+    span."""
+    span = _current_span.get()
+    if isinstance(span, Span):
+        return span.traceparent
+    return None
+
+
+@contextmanager
+def remote_parent(traceparent: Optional[str]) -> Generator[None, None, None]:
+    """Use the span of another process as the parent of the spans started
+    within this context.
+
+    Args:
+        traceparent (`Optional[str]`):
+            The W3C `traceparent` header of the parent span. If it's `None`
+            or malformed, the spans are started as usual.
+    """
+    parent = parse_traceparent(traceparent)
+    if parent is None:
+        yield
+        return
+    token = _current_span.set(parent)
+    try:
+        yield
+    finally:
+        _current_span.reset(token)
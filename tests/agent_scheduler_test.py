@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""Test the mailbox scheduler of the agent server."""
+import threading
+import time
+import unittest
+from typing import Optional, Sequence, Union
+
+import cloudpickle as pickle
+
+from agentscope.agents import AgentBase
+from agentscope.message import Msg
+from agentscope.server import RpcAgentServerLauncher
+from agentscope.server.scheduler import MailboxScheduler
+
+
+class SlowAddAgent(AgentBase):
+    """An agent adding one to the value of the message slowly"""
+
+    def reply(self, x: Optional[Union[Msg, Sequence[Msg]]] = None) -> Msg:
+        """add the value, wait 0.5s"""
+        time.sleep(0.5)
+        return Msg(self.name, {"value": x.content["value"] + 1}, "assistant")
+
+
+class MailboxSchedulerTest(unittest.TestCase):
+    """Test cases for MailboxScheduler"""
+
+    def test_per_agent_order_and_exclusion(self) -> None:
+        """Tasks of the same agent run one by one in submission order."""
+        scheduler = MailboxScheduler(capacity=8)
+        records = []
+        running = {"a": 0}
+        overlap = []
+        lock = threading.Lock()
+
+        def task(idx: int) -> None:
+            with lock:
+                running["a"] += 1
+                overlap.append(running["a"])
+            time.sleep(0.01)
+            with lock:
+                records.append(idx)
+                running["a"] -= 1
+
+        for i in range(20):
+            scheduler.submit("a", task, i)
+        scheduler.shutdown()
+        self.assertEqual(records, list(range(20)))
+        self.assertEqual(max(overlap), 1)
+
+    def test_round_robin_across_agents(self) -> None:
+        """A busy agent does not starve other agents."""
+        scheduler = MailboxScheduler(capacity=1)
+        records = []
+        gate = threading.Event()
+
+        def task(name: str) -> None:
+            gate.wait()
+            records.append(name)
+
+        for _ in range(3):
+            scheduler.submit("busy", task, "busy")
+        scheduler.submit("other", task, "other")
+        gate.set()
+        scheduler.shutdown()
+        self.assertEqual(records, ["busy", "other", "busy", "busy"])
+
+    def test_concurrency_limit_and_queue_depth(self) -> None:
+        """Per-agent limits and queue depth."""
+        scheduler = MailboxScheduler(capacity=4)
+        scheduler.set_limit("a", 2)
+        gate = threading.Event()
+        started = []
+
+        def task(idx: int) -> None:
+            started.append(idx)
+            gate.wait()
+
+        depths = [scheduler.submit("a", task, i) for i in range(4)]
+        self.assertEqual(depths[0], 1)
+        time.sleep(0.2)
+        self.assertEqual(sorted(started), [0, 1])
+        self.assertEqual(scheduler.queue_depth("a"), 2)
+        self.assertEqual(scheduler.queue_depth(), 2)
+        gate.set()
+        scheduler.shutdown()
+        self.assertEqual(sorted(started), [0, 1, 2, 3])
+        self.assertEqual(scheduler.queue_depth(), 0)
+
+
+class QueueDepthTest(unittest.TestCase):
+    """Test the queue depth returned to the callers"""
+
+    def setUp(self) -> None:
+        """Launch an agent server"""
+        self.launcher = RpcAgentServerLauncher(
+            host="localhost",
+            port=None,
+            custom_agent_classes=[SlowAddAgent],
+        )
+        self.launcher.launch()
+
+    def tearDown(self) -> None:
+        """Shut down the agent server"""
+        self.launcher.shutdown()
+
+    def test_async_result_queue_depth(self) -> None:
+        """The async results carry the queue depth of the agent."""
+        agent = SlowAddAgent(name="a").to_dist(
+            host=self.launcher.host,
+            port=self.launcher.port,
+        )
+        results = [agent(Msg("user", {"value": i}, "user")) for i in range(3)]
+        # one call is running, and the others are waiting in the mailbox
+        self.assertListEqual(
+            sorted(_.queue_depth for _ in results),
+            [1, 1, 2],
+        )
+        self.assertListEqual(
+            [_.content["value"] for _ in results],
+            [1, 2, 3],
+        )
+
+        # the depth is unknown for the results created from task ids
+        result = pickle.loads(
+            pickle.dumps(agent(Msg("user", {"value": 3}, "user"))),
+        )
+        self.assertIsNone(result.queue_depth)
+        self.assertEqual(result.content["value"], 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
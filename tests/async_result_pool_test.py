@@ -1,10 +1,12 @@
 # -*- coding: utf-8 -*-
 """Test the async result pool."""
 import unittest
+from unittest.mock import patch
 import time
 import pickle
 
 from loguru import logger
+import redis
 
 from agentscope.rpc.rpc_object import _call_func_in_thread
 from agentscope.server.async_result_pool import (
@@ -12,6 +14,11 @@ from agentscope.server.async_result_pool import (
     get_pool,
 )
 
+try:
+    import fakeredis
+except ImportError:
+    fakeredis = None
+
 
 def test_set_func(oid: int, value: int, pool: AsyncResultPool) -> None:
     """A test function which set value to the pool"""
@@ -86,3 +93,36 @@ class BasicResultPoolTest(unittest.TestCase):
             pool_type="redis",
             redis_url="redis://test:1234",
         )
+
+    @unittest.skipIf(fakeredis is None, reason="fakeredis is not installed")
+    def test_redis_pool_with_fakeredis(self) -> None:
+        """Test Redis pool against an in-process redis server"""
+        connection_pool = redis.BlockingConnectionPool(
+            connection_class=fakeredis.FakeConnection,
+            server=fakeredis.FakeServer(),
+            max_connections=16,
+        )
+        with patch.object(
+            redis.BlockingConnectionPool,
+            "from_url",
+            return_value=connection_pool,
+        ):
+            pool = get_pool(
+                pool_type="redis",
+                redis_url="redis://localhost:6379",
+                max_expire=3600,
+                max_connections=16,
+            )
+        self._test_result_pool(pool)
+
+        # batch get
+        oids = [pool.prepare() for _ in range(3)]
+        self.assertEqual(len(set(oids)), 3)
+        pool.set(oids[0], b"0")
+        stub = _call_func_in_thread(pool.get_many, oids, timeout=3)
+        time.sleep(0.5)
+        pool.set(oids[2], b"2")
+        pool.set(oids[1], b"1")
+        self.assertEqual(stub.result(), [b"0", b"1", b"2"])
+        self.assertRaises(TimeoutError, pool.get, pool.prepare(), 0.5)
+        self.assertEqual(pool._waiters, {})  # pylint: disable=W0212
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the sinks of the chat log
+"""
+
+import json
+import os
+import shutil
+import threading
+import unittest
+from typing import Any, List
+
+from loguru import logger
+
+from agentscope.logging import (
+    ChatRecord,
+    ChatSinkBase,
+    add_chat_sink,
+    flush_chat_log,
+    log_msg,
+    log_stream_msg,
+    remove_chat_sink,
+    setup_logger,
+)
+from agentscope.logging._sink import _chat_log
+from agentscope.message import Msg
+
+
+class _ListSink(ChatSinkBase):
+    """A sink that keeps the written batches, and waits for an event before
+    writing them."""
+
+    name = "list"
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.batches: List[List[ChatRecord]] = []
+        self.event = threading.Event()
+        self.event.set()
+
+    def write(self, records: List[ChatRecord]) -> None:
+        self.event.wait()
+        self.batches.append(records)
+
+    @property
+    def records(self) -> List[ChatRecord]:
+        """The written records."""
+        return [_ for batch in self.batches for _ in batch]
+
+
+class ChatLogTest(unittest.TestCase):
+    """Test class for the chat log"""
+
+    def setUp(self) -> None:
+        """Set up the test environment."""
+        self.run_dir = "./chat_log_runs"
+
+    def test_batch(self) -> None:
+        """Test the queued records are written in order and in batches."""
+        sink = _ListSink(batch_size=4)
+        add_chat_sink(sink)
+        sink.event.clear()
+        for i in range(10):
+            log_msg(Msg("a", str(i), "assistant"))
+        sink.event.set()
+        flush_chat_log()
+
+        self.assertListEqual(
+            [_.data["content"] for _ in sink.records],
+            [str(i) for i in range(10)],
+        )
+        self.assertLessEqual(max(len(_) for _ in sink.batches), 4)
+        self.assertLess(len(sink.batches), 10)
+        self.assertEqual(sink.dropped, 0)
+        remove_chat_sink("list")
+
+    def test_drop(self) -> None:
+        """Test the records are dropped when the queue is full."""
+        sink = _ListSink(policy="drop", max_queue_size=5, batch_size=1)
+        add_chat_sink(sink)
+        sink.event.clear()
+        for i in range(20):
+            log_msg(Msg("a", str(i), "assistant"))
+        sink.event.set()
+        flush_chat_log()
+
+        # at most one record is taken by the blocked worker
+        self.assertLessEqual(len(sink.records), 6)
+        self.assertEqual(len(sink.records) + sink.dropped, 20)
+        self.assertEqual(sink.records[0].data["content"], "0")
+        remove_chat_sink("list")
+
+    def test_sample(self) -> None:
+        """Test one of every `sample_every` records is kept once the queue is
+        half full."""
+        sink = _ListSink(
+            policy="sample",
+            max_queue_size=100,
+            batch_size=1,
+            sample_every=10,
+        )
+        add_chat_sink(sink)
+        sink.event.clear()
+        for i in range(150):
+            log_msg(Msg("a", str(i), "assistant"))
+        sink.event.set()
+        flush_chat_log()
+
+        self.assertLess(len(sink.records), 70)
+        self.assertGreater(len(sink.records), 50)
+        self.assertEqual(len(sink.records) + sink.dropped, 150)
+        remove_chat_sink("list")
+
+    def test_file(self) -> None:
+        """Test the file sink saves the complete messages only."""
+        setup_logger(self.run_dir)
+        msg = Msg("a", "hello", "assistant")
+        log_stream_msg(msg, last=False)
+        msg.content = "hello world"
+        log_stream_msg(msg, last=True)
+        remove_chat_sink("file")
+        # the chat lines of logging.log are written by loguru
+        logger.complete()
+
+        with open(
+            os.path.join(self.run_dir, "logging.chat"),
+            "r",
+            encoding="utf-8",
+        ) as file:
+            lines = file.readlines()
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(Msg.from_dict(json.loads(lines[0])), msg)
+
+        with open(
+            os.path.join(self.run_dir, "logging.log"),
+            "r",
+            encoding="utf-8",
+        ) as file:
+            self.assertIn("a: hello world\n", file.read())
+
+    def test_policy(self) -> None:
+        """Test the default and the unsupported back-pressure policies."""
+        # the built-in sinks don't lose messages unless opted in
+        for sink in _chat_log.sinks:
+            self.assertEqual(sink.policy, "block")
+        with self.assertRaises(ValueError):
+            _ListSink(policy="ignore")
+
+    def tearDown(self) -> None:
+        """Tear down the test environment."""
+        remove_chat_sink("list")
+        remove_chat_sink("file")
+        shutil.rmtree(self.run_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -11,6 +11,7 @@ from agentscope.environment import (
     Env,
     Event,
     EventListener,
+    batched_events,
 )
 
 from agentscope.exception import (
@@ -39,7 +40,7 @@ class Recorder:
     """Recorder class for test usage"""
 
     def __init__(self) -> None:
-        self.value = None
+        self.value: Any = None
 
     def record(self, value: Any) -> None:
         """record the value"""
@@ -340,6 +341,45 @@ class EnvTest(unittest.TestCase):
         self.assertTrue("p1" in p3.get())
         self.assertTrue("p2" in p3.get())
 
+    def test_batched_events(self) -> None:
+        """Test cases for batched event mode"""
+        env = MutableEnv(name="root", value=0)
+        set_rec = Recorder()
+        env.add_listener("set", SimpleListener("set_listener", set_rec))
+
+        class BatchListener(EventListener):
+            """A listener that records the batches it receives"""
+
+            def __init__(self, name: str) -> None:
+                super().__init__(name)
+                self.batches = []
+
+            def __call__(self, env: Env, event: Event) -> None:
+                self.batches.append([event])
+
+            def on_batch(self, env: Env, events: list) -> None:
+                self.batches.append(events)
+
+        batch_listener = BatchListener("batch_listener")
+        env.add_listener("set", batch_listener)
+        with batched_events(env):
+            with batched_events(env):
+                env.set(1)
+            env.set(value=2)
+            # nothing is delivered until the outermost batch exits
+            self.assertIsNone(set_rec.value)
+            self.assertEqual(batch_listener.batches, [])
+        self.assertEqual(len(batch_listener.batches), 1)
+        self.assertEqual(
+            [e.args for e in batch_listener.batches[0]],
+            [{"value": 1}, {"value": 2}],
+        )
+        # the default `on_batch` activates the listener per event
+        self.assertEqual(set_rec.value["event_args"], {"value": 2})
+        env.set(3)
+        self.assertEqual(set_rec.value["event_args"], {"value": 3})
+        self.assertEqual(batch_listener.batches[-1][0].args, {"value": 3})
+
     def test_chatroom(self) -> None:
         """Test cases for chatroom env"""
 
@@ -1,7 +1,11 @@
 # -*- coding: utf-8 -*-
 """ iPython code execution test."""
+import asyncio
 import unittest
-from agentscope.service.execute_code.exec_notebook import NoteBookExecutor
+from agentscope.service.execute_code.exec_notebook import (
+    NoteBookExecutor,
+    NoteBookKernelPool,
+)
 from agentscope.service.service_status import ServiceExecStatus
 
 
@@ -23,6 +27,10 @@ class ExecuteNotebookCodeTest(unittest.TestCase):
         # test without print
         self.arg3 = {"code": "1+1"}
 
+    def tearDown(self) -> None:
+        """Shut down the kernel."""
+        self.executor.close()
+
     def test_basic_expression(self) -> None:
         """Execute basic expression test."""
         response = self.executor.run_code_on_notebook(self.arg0["code"])
@@ -47,6 +55,58 @@ class ExecuteNotebookCodeTest(unittest.TestCase):
         self.assertEqual(response.status, ServiceExecStatus.SUCCESS)
         self.assertIn("2", response.content[0])
 
+    def test_async_and_streaming(self) -> None:
+        """Execute code from a running event loop and stream the outputs."""
+        code = (
+            "import sys, time\n"
+            "for i in range(3):\n"
+            "    print(i)\n"
+            "    sys.stdout.flush()\n"
+            "    time.sleep(0.2)"
+        )
+
+        async def _run() -> list:
+            response = await self.executor.async_run_code_on_notebook("a=1")
+            self.assertEqual(response.status, ServiceExecStatus.SUCCESS)
+            return [
+                output
+                async for output in self.executor.stream_code_on_notebook(
+                    code,
+                )
+            ]
+
+        outputs = asyncio.run(_run())
+        self.assertEqual("".join(outputs), "0\n1\n2\n")
+        self.assertGreater(len(outputs), 1)
+
+    def test_cell_eviction_and_truncation(self) -> None:
+        """Old cells are evicted while the kernel state is kept."""
+        executor = NoteBookExecutor(max_cells=2, max_output_length=5)
+        try:
+            for i in range(4):
+                executor.run_code_on_notebook(f"x{i} = {i}")
+            self.assertEqual(executor.cells_length, 2)
+            response = executor.run_code_on_notebook("print(x0, 'a' * 9)")
+            self.assertEqual(response.status, ServiceExecStatus.SUCCESS)
+            self.assertTrue(response.content[0].startswith("0 aaa\n"))
+            self.assertIn("truncated", response.content[0])
+        finally:
+            executor.close()
+
+    def test_kernel_pool(self) -> None:
+        """Leased kernels are reset when they are given back."""
+        pool = NoteBookKernelPool(size=1)
+        try:
+            with pool.leased() as executor:
+                executor.run_code_on_notebook("y = 1")
+            with pool.leased(timeout=60) as executor:
+                self.assertEqual(executor.cells_length, 0)
+                response = executor.run_code_on_notebook("print(y)")
+                self.assertEqual(response.status, ServiceExecStatus.ERROR)
+                self.assertRaises(TimeoutError, pool.lease, 0.1)
+        finally:
+            pool.close()
+
 
 if __name__ == "__main__":
     unittest.main()
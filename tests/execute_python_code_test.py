@@ -85,6 +85,25 @@ class ExecutePythonCodeTest(unittest.TestCase):
         """Execute no input code test."""
         self.run_test(self.arg4, "", "")
 
+    def test_crash_recovery(self) -> None:
+        """Execute code that kills the sandbox process test."""
+        self.run_test(
+            {"code": "import os\nos._exit(3)", "timeout": 5},
+            "",
+            "exited unexpectedly with exit code 3",
+        )
+        # the following calls are not affected
+        self.run_test(self.arg0, "Hello World\n", "")
+
+    def test_isolation_between_calls(self) -> None:
+        """Each call runs in a fresh sandbox process."""
+        self.run_test({"code": "x = 1\nprint(x)", "timeout": 5}, "1\n", "")
+        self.run_test(
+            {"code": "print(x)", "timeout": 5},
+            "",
+            "NameError",
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
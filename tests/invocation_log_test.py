@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+"""Unit tests for the segmented invocation log."""
+import gzip
+import importlib.util
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from agentscope.manager import InvocationLog, read_invocations
+from agentscope.manager._invocation import read_invocation_index
+
+
+def _record(i: int, model_class: str = "OpenAIChatWrapper") -> dict:
+    return {
+        "model_class": model_class,
+        "timestamp": f"20240101-1200{i:02d}",
+        "arguments": {"messages": [{"content": f"问题 {i}"}]},
+        "response": {"text": "x" * 100},
+    }
+
+
+class InvocationLogTest(unittest.TestCase):
+    """Tests for InvocationLog and read_invocations."""
+
+    def setUp(self) -> None:
+        """Create the log directory."""
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        """Remove the log directory."""
+        shutil.rmtree(self.directory)
+
+    def test_append_and_read(self) -> None:
+        """Test the records are read back in order with their ids."""
+        log = InvocationLog(self.directory, run_id="run")
+        ids = [log.append(_record(i)) for i in range(5)]
+        log.flush()
+
+        self.assertEqual(len(set(ids)), 5)
+        self.assertTrue(ids[0].endswith("#0"))
+        total, records = read_invocations(self.directory)
+        self.assertEqual(total, 5)
+        self.assertListEqual(records, [_record(i) for i in range(5)])
+
+        # the records are compact json lines
+        segments = [
+            _ for _ in os.listdir(self.directory) if _.endswith("0.jsonl")
+        ]
+        self.assertEqual(len(segments), 1)
+        with open(
+            os.path.join(self.directory, ids[0].split("#")[0] + ".jsonl"),
+            "r",
+            encoding="utf-8",
+        ) as file:
+            lines = file.read().splitlines()
+        self.assertEqual(len(lines), 5)
+        self.assertNotIn(": ", lines[0])
+        self.assertEqual(json.loads(lines[4]), _record(4))
+
+        log.close()
+        with self.assertRaises(RuntimeError):
+            log.append(_record(5))
+
+    def test_rotation_and_gzip(self) -> None:
+        """Test the full segments are compressed and still readable."""
+        log = InvocationLog(
+            self.directory,
+            compression="gzip",
+            max_segment_bytes=500,
+        )
+        for i in range(10):
+            log.append(_record(i))
+        log.flush()
+
+        names = os.listdir(self.directory)
+        compressed = sorted(_ for _ in names if _.endswith(".jsonl.gz"))
+        self.assertGreater(len(compressed), 1)
+        # the current segment is compressed when closing
+        self.assertEqual(
+            len(
+                [
+                    _
+                    for _ in names
+                    if _.endswith(".jsonl") and "index" not in _
+                ],
+            ),
+            1,
+        )
+        with gzip.open(
+            os.path.join(self.directory, compressed[0]),
+            "rt",
+            encoding="utf-8",
+        ) as file:
+            self.assertEqual(json.loads(file.readline()), _record(0))
+
+        log.close()
+        self.assertFalse(
+            any(
+                _.endswith(".jsonl") and "index" not in _
+                for _ in os.listdir(self.directory)
+            ),
+        )
+        total, records = read_invocations(self.directory)
+        self.assertEqual(total, 10)
+        self.assertListEqual(records, [_record(i) for i in range(10)])
+
+    @unittest.skipIf(
+        importlib.util.find_spec("zstandard") is None,
+        "zstandard is not installed",
+    )
+    def test_zstd(self) -> None:
+        """Test the zstd compression."""
+        log = InvocationLog(
+            self.directory,
+            compression="zstd",
+            max_segment_bytes=500,
+        )
+        for i in range(10):
+            log.append(_record(i))
+        log.close()
+
+        self.assertTrue(
+            any(_.endswith(".jsonl.zst") for _ in os.listdir(self.directory)),
+        )
+        _, records = read_invocations(self.directory, offset=7)
+        self.assertListEqual(records, [_record(i) for i in range(7, 10)])
+
+    def test_index_lookup(self) -> None:
+        """Test paging and filtering by the index."""
+        log = InvocationLog(
+            self.directory,
+            compression="gzip",
+            run_id="run",
+            max_segment_bytes=1000,
+        )
+        for i in range(20):
+            log.append(_record(i, "A" if i % 2 else "B"))
+        log.close()
+
+        index = read_invocation_index(self.directory)
+        self.assertEqual(len(index), 20)
+        self.assertGreater(len({_["segment"] for _ in index}), 1)
+
+        total, records = read_invocations(
+            self.directory,
+            offset=2,
+            limit=3,
+            model_class="A",
+        )
+        self.assertEqual(total, 10)
+        self.assertListEqual(records, [_record(i, "A") for i in (5, 7, 9)])
+
+        total, records = read_invocations(
+            self.directory,
+            start="20240101-120005",
+            end="20240101-120007",
+        )
+        self.assertEqual(total, 3)
+        self.assertListEqual(
+            [_["timestamp"] for _ in records],
+            [f"20240101-1200{i:02d}" for i in (5, 6, 7)],
+        )
+
+        self.assertEqual(read_invocations(self.directory, run_id="x")[0], 0)
+        self.assertEqual(
+            read_invocations(self.directory, run_id="run")[0],
+            20,
+        )
+
+    def test_legacy_files(self) -> None:
+        """Test the json files of the former versions are still read."""
+        with open(
+            os.path.join(self.directory, "model_B_20240101-120000_abc.json"),
+            "w",
+            encoding="utf-8",
+        ) as file:
+            json.dump(_record(0, "B"), file, indent=4)
+        log = InvocationLog(self.directory)
+        log.append(_record(1))
+        log.close()
+
+        total, records = read_invocations(self.directory)
+        self.assertEqual(total, 2)
+        self.assertListEqual(records, [_record(0, "B"), _record(1)])
+
+    def test_unsupported_compression(self) -> None:
+        """Test the unsupported compression is rejected."""
+        with self.assertRaises(ValueError):
+            InvocationLog(self.directory, compression="bz2")
+
+
+if __name__ == "__main__":
+    unittest.main()
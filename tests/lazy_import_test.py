@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""Unit test for importing the modules of agentscope on demand."""
+import json
+import subprocess
+import sys
+import unittest
+
+
+def _run(code: str) -> dict:
+    """Run the code in a fresh interpreter and load its json output."""
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+class LazyImportTest(unittest.TestCase):
+    """Test that the heavy modules are only imported when they're used."""
+
+    def test_import_agentscope(self) -> None:
+        """Test importing agentscope without loading its modules"""
+        imported = _run(
+            "import json, sys\n"
+            "import agentscope\n"
+            "print(json.dumps(sorted(sys.modules)))",
+        )
+        for name in [
+            "agentscope.agents",
+            "agentscope.manager",
+            "agentscope.models",
+            "agentscope.service",
+            "agentscope.rag",
+            "agentscope.studio",
+        ]:
+            self.assertNotIn(name, imported)
+
+    def test_import_on_access(self) -> None:
+        """Test the modules and the attributes are imported on access"""
+        result = _run(
+            "import json, sys\n"
+            "import agentscope\n"
+            "from agentscope.models import PostAPIChatWrapper\n"
+            "from agentscope.service import ServiceResponse\n"
+            "imported = set(sys.modules)\n"
+            "print(json.dumps({\n"
+            "    'init': callable(agentscope.init),\n"
+            "    'models': agentscope.models.PostAPIChatWrapper.__name__,\n"
+            "    'dir': 'service' in dir(agentscope),\n"
+            "    'dashscope': 'agentscope.models.dashscope_model' in imported,"
+            "\n"
+            "    'browser': 'agentscope.service.browser.web_browser' in "
+            "imported,\n"
+            "    'studio': 'agentscope.studio._app' in imported,\n"
+            "}))",
+        )
+        self.assertDictEqual(
+            result,
+            {
+                "init": True,
+                "models": "PostAPIChatWrapper",
+                "dir": True,
+                "dashscope": False,
+                "browser": False,
+                "studio": False,
+            },
+        )
+
+    def test_unknown_attribute(self) -> None:
+        """Test accessing an unknown attribute"""
+        import agentscope
+
+        with self.assertRaises(AttributeError):
+            _ = agentscope.unknown_module
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -45,6 +45,7 @@ class ManagerTest(TestCase):
                     "save_log": False,
                     "save_code": False,
                     "save_api_invoke": False,
+                    "invoke_compression": None,
                     "base_dir": None,
                     "run_dir": None,
                     "cache_dir": _DEFAULT_CACHE_DIR,
@@ -64,6 +65,23 @@ class ManagerTest(TestCase):
                     "use_monitor": False,
                     "path_db": None,
                 },
+                "tracing": {
+                    "active": False,
+                    "run_dir": None,
+                    "exporters": [],
+                },
+                "profiler": {
+                    "active": False,
+                    "run_dir": None,
+                    "interval": 0.01,
+                },
+                "replay": {
+                    "record": False,
+                    "run_dir": None,
+                    "replay": None,
+                    "replay_speed": 0.0,
+                    "compression": None,
+                },
             },
         )
 
@@ -84,6 +102,7 @@ class ManagerTest(TestCase):
                     "save_log": False,
                     "save_code": False,
                     "save_api_invoke": False,
+                    "invoke_compression": None,
                     "base_dir": None,
                     "run_dir": None,
                     "cache_dir": None,
@@ -92,6 +111,23 @@ class ManagerTest(TestCase):
                 "logger": {"level": "INFO"},
                 "studio": {"active": False, "studio_url": None},
                 "monitor": {"path_db": None, "use_monitor": False},
+                "tracing": {
+                    "active": False,
+                    "run_dir": None,
+                    "exporters": [],
+                },
+                "profiler": {
+                    "active": False,
+                    "run_dir": None,
+                    "interval": 0.01,
+                },
+                "replay": {
+                    "record": False,
+                    "run_dir": None,
+                    "replay": None,
+                    "replay_speed": 0.0,
+                    "compression": None,
+                },
             },
         )
 
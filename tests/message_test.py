@@ -1,7 +1,11 @@
 # -*- coding: utf-8 -*-
 """The unit test for message module."""
 
+import copy
+import pickle
+import random
 import unittest
+import uuid
 
 from agentscope.message import Msg
 
@@ -42,3 +46,31 @@ class MessageTest(unittest.TestCase):
         self.assertEqual(msg.metadata, deserialized_msg.metadata)
         self.assertEqual(msg.url, deserialized_msg.url)
         self.assertEqual(msg.timestamp, deserialized_msg.timestamp)
+
+    def test_lazy_stamp(self) -> None:
+        """Test the id and the timestamp are generated once on demand, and
+        shared by the copies."""
+        msg = Msg(name="A", content="B", role="assistant")
+        self.assertEqual(uuid.UUID(msg.id).version, 4)
+        self.assertEqual(msg.id, msg.id)
+        self.assertNotEqual(msg.id, Msg("A", "B", "assistant").id)
+        self.assertEqual(len(msg.timestamp), len("2024-01-01 00:00:00"))
+
+        msg = Msg(name="A", content="B", role="assistant")
+        for copied in [copy.deepcopy(msg), pickle.loads(pickle.dumps(msg))]:
+            self.assertEqual(copied, msg)
+
+        # the ids don't depend on or affect the seeded global random
+        random.seed(0)
+        ids = [Msg("A", "B", "assistant").id]
+        expected = random.random()
+        random.seed(0)
+        ids.append(Msg("A", "B", "assistant").id)
+        self.assertEqual(random.random(), expected)
+        self.assertNotEqual(ids[0], ids[1])
+
+        msg.embedding = [0.1, 0.2]
+        with self.assertRaises(AttributeError):
+            msg.unknown = 1  # pylint: disable=assigning-non-slot
+        with self.assertRaises(ValueError):
+            Msg(name="A", content="B", role="unknown")
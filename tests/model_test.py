@@ -57,30 +57,36 @@ class BasicModelTest(unittest.TestCase):
 
     def test_build_in_model_wrapper_classes(self) -> None:
         """Test the build in model wrapper classes."""
-        # get model wrapper class by class name
-        self.assertDictEqual(
-            ModelManager.get_instance().model_wrapper_mapping,
-            {
-                "post_api_chat": PostAPIChatWrapper,
-                "openai_chat": OpenAIChatWrapper,
-                "openai_dall_e": OpenAIDALLEWrapper,
-                "openai_embedding": OpenAIEmbeddingWrapper,
-                "dashscope_chat": DashScopeChatWrapper,
-                "dashscope_image_synthesis": DashScopeImageSynthesisWrapper,
-                "dashscope_text_embedding": DashScopeTextEmbeddingWrapper,
-                "dashscope_multimodal": DashScopeMultiModalWrapper,
-                "ollama_chat": OllamaChatWrapper,
-                "ollama_embedding": OllamaEmbeddingWrapper,
-                "ollama_generate": OllamaGenerationWrapper,
-                "gemini_chat": GeminiChatWrapper,
-                "gemini_embedding": GeminiEmbeddingWrapper,
-                "zhipuai_chat": ZhipuAIChatWrapper,
-                "zhipuai_embedding": ZhipuAIEmbeddingWrapper,
-                "litellm_chat": LiteLLMChatWrapper,
-                "yi_chat": YiChatWrapper,
-                "anthropic_chat": AnthropicChatWrapper,
-            },
-        )
+        # the build-in model wrappers are imported on demand
+        model_manager = ModelManager.get_instance()
+        expected = {
+            "post_api_chat": PostAPIChatWrapper,
+            "openai_chat": OpenAIChatWrapper,
+            "openai_dall_e": OpenAIDALLEWrapper,
+            "openai_embedding": OpenAIEmbeddingWrapper,
+            "dashscope_chat": DashScopeChatWrapper,
+            "dashscope_image_synthesis": DashScopeImageSynthesisWrapper,
+            "dashscope_text_embedding": DashScopeTextEmbeddingWrapper,
+            "dashscope_multimodal": DashScopeMultiModalWrapper,
+            "ollama_chat": OllamaChatWrapper,
+            "ollama_embedding": OllamaEmbeddingWrapper,
+            "ollama_generate": OllamaGenerationWrapper,
+            "gemini_chat": GeminiChatWrapper,
+            "gemini_embedding": GeminiEmbeddingWrapper,
+            "zhipuai_chat": ZhipuAIChatWrapper,
+            "zhipuai_embedding": ZhipuAIEmbeddingWrapper,
+            "litellm_chat": LiteLLMChatWrapper,
+            "yi_chat": YiChatWrapper,
+            "anthropic_chat": AnthropicChatWrapper,
+        }
+        for model_type, model_wrapper_class in expected.items():
+            self.assertIs(
+                model_manager.get_model_wrapper_class(model_type),
+                model_wrapper_class,
+            )
+        self.assertDictEqual(model_manager.model_wrapper_mapping, expected)
+        with self.assertRaises(ValueError):
+            model_manager.get_model_wrapper_class("unknown")
 
     @patch("loguru.logger.warning")
     def test_load_model_configs(self, mock_logging: MagicMock) -> None:
@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the latency histograms and the counters of the model calls
+"""
+
+import random
+import shutil
+import unittest
+from typing import Any, Generator, List, Sequence, Union
+
+import agentscope
+from agentscope.manager import (
+    ASManager,
+    Histogram,
+    MonitorManager,
+    read_metric_snapshots,
+)
+from agentscope.message import Msg
+from agentscope.models import ModelWrapperBase, ModelResponse
+
+
+class _StreamModel(ModelWrapperBase):
+    """A model wrapper returning a streaming response, which reports its
+    tokens at the end of the stream."""
+
+    model_type = "dummy_stream_metrics"
+
+    def __call__(self, *args: Any, **kwargs: Any) -> ModelResponse:
+        def generator() -> Generator:
+            text = ""
+            for chunk in ["a", "b", "c"]:
+                text += chunk
+                yield text
+            self.monitor.update_text_and_embedding_tokens(
+                self.model_name,
+                prompt_tokens=1,
+                completion_tokens=3,
+            )
+
+        return ModelResponse(stream=generator())
+
+    def format(
+        self,
+        *args: Union[Msg, Sequence[Msg]],
+    ) -> Union[List[dict], str]:
+        return str(args)
+
+
+class _FailedModel(ModelWrapperBase):
+    """A model wrapper raising an error."""
+
+    model_type = "dummy_failed_metrics"
+
+    def __call__(self, *args: Any, **kwargs: Any) -> ModelResponse:
+        raise RuntimeError("oops")
+
+    def format(
+        self,
+        *args: Union[Msg, Sequence[Msg]],
+    ) -> Union[List[dict], str]:
+        return str(args)
+
+
+class HistogramTest(unittest.TestCase):
+    """Test class for Histogram"""
+
+    def test_percentiles(self) -> None:
+        """Test the percentiles are within the relative error."""
+        rng = random.Random(0)
+        values = sorted(rng.lognormvariate(0, 1.5) for _ in range(10000))
+
+        histogram = Histogram(scale=1e6)
+        for value in values:
+            histogram.record(value)
+
+        for q in [0.5, 0.95, 0.99]:
+            expected = values[int(q * len(values)) - 1]
+            self.assertAlmostEqual(
+                histogram.percentile(q) / expected,
+                1.0,
+                delta=0.03,
+            )
+        self.assertEqual(histogram.percentile(1.0), values[-1])
+        self.assertEqual(histogram.count, len(values))
+
+        # serialization and merging
+        restored = Histogram.from_dict(histogram.to_dict())
+        restored.merge(histogram)
+        self.assertEqual(restored.count, 2 * len(values))
+        self.assertEqual(restored.percentile(0.5), histogram.percentile(0.5))
+        self.assertIsNone(Histogram().percentile(0.5))
+
+
+class ModelMetricsTest(unittest.TestCase):
+    """Test class for the metrics of the model calls"""
+
+    def setUp(self) -> None:
+        """Set up the test environment."""
+        agentscope.init(
+            use_monitor=True,
+            save_dir="./test_runs",
+        )
+        self.monitor = MonitorManager.get_instance()
+
+    def test_model_calls(self) -> None:
+        """Test the metrics are recorded by the model wrappers."""
+        model = _StreamModel(config_name="stream", model_name="stream")
+        response = model()
+        self.assertEqual(list(response.stream)[-1], (True, "abc"))
+
+        failed = _FailedModel(config_name="failed", model_name="failed")
+        with self.assertRaises(RuntimeError):
+            failed()
+        self.monitor.record_retry("failed", 2)
+
+        metrics = {_["name"]: _ for _ in self.monitor.query_metrics()}
+        self.assertEqual(metrics["stream"]["requests"], 1)
+        self.assertNotIn("errors", metrics["stream"])
+        for metric in ["latency", "ttft", "tokens_per_second"]:
+            self.assertEqual(metrics["stream"][metric]["count"], 1)
+        self.assertLessEqual(
+            metrics["stream"]["ttft"]["max"],
+            metrics["stream"]["latency"]["max"],
+        )
+        self.assertEqual(metrics["failed"]["errors"], 1)
+        self.assertEqual(metrics["failed"]["retries"], 2)
+        self.assertNotIn("ttft", metrics["failed"])
+
+        # the snapshots are saved into the database
+        self.monitor.snapshot_metrics()
+        snapshots = self.monitor.query_metric_snapshots(
+            name="stream",
+            metric="latency",
+        )
+        self.assertEqual(len(snapshots), 1)
+        self.assertEqual(snapshots[0]["count"], 1)
+
+        run_dir = agentscope.manager.FileManager.get_instance().run_dir
+        (histograms, counters), *others = read_metric_snapshots(
+            run_dir,
+        ).values()
+        self.assertListEqual(others, [])
+        self.assertEqual(counters[("failed", "errors")], 1)
+        self.assertEqual(histograms[("stream", "ttft")]["count"], 1)
+
+    def test_prometheus(self) -> None:
+        """Test the Prometheus text format."""
+        self.monitor.record_model_call("gpt-4", 0.5, completion_tokens=10)
+        self.monitor.record_model_call("gpt-4", 1.5, error=True)
+
+        text = self.monitor.metrics.to_prometheus({"run_id": 'a"b'})
+        lines = text.splitlines()
+        self.assertIn("# TYPE agentscope_model_latency_seconds summary", lines)
+        self.assertIn(
+            'agentscope_model_requests_total{name="gpt-4",run_id="a\\"b"} 2',
+            lines,
+        )
+        self.assertIn(
+            'agentscope_model_latency_seconds_count{name="gpt-4",'
+            'run_id="a\\"b"} 2',
+            lines,
+        )
+        p99 = [
+            _
+            for _ in lines
+            if _.startswith("agentscope_model_latency_seconds{")
+            and 'quantile="0.99"' in _
+        ]
+        self.assertEqual(len(p99), 1)
+        self.assertAlmostEqual(float(p99[0].split()[-1]), 1.5, delta=0.045)
+        self.assertEqual(
+            len([_ for _ in lines if _.startswith("# HELP")]),
+            4,
+        )
+
+    def tearDown(self) -> None:
+        """Tear down the test environment."""
+        ASManager.get_instance().flush()
+        shutil.rmtree("./test_runs")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 """Unit test for model response parser."""
 import unittest
+from typing import Generator
 
 from pydantic import BaseModel, Field
 
@@ -10,9 +11,12 @@ from agentscope.parsers import (
     MarkdownJsonObjectParser,
     MarkdownCodeBlockParser,
     MultiTaggedContentParser,
+    RegexTaggedContentParser,
     TaggedContent,
 )
+from agentscope.exception import TagNotFoundError
 from agentscope.parsers.parser_base import DictFilterMixin
+from agentscope.parsers._tag_scanner import _TagScanner
 
 
 class ModelResponseParserTest(unittest.TestCase):
@@ -271,6 +275,142 @@ class ModelResponseParserTest(unittest.TestCase):
             self.gt_to_metadata,
         )
 
+    def test_tag_scanner(self) -> None:
+        """Test locating the tags of multiple contents in one pass"""
+        tags = [
+            ("[SPEAK]", "[/SPEAK]"),
+            ("[THOUGHT]", "[/THOUGHT]"),
+            ("<a>", "</a>"),
+        ]
+        scanner = _TagScanner(tags)
+        self.assertIsNotNone(scanner._pattern)  # pylint: disable=W0212
+        for text in [
+            self.res_dict_2.text,
+            "[/SPEAK][SPEAK]a[THOUGHT]b[/SPEAK][/THOUGHT]",
+            "</a>[THOUGHT]<a>x</a>",
+            "[SPEAK][SPEAK][/SPEAK][/SPEAK]",
+            "",
+        ]:
+            self.assertEqual(
+                scanner.scan(text),
+                [
+                    _TagScanner._find(text, *_)  # pylint: disable=W0212
+                    for _ in tags
+                ],
+            )
+
+        # the tags overlap, e.g. "```" is within "```json"
+        scanner = _TagScanner([("```json", "```"), ("```", "```")])
+        self.assertIsNone(scanner._pattern)  # pylint: disable=W0212
+        self.assertEqual(
+            scanner.scan("```json\n{}\n```"),
+            [(0, 11), (0, 11)],
+        )
+
+        parser = MultiTaggedContentParser(
+            TaggedContent("speak", "[SPEAK]", "", "[/SPEAK]"),
+            TaggedContent("thought", "[THOUGHT]", "", "[/THOUGHT]"),
+            keys_allow_missing=["thought"],
+        )
+        res = parser.parse(ModelResponse(text="[THOUGHT]a[SPEAK]b[/SPEAK]"))
+        self.assertDictEqual(res.parsed, {"speak": "b"})
+        with self.assertRaises(TagNotFoundError) as cm:
+            parser.parse(ModelResponse(text="b[/SPEAK]"))
+        self.assertTrue(cm.exception.missing_begin_tag)
+        self.assertFalse(cm.exception.missing_end_tag)
+
+    def test_regextaggedcontentparser_pattern(self) -> None:
+        """Test changing the compiled pattern of RegexTaggedContentParser"""
+        parser = RegexTaggedContentParser(required_keys=["a"])
+        res = parser.parse(ModelResponse(text="<a>1</a><b>x</b>"))
+        self.assertDictEqual(res.parsed, {"a": 1, "b": "x"})
+
+        parser.tagged_content_pattern = (
+            r"\[(?P<name>[^\]]+)\](?P<content>.*?)\[/\1\]"
+        )
+        res = parser.parse(ModelResponse(text="[a]2[/a]<b>x</b>"))
+        self.assertDictEqual(res.parsed, {"a": 2})
+
+    @staticmethod
+    def _streamed(text: str, size: int, consumed: list) -> ModelResponse:
+        """Stream the accumulated text in chunks of `size` characters, and
+        record the number of generated chunks in `consumed`."""
+
+        def _gen() -> Generator[str, None, None]:
+            for i in range(size, len(text) + size, size):
+                consumed.append(i)
+                yield text[:i]
+
+        return ModelResponse(stream=_gen())
+
+    def test_parse_stream(self) -> None:
+        """Test incremental parsing of streamed responses"""
+        parser = MultiTaggedContentParser(
+            TaggedContent("speak", "[SPEAK]", "", "[/SPEAK]"),
+            TaggedContent("thought", "[THOUGHT]", "", "[/THOUGHT]"),
+            TaggedContent(
+                "end_discussion",
+                "[END_DISCUSSION]",
+                "",
+                "[/END_DISCUSSION]",
+                parse_json=True,
+            ),
+        )
+        consumed: list = []
+        res = self._streamed(self.res_dict_2.text, 3, consumed)
+        fields = list(parser.parse_stream(res))
+        self.assertEqual(
+            [key for key, _ in fields],
+            ["speak", "thought", "end_discussion"],
+        )
+        self.assertDictEqual(res.parsed, self.gt_dict)
+        self.assertEqual(res.text, self.res_dict_2.text)
+
+        # stop the generation once the required keys are available
+        text = self.res_dict_2.text + "\n" + "x" * 300
+        consumed = []
+        res = self._streamed(text, 3, consumed)
+        self.assertDictEqual(
+            dict(parser.parse_stream(res, True)),
+            self.gt_dict,
+        )
+        self.assertDictEqual(res.parsed, self.gt_dict)
+        self.assertLess(len(consumed), len(text) // 3)
+        self.assertTrue(text.startswith(res.text))
+        self.assertTrue(res.text.startswith(self.res_dict_2.text))
+
+        # json dictionary
+        parser = MarkdownJsonDictParser(required_keys=["speak", "thought"])
+        text = self.res_dict_1.text
+        res = self._streamed(text, 2, consumed)
+        fields = list(parser.parse_stream(res, stop_early=True))
+        self.assertEqual(
+            fields,
+            [("speak", "Hello, world!"), ("thought", "xxx")],
+        )
+        self.assertDictEqual(
+            res.parsed,
+            {"speak": "Hello, world!", "thought": "xxx"},
+        )
+        res = self._streamed('{"a": [1, {"b": "}"}], "c": "\\""}', 4, [])
+        self.assertEqual(
+            list(MarkdownJsonDictParser().parse_stream(res)),
+            [("a", [1, {"b": "}"}]), ("c", '"')],
+        )
+
+        # regex tagged content, the nested tags are not emitted before the
+        # enclosing one
+        parser = RegexTaggedContentParser(required_keys=["thought"])
+        res = self._streamed(
+            "<thought>use <b>x</b></thought><function>f</function>",
+            5,
+            [],
+        )
+        self.assertEqual(
+            list(parser.parse_stream(res)),
+            [("thought", "use <b>x</b>"), ("function", "f")],
+        )
+
     def test_DictFilterMixin_default_value(self) -> None:
         """Test the default value of the DictFilterMixin class"""
         mixin = DictFilterMixin(
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the sampling profiler
+"""
+
+import os
+import shutil
+import time
+import unittest
+from typing import Optional, Union, Sequence
+
+import agentscope
+from agentscope.agents import AgentBase
+from agentscope.manager import ASManager, FileManager
+from agentscope.message import Msg
+from agentscope.profiling import (
+    classify_stack,
+    read_profiles,
+    summarize_profile,
+)
+
+
+class _BusyAgent(AgentBase):
+    """An agent that keeps its memory busy."""
+
+    def reply(self, x: Optional[Union[Msg, Sequence[Msg]]] = None) -> Msg:
+        self.memory.add([Msg("user", "hello", "user") for _ in range(10)])
+        start = time.perf_counter()
+        while time.perf_counter() - start < 0.5:
+            self.memory.get_memory(recent_n=5)
+        return Msg(self.name, "done", "assistant")
+
+
+class ClassifyTest(unittest.TestCase):
+    """Test class for the component attribution"""
+
+    def test_classify_stack(self) -> None:
+        """Test the outermost component within the innermost agent reply is
+        used."""
+        agent_call = "agentscope.agents.agent:AgentBase.__call__"
+        stack = (
+            "__main__:<module>",
+            "agentscope.parsers.json_object_parser:MarkdownJsonDictParser"
+            ".parse",
+            agent_call,
+            "agentscope.agents.dialog_agent:DialogAgent.reply",
+            "agentscope.models.openai_model:OpenAIChatWrapper.format",
+            "json:dumps",
+        )
+        self.assertEqual(classify_stack(stack), "formatting")
+        self.assertEqual(classify_stack(stack[:4]), "other")
+        self.assertEqual(classify_stack(stack[:2]), "parsing")
+        self.assertEqual(
+            classify_stack((agent_call, "agentscope.memory.x:f", "json:f")),
+            "memory",
+        )
+
+
+class ProfilerTest(unittest.TestCase):
+    """Test class for the profiler"""
+
+    def setUp(self) -> None:
+        """Set up the test environment."""
+        agentscope.init(
+            save_dir="./test_runs",
+            save_code=False,
+            use_monitor=False,
+            profile=True,
+        )
+        self.directory = os.path.join(
+            FileManager.get_instance().run_dir,
+            "profile",
+        )
+
+    def test_profile(self) -> None:
+        """Test the samples are attributed to the agents and the
+        components."""
+        agent = _BusyAgent(name="busy")
+        agent()
+        ASManager.get_instance().flush()
+
+        pid = os.getpid()
+        for filename in [
+            f"profile-{pid}.collapsed",
+            f"profile-{pid}.json",
+            f"profile-{pid}.txt",
+            "summary.txt",
+        ]:
+            self.assertTrue(
+                os.path.exists(os.path.join(self.directory, filename)),
+            )
+
+        counts, metas = read_profiles(self.directory)
+        self.assertEqual(metas[0]["pid"], pid)
+        self.assertTrue(
+            all(root.startswith(("agent:", "thread:")) for root, _ in counts),
+        )
+
+        summary = summarize_profile(self.directory)
+        self.assertIn("agent:busy", summary["agents"])
+        self.assertIn("memory", summary["components"])
+        running, _ = summary["agents"]["agent:busy"]
+        self.assertGreater(running, 10)
+
+        with open(
+            os.path.join(self.directory, "summary.txt"),
+            "r",
+            encoding="utf-8",
+        ) as file:
+            text = file.read()
+        self.assertIn("agent:busy", text)
+        self.assertIn("By component:", text)
+
+    def tearDown(self) -> None:
+        """Tear down the test environment."""
+        ASManager.get_instance().flush()
+        shutil.rmtree("./test_runs")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,13 +1,12 @@
 # -*- coding: utf-8 -*-
 """ Test for record api invocation."""
-import json
 import os
 import shutil
 import unittest
 from unittest.mock import patch, MagicMock
 
 import agentscope
-from agentscope.manager import FileManager
+from agentscope.manager import FileManager, read_invocations
 from agentscope.manager import ASManager
 from agentscope.models import OpenAIChatWrapper
 
@@ -64,47 +63,35 @@ class RecordApiInvocation(unittest.TestCase):
     def assert_invocation_record(self) -> None:
         """Assert invocation record."""
         file_manager = FileManager.get_instance()
-        run_dir = file_manager.run_dir
-        records = [
-            _
-            for _ in os.listdir(
-                os.path.join(run_dir, "invoke"),
-            )
-            if _.startswith("model_OpenAIChatWrapper_")
-        ]
+        file_manager.flush_api_invocations()
+        total, records = read_invocations(
+            os.path.join(file_manager.run_dir, "invoke"),
+            model_class="OpenAIChatWrapper",
+        )
 
         # only one record is here
-        self.assertEqual(len(records), 1)
-
-        filename = records[0]
-        timestamp = filename.split("_")[2]
-
-        with open(
-            os.path.join(run_dir, "invoke", filename),
-            "r",
-            encoding="utf-8",
-        ) as file:
-            self.assertEqual(
-                json.load(file),
-                {
-                    "model_class": "OpenAIChatWrapper",
-                    "timestamp": timestamp,
-                    "arguments": {
-                        "model": "gpt-4",
-                        "stream": False,
-                        "messages": [],
-                    },
-                    "response": {
-                        "choices": [
-                            {
-                                "message": {
-                                    "content": "dummy_response",
-                                },
+        self.assertEqual(total, 1)
+        self.assertEqual(
+            records[0],
+            {
+                "model_class": "OpenAIChatWrapper",
+                "timestamp": records[0]["timestamp"],
+                "arguments": {
+                    "model": "gpt-4",
+                    "stream": False,
+                    "messages": [],
+                },
+                "response": {
+                    "choices": [
+                        {
+                            "message": {
+                                "content": "dummy_response",
                             },
-                        ],
-                    },
+                        },
+                    ],
                 },
-            )
+            },
+        )
 
     def tearDown(self) -> None:
         """Tear down for RecordApiInvocation."""
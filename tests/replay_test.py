@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for recording and replaying the model calls
+"""
+
+import shutil
+import time
+import unittest
+from typing import Any, Generator, List, Sequence, Union
+
+import agentscope
+from agentscope.exception import ReplayMissError
+from agentscope.manager import ASManager, FileManager
+from agentscope.message import Msg
+from agentscope.models import ModelWrapperBase, ModelResponse
+
+
+class _CountingModel(ModelWrapperBase):
+    """A model wrapper whose replies differ in each call."""
+
+    model_type = "dummy_replay"
+
+    calls = 0
+
+    def __call__(
+        self,
+        messages: list,
+        stream: bool = False,
+        **kwargs: Any,
+    ) -> ModelResponse:
+        _CountingModel.calls += 1
+        text = f"reply {_CountingModel.calls} to {messages[-1]['content']}"
+        if not stream:
+            return ModelResponse(text=text, raw={"calls": self.calls})
+
+        def generator() -> Generator:
+            for i in range(1, len(text) + 1, 4):
+                time.sleep(0.01)
+                yield text[:i]
+            yield text
+
+        return ModelResponse(stream=generator())
+
+    def format(
+        self,
+        *args: Union[Msg, Sequence[Msg]],
+    ) -> Union[List[dict], str]:
+        return str(args)
+
+
+class ReplayTest(unittest.TestCase):
+    """Test class for recording and replaying the model calls"""
+
+    def setUp(self) -> None:
+        """Record the model calls."""
+        _CountingModel.calls = 0
+        agentscope.init(
+            save_dir="./test_runs",
+            save_code=False,
+            use_monitor=False,
+            record_model_calls=True,
+        )
+        self.run_dir = FileManager.get_instance().run_dir
+
+        model = _CountingModel(config_name="counting", model_name="counting")
+        prompt = [{"role": "user", "content": "hi"}]
+        self.texts = [model(prompt).text, model(prompt).text]
+        self.chunks = [text for _, text in model(prompt, stream=True).stream]
+        self.recorded_calls = _CountingModel.calls
+        ASManager.get_instance().flush()
+
+    def test_replay(self) -> None:
+        """Test the identical requests are served from the archive in
+        order."""
+        agentscope.init(disable_saving=True, replay=self.run_dir)
+        model = _CountingModel(config_name="counting", model_name="counting")
+        prompt = [{"role": "user", "content": "hi"}]
+
+        self.assertEqual(model(prompt).text, self.texts[0])
+        response = model(prompt)
+        self.assertEqual(response.text, self.texts[1])
+        self.assertEqual(response.raw, {"calls": 2})
+        # the last response is served once the recorded ones are used up
+        self.assertEqual(model(prompt).text, self.texts[1])
+        chunks = [text for _, text in model(prompt, stream=True).stream]
+        self.assertListEqual(chunks, self.chunks)
+
+        with self.assertRaises(ReplayMissError):
+            model([{"role": "user", "content": "bye"}])
+        self.assertEqual(_CountingModel.calls, self.recorded_calls)
+
+    def test_replay_speed(self) -> None:
+        """Test the recorded timing of the stream is replayed."""
+        agentscope.init(
+            disable_saving=True,
+            replay=self.run_dir,
+            replay_speed=1.0,
+        )
+        model = _CountingModel(config_name="counting", model_name="counting")
+        prompt = [{"role": "user", "content": "hi"}]
+
+        start = time.perf_counter()
+        chunks = [text for _, text in model(prompt, stream=True).stream]
+        self.assertListEqual(chunks, self.chunks)
+        self.assertGreater(
+            time.perf_counter() - start,
+            0.01 * (len(self.chunks) - 1),
+        )
+
+    def tearDown(self) -> None:
+        """Tear down the test environment."""
+        ASManager.get_instance().flush()
+        shutil.rmtree("./test_runs")
+
+
+if __name__ == "__main__":
+    unittest.main()
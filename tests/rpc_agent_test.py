@@ -5,6 +5,8 @@ Unit tests for rpc agent classes
 """
 import unittest
 import os
+import subprocess
+import sys
 import time
 import shutil
 from typing import Optional, Union, Sequence, Callable
@@ -34,6 +36,26 @@ from agentscope.rpc.retry_strategy import (
 )
 
 
+# A server launched by a fresh interpreter, which hasn't imported the agents
+_FRESH_SERVER_SCRIPT = """
+from agentscope.server import RpcAgentServerLauncher
+
+launcher = RpcAgentServerLauncher(host="localhost", port=None, local_mode=True)
+launcher.launch()
+try:
+    from agentscope.agents import UserAgent
+
+    agent = UserAgent(
+        name="user",
+        to_dist={"host": "localhost", "port": launcher.port},
+    )
+    agent.observe(None)
+    print("created", agent.agent_id)
+finally:
+    launcher.shutdown()
+"""
+
+
 class DemoRpcAgent(AgentBase):
     """A demo Rpc agent for test usage."""
 
@@ -929,3 +951,16 @@ class BasicRpcAgentTest(unittest.TestCase):
         self.assertGreaterEqual(et - st, delay * 0.5)
         self.assertLessEqual(et - st, delay * 1.5 + 0.2)
         self.assertEqual(result, "Success")
+
+    def test_builtin_agents_in_fresh_server(self) -> None:
+        """Test the built-in agents are registered in the servers launched
+        by a fresh interpreter."""
+        result = subprocess.run(
+            [sys.executable, "-c", _FRESH_SERVER_SCRIPT],
+            capture_output=True,
+            text=True,
+            timeout=60,
+            check=False,
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertIn("created", result.stdout)
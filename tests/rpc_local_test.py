@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the rpc calls between the agents in the same process
+"""
+import threading
+import unittest
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import cloudpickle as pickle
+
+from agentscope.agents import AgentBase
+from agentscope.message import Msg
+from agentscope.rpc import AsyncResult, RpcClient
+from agentscope.rpc.rpc_async import (
+    _get_local_resolver,
+    _register_local_resolver,
+    _unregister_local_resolver,
+)
+from agentscope.rpc.rpc_object import _CreationBatcher, _LocalServerPool
+from agentscope.server.servicer import AgentServerServicer
+
+
+class LocalResultTest(unittest.TestCase):
+    """Test cases for the results of the co-located agent servers"""
+
+    def test_local_async_result(self) -> None:
+        """Test that async results of co-located servers are resolved
+        without rpc."""
+        msg = Msg(name="System", content="local", role="system")
+        resolver = MagicMock(return_value=msg)
+        _register_local_resolver("localhost", 12345, resolver)
+        try:
+            with patch.object(RpcClient, "update_result") as update_result:
+                res = AsyncResult(host="localhost", port=12345, task_id=1)
+                self.assertIs(res.result(), msg)
+                self.assertEqual(res.content, "local")
+                resolver.assert_called_once_with(1)
+                update_result.assert_not_called()
+        finally:
+            _unregister_local_resolver("localhost", 12345)
+        self.assertIsNone(_get_local_resolver("localhost", 12345))
+
+        # the other hosts are not resolved locally
+        _register_local_resolver("127.0.0.1", 12345, resolver)
+        try:
+            self.assertIsNone(_get_local_resolver("localhost", 12345))
+        finally:
+            _unregister_local_resolver("127.0.0.1", 12345)
+
+    def test_local_result_copies(self) -> None:
+        """Test that co-located consumers share immutable results only, and
+        get their own copies of the others."""
+        results = {}
+        servicer = MagicMock(local_results={}, timeout=1)
+        servicer.result_pool.set.side_effect = results.__setitem__
+        servicer.result_pool.get.side_effect = (
+            lambda task_id, timeout: results[task_id]
+        )
+        msg = Msg(name="System", content=["local"], role="system")
+        content = ("local", 1)
+        servicer.get_agent.return_value = MagicMock(
+            reply=MagicMock(return_value=msg),
+            echo=MagicMock(return_value=content),
+        )
+        for task_id, target_func in enumerate(["reply", "echo"]):
+            AgentServerServicer._process_task(  # pylint: disable=W0212
+                servicer,
+                task_id,
+                "agent",
+                target_func,
+                pickle.dumps({"args": ()}),
+            )
+
+        first, second = [
+            AgentServerServicer._get_local_result(  # pylint: disable=W0212
+                servicer,
+                0,
+            )
+            for _ in range(2)
+        ]
+        self.assertEqual(first, msg)
+        self.assertIsNot(first, msg)
+        self.assertIsNot(first, second)
+        first.content.append("changed")
+        self.assertEqual(second.content, ["local"])
+        self.assertIs(
+            AgentServerServicer._get_local_result(  # pylint: disable=W0212
+                servicer,
+                1,
+            ),
+            content,
+        )
+
+
+class RpcObjectCreationTest(unittest.TestCase):
+    """Test cases for the creation of the rpc objects"""
+
+    def test_batched_creation_and_server_pool(self) -> None:
+        """Test that creation requests are batched and automatically
+        launched servers are shared."""
+        client = MagicMock(url="mock:1")
+        # hold the first request until all creations are submitted
+        submitted = threading.Event()
+
+        def _create_agents(agents: list) -> list:
+            submitted.wait(timeout=5)
+            return [True] * len(agents)
+
+        client.create_agents.side_effect = _create_agents
+        batcher = _CreationBatcher(client)
+        futures = [batcher.submit({"idx": i}, f"a{i}") for i in range(20)]
+        submitted.set()
+        self.assertTrue(all(f.result(timeout=5) for f in futures))
+
+        # the creations submitted while the first request is pending are
+        # sent together in the second request
+        batches = [
+            [oid for _, oid in call.args[0]]
+            for call in client.create_agents.call_args_list
+        ]
+        self.assertLessEqual(len(batches), 2)
+        first_batch = batches[0]
+        self.assertListEqual(
+            first_batch,
+            [f"a{i}" for i in range(len(first_batch))],
+        )
+        if len(batches) == 2:
+            self.assertListEqual(
+                batches[1],
+                [f"a{i}" for i in range(len(first_batch), 20)],
+            )
+        for call in client.create_agents.call_args_list:
+            for configs, oid in call.args[0]:
+                self.assertEqual(
+                    pickle.loads(configs),
+                    {"idx": int(oid[1:])},
+                )
+
+        with patch(
+            "agentscope.server.RpcAgentServerLauncher",
+        ) as launcher_cls:
+            pool = _LocalServerPool(max_servers=2, capacity=2)
+
+            def _new_launcher(**_kwargs: Any) -> MagicMock:
+                launcher = MagicMock(server=None)
+                # the server is launched without holding the pool lock
+                launcher.launch.side_effect = lambda: self.assertFalse(
+                    pool._lock.locked(),  # pylint: disable=W0212
+                )
+                # and shut down without holding it
+                launcher.shutdown.side_effect = lambda: self.assertFalse(
+                    pool._lock.locked(),  # pylint: disable=W0212
+                )
+                return launcher
+
+            launcher_cls.side_effect = _new_launcher
+            acquired = [pool.acquire(AgentBase) for _ in range(5)]
+            first, second = acquired[0], acquired[2]
+            # a new server is launched only when the others are full
+            self.assertListEqual(
+                acquired[:4],
+                [first, first, second, second],
+            )
+            self.assertIsNot(first, second)
+            self.assertIn(acquired[4], (first, second))
+            self.assertEqual(launcher_cls.call_count, 2)
+            first.launch.assert_called_once()
+            second.launch.assert_called_once()
+            for launcher in acquired:
+                pool.release(launcher)
+            first.shutdown.assert_called_once()
+            second.shutdown.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -286,6 +286,9 @@ we use the embedding model to embed the query.""",
             port=3306,
             allow_change_data=False,
             maxcount_results=None,
+            params=None,
+            max_preview_rows=None,
+            fetch_size=1000,
         )
 
         self.assertDictEqual(
@@ -302,6 +305,9 @@ we use the embedding model to embed the query.""",
             summarization_prompt="",
             max_return_token=-1,
             token_limit_prompt="",
+            chunk_size=None,
+            fan_out=4,
+            max_parallel=4,
         )
 
         print(json.dumps(doc_dict, indent=4))
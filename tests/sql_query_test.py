@@ -1,8 +1,13 @@
 # -*- coding: utf-8 -*-
 """ Python sql query test."""
+import os
+import shutil
+import tempfile
+import threading
 import unittest
 from unittest.mock import MagicMock, patch
 
+from agentscope.service import close_sql_connections, close_mongodb_clients
 from agentscope.service.sql_query.mongodb import query_mongodb
 
 from agentscope.service.sql_query.mysql import query_mysql
@@ -13,6 +18,17 @@ from agentscope.service.sql_query.sqlite import query_sqlite
 class TestSQLQueries(unittest.TestCase):
     """ExampleTest for a unit test."""
 
+    def setUp(self) -> None:
+        """Drop the pooled connections of other tests"""
+        close_sql_connections()
+        close_mongodb_clients()
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        """Close the pooled connections"""
+        close_sql_connections()
+        shutil.rmtree(self.tmp_dir)
+
     @patch("agentscope.service.sql_query.mysql.pymysql.connect")
     def test_query_mysql_success(self, mock_connect: MagicMock) -> None:
         """Test query mysql success"""
@@ -78,7 +94,7 @@ class TestSQLQueries(unittest.TestCase):
         mock_db.__getitem__.return_value = mock_collection
 
         mock_client = MagicMock()
-        mock_mongo_client.return_value.__enter__.return_value = mock_client
+        mock_mongo_client.return_value = mock_client
         mock_client.__getitem__.return_value = mock_db
 
         # Call the query_mongodb function
@@ -170,6 +186,100 @@ class TestSQLQueries(unittest.TestCase):
         self.assertEqual(response.status, ServiceExecStatus.ERROR)
         self.assertIn("Connection Error", str(response.content))
 
+    def test_query_sqlite_pool_and_preview(self) -> None:
+        """Test pooled connections and bounded previews with a real sqlite
+        database"""
+        database = os.path.join(self.tmp_dir, "test.db")
+        response = query_sqlite(
+            database,
+            "CREATE TABLE t (id INTEGER, name TEXT)",
+            allow_change_data=True,
+        )
+        self.assertEqual(response.status, ServiceExecStatus.SUCCESS)
+        for i in range(25):
+            response = query_sqlite(
+                database,
+                "INSERT INTO t VALUES (?, ?)",
+                allow_change_data=True,
+                params=[i, f"name{i}"],
+            )
+            self.assertEqual(response.status, ServiceExecStatus.SUCCESS)
+
+        # the change is committed and visible to a new connection
+        close_sql_connections()
+        response = query_sqlite(
+            database,
+            "SELECT id, name FROM t WHERE id < :max_id ORDER BY id",
+            params={"max_id": 10},
+        )
+        self.assertEqual(response.content[:2], [(0, "name0"), (1, "name1")])
+        self.assertEqual(len(response.content), 10)
+
+        response = query_sqlite(
+            database,
+            "SELECT id, name FROM t ORDER BY id",
+            max_preview_rows=3,
+            fetch_size=4,
+        )
+        self.assertEqual(
+            response.content,
+            {
+                "columns": ["id", "name"],
+                "rows": [(0, "name0"), (1, "name1"), (2, "name2")],
+                "row_count": 25,
+                "truncated": True,
+            },
+        )
+
+        # the errors don't break the pooled connection
+        response = query_sqlite(database, "SELECT * FROM missing")
+        self.assertEqual(response.status, ServiceExecStatus.ERROR)
+        self.assertIn("no such table", response.content)
+
+        # only one connection is created for sequential queries from
+        # different threads
+        close_sql_connections()
+        connections = []
+
+        def _query() -> None:
+            response = query_sqlite(database, "SELECT count(*) FROM t")
+            connections.append(response.content)
+
+        with patch(
+            "agentscope.service.sql_query.sqlite.sqlite3.connect",
+            wraps=__import__("sqlite3").connect,
+        ) as mock_connect:
+            for _ in range(3):
+                thread = threading.Thread(target=_query)
+                thread.start()
+                thread.join()
+            self.assertEqual(mock_connect.call_count, 1)
+        self.assertEqual(connections, [[(25,)]] * 3)
+
+    def test_query_sqlite_memory(self) -> None:
+        """Test in-memory databases are not pooled, so that their state
+        doesn't persist across queries"""
+        for _ in range(2):
+            response = query_sqlite(
+                ":memory:",
+                "CREATE TABLE t (id INTEGER)",
+                allow_change_data=True,
+            )
+            self.assertEqual(response.status, ServiceExecStatus.SUCCESS)
+
+        with patch(
+            "agentscope.service.sql_query.sqlite.sqlite3.connect",
+            wraps=__import__("sqlite3").connect,
+        ) as mock_connect:
+            response = query_sqlite(
+                "file::memory:?cache=shared",
+                "SELECT count(*) FROM sqlite_master",
+                uri=True,
+            )
+            self.assertEqual(response.content, [(0,)])
+            # the connection isn't bound to the pooling thread
+            self.assertNotIn("check_same_thread", mock_connect.call_args[1])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""Unit tests for the message history of AgentScope Studio."""
+import unittest
+import uuid
+
+from agentscope.studio._app import (
+    _app,
+    _cache_db,
+    _create_indexes,
+    _db,
+    _MessageTable,
+    _RunTable,
+)
+from agentscope.studio._studio_utils import _add_sequence_column
+
+
+class MessagePageTest(unittest.TestCase):
+    """Tests for the pages of the messages of a registered run."""
+
+    def setUp(self) -> None:
+        """Register a run."""
+        with _app.app_context():
+            _db.create_all()
+        _add_sequence_column(str(_cache_db), "message_table")
+        with _app.app_context():
+            _create_indexes()
+
+        self.run_id = uuid.uuid4().hex
+        with _app.app_context():
+            _db.session.add(_RunTable(run_id=self.run_id, pid=-1))
+            _db.session.commit()
+        self.client = _app.test_client()
+
+    def tearDown(self) -> None:
+        """Remove the run and its messages."""
+        with _app.app_context():
+            _MessageTable.query.filter_by(run_id=self.run_id).delete()
+            _RunTable.query.filter_by(run_id=self.run_id).delete()
+            _db.session.commit()
+
+    def _push(self, ids: list, content: str = "hi") -> None:
+        for msg_id in ids:
+            response = self.client.post(
+                "/api/messages/push",
+                json={
+                    "run_id": self.run_id,
+                    "id": msg_id,
+                    "name": "a",
+                    "role": "assistant",
+                    "content": content,
+                    "timestamp": "2024-01-01 00:00:00",
+                    "metadata": None,
+                    "url": None,
+                },
+            )
+            self.assertEqual(response.status_code, 200)
+
+    def _page(self, **args: str) -> dict:
+        response = self.client.get(
+            f"/api/messages/run/{self.run_id}",
+            query_string=args,
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.get_json()
+
+    def test_order_of_same_second(self) -> None:
+        """Test the messages created in the same second are in the order
+        they are received, and a replaced message keeps its position."""
+        ids = [uuid.uuid4().hex for _ in range(5)]
+        self._push(ids[:3])
+        # read the first messages before pushing the others
+        self._page(limit="10")
+        self._push(ids[3:])
+        self._push([ids[1]], content="updated")
+
+        page = self._page(limit="2", tail="true")
+        self.assertListEqual([_["id"] for _ in page["messages"]], ids[3:])
+        self.assertTrue(page["has_more"])
+
+        page = self._page(limit="10", before=page["cursors"][0])
+        self.assertListEqual([_["id"] for _ in page["messages"]], ids[:3])
+        self.assertEqual(page["messages"][1]["content"], "updated")
+        self.assertFalse(page["has_more"])
+
+        page = self._page(limit="10", after=page["cursors"][0])
+        self.assertListEqual([_["id"] for _ in page["messages"]], ids[1:])
+
+        messages = self._page()
+        self.assertListEqual([_["id"] for _ in messages], ids)
+
+        response = self.client.get(
+            f"/api/messages/run/{self.run_id}",
+            query_string={"limit": "2", "after": "invalid"},
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""Unit tests for the utilities of AgentScope Studio."""
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import unittest
+
+from agentscope.studio._studio_utils import (
+    _add_sequence_column,
+    _CoalescingBuffer,
+    _LineOffsetIndex,
+)
+
+
+class LineOffsetIndexTest(unittest.TestCase):
+    """Tests for the line offset index of logging.chat."""
+
+    def setUp(self) -> None:
+        """Create a chat file."""
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "logging.chat")
+        self._write([{"id": i, "content": f"消息 {i}"} for i in range(5)])
+
+    def tearDown(self) -> None:
+        """Remove the chat file."""
+        shutil.rmtree(self.directory)
+
+    def _write(self, msgs: list, mode: str = "w", tail: str = "") -> None:
+        with open(self.path, mode, encoding="utf-8") as file:
+            for msg in msgs:
+                file.write(json.dumps(msg, ensure_ascii=False) + "\n")
+            file.write(tail)
+
+    def _ids(self, index: _LineOffsetIndex, start: int, stop: int) -> list:
+        return [json.loads(_)["id"] for _ in index.read_lines(start, stop)]
+
+    def test_read_lines(self) -> None:
+        """Test reading ranges of lines by their offsets."""
+        index = _LineOffsetIndex(self.path)
+        self.assertEqual(index.refresh(), 5)
+        self.assertListEqual(self._ids(index, 1, 3), [1, 2])
+        self.assertListEqual(self._ids(index, 3, 100), [3, 4])
+        self.assertListEqual(self._ids(index, 4, 2), [])
+
+    def test_incremental_refresh(self) -> None:
+        """Test the index grows with the file, and skips the incomplete
+        last line."""
+        index = _LineOffsetIndex(self.path)
+        index.refresh()
+
+        self._write([{"id": 5}], mode="a", tail='{"id": ')
+        self.assertEqual(index.refresh(), 6)
+        self.assertListEqual(self._ids(index, 4, 10), [4, 5])
+
+        self._write([], mode="a", tail="6}\n")
+        self.assertEqual(index.refresh(), 7)
+        self.assertListEqual(self._ids(index, 6, 7), [6])
+
+        # the file is replaced by a shorter one
+        self._write([{"id": 10}])
+        self.assertEqual(index.refresh(), 1)
+        self.assertListEqual(self._ids(index, 0, 1), [10])
+
+
+class CoalescingBufferTest(unittest.TestCase):
+    """Tests for the write-behind buffer of the pushed messages."""
+
+    def setUp(self) -> None:
+        """Create a buffer collecting the flushed batches."""
+        self.batches = []
+        self.flushed = threading.Event()
+
+        def _flush(items: list) -> None:
+            self.batches.append(items)
+            self.flushed.set()
+
+        self.buffer = _CoalescingBuffer(
+            _flush,
+            interval=60,
+            max_size=3,
+            name="test",
+        )
+
+    def test_coalesce(self) -> None:
+        """Test the updates of the same key are merged in place."""
+        self.buffer.put("a", 1)
+        self.buffer.put("b", 1)
+        self.buffer.put("a", 2)
+        self.buffer.flush()
+        self.assertListEqual(self.batches, [[2, 1]])
+
+        # nothing to flush
+        self.buffer.flush()
+        self.assertEqual(len(self.batches), 1)
+
+    def test_flush_when_full(self) -> None:
+        """Test the background thread flushes a full buffer without
+        waiting for the interval."""
+        for key in "abc":
+            self.buffer.put(key, key)
+        self.assertTrue(self.flushed.wait(10))
+        self.assertListEqual(self.batches, [["a", "b", "c"]])
+
+
+class SequenceColumnTest(unittest.TestCase):
+    """Tests for adding the sequence column to the former message table."""
+
+    def test_add_sequence_column(self) -> None:
+        """Test the existing rows are numbered in the insertion order."""
+        directory = tempfile.mkdtemp()
+        path = os.path.join(directory, "agentscope.db")
+        try:
+            conn = sqlite3.connect(path)
+            conn.execute("CREATE TABLE message_table (id VARCHAR);")
+            conn.executemany(
+                "INSERT INTO message_table (id) VALUES (?);",
+                [("c",), ("a",), ("b",)],
+            )
+            conn.commit()
+            conn.close()
+
+            _add_sequence_column(path, "message_table")
+            # adding the column again does nothing
+            _add_sequence_column(path, "message_table")
+
+            conn = sqlite3.connect(path)
+            rows = conn.execute(
+                "SELECT id FROM message_table ORDER BY seq;",
+            ).fetchall()
+            conn.close()
+            self.assertListEqual(rows, [("c",), ("a",), ("b",)])
+        finally:
+            shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    unittest.main()
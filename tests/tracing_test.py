@@ -0,0 +1,265 @@
+# -*- coding: utf-8 -*-
+"""Unit tests for the tracing."""
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from typing import Any, Generator, List, Sequence, Union
+
+from agentscope.message import Msg
+from agentscope.models import ModelWrapperBase, ModelResponse
+from agentscope.service import ServiceToolkit, ServiceResponse
+from agentscope.service.service_status import ServiceExecStatus
+from agentscope.tracing import (
+    current_span,
+    get_traceparent,
+    read_spans,
+    remote_parent,
+    start_span,
+    to_chrome_trace,
+)
+from agentscope.tracing._tracer import _tracer
+
+
+class _DummyModel(ModelWrapperBase):
+    """A model wrapper reporting its token usage."""
+
+    model_type = "dummy_tracing"
+
+    def __call__(self, *args: Any, **kwargs: Any) -> ModelResponse:
+        self.monitor.update_text_and_embedding_tokens(
+            self.model_name,
+            prompt_tokens=3,
+            completion_tokens=5,
+        )
+        return ModelResponse(text="hello")
+
+    def format(
+        self,
+        *args: Union[Msg, Sequence[Msg]],
+    ) -> Union[List[dict], str]:
+        return str(args)
+
+
+class _DerivedModel(_DummyModel):
+    """A model wrapper calling the `__call__` of its parent class."""
+
+    model_type = "derived_tracing"
+
+    def __call__(self, *args: Any, **kwargs: Any) -> ModelResponse:
+        response = super().__call__(*args, **kwargs)
+        response.text = response.text.upper()
+        return response
+
+
+class _StreamingModel(ModelWrapperBase):
+    """A model wrapper streaming its response, and reporting its token usage
+    at the end of the stream."""
+
+    model_type = "streaming_tracing"
+
+    def __call__(self, *args: Any, **kwargs: Any) -> ModelResponse:
+        def generator() -> Generator:
+            text = ""
+            for chunk in ["a", "b", "c"]:
+                time.sleep(0.05)
+                text += chunk
+                yield text
+            self.monitor.update_text_and_embedding_tokens(
+                self.model_name,
+                prompt_tokens=3,
+                completion_tokens=5,
+            )
+
+        return ModelResponse(stream=generator())
+
+    def format(
+        self,
+        *args: Union[Msg, Sequence[Msg]],
+    ) -> Union[List[dict], str]:
+        return str(args)
+
+
+def _echo(text: str) -> ServiceResponse:
+    """Echo the text.
+
+    Args:
+        text (`str`):
+            The text.
+    """
+    return ServiceResponse(ServiceExecStatus.SUCCESS, text)
+
+
+class TracingTest(unittest.TestCase):
+    """Tests for the spans, the exporters and the instrumentation."""
+
+    def setUp(self) -> None:
+        """Enable the tracer with the file exporters."""
+        self.run_dir = tempfile.mkdtemp()
+        self.trace_dir = os.path.join(self.run_dir, "trace")
+        _tracer.initialize(True, self.run_dir, ["jsonl", "chrome"])
+
+    def tearDown(self) -> None:
+        """Disable the tracer and remove the files."""
+        _tracer.flush()
+        shutil.rmtree(self.run_dir)
+
+    def _spans(self) -> list:
+        _tracer.force_flush()
+        return read_spans(self.trace_dir)
+
+    def test_nested_spans(self) -> None:
+        """Test the parent and child ids, the timing and the errors."""
+        with start_span("outer", "agent", agent="bob") as outer:
+            self.assertIs(current_span(), outer)
+            with start_span("inner", "tool"):
+                pass
+            with self.assertRaises(ValueError):
+                with start_span("failed"):
+                    raise ValueError("oops")
+        self.assertIsNone(current_span())
+
+        spans = {_["name"]: _ for _ in self._spans()}
+        self.assertEqual(len(spans), 3)
+        self.assertIsNone(spans["outer"]["parent_id"])
+        self.assertEqual(spans["outer"]["attributes"], {"agent": "bob"})
+        for name in ["inner", "failed"]:
+            self.assertEqual(
+                spans[name]["parent_id"],
+                spans["outer"]["span_id"],
+            )
+            self.assertEqual(
+                spans[name]["trace_id"],
+                spans["outer"]["trace_id"],
+            )
+        self.assertGreaterEqual(
+            spans["outer"]["duration_ns"],
+            spans["inner"]["duration_ns"],
+        )
+        self.assertEqual(spans["failed"]["status"], "error")
+        self.assertEqual(
+            spans["failed"]["attributes"]["error"],
+            "ValueError: oops",
+        )
+
+        # the chrome trace is written as well
+        with open(
+            os.path.join(self.trace_dir, f"trace-{os.getpid()}.json"),
+            "r",
+            encoding="utf-8",
+        ) as file:
+            events = json.loads(file.read().rstrip(",\n") + "]")
+        self.assertEqual(len(events), 3)
+        self.assertDictEqual(
+            to_chrome_trace(list(spans.values()))["traceEvents"][0],
+            events[-1],
+        )
+
+    def test_remote_parent(self) -> None:
+        """Test continuing a trace from the traceparent of another
+        process."""
+        self.assertIsNone(get_traceparent())
+        with start_span("client", "client"):
+            traceparent = get_traceparent()
+
+        with remote_parent(traceparent):
+            with start_span("server", "server"):
+                pass
+        with remote_parent("malformed"):
+            with start_span("root"):
+                pass
+
+        spans = {_["name"]: _ for _ in self._spans()}
+        self.assertEqual(
+            spans["server"]["parent_id"],
+            spans["client"]["span_id"],
+        )
+        self.assertEqual(
+            spans["server"]["trace_id"],
+            spans["client"]["trace_id"],
+        )
+        self.assertIsNone(spans["root"]["parent_id"])
+
+    def test_model_and_tool_calls(self) -> None:
+        """Test the spans of the model calls with their tokens and the tool
+        calls."""
+        model = _DerivedModel(config_name="dummy", model_name="dummy")
+        toolkit = ServiceToolkit()
+        toolkit.add(_echo)
+
+        with start_span("reply", "agent"):
+            model()
+            toolkit._execute_func(  # pylint: disable=protected-access
+                [{"name": "_echo", "arguments": {"text": "hi"}}],
+            )
+
+        spans = {_["name"]: _ for _ in self._spans()}
+        self.assertSetEqual(
+            set(spans),
+            {"reply", "_DerivedModel.__call__", "_echo"},
+        )
+        model_span = spans["_DerivedModel.__call__"]
+        self.assertEqual(model_span["kind"], "model")
+        self.assertEqual(model_span["attributes"]["prompt_tokens"], 3)
+        self.assertEqual(model_span["attributes"]["completion_tokens"], 5)
+        self.assertEqual(spans["_echo"]["attributes"]["status"], "SUCCESS")
+        self.assertEqual(
+            spans["_echo"]["parent_id"],
+            spans["reply"]["span_id"],
+        )
+
+    def test_streaming_model_call(self) -> None:
+        """Test the span of a streamed model call lasts until the stream is
+        exhausted, and gets the tokens reported within the stream."""
+        model = _StreamingModel(config_name="dummy", model_name="dummy")
+
+        with start_span("reply", "agent") as reply:
+            response = model()
+            # the model span isn't the current span after the call returns
+            self.assertIs(current_span(), reply)
+            self.assertEqual(
+                [text for _, text in response.stream][-1],
+                "abc",
+            )
+            self.assertIs(current_span(), reply)
+
+        spans = {_["name"]: _ for _ in self._spans()}
+        model_span = spans["_StreamingModel.__call__"]
+        self.assertEqual(model_span["parent_id"], spans["reply"]["span_id"])
+        self.assertGreaterEqual(model_span["duration_ns"], 0.15e9)
+        self.assertEqual(model_span["attributes"]["prompt_tokens"], 3)
+        self.assertEqual(model_span["attributes"]["completion_tokens"], 5)
+        self.assertNotIn("prompt_tokens", spans["reply"]["attributes"])
+
+    def test_disabled(self) -> None:
+        """Test nothing is recorded when the tracing is disabled."""
+        _tracer.flush()
+        with start_span("ignored") as span:
+            span.set_attribute("key", "value")
+            self.assertIsNone(current_span())
+        self.assertFalse(os.path.exists(self.trace_dir))
+
+    def test_state_dict(self) -> None:
+        """Test the tracer is restored from its state, e.g. in the agent
+        servers."""
+        state = _tracer.state_dict()
+        self.assertDictEqual(
+            state,
+            {
+                "active": True,
+                "run_dir": self.run_dir,
+                "exporters": ["jsonl", "chrome"],
+            },
+        )
+        _tracer.flush()
+        _tracer.load_dict(state)
+        self.assertDictEqual(_tracer.state_dict(), state)
+
+        with self.assertRaises(ValueError):
+            _tracer.initialize(True, self.run_dir, ["unknown"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+"""Unit test for the pool of browser pages."""
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import patch
+
+from agentscope.service import WebBrowserPool
+
+# the pool wraps the objects of the playwright modules with proxies
+_MODULE = "playwright.async_api._fake"
+
+
+class _FakePage:
+    __module__ = _MODULE
+
+    def __init__(self, context: "_FakeContext") -> None:
+        self.context = context
+        self.url = "about:blank"
+
+    def is_closed(self) -> bool:
+        """Whether the context of the page is closed"""
+        return self.context.closed
+
+    async def goto(self, url: str) -> None:
+        """Navigate to the url"""
+        self.url = url
+
+
+class _FakeContext:
+    __module__ = _MODULE
+
+    def __init__(self, browser: "_FakeBrowser", kwargs: dict) -> None:
+        self.browser = browser
+        self.kwargs = kwargs
+        self.closed = False
+
+    async def new_page(self) -> _FakePage:
+        """Open a page in the context"""
+        return _FakePage(self)
+
+    async def close(self) -> None:
+        """Close the context"""
+        self.closed = True
+        self.browser.contexts.remove(self)
+
+
+class _FakeBrowser:
+    __module__ = _MODULE
+
+    def __init__(self, launch_kwargs: dict) -> None:
+        self.launch_kwargs = launch_kwargs
+        self.contexts = []
+        self.closed = False
+
+    async def new_context(self, **kwargs: Any) -> _FakeContext:
+        """Create a context in the browser"""
+        context = _FakeContext(self, kwargs)
+        self.contexts.append(context)
+        return context
+
+    async def close(self) -> None:
+        """Close the browser"""
+        self.closed = True
+
+
+class _FakePlaywright:
+    def __init__(self) -> None:
+        self.browsers = []
+        self.stopped = False
+        self.chromium = SimpleNamespace(launch=self._launch)
+
+    async def _launch(self, **kwargs: Any) -> _FakeBrowser:
+        browser = _FakeBrowser(kwargs)
+        self.browsers.append(browser)
+        return browser
+
+    async def start(self) -> "_FakePlaywright":
+        """Start the playwright"""
+        return self
+
+    async def stop(self) -> None:
+        """Stop the playwright"""
+        self.stopped = True
+
+
+def _wait_until(condition: Any, timeout: float = 5) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+class WebBrowserPoolTest(unittest.TestCase):
+    """Test the leasing, the limit and the reaping of the pool."""
+
+    def setUp(self) -> None:
+        """Patch the playwright with fakes"""
+        self.playwright = _FakePlaywright()
+        self.patcher = patch(
+            "agentscope.service.browser.browser_pool.async_playwright",
+            return_value=self.playwright,
+        )
+        self.patcher.start()
+
+    def tearDown(self) -> None:
+        """Stop the patch"""
+        self.patcher.stop()
+
+    def test_lease_and_release(self) -> None:
+        """Test leasing pages with the warm pages and the limit"""
+        pool = WebBrowserPool(
+            max_pages=2,
+            warm_pages=1,
+            headless=True,
+            viewport={"width": 800, "height": 600},
+        )
+        self.assertTrue(_wait_until(lambda: pool.num_idle_pages == 1))
+        self.assertEqual(
+            self.playwright.browsers[0].launch_kwargs,
+            {"headless": True},
+        )
+
+        page = pool.lease()
+        # the sync-style calls are run in the loop of the pool
+        self.assertIsNone(page.goto("https://example.com"))
+        self.assertEqual(page.url, "https://example.com")
+        self.assertEqual(
+            page.context.kwargs,
+            {"viewport": {"width": 800, "height": 600}},
+        )
+
+        # a new warm page is created in background up to the limit
+        self.assertTrue(_wait_until(lambda: pool.num_idle_pages == 1))
+        other = pool.lease()
+        self.assertEqual(pool.num_pages, 2)
+        with self.assertRaises(TimeoutError):
+            pool.lease(timeout=0.1)
+
+        # a waiting lease gets the page after release
+        leased = []
+        thread = threading.Thread(target=lambda: leased.append(pool.lease()))
+        thread.start()
+        pool.release(page)
+        thread.join(timeout=5)
+        self.assertEqual(len(leased), 1)
+        # the context of the released page is closed
+        self.assertTrue(page.is_closed())
+        self.assertNotEqual(leased[0], page)
+
+        pool.release(other)
+        pool.release(leased[0])
+        pool.close()
+        self.assertTrue(self.playwright.stopped)
+        self.assertTrue(self.playwright.browsers[0].closed)
+        with self.assertRaises(RuntimeError):
+            pool.lease()
+
+    def test_keep_pages_and_reap(self) -> None:
+        """Test reusing the released pages and reaping the idle ones"""
+        pool = WebBrowserPool(
+            max_pages=4,
+            warm_pages=0,
+            idle_timeout=0.2,
+            reset_on_release=False,
+        )
+        with pool.leased() as page:
+            page.goto("https://example.com")
+        self.assertEqual(pool.num_idle_pages, 1)
+        with pool.leased() as reused:
+            self.assertEqual(reused, page)
+            self.assertEqual(reused.url, "https://example.com")
+
+        self.assertTrue(_wait_until(lambda: pool.num_pages == 0))
+        self.assertTrue(page.is_closed())
+        pool.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""Unit test for the web browser with local html fixtures."""
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from agentscope.service import ServiceExecStatus, WebBrowser, WebBrowserPool
+
+
+def _launch_browser() -> WebBrowser:
+    """Launch a headless browser, or return None if playwright or the
+    browser is not installed."""
+    try:
+        return WebBrowser(browser_visible=False, timeout=10)
+    except Exception:
+        return None
+
+
+INDEX_HTML = """<html><body>
+<a id="next" href="next.html">Next page</a>
+<input id="box" type="text">
+<button id="more" onclick="setTimeout(() => {
+    const b = document.createElement('button');
+    b.textContent = 'Added';
+    b.onclick = () => {};
+    document.body.appendChild(b);
+}, 300)">More</button>
+</body></html>"""
+
+NEXT_HTML = """<html><body>
+<p id="title">Second page</p>
+<button onclick="">Back</button>
+</body></html>"""
+
+
+class WebBrowserTest(unittest.TestCase):
+    """Test the waiting and the interactive marks of the web browser."""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """Launch the browser once for all the tests"""
+        cls.browser = _launch_browser()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        """Close the browser"""
+        if cls.browser is not None:
+            cls.browser.close()
+
+    def setUp(self) -> None:
+        """Write the html fixtures"""
+        if self.browser is None:
+            self.skipTest("playwright or the browser is not installed")
+        self.tmp_dir = tempfile.mkdtemp()
+        for name, html in [
+            ("index.html", INDEX_HTML),
+            ("next.html", NEXT_HTML),
+        ]:
+            with open(
+                os.path.join(self.tmp_dir, name),
+                "w",
+                encoding="utf-8",
+            ) as f:
+                f.write(html)
+        self.index_url = Path(self.tmp_dir, "index.html").as_uri()
+
+    def tearDown(self) -> None:
+        """Remove the html fixtures"""
+        shutil.rmtree(self.tmp_dir)
+
+    def test_wait_and_incremental_marks(self) -> None:
+        """Test waiting for the DOM changes and updating the marks"""
+        self.browser.action_visit_url(self.index_url)
+        elements = self.browser.set_interactive_marks()
+        self.assertEqual(
+            [element.tag_name for element in elements],
+            ["a", "input", "button"],
+        )
+
+        # the click returns after the element is added, without fixed sleeps
+        st = time.perf_counter()
+        response = self.browser.action_click(2)
+        self.assertEqual(response.status, ServiceExecStatus.SUCCESS)
+        self.assertLess(time.perf_counter() - st, 2)
+
+        diff = self.browser.update_interactive_marks()
+        self.assertEqual(diff["removed"], [])
+        self.assertEqual(list(diff["added"]), [3])
+        self.assertEqual(diff["added"][3].inner_text, "Added")
+
+        # the ids of the remaining elements are stable
+        response = self.browser.action_type(1, "hello", submit=False)
+        self.assertEqual(response.status, ServiceExecStatus.SUCCESS)
+        self.assertEqual(
+            self.browser.update_interactive_marks(),
+            {"added": {}, "removed": []},
+        )
+
+    def test_navigation(self) -> None:
+        """Test waiting for the navigation triggered by the actions"""
+        self.browser.action_visit_url(self.index_url)
+        self.browser.set_interactive_marks()
+
+        response = self.browser.action_click(0)
+        self.assertEqual(response.status, ServiceExecStatus.SUCCESS)
+        self.assertTrue(self.browser.url.endswith("next.html"))
+        self.assertTrue(self.browser.wait_for_ready(selector="#title"))
+
+        # all the elements are replaced after the navigation
+        diff = self.browser.update_interactive_marks()
+        self.assertEqual(sorted(diff["removed"]), [0, 1, 2])
+        self.assertEqual(
+            [element.tag_name for element in diff["added"].values()],
+            ["button"],
+        )
+
+        response = self.browser.action_click(1)
+        self.assertEqual(response.status, ServiceExecStatus.ERROR)
+
+    def test_pooled_browsers(self) -> None:
+        """Test the browsers with the pages leased from a pool"""
+        pool = WebBrowserPool(max_pages=2, warm_pages=1)
+        try:
+            browsers = [WebBrowser(pool=pool) for _ in range(2)]
+            for browser in browsers:
+                browser.action_visit_url(self.index_url)
+                self.assertEqual(len(browser.set_interactive_marks()), 3)
+
+            response = browsers[0].action_click(0)
+            self.assertEqual(response.status, ServiceExecStatus.SUCCESS)
+            self.assertTrue(browsers[0].url.endswith("next.html"))
+            self.assertTrue(browsers[1].url.endswith("index.html"))
+
+            for browser in browsers:
+                browser.close()
+            self.assertEqual(pool.num_pages, 2)
+        finally:
+            pool.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,20 +1,30 @@
 # -*- coding: utf-8 -*-
 """ Python web digest test."""
 
+import os
+import shutil
+import threading
 import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from typing import Union, Sequence, List
 from unittest.mock import patch, MagicMock, Mock
 
 from agentscope.service import ServiceResponse
-from agentscope.service import load_web, digest_webpage
+from agentscope.service import load_web, digest_webpage, summarization
+from agentscope.service import load_web_many, parse_html_to_text
 from agentscope.service.service_status import ServiceExecStatus
 from agentscope.models import ModelWrapperBase, ModelResponse
 from agentscope.message import Msg
+from agentscope import tokens
 
 
 class TestWebDigest(unittest.TestCase):
     """Tests for web loading and digesting."""
 
+    def tearDown(self) -> None:
+        """Unregister the token counting function of the dummy model."""
+        vars(tokens)["__register_models"].pop("dummy_counting_model", None)
+
     @patch("requests.get")
     def test_web_load(self, mock_get: MagicMock) -> None:
         """test web_load function loading html"""
@@ -70,6 +80,101 @@ class TestWebDigest(unittest.TestCase):
             expected_result,
         )
 
+    def test_parse_html_to_text(self) -> None:
+        """test the text extraction of nested, unclosed and hidden tags"""
+        html = (
+            "<div>Hello <b>World</b>!<script>var x;</script>"
+            '<a href="https://a.com">A <i>link</i></a> <a href="x">no</a>'
+            "</span><p>unclosed<li>item</div>tail<p>last"
+        )
+        self.assertEqual(
+            parse_html_to_text(html, ["div", "p"]),
+            "Hello World![A](https://a.com)link uncloseditemlast",
+        )
+        self.assertEqual(parse_html_to_text(html, ["li"]), "item")
+        self.assertEqual(parse_html_to_text(html, []), "")
+
+    def test_load_web_many(self) -> None:
+        """test loading web pages concurrently with cache"""
+        requests_log = []
+
+        class Handler(BaseHTTPRequestHandler):
+            """Serve html pages with ETag"""
+
+            def do_GET(self) -> None:  # pylint: disable=invalid-name
+                """Handle the GET requests"""
+                requests_log.append(
+                    (self.path, self.headers.get("If-None-Match")),
+                )
+                if self.path == "/missing":
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+                etag = f'"{self.path}"'
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                body = (
+                    f"<html><body><p>Page {self.path}</p>"
+                    f"<script>x</script></body></html>"
+                ).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args: object) -> None:
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        cache_dir = "./test_web_cache"
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        urls = [f"{base}/{i}" for i in range(5)] + [f"{base}/missing"]
+        try:
+            response = load_web_many(
+                urls,
+                keep_raw=True,
+                html_selected_tags=["p"],
+                max_per_host=2,
+                cache_dir=cache_dir,
+            )
+            self.assertEqual(response.status, ServiceExecStatus.SUCCESS)
+            self.assertEqual(list(response.content), urls)
+            for i in range(5):
+                result = response.content[urls[i]]
+                self.assertEqual(result.status, ServiceExecStatus.SUCCESS)
+                self.assertEqual(result.content["html_to_text"], f"Page /{i}")
+                self.assertIn(b"<script>", result.content["raw"])
+            self.assertEqual(
+                response.content[urls[-1]].status,
+                ServiceExecStatus.ERROR,
+            )
+
+            # the cached pages are revalidated by ETag
+            requests_log.clear()
+            response = load_web_many(
+                urls[:5],
+                html_selected_tags=["p"],
+                cache_dir=cache_dir,
+            )
+            self.assertEqual(
+                sorted(requests_log),
+                [(f"/{i}", f'"/{i}"') for i in range(5)],
+            )
+            self.assertEqual(
+                response.content[urls[3]].content,
+                {"html_to_text": "Page /3"},
+            )
+        finally:
+            server.shutdown()
+            server.server_close()
+            shutil.rmtree(cache_dir, ignore_errors=True)
+        self.assertFalse(os.path.exists(cache_dir))
+
     def test_web_digest(self) -> None:
         """test web_digest function"""
 
@@ -100,6 +205,89 @@ class TestWebDigest(unittest.TestCase):
             expected_result,
         )
 
+    def test_chunked_summarization(self) -> None:
+        """test the map-reduce summarization of long texts"""
+
+        class CountingModel(ModelWrapperBase):
+            """Dummy model recording the summarized texts"""
+
+            def __init__(self, replies: Sequence[str] = ()) -> None:
+                self.model_name = "dummy_counting_model"
+                self.inputs = []
+                self.replies = list(replies)
+
+            def __call__(self, messages: list[dict]) -> ModelResponse:
+                self.inputs.append(messages[1]["content"])
+                if self.replies:
+                    return ModelResponse(text=self.replies.pop(0))
+                return ModelResponse(text=f"s{len(self.inputs)}")
+
+            def format(
+                self,
+                *args: Union[Msg, Sequence[Msg]],
+            ) -> Union[List[dict], str]:
+                return [{"content": msg.content} for msg in args[0]]
+
+        # one token per word
+        tokens.register_model(
+            "dummy_counting_model",
+            lambda _, msgs: len(msgs[0]["content"].split()),
+        )
+        text = "\n\n".join(" ".join(["word"] * 10) for _ in range(9))
+
+        model = CountingModel()
+        response = summarization(model, text, chunk_size=30, fan_out=2)
+        self.assertEqual(response.status, ServiceExecStatus.SUCCESS)
+        # 3 chunks -> 2 groups -> 1 group -> the final summary
+        self.assertEqual(len(model.inputs), 3 + 2 + 1)
+        self.assertEqual(response.content, "s6")
+        for chunk in model.inputs[:3]:
+            self.assertLessEqual(len(chunk.split()), 30)
+        self.assertEqual(
+            " ".join(model.inputs[:3]).split(),
+            text.split(),
+        )
+        # the tokens of the chunks are estimated from their lengths
+        self.assertEqual(response.metadata["n_tokens"], 90)
+        self.assertEqual(response.metadata["n_calls"], 6)
+        self.assertAlmostEqual(
+            response.metadata["n_sent_tokens"],
+            90 + 3 + 2,
+            delta=3,
+        )
+        self.assertAlmostEqual(
+            response.metadata["n_saved_tokens"],
+            60,
+            delta=3,
+        )
+
+        # the merged summaries exceeding the chunk size are split again
+        model = CountingModel(replies=[" ".join(["long"] * 40)])
+        response = summarization(model, text, chunk_size=30, fan_out=4)
+        self.assertEqual(response.status, ServiceExecStatus.SUCCESS)
+        for summarized in model.inputs:
+            self.assertLessEqual(len(summarized.split()), 30)
+        self.assertEqual(
+            " ".join(model.inputs[3:5]).split(),
+            ["long"] * 40,
+        )
+
+        # short texts are summarized by a single call
+        model = CountingModel()
+        response = summarization(model, "short text", chunk_size=30)
+        self.assertEqual(model.inputs, ["short text"])
+        self.assertEqual(response.content, "s1")
+
+        # the errors of the model calls are returned in the response
+        model = CountingModel()
+        with patch.object(
+            model,
+            "format",
+            side_effect=RuntimeError("format error"),
+        ):
+            response = summarization(model, text, chunk_size=30)
+        self.assertEqual(response.status, ServiceExecStatus.ERROR)
+
 
 # This allows the tests to be run from the command line
 if __name__ == "__main__":